@@ -1,49 +1,61 @@
 # __init__.py - MBTI模块热插拔接口定义
-# sys 通过 import 导入系统模块，用于路径操作
+# 清单 MANIFEST 为纯数据，导入本包时只加载它；router、step1-5、schemas 均在首次访问时才导入
 import sys
-# os 通过 import 导入操作系统接口模块，用于文件路径处理
-import os
-# os.path.dirname 通过调用获取当前文件的上级目录路径
-# 然后再次调用获取上上级目录路径，赋值给parent_dir变量
-parent_dir = os.path.dirname(os.path.dirname(__file__))
-# sys.path.insert 通过调用在路径列表开头插入parent_dir
-# 传入索引0和parent_dir参数，确保上级目录优先被搜索
-sys.path.insert(0, parent_dir)
+import types
+
+from applications.mbti.manifest import MANIFEST
+
+# _LAZY_ATTRIBUTES 记录按需加载的对外属性：属性名 -> (模块路径, 模块内属性名)
+# 通过 PEP 562 的模块级 __getattr__ 在首次访问时导入，保持原有 from applications.mbti import xxx 用法不变
+_LAZY_ATTRIBUTES = {
+    "execute": ("applications.mbti.mbti", "run"),
+    "router": ("applications.mbti.router", "router"),
+    "process_mbti_request": ("applications.mbti.router", "process_mbti_request"),
+    "FIELD_DEFINITIONS": ("applications.mbti.schemas", "FIELD_DEFINITIONS"),
+    "schema_manager": ("applications.mbti.schemas", "schema_manager"),
+    "get_field_types": ("applications.mbti.schemas", "get_field_types"),
+    "get_field_groups": ("applications.mbti.schemas", "get_field_groups"),
+    "get_request_fields": ("applications.mbti.schemas", "get_request_fields"),
+    "get_response_fields": ("applications.mbti.schemas", "get_response_fields"),
+    "get_reverse_question_fields": ("applications.mbti.schemas", "get_reverse_question_fields"),
+    "get_assessment_fields": ("applications.mbti.schemas", "get_assessment_fields"),
+    "get_valid_steps": ("applications.mbti.schemas", "get_valid_steps"),
+    "get_all_field_definitions": ("applications.mbti.schemas", "get_all_field_definitions"),
+    "inject_to_target_module": ("applications.mbti.schemas", "inject_to_target_module"),
+}
+
+
+def __getattr__(name):
+    """
+    模块级属性按需加载：首次访问时导入对应实现模块，并写回包命名空间，之后不再经过此函数
+    MODULE_INFO 同样在首次访问时才动态生成
+    """
+    if name == "MODULE_INFO":
+        return _get_module_info()
+    target = _LAZY_ATTRIBUTES.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(target[0]), target[1])
+    globals()[name] = value
+    return value
+
+
+class _LazyPackage(types.ModuleType):
+    """
+    导入子模块 applications.mbti.router 时，导入系统会把子模块对象写到包的 router 属性上，
+    覆盖对外暴露的 router 实例；这里改为写入子模块中的同名属性，与原先立即导入时的行为一致
+    """
+
+    def __setattr__(self, name, value):
+        target = _LAZY_ATTRIBUTES.get(name)
+        if target is not None and isinstance(value, types.ModuleType) and value.__name__ == target[0]:
+            value = getattr(value, target[1])
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
 
-# from applications.mbti.mbti import run as execute
-# 通过绝对导入路径applications.mbti.mbti获取run函数
-# 并将其重命名为execute，用于统一模块执行入口
-from applications.mbti.mbti import run as execute
-# from applications.mbti.schemas import 导入多个字段定义相关函数和变量
-# 包含FIELD_DEFINITIONS字典、schema_manager实例等多个导入项
-from applications.mbti.schemas import (
-    # FIELD_DEFINITIONS 导入字段定义规范字典
-    FIELD_DEFINITIONS,
-    # schema_manager 导入字段管理器SchemaManager实例
-    schema_manager,
-    # get_field_types 导入获取字段类型映射的函数
-    get_field_types,
-    # get_field_groups 导入获取字段分组映射的函数
-    get_field_groups,
-    # get_request_fields 导入获取请求字段列表的函数
-    get_request_fields,
-    # get_response_fields 导入获取响应字段列表的函数
-    get_response_fields,
-    # get_reverse_question_fields 导入获取反向问题字段列表的函数
-    get_reverse_question_fields,
-    # get_assessment_fields 导入获取评估字段列表的函数
-    get_assessment_fields,
-    # get_valid_steps 导入获取有效步骤列表的函数
-    get_valid_steps,
-    # get_all_field_definitions 导入获取所有字段定义的函数
-    get_all_field_definitions,
-    # inject_to_target_module 导入向目标模块注入字段的函数
-    inject_to_target_module
-)
-# from applications.mbti.router import router, process_mbti_request
-# 通过绝对导入路径applications.mbti.router获取router实例
-# 和process_mbti_request函数，用于路由和请求处理
-from applications.mbti.router import router, process_mbti_request
 
 # def _get_dynamic_module_info() 定义动态生成模块元信息的函数
 # 函数不接收参数，返回包含动态字段信息的模块信息字典
@@ -52,6 +64,22 @@ def _get_dynamic_module_info():
     动态生成模块元信息，通过调用schemas.py获取字段定义
     返回：完整的模块信息字典
     """
+    # 实现模块在此处才导入：模块级 __getattr__ 不作用于本模块函数内的全局名称查找，因此显式导入
+    from applications.mbti.mbti import run as execute
+    from applications.mbti.router import router, process_mbti_request
+    from applications.mbti.schemas import (
+        FIELD_DEFINITIONS,
+        schema_manager,
+        get_field_types,
+        get_field_groups,
+        get_request_fields,
+        get_response_fields,
+        get_reverse_question_fields,
+        get_assessment_fields,
+        get_valid_steps,
+        get_all_field_definitions,
+    )
+
     # get_all_field_definitions() 通过调用获取所有字段定义信息
     # 不传入参数，返回包含字段类型、分组、元数据的完整字典
     # 赋值给all_field_definitions变量用于后续模块信息构建
@@ -61,20 +89,18 @@ def _get_dynamic_module_info():
     # 字典包含name、version、description等静态信息
     # 以及通过调用schemas函数动态获取的interface和capabilities信息
     return {
-        # "name" 键赋值为字符串"mbti"，标识模块名称
-        "name": "mbti",
-        # "version" 键赋值为字符串"1.0.0"，标识模块版本
-        "version": "1.0.0",
-        # "description" 键赋值为模块功能描述字符串
-        "description": "MBTI性格测试中心模块",
+        # "name"、"version"、"description" 键取自清单 MANIFEST，与清单保持一致
+        "name": MANIFEST["name"],
+        "version": MANIFEST["version"],
+        "description": MANIFEST["description"],
         "interface": {  # 对外暴露的接口字典
-            # "execute" 键赋值为之前导入的execute函数引用
+            # "execute" 键赋值为导入的execute函数引用
             "execute": execute,
             # "validate" 键赋值为None，表示验证接口暂未实现
             "validate": None,
-            # "router" 键赋值为之前导入的router实例
+            # "router" 键赋值为导入的router实例
             "router": router,
-            # "process_mbti_request" 键赋值为之前导入的process_mbti_request函数
+            # "process_mbti_request" 键赋值为导入的process_mbti_request函数
             "process_mbti_request": process_mbti_request,
             "schemas": {  # 数据结构定义字典，包含动态获取的字段信息
                 # "field_definitions" 键赋值为FIELD_DEFINITIONS字典
@@ -119,35 +145,8 @@ def _get_dynamic_module_info():
             }
         },
         "orchestrate_info": {  # 编排信息字典
-            # "supported_intents" 键赋值为具体的意图字符串列表
-            # 包含mbti_step1到mbti_step5的完整意图标识，匹配router.py中的实际处理逻辑
-            "supported_intents": ["mbti_step1", "mbti_step2", "mbti_step3", "mbti_step4", "mbti_step5"],
-            "step_flow": {  # 步骤流程定义字典
-                # "step1" 键赋值为包含next和description的字典，表示初始MBTI测试引导
-                "step1": {"next": "step2", "description": "初始MBTI测试引导"},
-                # "step2" 键赋值为包含next和description的字典，表示MBTI类型计算
-                "step2": {"next": "step3", "description": "MBTI类型计算"},
-                # "step3" 键赋值为包含next和description的字典，表示反向问题生成
-                "step3": {"next": "step4", "description": "反向问题生成"},
-                # "step4" 键赋值为包含next和description的字典，表示反向问题计分
-                "step4": {"next": "step5", "description": "反向问题计分"},
-                # "step5" 键赋值为包含next和description的字典，表示最终报告生成
-                "step5": {"next": None, "description": "最终报告生成"}
-            },
-            "data_flow": {  # 数据流转定义字典
-                # "input_validation" 键赋值为验证函数的完整路径字符串
-                # 指向entry.validators.data_validator模块的validate_request_data函数
-                "input_validation": "entry.validators.data_validator.validate_request_data",
-                # "step_orchestrate" 键赋值为编排函数的完整路径字符串
-                # 指向applications.mbti.router模块的process方法
-                "step_orchestrate": "applications.mbti.router.process",
-                # "result_storage" 键赋值为存储函数的完整路径字符串
-                # 指向orchestrate模块的database存储功能
-                "result_storage": "orchestrate.database.save_mbti_result",
-                # "frontend_response" 键赋值为响应函数的完整路径字符串
-                # 指向orchestrate模块的entry响应处理功能
-                "frontend_response": "orchestrate.entry.process_response"
-            },
+            # supported_intents、step_flow、data_flow 取自清单 MANIFEST，避免两处定义不一致
+            **MANIFEST["orchestrate_info"],
             "field_mappings": {  # 字段映射信息字典（动态获取）
                 # "request_fields" 键通过get_request_fields()调用获取请求字段列表
                 # 不传入参数，返回包含request_id、user_id等字段的列表
@@ -160,24 +159,13 @@ def _get_dynamic_module_info():
                 "assessment_fields": get_assessment_fields()
             }
         },
-        # "dependencies" 键赋值为空列表，表示不依赖其他模块
-        "dependencies": [],
-        "metadata": {  # 模块元数据字典
-            # "author" 键赋值为开发团队字符串
-            "author": "Career Bot Team",
-            # "created" 键赋值为创建日期字符串
-            "created": "2024-09-05",
-            # "last_modified" 键赋值为最后修改日期字符串
-            "last_modified": "2024-09-05",
-            # "compatibility" 键赋值为兼容性要求字符串
-            "compatibility": "orchestrate v1.0+",
-            # "license" 键赋值为使用许可字符串
-            "license": "Internal Use Only",
+        # "dependencies" 键取自清单 MANIFEST
+        "dependencies": MANIFEST["dependencies"],
+        "metadata": {  # 模块元数据字典，静态部分取自清单，字段统计动态计算
+            **MANIFEST["metadata"],
             # "field_count" 键通过len(get_field_types())调用计算字段总数
             # get_field_types()不传入参数，返回字段类型字典，然后len()计算其长度
-            "field_count": len(get_field_types()),
-            # "schema_version" 键赋值为字段定义版本字符串
-            "schema_version": "2.0.0"
+            "field_count": len(get_field_types())
         }
     }
 
@@ -204,9 +192,8 @@ def _get_module_info():
     # return 语句返回缓存的模块信息字典
     return _MODULE_INFO_CACHE
 
-# MODULE_INFO 通过_get_module_info()调用获取动态生成的模块信息
-# 赋值给全局变量MODULE_INFO，用于向后兼容现有代码
-MODULE_INFO = _get_module_info()
+# MODULE_INFO 不再在导入时生成：访问 applications.mbti.MODULE_INFO 时由 __getattr__ 调用 _get_module_info()
+# 生成后缓存在 _MODULE_INFO_CACHE，向后兼容现有代码
 
 # def initialize_module(config: dict = None) 定义模块初始化钩子函数
 # 函数接收可选的config字典参数，默认为None，返回初始化状态字典
@@ -221,18 +208,18 @@ def initialize_module(config: dict = None):
     # 传入字符串消息"MBTI Agent模块初始化完成"
     logger.info("MBTI Agent模块初始化完成")
 
-    # schema_manager 通过引用触发字段管理器初始化
-    # 这会调用SchemaManager的__init__方法，加载JSON数据并注入字段
-    schema_manager
+    # module_info 通过_get_module_info()调用获取模块信息
+    # 这会导入schemas.py，调用SchemaManager的__init__方法，加载JSON数据并注入字段
+    module_info = _get_module_info()
 
     # return 语句返回包含初始化状态的字典
     return {
         # "status" 键赋值为字符串"initialized"表示初始化成功
         "status": "initialized",
-        # "capabilities" 键赋值为MODULE_INFO["capabilities"]获取模块能力信息
-        "capabilities": MODULE_INFO["capabilities"],
-        # "orchestrate_info" 键赋值为MODULE_INFO["orchestrate_info"]获取编排信息
-        "orchestrate_info": MODULE_INFO["orchestrate_info"]
+        # "capabilities" 键赋值为module_info["capabilities"]获取模块能力信息
+        "capabilities": module_info["capabilities"],
+        # "orchestrate_info" 键赋值为module_info["orchestrate_info"]获取编排信息
+        "orchestrate_info": module_info["orchestrate_info"]
     }
 
 # def cleanup_module() 定义模块清理钩子函数
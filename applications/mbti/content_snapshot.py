@@ -0,0 +1,34 @@
+# content_snapshot.py - MBTI只读内容的共享快照
+"""
+step2 的类型输出模板表（step2_mbti_output_templates.json）编译为快照中的有序字符串表，
+多 worker 部署时各进程只读 mmap 同一份快照，按 MBTI 类型二分查找模板，不再各自解析并持有一份 JSON 副本。
+快照由 boot/build_snapshot.py 构建；快照缺失或模板文件已更新时返回 None，调用方回退到解析 JSON。
+"""
+
+import json
+import os
+from typing import List, Mapping, Optional
+
+from utilities.snapshot.snapshot import SnapshotWriter, is_fresh, shared_snapshot, source_fingerprint
+
+MBTI_DIR = os.path.dirname(os.path.abspath(__file__))
+STEP2_TEMPLATES_PATH = os.path.join(MBTI_DIR, "step2_mbti_output_templates.json")
+# STEP2_TEMPLATES_SECTION 为模板表在快照中的分区名前缀
+STEP2_TEMPLATES_SECTION = "mbti.step2_templates"
+
+
+def compile_snapshot(writer: SnapshotWriter) -> List[str]:
+    """快照构建钩子（boot/build_snapshot.py 调用）：写入 step2 模板表，返回数据源文件列表"""
+    with open(STEP2_TEMPLATES_PATH, "r", encoding="utf-8") as f:
+        templates = json.load(f)
+    writer.add_bytes(f"{STEP2_TEMPLATES_SECTION}.fingerprint", source_fingerprint([STEP2_TEMPLATES_PATH]))
+    writer.add_string_map(STEP2_TEMPLATES_SECTION, templates)
+    return [STEP2_TEMPLATES_PATH]
+
+
+def step2_templates() -> Optional[Mapping[str, str]]:
+    """快照中的 step2 模板表（只读 Mapping）；快照不可用或已过期时返回 None"""
+    snapshot = shared_snapshot()
+    if not is_fresh(snapshot, STEP2_TEMPLATES_SECTION, [STEP2_TEMPLATES_PATH]):
+        return None
+    return snapshot.string_map(STEP2_TEMPLATES_SECTION)
@@ -0,0 +1,61 @@
+# manifest.py - MBTI模块清单
+"""
+MBTI 模块的轻量清单，只包含纯数据，不导入任何实现代码。
+
+编排层和 entry 通过读取 MANIFEST 即可得知模块支持的 intent 与步骤流程，
+真正的实现（router、step1-5、schemas）在首次处理请求时才通过 entrypoint 加载，
+冷启动时 import applications.mbti 不再触发 JSON 读取和字段注入。
+"""
+
+MANIFEST = {
+    # "name" 标识模块名称，与 MODULE_INFO["name"] 一致
+    "name": "mbti",
+    "version": "1.0.0",
+    "description": "MBTI性格测试中心模块",
+    # "entrypoint" 为 "模块路径:属性名"，首次分派请求时才导入
+    "entrypoint": "applications.mbti.mbti:run",
+    "orchestrate_info": {
+        # "supported_intents" 与 router.py 中实际处理的 intent 保持一致
+        "supported_intents": ["mbti_step1", "mbti_step2", "mbti_step3", "mbti_step4", "mbti_step5"],
+        # "intent_handlers" 为 intent 到处理函数的 "模块路径:属性名"，模块加载时注册到 RegistryCenter，
+        # 编排层据此构建扁平分派表，请求一次查表直达 MBTIRouter.process，不再经过 route_type 和模块入口两层；
+        # 统一经 MBTIRouter.process 保留其错误响应格式、请求上下文、指标、追踪与采样标注
+        "intent_handlers": {
+            "mbti_step1": "applications.mbti.router:process_mbti_request",
+            "mbti_step2": "applications.mbti.router:process_mbti_request",
+            "mbti_step3": "applications.mbti.router:process_mbti_request",
+            "mbti_step4": "applications.mbti.router:process_mbti_request",
+            "mbti_step5": "applications.mbti.router:process_mbti_request"
+        },
+        "step_flow": {
+            "step1": {"next": "step2", "description": "初始MBTI测试引导"},
+            "step2": {"next": "step3", "description": "MBTI类型计算"},
+            "step3": {"next": "step4", "description": "反向问题生成"},
+            "step4": {"next": "step5", "description": "反向问题计分"},
+            "step5": {"next": None, "description": "最终报告生成"}
+        },
+        "data_flow": {
+            "input_validation": "entry.validators.data_validator.validate_request_data",
+            "step_orchestrate": "applications.mbti.router.process",
+            "result_storage": "orchestrate.database.save_mbti_result",
+            "frontend_response": "orchestrate.entry.process_response"
+        }
+    },
+    # "dependencies" 为启动时必须先完成初始化的模块名，boot 据此构建启动依赖图
+    "dependencies": [],
+    # "lifecycle" 为启动/关闭钩子，boot 按依赖顺序调用；同步钩子在线程池中执行
+    # prebuild 供接收流量前的预热阶段使用；不注册 warmup_requests，回放请求会写入持久化存储
+    "lifecycle": {
+        "initialize": "applications.mbti:initialize_module",
+        "cleanup": "applications.mbti:cleanup_module",
+        "prebuild": "applications.mbti.warmup:prebuild"
+    },
+    "metadata": {
+        "author": "Career Bot Team",
+        "created": "2024-09-05",
+        "last_modified": "2024-09-05",
+        "compatibility": "orchestrate v1.0+",
+        "license": "Internal Use Only",
+        "schema_version": "2.0.0"
+    }
+}
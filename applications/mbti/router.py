@@ -16,26 +16,42 @@ RequestData = Dict[str, Union[str, int, bool, None]]
 # 赋值给 ResponseData 作为响应数据类型定义
 ResponseData = Dict[str, Union[str, bool, int]]
 
-# import 语句通过模块名导入 step1 模块
-# 使用绝对导入方式，支持测试环境和独立运行环境
-# 赋值给 step1 变量，用于后续调用 step1.process() 方法
-from applications.mbti import step1
-# import 语句通过模块名导入 step2 模块
-# 使用绝对导入方式，支持测试环境和独立运行环境
-# 赋值给 step2 变量，用于后续调用 step2.process() 方法
-from applications.mbti import step2
-# import 语句通过模块名导入 step3 模块
-# 使用绝对导入方式，支持测试环境和独立运行环境
-# 赋值给 step3 变量，用于后续调用 step3.process() 方法
-from applications.mbti import step3
-# import 语句通过模块名导入 step4 模块
-# 使用绝对导入方式，支持测试环境和独立运行环境
-# 赋值给 step4 变量，用于后续调用 step4.process() 方法
-from applications.mbti import step4
-# import 语句通过模块名导入 step5 模块
-# 使用绝对导入方式，支持测试环境和独立运行环境
-# 赋值给 step5 变量，用于后续调用 step5.process() 方法
-from applications.mbti import step5
+# importlib 通过 import 导入动态导入模块，step 子模块在首次处理对应 intent 时才加载
+import importlib
+
+# _STEP_MODULES 为 intent 到 step 子模块路径的映射
+# 路由器本身不导入任何 step 模块，冷启动只加载实际被请求的步骤
+_STEP_MODULES = {
+    "mbti_step1": "applications.mbti.step1",
+    "mbti_step2": "applications.mbti.step2",
+    "mbti_step3": "applications.mbti.step3",
+    "mbti_step4": "applications.mbti.step4",
+    "mbti_step5": "applications.mbti.step5",
+}
+# _loaded_steps 缓存已加载的 step 模块，命中后不再经过 importlib
+_loaded_steps = {}
+
+
+def _load_step(intent: str):
+    """
+    按 intent 返回对应的 step 模块，首次调用时导入并缓存
+    """
+    module = _loaded_steps.get(intent)
+    if module is None:
+        module = _loaded_steps[intent] = importlib.import_module(_STEP_MODULES[intent])
+    return module
+
+# 导入结构化日志工具，直接调用路由器时（测试或独立运行）同样绑定请求上下文
+from utilities.logger.logger import bind_request_context, get_logger, reset_request_context
+# 导入timed装饰器，按intent记录路由器处理耗时
+from utilities.monitor.monitor import timed
+# 导入traced装饰器，为路由器处理创建追踪span
+from utilities.monitor.tracing import traced
+# 导入采样分析器，直接调用路由器时同样将采样样本归属到当前 intent
+from utilities.monitor import profiler
+
+# logger 为MBTI路由器的结构化日志记录器
+logger = get_logger("mbti.router")
 
 
 class MBTIRouter:
@@ -64,7 +80,17 @@ class MBTIRouter:
     
     # process 方法通过 async def 定义异步处理方法，接收 self 和 request 参数
     # request 参数类型为 RequestData，返回类型为 ResponseData
+    @traced("mbti.router.process")
+    @timed("mbti_router", "MBTI router latency and outcomes per intent", request_labels=("intent",))
     async def process(self, request: RequestData) -> ResponseData:
+        # context_token 通过 bind_request_context() 绑定 request_id 和 user_id
+        # 各步骤子模块输出的日志自动携带这两个字段，处理结束后在 finally 中恢复
+        context_token = bind_request_context(
+            request_id=request.get("request_id"),
+            user_id=request.get("user_id")
+        )
+        # 采样分析进行中时标注当前任务，外层已标注时保持外层的 route_type/intent
+        profile_token = profiler.tag_current_task(request)
         # try 块开始异常处理，捕获可能出现的异常情况
         try:
             # current_intent 通过 request.get() 方法获取 "intent" 键对应的值
@@ -101,6 +127,8 @@ class MBTIRouter:
         # except 捕获 Exception 异常类及其子类的异常实例
         # 异常对象赋值给变量 e
         except Exception as e:
+            # 通过 logger.exception() 记录异常及堆栈，便于按 request_id 排查
+            logger.exception("mbti_router_failed", intent=request.get("intent"))
             # 通过 return 调用 self._create_error_response() 方法
             # request.get("request_id", "unknown") 获取请求ID，默认值为 "unknown"
             # "SYSTEM_ERROR" 字符串作为错误类型传入
@@ -111,46 +139,50 @@ class MBTIRouter:
                 "SYSTEM_ERROR",
                 f"系统处理异常: {str(e)}"
             )
+        # finally 块恢复进入方法前的请求上下文
+        finally:
+            reset_request_context(context_token)
+            profiler.release_task_tag(profile_token)
     
     # _handle_mbti_step1 方法通过 async def 定义异步处理方法，接收 self 和 request 参数
     # request 参数类型为 RequestData，返回类型为 ResponseData
     async def _handle_mbti_step1(self, request: RequestData) -> ResponseData:
-        # 通过 return 调用 await step1.process() 方法
+        # 通过 _load_step() 获取 step1 模块（首次调用时导入），再调用 await step1.process() 方法
         # 传入 request 参数到 step1.process() 方法
         # await 等待异步执行完成后返回结果作为方法返回值
-        return await step1.process(request)
+        return await _load_step("mbti_step1").process(request)
 
     # _handle_mbti_step2 方法通过 async def 定义异步处理方法，接收 self 和 request 参数
     # request 参数类型为 RequestData，返回类型为 ResponseData
     async def _handle_mbti_step2(self, request: RequestData) -> ResponseData:
-        # 通过 return 调用 await step2.process() 方法
+        # 通过 _load_step() 获取 step2 模块（首次调用时导入），再调用 await step2.process() 方法
         # 传入 request 参数到 step2.process() 方法
         # await 等待异步执行完成后返回结果作为方法返回值
-        return await step2.process(request)
+        return await _load_step("mbti_step2").process(request)
 
     # _handle_mbti_step3 方法通过 async def 定义异步处理方法，接收 self 和 request 参数
     # request 参数类型为 RequestData，返回类型为 ResponseData
     async def _handle_mbti_step3(self, request: RequestData) -> ResponseData:
-        # 通过 return 调用 await step3.process() 方法
+        # 通过 _load_step() 获取 step3 模块（首次调用时导入），再调用 await step3.process() 方法
         # 传入 request 参数到 step3.process() 方法
         # await 等待异步执行完成后返回结果作为方法返回值
-        return await step3.process(request)
+        return await _load_step("mbti_step3").process(request)
 
     # _handle_mbti_step4 方法通过 async def 定义异步处理方法，接收 self 和 request 参数
     # request 参数类型为 RequestData，返回类型为 ResponseData
     async def _handle_mbti_step4(self, request: RequestData) -> ResponseData:
-        # 通过 return 调用 await step4.process() 方法
+        # 通过 _load_step() 获取 step4 模块（首次调用时导入），再调用 await step4.process() 方法
         # 传入 request 参数到 step4.process() 方法
         # await 等待异步执行完成后返回结果作为方法返回值
-        return await step4.process(request)
+        return await _load_step("mbti_step4").process(request)
 
     # _handle_mbti_step5 方法通过 async def 定义异步处理方法，接收 self 和 request 参数
     # request 参数类型为 RequestData，返回类型为 ResponseData
     async def _handle_mbti_step5(self, request: RequestData) -> ResponseData:
-        # 通过 return 调用 await step5.process() 方法
+        # 通过 _load_step() 获取 step5 模块（首次调用时导入），再调用 await step5.process() 方法
         # 传入 request 参数到 step5.process() 方法
         # await 等待异步执行完成后返回结果作为方法返回值
-        return await step5.process(request)
+        return await _load_step("mbti_step5").process(request)
     
     # _create_error_response 方法通过 def 定义错误响应创建方法
     # 接收 self、request_id、error_code、error_message 参数
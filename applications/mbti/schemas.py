@@ -268,6 +268,7 @@ class SchemaManager:
         """初始化字段定义管理器"""
         self.field_definitions = FIELD_DEFINITIONS.copy()  # 复制字段定义配置
         self.field_injections = FIELD_INJECTIONS.copy()  # 复制字段注入配置
+        self.schema_version = 0  # 字段定义版本号，每次字段变更递增，供validator判断是否需要重新编译
         self.reverse_questions_data = self._load_reverse_questions_data()  # 加载反向问题数据
         self._inject_reverse_questions_fields()  # 注入反向问题字段定义
 
@@ -364,6 +365,7 @@ class SchemaManager:
                                     field_type = "string"
 
                                 self.field_definitions["field_types"][field_key] = field_type
+                                self.schema_version += 1  # 字段定义发生变化，递增版本号
                                 # 将反向问题字段添加到相应分组
                                 if field_key not in self.field_definitions["field_groups"]["reverse_question_fields"]:
                                     self.field_definitions["field_groups"]["reverse_question_fields"].append(field_key)
@@ -386,6 +388,9 @@ class SchemaManager:
         # 记录注入信息
         self.field_injections["injected_fields"].append(field_name)
 
+        # 字段定义发生变化，递增版本号
+        self.schema_version += 1
+
     def get_reverse_questions_data(self) -> Dict[str, Union[str, dict, list]]:
         """
         获取反向问题数据
@@ -4,18 +4,15 @@
 step1.py - MBTI测试引导处理器  # 处理用户点击找工作按钮后的引导
 """
 
-import re  # 导入正则表达式模块，用于request ID格式验证
 from typing import Dict, Union  # 导入类型提示，使用Union替代Any
-import sys  # 导入sys模块，用于路径操作
-import os  # 导入os模块，用于路径操作
-
-# 添加上级目录到Python路径，以便导入utilities模块
-parent_dir = os.path.dirname(os.path.dirname(__file__))
-sys.path.insert(0, parent_dir)
 
 # 从utilities模块导入Time类，用于生成带时间戳的request ID
 # 使用绝对导入路径utilities.time.Time确保跨环境兼容性
 from utilities.time import Time
+# 从utilities模块导入timed装饰器，记录每个步骤的处理耗时和结果计数
+from utilities.monitor.monitor import timed
+# 从utilities模块导入traced装饰器，为每个步骤创建追踪span
+from utilities.monitor.tracing import traced
 
 # import 语句通过 orchestrate_connector 模块名导入 process_orchestrate_request 函数
 # 使用绝对导入方式，支持测试环境和独立运行环境
@@ -30,12 +27,9 @@ def is_valid_request_id(request_id_string: str) -> bool:
     Returns:
         bool: 是否为有效request ID格式
     """
-    # request_id_pattern 通过正则表达式定义timestamp_uuid格式
+    # Time.is_valid_request_id 通过定长切片和字符表检查timestamp_uuid格式，不使用正则表达式
     # 格式：YYYY-MM-DDTHH:MM:SS+TZ_xxxxxxxx-xxxx-4xxx-xxxx-xxxxxxxxxxxx
-    request_id_pattern = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\+\d{4}_[0-9a-f]{8}-[0-9a-f]{4}-[4][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$'
-    # re.match 函数通过传入正则模式和字符串进行匹配，re.IGNORECASE 忽略大小写
-    # bool 函数将匹配结果转换为布尔值返回
-    return bool(re.match(request_id_pattern, str(request_id_string), re.IGNORECASE))
+    return Time.is_valid_request_id(request_id_string)
 
 
 def validate_and_generate_request_id(provided_request_id: str = None) -> str:
@@ -60,6 +54,8 @@ def validate_and_generate_request_id(provided_request_id: str = None) -> str:
         raise ValueError(f"Invalid request ID format: {provided_request_id}. Request rejected for security reasons.")
 
 
+@traced("mbti.step1.process")
+@timed("mbti_step", "MBTI step handler latency and outcomes", step="mbti_step1")
 async def process(request: Dict[str, Union[str, int, bool, None]]) -> Dict[str, Union[str, bool]]:
     """
     处理用户点击找工作按钮的请求
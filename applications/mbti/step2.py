@@ -6,26 +6,30 @@
 step2.py - MBTI测试结果处理器  # 处理测试结果，计算类型，输出分析
 """
 
+# 通过 import 导入 functools 模块，用于缓存只读内容文件的解析结果
+import functools
 # 通过 import 导入 json 模块，用于后续文件读取和数据解析操作
 import json
 # 通过 import 导入 os 模块，用于文件路径处理
 import os
-# 通过 import 导入 re 模块，用于request ID格式验证的正则表达式操作
-import re
-# 通过 import 导入 sys 模块，用于路径操作
-import sys
 # 通过 from...import 导入 typing 模块的类型提示工具，使用精确类型定义
 from typing import Dict, List, TypedDict, Union, Optional
 # 通过 import 导入 step3 模块，用于在step2完成后触发step3进一步测试
 from applications.mbti import step3
-
-# 添加上级目录到Python路径，以便导入utilities模块
-parent_dir = os.path.dirname(os.path.dirname(__file__))
-sys.path.insert(0, parent_dir)
+# 通过 import 导入 content_snapshot 模块，用于读取共享快照中的输出模板表
+from applications.mbti import content_snapshot
 
 # 从utilities模块导入Time类，用于生成带时间戳的request ID
 # 使用绝对导入路径utilities.time.Time确保跨环境兼容性
 from utilities.time import Time
+# 从utilities模块导入timed装饰器，记录每个步骤的处理耗时和结果计数
+from utilities.monitor.monitor import timed
+# 从utilities模块导入traced装饰器，为每个步骤创建追踪span
+from utilities.monitor.tracing import traced
+from utilities.logger.logger import get_logger
+
+# logger 为step2的结构化日志记录器，request_id/user_id 由上游绑定的请求上下文自动附加
+logger = get_logger("mbti.step2")
 
 
 def is_valid_request_id(request_id_string: str) -> bool:
@@ -36,12 +40,9 @@ def is_valid_request_id(request_id_string: str) -> bool:
     Returns:
         bool: 是否为有效request ID格式
     """
-    # request_id_pattern 通过正则表达式定义timestamp_uuid格式
+    # Time.is_valid_request_id 通过定长切片和字符表检查timestamp_uuid格式，不使用正则表达式
     # 格式：YYYY-MM-DDTHH:MM:SS+TZ_xxxxxxxx-xxxx-4xxx-xxxx-xxxxxxxxxxxx
-    request_id_pattern = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\+\d{4}_[0-9a-f]{8}-[0-9a-f]{4}-[4][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$'
-    # re.match 函数通过传入正则模式和字符串进行匹配，re.IGNORECASE 忽略大小写
-    # bool 函数将匹配结果转换为布尔值返回
-    return bool(re.match(request_id_pattern, str(request_id_string), re.IGNORECASE))
+    return Time.is_valid_request_id(request_id_string)
 
 
 def validate_request_id(request_id: str) -> str:
@@ -141,8 +142,11 @@ class MBTIScorer:
         # 通过 self._load_questions() 调用私有方法加载题目数据，赋值给 self.questions_data 实例变量存储
         self.questions_data = self._load_questions()
 
-    # _load_questions 方法定义为私有方法，通过 -> QuestionData 返回精确的题目数据类型
-    def _load_questions(self) -> QuestionData:
+    # _load_questions 方法定义为私有静态方法，通过 -> QuestionData 返回精确的题目数据类型
+    # 题目文件只解析一次，缓存与预热见 warmup.py
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _load_questions() -> QuestionData:
         """加载题目数据"""  # 方法功能说明，读取JSON格式的题目数据
         # try 块开始尝试执行文件读取操作，捕获可能的异常
         try:
@@ -279,8 +283,14 @@ class MBTIScorer:
 
 
 # load_output_templates 函数定义为独立函数，无需传入参数，通过 -> Dict[str, str] 返回模板字典
+# 模板表只加载一次，缓存与预热见 warmup.py
+@functools.lru_cache(maxsize=None)
 def load_output_templates() -> Dict[str, str]:
     """加载MBTI类型输出模板"""  # 方法功能：读取输出模板JSON文件
+    # 多 worker 部署时优先使用共享快照中的只读模板表（各进程共享同一份 mmap 页），快照不可用时解析 JSON
+    templates = content_snapshot.step2_templates()
+    if templates is not None:
+        return templates
     # try 块开始尝试执行文件读取操作，捕获可能的异常
     try:
         # 获取当前脚本文件所在目录，然后构建完整的文件路径
@@ -297,6 +307,8 @@ def load_output_templates() -> Dict[str, str]:
 
 
 # process 函数定义为异步函数，接收 request 参数（Dict[str, Union[str, int, bool, None]]类型），通过 -> Dict[str, Union[str, bool, int]] 返回处理结果字典
+@traced("mbti.step2.process")
+@timed("mbti_step", "MBTI step handler latency and outcomes", step="mbti_step2")
 async def process(request: Dict[str, Union[str, int, bool, None]]) -> Dict[str, Union[str, bool, int]]:
     """
     处理用户测试结果，计算MBTI类型，输出分析结果
@@ -348,8 +360,8 @@ async def process(request: Dict[str, Union[str, int, bool, None]]) -> Dict[str,
             await _call_database(request, mbti_result)
         # except 捕获 Exception 异常，当数据库调用失败时执行
         except Exception as db_error:
-            # 通过 print() 输出数据库调用失败信息，但不影响主流程继续执行
-            print(f"数据库存储失败: {str(db_error)}，跳过存储继续执行")
+            # 通过 logger.warning() 记录数据库调用失败信息，但不影响主流程继续执行
+            logger.warning("mbti_step2_database_failed", error=str(db_error))
 
         # try 块开始尝试触发step3进一步测试，捕获可能的异常
         try:
@@ -368,12 +380,12 @@ async def process(request: Dict[str, Union[str, int, bool, None]]) -> Dict[str,
             }
             # 通过 await step3.process() 调用step3的处理函数，传入 step3_request 参数
             step3_result = await step3.process(step3_request)
-            # 通过 print() 输出step3触发成功信息和结果概要
-            print(f"Step3触发成功，用户ID: {user_id}, MBTI类型: {mbti_type}")
+            # 通过 logger.info() 记录step3触发成功信息和结果概要
+            logger.info("mbti_step3_triggered", mbti_type=mbti_type)
         # except 捕获 Exception 异常，当step3调用失败时执行
         except Exception as step3_error:
-            # 通过 print() 输出step3触发失败信息，但不影响step2的正常返回
-            print(f"Step3触发失败: {str(step3_error)}，但step2处理完成，继续返回结果")
+            # 通过 logger.warning() 记录step3触发失败信息，但不影响step2的正常返回
+            logger.warning("mbti_step3_trigger_failed", error=str(step3_error))
 
         # 通过 return 返回完整的 response 字典响应
         return response
@@ -412,8 +424,8 @@ async def _call_database(request: Dict[str, Union[str, int, bool, None]], mbti_r
     #     "timestamp": datetime.now()
     # }
 
-    # 通过 print() 输出格式化字符串，记录数据库代理被调用但不执行实际写入操作
-    print(f"Database agent called for user {request.get('user_id')} with MBTI type {mbti_result['mbti_type']}")
+    # 通过 logger.debug() 记录数据库代理被调用但不执行实际写入操作
+    logger.debug("mbti_database_agent_called", user_id=request.get("user_id"), mbti_type=mbti_result["mbti_type"])
 
     # TODO: 替换为实际的数据库代理调用代码
     # 例如：await database.save_mbti_result(request, mbti_result)
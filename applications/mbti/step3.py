@@ -4,24 +4,22 @@
 step3.py - MBTI反向能力测试表单生成器
 """
 
+# import 语句通过 functools 模块名导入用于缓存只读内容文件的解析结果
+import functools
 # import 语句通过 json 模块名导入用于JSON数据读取和解析操作
 import json
 # import 语句通过 os 模块名导入用于文件路径处理操作
 import os
-# import 语句通过 re 模块名导入用于request ID格式验证的正则表达式操作
-import re
-# import 语句通过 sys 模块名导入用于路径操作
-import sys
 # from...import 语句通过 typing 模块导入类型提示工具，使用精确类型定义
 from typing import Dict, List, Union, Optional
 
-# 添加上级目录到Python路径，以便导入utilities模块
-parent_dir = os.path.dirname(os.path.dirname(__file__))
-sys.path.insert(0, parent_dir)
-
 # 从utilities模块导入Time类，用于生成带时间戳的request ID
 # 使用绝对导入路径utilities.time.Time确保跨环境兼容性
 from utilities.time import Time
+# 从utilities模块导入timed装饰器，记录每个步骤的处理耗时和结果计数
+from utilities.monitor.monitor import timed
+# 从utilities模块导入traced装饰器，为每个步骤创建追踪span
+from utilities.monitor.tracing import traced
 
 
 def is_valid_request_id(request_id_string: str) -> bool:
@@ -32,12 +30,9 @@ def is_valid_request_id(request_id_string: str) -> bool:
     Returns:
         bool: 是否为有效request ID格式
     """
-    # request_id_pattern 通过正则表达式定义timestamp_uuid格式
+    # Time.is_valid_request_id 通过定长切片和字符表检查timestamp_uuid格式，不使用正则表达式
     # 格式：YYYY-MM-DDTHH:MM:SS+TZ_xxxxxxxx-xxxx-4xxx-xxxx-xxxxxxxxxxxx
-    request_id_pattern = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\+\d{4}_[0-9a-f]{8}-[0-9a-f]{4}-[4][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$'
-    # re.match 函数通过传入正则模式和字符串进行匹配，re.IGNORECASE 忽略大小写
-    # bool 函数将匹配结果转换为布尔值返回
-    return bool(re.match(request_id_pattern, str(request_id_string), re.IGNORECASE))
+    return Time.is_valid_request_id(request_id_string)
 
 
 def validate_request_id(request_id: str) -> str:
@@ -76,6 +71,8 @@ class MbtiReverseQuestion:
         self.options = options
 
 
+@traced("mbti.step3.process")
+@timed("mbti_step", "MBTI step handler latency and outcomes", step="mbti_step3")
 async def process(request: Dict[str, Union[str, int, bool, None]]) -> Dict[str, Union[str, bool, int, List, Dict]]:
     """
     处理MBTI反向能力测试表单生成请求
@@ -147,6 +144,8 @@ async def process(request: Dict[str, Union[str, int, bool, None]]) -> Dict[str,
         }
 
 
+# 反向问题文件只解析一次，缓存与预热见 warmup.py
+@functools.lru_cache(maxsize=None)
 def _load_reverse_questions() -> Dict:
     """加载反向问题数据文件"""
     # try 块开始尝试执行文件读取操作，捕获可能的异常
@@ -0,0 +1,113 @@
+# test_import_time.py - MBTI 模块导入耗时预算测试脚本
+# 职责：用 python -X importtime 在子进程中冷启动导入 applications.mbti，解析其累计导入耗时并与预算比较；
+#       同时检查导入包时没有连带加载 router、step1-5、schemas 等实现模块（它们应在首次请求时才加载）
+# 用法：python -m pytest -q applications/mbti/test/test_import_time.py（CI）或直接运行脚本查看耗时明细
+
+import os
+import re
+import subprocess
+import sys
+
+# 项目根目录，子进程在此目录下执行以便按绝对路径导入 applications.mbti
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+
+# IMPORT_BUDGET_US 为 import applications.mbti 的累计耗时预算（微秒）
+# 清单化之前约 155 ms，清单化之后约 4 ms，预算留出充足余量以容忍慢机器和共享 CI
+IMPORT_BUDGET_US = 30000
+# RUNS 为冷启动测量次数，取最小值以排除偶发抖动
+RUNS = 3
+# LAZY_MODULES 为导入包时不应被加载的实现模块
+LAZY_MODULES = (
+    "applications.mbti.router",
+    "applications.mbti.mbti",
+    "applications.mbti.schemas",
+    "applications.mbti.step1",
+    "applications.mbti.step2",
+    "applications.mbti.step3",
+    "applications.mbti.step4",
+    "applications.mbti.step5",
+)
+
+# -X importtime 输出格式："import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure(module):
+    """
+    在新的 Python 进程中导入 module，返回 (累计耗时微秒, 已导入模块名集合)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root_dir,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "import failed")
+    cumulative = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if name == module:
+            cumulative = int(match.group(2))
+    if cumulative is None:
+        raise RuntimeError(f"{module} not found in -X importtime output")
+    return cumulative, imported
+
+
+def measure_best():
+    """冷启动导入 RUNS 次，返回 (最小累计耗时微秒, 各次耗时列表, 最后一次已导入模块名集合)"""
+    timings = []
+    imported = set()
+    for _ in range(RUNS):
+        cumulative, imported = measure("applications.mbti")
+        timings.append(cumulative)
+    return min(timings), timings, imported
+
+
+def test_import_budget():
+    best, timings, _ = measure_best()
+    assert best <= IMPORT_BUDGET_US, \
+        f"import applications.mbti took {best / 1000:.1f} ms (runs {[t // 1000 for t in timings]} ms), " \
+        f"budget {IMPORT_BUDGET_US / 1000:.0f} ms"
+
+
+def test_lazy_modules():
+    _, imported = measure("applications.mbti")
+    eager = [name for name in LAZY_MODULES if name in imported]
+    assert not eager, f"implementation modules imported eagerly: {', '.join(eager)}"
+
+
+def main():
+    success = True
+
+    best, timings, imported = measure_best()
+    print(f"import applications.mbti: best={best / 1000:.1f} ms  runs={[t // 1000 for t in timings]} ms  "
+          f"budget={IMPORT_BUDGET_US / 1000:.0f} ms")
+    if best > IMPORT_BUDGET_US:
+        print("FAILED: import applications.mbti exceeds the import-time budget")
+        success = False
+
+    eager = [name for name in LAZY_MODULES if name in imported]
+    if eager:
+        print(f"FAILED: implementation modules imported eagerly: {', '.join(eager)}")
+        success = False
+    else:
+        print("implementation modules deferred until first use: OK")
+
+    # 参考信息：首次加载实现（router + step1-5 + 可观测性工具）的代价，由首个请求在线程池中承担
+    router_cost, _ = measure("applications.mbti.router")
+    print(f"import applications.mbti.router (first request): {router_cost / 1000:.1f} ms")
+
+    print("FINAL RESULT: IMPORT TIME TEST " + ("PASSED" if success else "FAILED"))
+    sys.exit(0 if success else 1)
+
+
+# if __name__ == "__main__" 条件判断当前脚本是否作为主程序运行
+if __name__ == "__main__":
+    main()
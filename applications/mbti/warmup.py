@@ -0,0 +1,62 @@
+# warmup.py - MBTI模块启动预热
+"""
+启动预热钩子，由 boot 的预热阶段在接收流量之前调用（清单 lifecycle.prebuild）：
+- prebuild(): 预先解析 step2-step5 使用的只读内容文件（题目、计分规则、输出模板），结果由各加载函数的 lru_cache 保留，
+  再以合成输入调用一遍各步骤的纯计算函数（请求 ID 校验、计分、表单与报告生成），承担首次调用开销
+- 不注册 warmup_requests：经分派链路回放的请求会调用持久化（_call_database）并链式进入下一步，
+  每次启动都会写入合成用户数据；sample_requests() 只供基准脚本模拟首批真实请求
+"""
+
+from typing import Dict, List, Union
+
+from utilities.time import Time
+
+# WARMUP_USER_ID 为合成请求使用的用户ID，便于在日志中区分预热流量
+WARMUP_USER_ID = "warmup"
+# QUESTION_COUNT 为 step1_mbti_questions.json 中的题目数量，step2 按题目下标读取答案
+QUESTION_COUNT = 96
+# REVERSE_QUESTION_COUNT 为 step3 生成的反向问题数量（4 个维度各 3 题）
+REVERSE_QUESTION_COUNT = 12
+
+
+def prebuild(config: Dict = None) -> None:
+    """
+    预先加载并缓存各步骤的只读内容文件，首个真实请求不再承担 JSON 解析耗时
+
+    下面调用的加载函数都以 functools.lru_cache(maxsize=None) 缓存解析结果：内容文件随代码部署、运行期间不变，
+    每个进程只在 prebuild 或首次使用时解析一次，之后所有请求共享同一份对象。调用方只能读取返回值，
+    不能原地修改；内容文件更新后需要重启 worker 才会生效
+    """
+    from applications.mbti import step2, step3, step4, step5
+
+    step2.MBTIScorer._load_questions()
+    step2.load_output_templates()
+    step3._load_reverse_questions()
+    step4.MbtiReverseScorer._load_scoring_rules()
+    step5.MbtiReportGenerator._load_output_templates()
+
+    # 只调用不含持久化和链式调用的纯计算函数，预热不产生任何写入
+    step2.validate_request_id(Time.timestamp())
+    mbti_type = step2.MBTIScorer().calculate_scores({i: 3 for i in range(QUESTION_COUNT)})["mbti_type"]
+    reverse_dimensions = step3._get_reverse_dimensions(mbti_type)
+    step3._generate_form_schema(step3._extract_questions(step3._load_reverse_questions(), reverse_dimensions))
+    step4.MbtiReverseScorer().calculate_scores(
+        {f"question_{i}": "A" for i in range(REVERSE_QUESTION_COUNT)}, reverse_dimensions)
+    step5.MbtiReportGenerator().generate_report(mbti_type, reverse_dimensions, {"E": 2, "N": 1, "F": 3, "P": 0})
+
+
+def sample_requests() -> List[Dict[str, Union[str, bool, int, dict, list]]]:
+    """
+    返回覆盖全部 MBTI intent 的合成请求列表（step1 到 step5 的顺序），供基准脚本测量首批请求耗时，不在启动时回放
+    """
+    request_id = Time.timestamp()
+    base = {"user_id": WARMUP_USER_ID, "request_id": request_id}
+    return [
+        {"intent": "mbti_step1", "user_id": WARMUP_USER_ID, "test_user": True},
+        {**base, "intent": "mbti_step2", "responses": {i: 3 for i in range(QUESTION_COUNT)}},
+        {**base, "intent": "mbti_step3", "mbti_type": "INTJ"},
+        {**base, "intent": "mbti_step4", "mbti_type": "INTJ",
+         "responses": {f"question_{i}": "A" for i in range(REVERSE_QUESTION_COUNT)}},
+        {**base, "intent": "mbti_step5", "mbti_type": "INTJ", "reverse_dimensions": ["E", "N", "F", "P"],
+         "dimension_scores": {"E": 2, "N": 1, "F": 3, "P": 0}},
+    ]
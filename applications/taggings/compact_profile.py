@@ -0,0 +1,265 @@
+# compact_profile.py - 紧凑的分层标签画像表示
+"""
+user / job / company 的标签画像按七层、每层若干来源字段（observed / inferred / extended 等，
+字段定义见 tagging_config.json 的 output_format）组织。以字符串字典列表保存时每个实体占数 KB，
+匹配比较也要逐个比较字符串。CompactProfile 把一个画像编码为单个 bytes：
+
+- 标签编码为 uint16：小于 LOCAL_BASE 的为标签图词表 ID（tag_graph 的整数 ID）；不在本层词表中的文本
+  （LLM 生成的自由文本、MBTI-XXXX 等）写入画像自带的字符串表，编码为 LOCAL_BASE + 字符串表下标
+- 每层一段：按编码升序排列的标签数组，并列的来源字段位图（第 i 位为该层 output_format 的第 i 个字段，
+  同一标签以相同属性出现在多个字段时合并为一个条目）与属性字节（layer_2 为技能等级，layer_3 为 rank + 1）
+- layer_3 的 migrated_locations 有先后顺序（原居住地 → 现居住地），单独按原顺序保存；
+  remote_adaptability 编码为一个字节
+- 头部记录标签图词表的 CRC32，标签图变化（整数 ID 重新分配）后旧画像解码时报错，需经 retag 重新生成
+
+API 边界通过 to_verbose() / encode_profile() 与原有 JSON 结构互转。除 migrated_locations 外，
+各字段列表按标签编码排序，不保留原列表顺序，同一字段内的重复值只保留一个；词表中的标签文本还原为标签图中的规范写法。
+"""
+
+import functools
+import json
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from applications.taggings.label_matcher import CONFIG_PATH
+from applications.taggings.tag_graph import ENTITY_BITS, TagGraph, load_tag_graph
+
+FORMAT_VERSION = 1
+# LOCAL_BASE 以上的编码指向画像自带的字符串表
+LOCAL_BASE = 0x8000
+LAYERS = ("layer_0_background", "layer_1_adaptable_positions", "layer_2_skills", "layer_3_geography",
+          "layer_4_positive_attributes", "layer_5_negative_attributes", "layer_6_potential_risks")
+SKILLS_LAYER, GEOGRAPHY_LAYER = 2, 3
+# 技能等级编码，0 为未给出；不在列表中的等级写入字符串表，属性字节为 LEVEL_LOCAL + 字符串表下标
+LEVELS = (None, "Basic", "Beginner", "Intermediate", "Proficient", "Advanced", "Fluent", "Native", "Expert")
+LEVEL_LOCAL = 0x80
+REMOTE_CODES = (None, "yes", "no", "mixed")
+ENTITIES = tuple(sorted(ENTITY_BITS, key=ENTITY_BITS.get))
+
+# 头部：格式版本、实体、remote_adaptability、migrated 数量、字符串表条目数、词表 CRC32
+_HEADER = struct.Struct("<BBBBHI")
+
+
+@functools.lru_cache(maxsize=None)
+def layer_fields() -> Tuple[Tuple[str, ...], ...]:
+    """每层 output_format 的字段顺序，第 i 个字段对应来源位图的第 i 位（layer_3 只有 core_locations 入位图）"""
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        schema = json.load(f).get("tagging_schema", {})
+    fields = []
+    for layer in LAYERS:
+        names = tuple(schema.get(layer, {}).get("output_format", {}))
+        if layer == LAYERS[GEOGRAPHY_LAYER]:
+            names = tuple(name for name in names if name not in ("migrated_locations", "remote_adaptability"))
+        fields.append(names)
+    return tuple(fields)
+
+
+@functools.lru_cache(maxsize=4)
+def _vocabulary(graph: TagGraph) -> Tuple[int, Tuple[Dict[str, int], ...]]:
+    """(词表 CRC32, 每层 小写标签文本 → 标签 ID)"""
+    by_layer = tuple({} for _ in LAYERS)
+    index = {layer: position for position, layer in enumerate(LAYERS)}
+    for tag in range(len(graph)):
+        position = index.get(graph.layer(tag))
+        if position is not None:
+            by_layer[position].setdefault(graph.labels[tag].lower(), tag)
+    return zlib.crc32("\n".join(graph.ids).encode("utf-8")), by_layer
+
+
+class CompactProfile:
+    """
+    CompactProfile 类包装一个画像的紧凑编码，持有一个 bytes
+    参与匹配比较后另缓存各层词表标签的位集：画像不可变，首次比较解析一次，之后的比较只做整数按位与；
+    代价是参与过比较的画像多占约 1 KB（8 个位集，宽度随标签图规模增长），只做存取的画像不受影响
+    """
+
+    __slots__ = ("data", "_bitsets")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        # _bitsets 为 (各层位集..., 全部层合并的位集)，首次调用 bitset() 时构建
+        self._bitsets: Optional[Tuple[int, ...]] = None
+
+    def __bytes__(self) -> bytes:
+        return self.data
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CompactProfile) and self.data == other.data
+
+    def __hash__(self) -> int:
+        return hash(self.data)
+
+    def _parse(self) -> Tuple[Tuple[int, ...], List[str], List[Tuple[int, int]], List[Tuple[Tuple[int, ...], ...]]]:
+        """解析为 (头部, 字符串表, migrated [(编码, 属性)], 每层 (编码, 来源位图, 属性))"""
+        data = self.data
+        header = _HEADER.unpack_from(data, 0)
+        if header[0] != FORMAT_VERSION:
+            raise ValueError(f"unsupported compact profile format {header[0]}")
+        offset = _HEADER.size
+        strings = []
+        for _ in range(header[4]):
+            (length,) = struct.unpack_from("<H", data, offset)
+            strings.append(data[offset + 2:offset + 2 + length].decode("utf-8"))
+            offset += 2 + length
+        count = header[3]
+        migrated_codes = struct.unpack_from(f"<{count}H", data, offset)
+        migrated = list(zip(migrated_codes, data[offset + 2 * count:offset + 3 * count]))
+        offset += 3 * count
+        layers = []
+        for _ in LAYERS:
+            count = data[offset]
+            codes = struct.unpack_from(f"<{count}H", data, offset + 1)
+            offset += 1 + 2 * count
+            layers.append((codes, tuple(data[offset:offset + count]), tuple(data[offset + count:offset + 2 * count])))
+            offset += 2 * count
+        return header, strings, migrated, layers
+
+    @property
+    def entity(self) -> str:
+        return ENTITIES[self.data[1]]
+
+    def _layers_offset(self) -> int:
+        """跳过字符串表与 migrated，返回第一层数据的起始偏移"""
+        offset = _HEADER.size
+        data = self.data
+        for _ in range(struct.unpack_from("<H", data, 4)[0]):
+            offset += 2 + struct.unpack_from("<H", data, offset)[0]
+        return offset + 3 * data[3]
+
+    def tags(self, layer: int) -> Tuple[int, ...]:
+        """第 layer 层中属于标签图词表的标签 ID（升序，属性不同的同一标签可能重复出现）"""
+        data = self.data
+        offset = self._layers_offset()
+        for _ in range(layer):
+            offset += 1 + 4 * data[offset]
+        codes = struct.unpack_from(f"<{data[offset]}H", data, offset + 1)
+        return tuple(code for code in codes if code < LOCAL_BASE)
+
+    def _build_bitsets(self) -> Tuple[int, ...]:
+        """一次遍历编码构建各层位集与合并位集"""
+        data = self.data
+        offset = self._layers_offset()
+        bitsets = []
+        union = 0
+        for _ in LAYERS:
+            count = data[offset]
+            bits = 0
+            for code in struct.unpack_from(f"<{count}H", data, offset + 1):
+                if code < LOCAL_BASE:
+                    bits |= 1 << code
+            bitsets.append(bits)
+            union |= bits
+            offset += 1 + 4 * count
+        bitsets.append(union)
+        self._bitsets = tuple(bitsets)
+        return self._bitsets
+
+    def bitset(self, layer: Optional[int] = None) -> int:
+        """词表标签的位集（int），layer 为 None 时合并全部层"""
+        bitsets = self._bitsets or self._build_bitsets()
+        return bitsets[-1 if layer is None else layer]
+
+    def overlap(self, other: "CompactProfile", layer: Optional[int] = None) -> int:
+        """两个画像共有的词表标签数"""
+        return bin(self.bitset(layer) & other.bitset(layer)).count("1")
+
+    def to_verbose(self, graph: Optional[TagGraph] = None) -> Dict[str, Dict[str, Any]]:
+        """还原为 tagging_config.json output_format 结构的分层 JSON"""
+        graph = graph or load_tag_graph()
+        header, strings, migrated, layers = self._parse()
+        if header[5] != _vocabulary(graph)[0]:
+            raise ValueError("compact profile was encoded against a different tag graph vocabulary")
+
+        def text(code: int) -> str:
+            return strings[code - LOCAL_BASE] if code >= LOCAL_BASE else graph.labels[code]
+
+        def rank(attribute: int) -> Optional[int]:
+            return attribute - 1 if attribute else None
+
+        fields = layer_fields()
+        verbose: Dict[str, Dict[str, Any]] = {}
+        for position, (codes, masks, attributes) in enumerate(layers):
+            layer = {name: [] for name in fields[position]}
+            for code, mask, attribute in zip(codes, masks, attributes):
+                if position == SKILLS_LAYER:
+                    level = strings[attribute - LEVEL_LOCAL] if attribute >= LEVEL_LOCAL else LEVELS[attribute]
+                    value: Any = {"skill": text(code), "level": level}
+                elif position == GEOGRAPHY_LAYER:
+                    value = {"city": text(code), "rank": rank(attribute)}
+                else:
+                    value = text(code)
+                for bit, name in enumerate(fields[position]):
+                    if mask >> bit & 1:
+                        layer[name].append(value)
+            if position == GEOGRAPHY_LAYER:
+                layer["migrated_locations"] = [{"city": text(code), "rank": rank(attribute)}
+                                               for code, attribute in migrated]
+                layer["remote_adaptability"] = REMOTE_CODES[header[2]]
+            verbose[LAYERS[position]] = layer
+        return verbose
+
+
+def encode_profile(verbose: Dict[str, Dict[str, Any]], entity: str = "user",
+                   graph: Optional[TagGraph] = None) -> CompactProfile:
+    """
+    把分层 JSON 画像编码为 CompactProfile
+    字段值可以是标签文本，或 layer_2 的 {"skill", "level"}、layer_3 的 {"city", "rank"}
+    """
+    graph = graph or load_tag_graph()
+    crc, vocabulary = _vocabulary(graph)
+    fields = layer_fields()
+    strings: Dict[str, int] = {}
+
+    def local(value: str) -> int:
+        index = strings.setdefault(value, len(strings))
+        if index >= LOCAL_BASE:
+            raise ValueError("too many free-text tags in one profile")
+        return index
+
+    def code_of(position: int, value: str) -> int:
+        tag = vocabulary[position].get(value.lower())
+        return tag if tag is not None else LOCAL_BASE + local(value)
+
+    def attribute_of(position: int, value: Any) -> Tuple[str, int]:
+        if position == SKILLS_LAYER and isinstance(value, dict):
+            level = value.get("level")
+            if level in LEVELS:
+                return value["skill"], LEVELS.index(level)
+            index = local(level)
+            if index >= 0x100 - LEVEL_LOCAL:
+                raise ValueError("too many free-text skill levels in one profile")
+            return value["skill"], LEVEL_LOCAL + index
+        if position == GEOGRAPHY_LAYER and isinstance(value, dict):
+            return value["city"], 0 if value.get("rank") is None else value["rank"] + 1
+        return value, 0
+
+    layers = []
+    for position, layer in enumerate(LAYERS):
+        entries: Dict[Tuple[int, int], int] = {}
+        for bit, name in enumerate(fields[position]):
+            for value in verbose.get(layer, {}).get(name) or ():
+                label, attribute = attribute_of(position, value)
+                key = (code_of(position, label), attribute)
+                entries[key] = entries.get(key, 0) | 1 << bit
+        if len(entries) > 0xFF:
+            raise ValueError(f"{layer} has more than 255 distinct tags")
+        layers.append(sorted(entries.items()))
+
+    geography = verbose.get(LAYERS[GEOGRAPHY_LAYER], {})
+    migrated = [attribute_of(GEOGRAPHY_LAYER, value) for value in geography.get("migrated_locations") or ()]
+    migrated = [(code_of(GEOGRAPHY_LAYER, city), attribute) for city, attribute in migrated]
+
+    encoded = [b""]
+    for value in strings:
+        raw = value.encode("utf-8")
+        encoded.append(struct.pack("<H", len(raw)) + raw)
+    encoded.append(struct.pack(f"<{len(migrated)}H", *(code for code, _ in migrated)))
+    encoded.append(bytes(attribute for _, attribute in migrated))
+    for entries in layers:
+        encoded.append(struct.pack(f"<B{len(entries)}H", len(entries), *(code for (code, _), _ in entries)))
+        encoded.append(bytes(mask for _, mask in entries) + bytes(attribute for (_, attribute), _ in entries))
+    encoded[0] = _HEADER.pack(FORMAT_VERSION, ENTITIES.index(entity),
+                              REMOTE_CODES.index(geography.get("remote_adaptability")),
+                              len(migrated), len(strings), crc)
+    return CompactProfile(b"".join(encoded))
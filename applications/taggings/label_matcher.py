@@ -0,0 +1,245 @@
+# label_matcher.py - 标签文本多模式匹配（Aho–Corasick）
+"""
+在简历、招聘简章等文档中查找 tag_graph_nodes.json 中 1468 个 label_text 及其规范化变体的显式提及，
+产出 observed_tags 候选。所有模式编译为一个 Aho–Corasick 自动机，每篇文档只需线性扫描一遍，
+耗时与模式数量无关。
+
+规范化：NFKD 去除重音（Parañaque -> paranaque）、转小写、删除撇号、& 改写为 and，
+其余非 [a-z0-9+#] 字符视为空格并合并。模式两端各加一个空格，文档两端同样补空格，
+因此只有整词匹配才会命中（"bay" 不会命中 "ebay"），且输出只可能出现在读入空格之后。
+
+变体：完整标签；去掉括号内容的标签与括号内的缩写（"Certified Public Accountant (CPA)" ->
+"certified public accountant" / "cpa"）；技能层去掉结尾的 skills；Sto./Sta./Gen. 展开为 santo/santa/general。
+只由 tagging_config.json 停用词组成的变体被丢弃。
+
+自动机预先展开为完整的 DFA 转移表 delta[state * ALPHABET + code]，连同输出表一起写入共享快照，
+worker 只读 mmap 后直接使用，无需在每个进程中重新构建。
+"""
+
+import functools
+import json
+import os
+import re
+import unicodedata
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from applications.taggings.tag_graph import DATA_DIR, TAG_GRAPH_PATH, TagGraph, load_tag_graph
+from utilities.snapshot.snapshot import Snapshot, SnapshotWriter, snapshot_for, source_fingerprint
+
+CONFIG_PATH = os.path.join(DATA_DIR, "tagging_config.json")
+# MATCHER_FORMAT 为自动机编译规则的版本号，规范化或变体规则变化时递增；
+# 版本号是快照分区名的一部分，旧版本快照中找不到新分区，自动回退为进程内构建
+MATCHER_FORMAT = 1
+SECTION = f"label_matcher.v{MATCHER_FORMAT}"
+
+# 字符编码：空格为 0，其余依次编号；ALPHABET 为转移表每个状态的列数
+_CHARACTERS = " abcdefghijklmnopqrstuvwxyz0123456789+#"
+ALPHABET = len(_CHARACTERS)
+_ENCODE = str.maketrans({character: chr(code) for code, character in enumerate(_CHARACTERS)})
+_SEPARATORS = re.compile(r"[^a-z0-9+#]+")
+# _COMBINING 为 NFKD 分解后的组合附加符号（重音等）
+_COMBINING = re.compile(r"[\u0300-\u036f]+")
+_ABBREVIATIONS = {"sto": "santo", "sta": "santa", "gen": "general"}
+_PARENTHETICAL = re.compile(r"\(([^)]*)\)")
+_SKILL_SUFFIX = re.compile(r"\s+skills?$", re.IGNORECASE)
+
+
+def normalize(text: str) -> str:
+    """规范化文本：去重音、小写、撇号删除、& -> and，分隔符合并为单个空格，两端补空格"""
+    if not text.isascii():
+        text = _COMBINING.sub("", unicodedata.normalize("NFKD", text))
+    text = text.lower().replace("'", "").replace("’", "").replace("&", " and ")
+    return f" {_SEPARATORS.sub(' ', text).strip()} "
+
+
+def label_variants(label_text: str, layer: str, stop_words: Sequence[str] = ()) -> List[str]:
+    """生成一个标签的全部规范化变体（含两端空格），去重并保持生成顺序"""
+    candidates = [label_text]
+    match = _PARENTHETICAL.search(label_text)
+    if match:
+        candidates.append(_PARENTHETICAL.sub(" ", label_text))
+        candidates.append(match.group(1))
+    if layer == "layer_2_skills" and _SKILL_SUFFIX.search(label_text):
+        candidates.append(_SKILL_SUFFIX.sub("", label_text))
+    variants = []
+    for candidate in candidates:
+        normalized = normalize(candidate)
+        words = normalized.split()
+        expanded = " " + " ".join(_ABBREVIATIONS.get(word, word) for word in words) + " "
+        for variant in (normalized, expanded):
+            if variant.strip() and variant not in variants and not all(word in stop_words for word in variant.split()):
+                variants.append(variant)
+    return variants
+
+
+def _stop_words(path: str) -> List[str]:
+
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    return config.get("processing_config", {}).get("keyword_extraction", {}).get("stop_words", [])
+
+
+def compile_label_matcher(writer: SnapshotWriter, tag_graph_path: str = TAG_GRAPH_PATH,
+                          config_path: str = CONFIG_PATH, prefix: str = SECTION) -> Dict[str, int]:
+    """
+    构建 Aho–Corasick 自动机并写入 writer，返回统计信息：
+    - patterns：去重后的规范化变体；pattern_tags CSR 记录每个变体对应的标签 ID（同一变体可能属于多个标签）
+    - delta：展开失败链接后的完整 DFA 转移表
+    - output / next_output：状态命中的模式 ID（-1 为无）与沿失败链的下一个输出状态（0 为无）
+    """
+    with open(tag_graph_path, "r", encoding="utf-8") as f:
+        nodes = json.load(f)
+    stop_words = _stop_words(config_path)
+    tag_ids = sorted(nodes)
+    pattern_index: Dict[str, int] = {}
+    pattern_tags: List[List[int]] = []
+    for tag, tag_id in enumerate(tag_ids):
+        for variant in label_variants(nodes[tag_id]["label_text"], nodes[tag_id]["layer"], stop_words):
+            pattern = pattern_index.setdefault(variant, len(pattern_index))
+            if pattern == len(pattern_tags):
+                pattern_tags.append([])
+            if tag not in pattern_tags[pattern]:
+                pattern_tags[pattern].append(tag)
+    patterns = list(pattern_index)
+
+    # 构建字典树
+    children: List[Dict[int, int]] = [{}]
+    output = [-1]
+    for pattern_id, pattern in enumerate(patterns):
+        state = 0
+        for code in pattern.translate(_ENCODE).encode("latin-1"):
+            child = children[state].get(code)
+            if child is None:
+                child = len(children)
+                children[state][code] = child
+                children.append({})
+                output.append(-1)
+            state = child
+        output[state] = pattern_id
+
+    # BFS 计算失败链接并展开为完整转移表；next_output 指向失败链上最近的输出状态
+    count = len(children)
+    delta = [0] * (count * ALPHABET)
+    fail = [0] * count
+    next_output = [0] * count
+    queue = deque()
+    for code, child in children[0].items():
+        delta[code] = child
+        queue.append(child)
+    while queue:
+        state = queue.popleft()
+        row = state * ALPHABET
+        fallback_row = fail[state] * ALPHABET
+        for code in range(ALPHABET):
+            child = children[state].get(code)
+            if child is None:
+                delta[row + code] = delta[fallback_row + code]
+            else:
+                delta[row + code] = child
+                fail[child] = delta[fallback_row + code]
+                target = fail[child]
+                next_output[child] = target if output[target] >= 0 else next_output[target]
+                queue.append(child)
+
+    indptr = [0]
+    for tags in pattern_tags:
+        indptr.append(indptr[-1] + len(tags))
+    writer.add_bytes(f"{prefix}.fingerprint", source_fingerprint([tag_graph_path, config_path]))
+    writer.add_strings(f"{prefix}.patterns", patterns)
+    writer.add_array(f"{prefix}.pattern_indptr", "I", indptr)
+    writer.add_array(f"{prefix}.pattern_tags", "I", [tag for tags in pattern_tags for tag in tags])
+    writer.add_array(f"{prefix}.pattern_length", "H", [len(pattern) for pattern in patterns])
+    writer.add_array(f"{prefix}.delta", "H" if count <= 0xFFFF else "I", delta)
+    writer.add_array(f"{prefix}.output", "i", output)
+    writer.add_array(f"{prefix}.next_output", "I", next_output)
+    return {"patterns": len(patterns), "states": count, "tags": len(tag_ids)}
+
+
+def compile_snapshot(writer: SnapshotWriter) -> List[str]:
+    """快照构建钩子（boot/build_snapshot.py 调用）：写入标签匹配自动机，返回数据源文件列表"""
+    compile_label_matcher(writer)
+    return [TAG_GRAPH_PATH, CONFIG_PATH]
+
+
+class LabelMatcher:
+    """
+    只读的 Aho–Corasick 匹配器，转移表和输出表均为快照中的数组视图
+    """
+
+    def __init__(self, snapshot: Snapshot, graph: TagGraph, prefix: str = SECTION):
+        self.graph = graph
+        self.patterns = snapshot.strings(f"{prefix}.patterns")
+        self.pattern_indptr = snapshot.array(f"{prefix}.pattern_indptr")
+        self.pattern_tags = snapshot.array(f"{prefix}.pattern_tags")
+        self.delta = snapshot.array(f"{prefix}.delta")
+        self.output = snapshot.array(f"{prefix}.output")
+        self.next_output = snapshot.array(f"{prefix}.next_output")
+        self.pattern_lengths = snapshot.array(f"{prefix}.pattern_length")
+
+    def scan(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        单遍扫描规范化后的文本，返回 [(模式 ID, 起始位置, 结束位置)]，位置为规范化文本中两端空格的下标
+        模式以空格结尾，因此只在读入空格（编码 0）后检查输出
+        """
+        delta, output, next_output, lengths = self.delta, self.output, self.next_output, self.pattern_lengths
+        hits = []
+        state = 0
+        for position, code in enumerate(normalize(text).translate(_ENCODE).encode("latin-1")):
+            state = delta[state * ALPHABET + code]
+            if code == 0:
+                match = state if output[state] >= 0 else next_output[state]
+                while match:
+                    pattern = output[match]
+                    hits.append((pattern, position - lengths[pattern] + 1, position))
+                    match = next_output[match]
+        return hits
+
+    def match(self, text: str, overlapping: bool = False) -> Dict[int, Dict[str, Any]]:
+        """
+        返回 {标签 ID: {"count", "first_position", "variants"}}
+        overlapping 为 False 时，被更长命中完整包含的命中被丢弃（"Quezon City" 中不再单独计入 "Quezon"，
+        "Customer Service Skills" 中不再重复计入变体 "customer service"）
+        """
+        hits = self.scan(text)
+        if not overlapping:
+            # 按起点升序、终点降序排列，终点不超过已保留命中最远终点的命中即被包含
+            kept, reach = [], -1
+            for hit in sorted(hits, key=lambda item: (item[1], -item[2])):
+                if hit[2] > reach:
+                    kept.append(hit)
+                    reach = hit[2]
+            hits = kept
+        matches: Dict[int, Dict[str, Any]] = {}
+        for pattern, start, _ in hits:
+            variant = self.patterns[pattern].strip()
+            for i in range(self.pattern_indptr[pattern], self.pattern_indptr[pattern + 1]):
+                entry = matches.setdefault(self.pattern_tags[i], {"count": 0, "first_position": start, "variants": []})
+                entry["count"] += 1
+                entry["first_position"] = min(entry["first_position"], start)
+                if variant not in entry["variants"]:
+                    entry["variants"].append(variant)
+        return matches
+
+    def observed_tags(self, text: str, entity: Optional[str] = None, max_tags: Optional[int] = None,
+                      overlapping: bool = False) -> List[Dict[str, Any]]:
+        """
+        observed_tags 候选：文档中显式提及的标签，按出现次数降序、首次出现位置升序排列
+        entity 给定时（user / job / company）只保留 applicable_entities 包含该实体的标签
+        """
+        graph = self.graph
+        candidates = [
+            {"label_id": graph.ids[tag], "label_text": graph.labels[tag], "layer": graph.layer(tag),
+             "count": entry["count"], "first_position": entry["first_position"], "matched": entry["variants"]}
+            for tag, entry in self.match(text, overlapping).items()
+            if entity is None or graph.applies_to(tag, entity)
+        ]
+        candidates.sort(key=lambda candidate: (-candidate["count"], candidate["first_position"]))
+        return candidates if max_tags is None else candidates[:max_tags]
+
+
+@functools.lru_cache(maxsize=None)
+def load_label_matcher() -> LabelMatcher:
+    """进程内共享的匹配器：优先使用共享快照中的自动机，快照缺失或过期时在进程内构建"""
+    snapshot = snapshot_for(SECTION, [TAG_GRAPH_PATH, CONFIG_PATH], compile_label_matcher)
+    return LabelMatcher(snapshot, load_tag_graph())
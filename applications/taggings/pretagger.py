@@ -0,0 +1,274 @@
+# pretagger.py - 确定性预打标阶段
+"""
+在调用 LLM 生成七层标签之前，先用标签图词典、地理拓扑和规则解决所有不需要模型的部分：
+
+- layer_3_geography：完全确定性。core_locations 来自地点字段（tagging_config.json 的 location_fields）
+  或正文中提及的城市及其 city_rank；migrated_locations 由 "originally from / moved from" 等迁移线索给出
+  原居住地 → 现居住地；remote_adaptability 由远程/驻场词典判定 yes / no / mixed
+- layer_1_adaptable_positions：正文提及的职位即 observed_positions，upgrades_to / downgrades_to 关系
+  给出向上挑战和向下兼容职位，两步阶梯内的职位作为 extended_positions；有 observed_positions 时整层确定
+- 其余层（0、2、4、5、6）仍需 LLM 推断 inferred / latent 等字段，但显式提及的标签（技能、行业背景、
+  特质、MBTI 类型）作为 known_tags 预先填入，并以 "命中标签 + 图上一跳邻居" 组成的精简候选列表
+  （最多 concept_extraction.max_concepts 个）代替每轮从 ChromaDB 取回的 100 个相似标签
+
+estimate_savings() 比较基线（6 轮 LLM，每轮附 100 个已有标签）与预打标后请求的输入 token 和调用次数，
+并按 LATENCY_MODEL 估算节省的延迟。
+"""
+
+import json
+import math
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from applications.taggings.label_matcher import CONFIG_PATH, LabelMatcher, load_label_matcher, normalize
+from applications.taggings.tag_graph import TagGraph
+
+# LLM_LAYERS 为基线流程中逐层调用 LLM 的层（layer_3 地理层本就直接提取，不调用 LLM）
+LLM_LAYERS = ("layer_0_background", "layer_1_adaptable_positions", "layer_2_skills",
+              "layer_4_positive_attributes", "layer_5_negative_attributes", "layer_6_potential_risks")
+GEOGRAPHY_LAYER = "layer_3_geography"
+POSITIONS_LAYER = "layer_1_adaptable_positions"
+# BASELINE_EXISTING_TAGS 为基线流程每轮生成前从 ChromaDB 取回的相似已有标签数
+BASELINE_EXISTING_TAGS = 100
+# CHARS_PER_TOKEN 为估算 token 数时每个 token 的平均字符数（未引入分词器，按英文文本经验值估算）
+CHARS_PER_TOKEN = 4
+# LATENCY_MODEL 为估算 LLM 延迟的假设参数：每次调用的固定耗时与每个输入 token 的预填充耗时，
+# 部署时应按实际模型服务的测量值校准
+LATENCY_MODEL = {"per_call_ms": 1500.0, "per_input_token_ms": 0.25}
+
+# 技能标签的 sub_key 到 layer_2 输出字段的映射
+SKILL_FIELDS = {
+    "technical_skills": "technical_skills",
+    "interpersonal_skills": "soft_skills",
+    "soft_skills": "soft_skills",
+    "personal_effectiveness": "basic_skills",
+}
+# 候选列表扩展时沿用的关系类型（conflicts_with 等反向关系不扩展）
+SHORTLIST_RELATIONS = ("implies", "requires", "related_to", "complements", "part_of", "is_part_of",
+                       "equivalent", "upgrades_to", "downgrades_to")
+REMOTE_CUES = (" remote ", " work from home ", " wfh ", " home based ", " telecommute ", " telecommuting ")
+ONSITE_CUES = (" onsite ", " on site ", " office based ", " in office ", " skeleton workforce ")
+MIGRATION_CUES = (" originally from ", " moved from ", " relocated from ", " grew up in ", " born in ", " hometown ")
+MBTI_PATTERN = re.compile(r"\b([EI][NS][TF][JP])(?:-[AT])?\b")
+
+
+def _load_config(path: str = CONFIG_PATH) -> Dict[str, Any]:
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class PreTagger:
+    """
+    PreTagger 对单篇文档执行确定性预打标，并生成剩余层的 LLM 请求
+    """
+
+    def __init__(self, matcher: Optional[LabelMatcher] = None, config: Optional[Dict[str, Any]] = None):
+        self.matcher = matcher or load_label_matcher()
+        self.graph: TagGraph = self.matcher.graph
+        self.config = config or _load_config()
+        processing = self.config.get("processing_config", {})
+        self.location_fields = processing.get("location_extraction", {}).get("location_fields", [])
+        self.max_concepts = processing.get("concept_extraction", {}).get("max_concepts", 20)
+        self.schema = self.config.get("tagging_schema", {})
+
+    # ---------- 确定性预打标 ----------
+
+    def pretag(self, text: str, entity: str = "user", fields: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        返回 {"entity", "resolved_layers", "known_tags", "llm_layers", "shortlists", "observed_tags", "duration_ms"}
+        resolved_layers 为已完全确定的层输出；known_tags 为仍需 LLM 的层中已确定的字段
+        """
+        started = time.perf_counter()
+        fields = fields or {}
+        observed = self.matcher.match(text)
+        applicable = {tag: entry for tag, entry in observed.items() if self.graph.applies_to(tag, entity)}
+        by_layer: Dict[str, List[int]] = {}
+        for tag in sorted(applicable, key=lambda item: (-applicable[item]["count"], applicable[item]["first_position"])):
+            by_layer.setdefault(self.graph.layer(tag), []).append(tag)
+
+        normalized = normalize(text)
+        resolved = {GEOGRAPHY_LAYER: self._geography(normalized, by_layer.get(GEOGRAPHY_LAYER, []), applicable, fields)}
+        positions = self._positions(by_layer.get(POSITIONS_LAYER, []))
+        if positions["observed_positions"]:
+            resolved[POSITIONS_LAYER] = positions
+
+        known = {
+            "layer_0_background": {"observed_tags": self._labels(by_layer.get("layer_0_background", []))},
+            "layer_2_skills": self._skills(by_layer.get("layer_2_skills", [])),
+            "layer_4_positive_attributes": {
+                "trait_tags": self._labels(by_layer.get("layer_4_positive_attributes", []))
+                + [f"MBTI-{mbti}" for mbti in dict.fromkeys(MBTI_PATTERN.findall(text))]},
+        }
+        llm_layers = [layer for layer in LLM_LAYERS if layer not in resolved]
+        return {
+            "entity": entity,
+            "resolved_layers": resolved,
+            "known_tags": {layer: known[layer] for layer in llm_layers if layer in known},
+            "llm_layers": llm_layers,
+            "shortlists": {layer: self._shortlist(layer, by_layer.get(layer, []), entity) for layer in llm_layers},
+            "observed_tags": [self.graph.ids[tag] for layers in by_layer.values() for tag in layers],
+            "duration_ms": (time.perf_counter() - started) * 1e3,
+        }
+
+    def _labels(self, tags: Sequence[int]) -> List[str]:
+
+        return [self.graph.labels[tag] for tag in tags]
+
+    def _place(self, tag: int) -> Dict[str, Any]:
+
+        return {"city": self.graph.labels[tag], "rank": self.graph.city_rank(tag)}
+
+    def _resolve_places(self, tags: Sequence[int], normalized: str) -> List[int]:
+        """
+        地名歧义消解：同名地点（如省与城市同名）优先保留上级地区同样被提及的一个；
+        否则保留有 city_rank 的城市级标签，都没有时保留全部
+        """
+        groups: Dict[str, List[int]] = {}
+        for tag in tags:
+            groups.setdefault(self.graph.labels[tag].lower(), []).append(tag)
+        resolved = []
+        for candidates in groups.values():
+            if len(candidates) > 1:
+                with_parent = [tag for tag in candidates
+                               if self.graph.parent_regions[tag] and normalize(self.graph.parent_regions[tag]) in normalized]
+                ranked = [tag for tag in candidates if self.graph.city_rank(tag) is not None]
+                candidates = with_parent or ranked[:1] or candidates
+            resolved.extend(candidates)
+        return sorted(resolved, key=tags.index)
+
+    def _geography(self, normalized: str, text_tags: List[int], observed: Dict[int, Dict[str, Any]],
+                   fields: Dict[str, str]) -> Dict[str, Any]:
+        """
+        layer_3：地点字段优先，其次正文提及；每个迁移线索之后的首个地点为原居住地
+        原居住地从 core_locations 中移除（地点来自正文时会包含它），移除后没有剩余地点时不判定迁移
+        """
+        field_tags = []
+        for field in self.location_fields:
+            if fields.get(field):
+                field_tags.extend(tag for tag in self.matcher.match(fields[field])
+                                  if self.graph.layer(tag) == GEOGRAPHY_LAYER and tag not in field_tags)
+        places = self._resolve_places(field_tags or text_tags, normalized)
+        # 已列出下级地点时不再单独列出其上级地区（"Makati, Metro Manila" 只保留 Makati）
+        parents = {self.graph.parent_regions[tag] for tag in places}
+        core = [tag for tag in places if self.graph.labels[tag] not in parents]
+
+        migrated = []
+        cue_positions = sorted(normalized.find(cue) for cue in MIGRATION_CUES if cue in normalized)
+        if cue_positions and core:
+            # 按正文中的出现位置排列，线索之后最先出现的地点即该线索指向的原居住地
+            mentioned = sorted((tag for tag in self._resolve_places(text_tags, normalized) if tag in observed),
+                               key=lambda tag: observed[tag]["first_position"])
+            origins = []
+            for cue_at in cue_positions:
+                origin = next((tag for tag in mentioned if observed[tag]["first_position"] >= cue_at), None)
+                if origin is not None and origin not in origins:
+                    origins.append(origin)
+            current = [tag for tag in core if tag not in origins]
+            origins = [tag for tag in origins if tag not in current]
+            if origins and current:
+                core = current
+                migrated = [self._place(origins[0]), self._place(core[0])]
+
+        remote = any(cue in normalized for cue in REMOTE_CUES)
+        onsite = any(cue in normalized for cue in ONSITE_CUES)
+        return {
+            "core_locations": [self._place(tag) for tag in core],
+            "migrated_locations": migrated,
+            "remote_adaptability": "mixed" if remote and onsite else "yes" if remote else "no" if onsite else None,
+        }
+
+    def _positions(self, tags: List[int]) -> Dict[str, List[str]]:
+        """layer_1：沿 upgrades_to / downgrades_to 阶梯展开向上、向下和两步内的相邻职位"""
+        graph = self.graph
+        upward = [target for tag in tags for target in graph.neighbors(tag, "upgrades_to")]
+        downward = [target for tag in tags for target in graph.neighbors(tag, "downgrades_to")]
+        extended = [target for tag in upward for target in graph.neighbors(tag, "upgrades_to")]
+        extended += [target for tag in downward for target in graph.neighbors(tag, "downgrades_to")]
+
+        def unique(items: List[int], exclude: Sequence[int] = ()) -> List[str]:
+            return self._labels([tag for tag in dict.fromkeys(items) if tag not in tags and tag not in exclude])
+
+        return {
+            "observed_positions": self._labels(tags),
+            "extended_positions": unique(extended, upward + downward),
+            "upward_challenge_roles": unique(upward),
+            "downward_compatible_roles": unique(downward),
+        }
+
+    def _skills(self, tags: List[int]) -> Dict[str, List[Dict[str, Optional[str]]]]:
+        """layer_2：显式提及的技能按 sub_key 归入字段，level 留给 LLM 判断"""
+        skills: Dict[str, List[Dict[str, Optional[str]]]] = {}
+        for tag in tags:
+            field = SKILL_FIELDS.get(self.graph.sub_keys[tag], "technical_skills")
+            skills.setdefault(field, []).append({"skill": self.graph.labels[tag], "level": None})
+        return skills
+
+    def _shortlist(self, layer: str, tags: List[int], entity: str) -> List[str]:
+        """候选列表：本层命中标签在前，其后为图上一跳的同层邻居，按被引用次数排序，最多 max_concepts 个"""
+        graph = self.graph
+        neighbors: Dict[int, int] = {}
+        for tag in tags:
+            for relation, target, _ in graph.relations(tag):
+                if relation in SHORTLIST_RELATIONS and graph.layer(target) == layer and target not in tags \
+                        and graph.applies_to(target, entity):
+                    neighbors[target] = neighbors.get(target, 0) + 1
+        ranked = list(tags) + sorted(neighbors, key=lambda target: -neighbors[target])
+        return self._labels(ranked[:self.max_concepts])
+
+    # ---------- LLM 请求与节省估算 ----------
+
+    def _layer_instructions(self, layer: str) -> Dict[str, Any]:
+
+        schema = self.schema.get(layer, {})
+        return {"layer": layer, "description": schema.get("description"), "output_format": schema.get("output_format")}
+
+    def baseline_requests(self, text: str, entity: str = "user") -> List[Dict[str, Any]]:
+        """基线流程：每层一次 LLM 调用，附带该层 100 个已有标签用于语义去重（模拟 ChromaDB 相似检索结果）"""
+        graph = self.graph
+        requests = []
+        for layer in LLM_LAYERS:
+            existing = [tag for tag in range(len(graph)) if graph.layer(tag) == layer and graph.applies_to(tag, entity)]
+            requests.append({**self._layer_instructions(layer), "entity": entity, "document": text,
+                             "existing_tags": self._labels(existing[:BASELINE_EXISTING_TAGS])})
+        return requests
+
+    def llm_requests(self, text: str, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """预打标后：只为剩余层发起调用，附带已确定字段和精简候选列表"""
+        return [{**self._layer_instructions(layer), "entity": result["entity"], "document": text,
+                 "known_tags": result["known_tags"].get(layer, {}), "candidate_tags": result["shortlists"][layer]}
+                for layer in result["llm_layers"]]
+
+    def estimate_savings(self, text: str, entity: str = "user", fields: Optional[Dict[str, str]] = None,
+                         latency_model: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        对比基线与预打标后的 LLM 调用次数、输入 token 数和估算延迟（串行调用时的总和），
+        预打标本身的耗时计入 pretag_ms 并从节省的延迟中扣除
+        """
+        model = latency_model or LATENCY_MODEL
+        result = self.pretag(text, entity, fields)
+        baseline = self.baseline_requests(text, entity)
+        pretagged = self.llm_requests(text, result)
+        baseline_tokens = sum(estimate_tokens(request) for request in baseline)
+        pretagged_tokens = sum(estimate_tokens(request) for request in pretagged)
+
+        def latency(calls: int, tokens: int) -> float:
+            return calls * model["per_call_ms"] + tokens * model["per_input_token_ms"]
+
+        baseline_ms = latency(len(baseline), baseline_tokens)
+        pretagged_ms = latency(len(pretagged), pretagged_tokens) + result["duration_ms"]
+        return {
+            "baseline_calls": len(baseline), "llm_calls": len(pretagged),
+            "baseline_tokens": baseline_tokens, "llm_tokens": pretagged_tokens,
+            "tokens_saved": baseline_tokens - pretagged_tokens,
+            "pretag_ms": result["duration_ms"],
+            "latency_saved_ms": baseline_ms - pretagged_ms,
+            "resolved_layers": sorted(result["resolved_layers"]),
+        }
+
+
+def estimate_tokens(payload: Any) -> int:
+    """按序列化后字符数估算 token 数"""
+    return math.ceil(len(json.dumps(payload, ensure_ascii=False)) / CHARS_PER_TOKEN)
@@ -0,0 +1,312 @@
+# retag.py - 标签数据变更后的批量重打标任务
+"""
+tag_graph_nodes.json 或 tagging_config.json 变更（新增技能、新增关系）后，所有已存储的 user / job / company
+画像都需要按新图重新展开。单个事件循环串行处理大规模画像耗时过长，本任务：
+
+- 从存储中按块流式读取画像（JsonlProfileStore / MongoProfileStore），不一次性载入全部画像
+- 在 ProcessPoolExecutor 中执行确定性打标（PreTagger）与图展开；标签图与匹配自动机来自共享快照，
+  各 worker 只读 mmap 同一份文件，启动前若快照缺失或过期先由父进程构建
+- 按提交顺序回收结果并批量写回存储，每写完一块即原子更新检查点（块结束处的游标 + 标签数据版本），
+  中断后重新执行从检查点继续；标签数据再次变化时检查点版本不符，从头开始
+- 通过结构化日志报告进度与 profiles/sec
+
+    python -m applications.taggings.retag --input profiles.jsonl --output retagged.jsonl [--workers N]
+
+画像格式：{"id", "entity", "text", "fields"（可选，地点等结构化字段）, "tags"（可选，已存储的 label_id 列表）}
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from applications.taggings.label_matcher import CONFIG_PATH, SECTION as MATCHER_SECTION
+from applications.taggings.pretagger import PreTagger
+from applications.taggings.tag_graph import TAG_GRAPH_PATH, TAG_GRAPH_SECTION, TagGraph
+from applications.taggings.tagging_cache import tagging_version
+from utilities.logger.logger import get_logger
+from utilities.snapshot.snapshot import DEFAULT_SNAPSHOT_PATH, SNAPSHOT_PATH_ENV, Snapshot, SnapshotError, is_fresh
+
+logger = get_logger("taggings.retag")
+
+# EXPANSION_RELATIONS 为图展开沿用的关系类型：拥有源标签即可推出目标标签
+EXPANSION_RELATIONS = ("implies", "part_of", "is_part_of", "equivalent")
+# EXPANSION_DEPTH 为图展开的最大跳数
+EXPANSION_DEPTH = 2
+DEFAULT_CHUNK_SIZE = 500
+
+Chunk = Tuple[Any, List[Dict[str, Any]]]
+
+
+def expand_tags(graph: TagGraph, tags: Iterable[int], entity: str, depth: int = EXPANSION_DEPTH) -> List[int]:
+    """沿 EXPANSION_RELATIONS 做 depth 跳广度优先展开，返回新增的、适用于 entity 的标签"""
+    seen = set(tags)
+    frontier = list(seen)
+    expanded = []
+    for _ in range(depth):
+        next_frontier = []
+        for tag in frontier:
+            for relation, target, _ in graph.relations(tag):
+                if relation in EXPANSION_RELATIONS and target not in seen:
+                    seen.add(target)
+                    next_frontier.append(target)
+                    if graph.applies_to(target, entity):
+                        expanded.append(target)
+        frontier = next_frontier
+    return expanded
+
+
+def tag_profile(pretagger: PreTagger, profile: Dict[str, Any], version: str) -> Dict[str, Any]:
+    """
+    对单个画像执行确定性打标与图展开
+    已存储标签中在新图里不存在的记入 dropped_tags
+    """
+    graph = pretagger.graph
+    entity = profile.get("entity", "user")
+    result = pretagger.pretag(profile.get("text", ""), entity, profile.get("fields"))
+    observed = [graph.id_of(label_id) for label_id in result["observed_tags"]]
+    dropped = []
+    for label_id in profile.get("tags", ()):
+        tag = graph.id_of(label_id)
+        if tag < 0:
+            dropped.append(label_id)
+        elif tag not in observed:
+            observed.append(tag)
+    return {
+        "id": profile["id"],
+        "entity": entity,
+        "tagging_version": version,
+        "observed_tags": [graph.ids[tag] for tag in observed],
+        "expanded_tags": [graph.ids[tag] for tag in expand_tags(graph, observed, entity)],
+        "resolved_layers": result["resolved_layers"],
+        "known_tags": result["known_tags"],
+        "dropped_tags": dropped,
+    }
+
+
+# ---------- worker 进程 ----------
+
+_worker_pretagger: Optional[PreTagger] = None
+
+
+def _init_worker(snapshot_path: str) -> None:
+    """
+    worker 初始化：映射父进程确认为最新的共享快照并构建 PreTagger，之后每块复用
+    快照路径经 initargs 传入，只写入 worker 进程自身的环境变量，父进程的环境不变
+    """
+    global _worker_pretagger
+    os.environ[SNAPSHOT_PATH_ENV] = snapshot_path
+    _worker_pretagger = PreTagger()
+
+
+def _tag_chunk(profiles: List[Dict[str, Any]], version: str) -> List[Dict[str, Any]]:
+
+    results = []
+    for profile in profiles:
+        try:
+            results.append(tag_profile(_worker_pretagger, profile, version))
+        except Exception as e:
+            results.append({"id": profile.get("id"), "tagging_version": version, "error": f"{type(e).__name__}: {e}"})
+    return results
+
+
+# ---------- 存储 ----------
+
+class JsonlProfileStore:
+    """
+    JSONL 文件存储：每行一个画像，游标为已读取的行数；结果以 JSONL 追加写入 output_path
+    从检查点恢复时，检查点之后已写出的块会被再次写出，读取方以同一 id 的最后一行为准
+    """
+
+    def __init__(self, input_path: str, output_path: str):
+        self.input_path = input_path
+        self.output_path = output_path
+
+    def chunks(self, cursor: Optional[int], size: int) -> Iterator[Chunk]:
+
+        position = cursor or 0
+        chunk = []
+        with open(self.input_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f):
+                if line_number < position or not line.strip():
+                    continue
+                chunk.append(json.loads(line))
+                if len(chunk) == size:
+                    yield line_number + 1, chunk
+                    chunk = []
+            if chunk:
+                yield line_number + 1, chunk
+
+    def write(self, results: List[Dict[str, Any]]) -> None:
+
+        with open(self.output_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results))
+
+
+class MongoProfileStore:
+    """
+    MongoDB 存储：按 _id 升序流式读取 profiles 集合，游标为块内最后一个 _id，以 bson.json_util 的扩展 JSON
+    保存，恢复时 ObjectId、整数、字符串等 _id 类型不变（BSON 按类型分段比较，类型不符的 $gt 查询不会命中任何文档）；
+    结果以无序 bulk_write 写入 results 集合（默认写回画像文档的 tagging 字段）
+    """
+
+    def __init__(self, profiles: Any, results: Any = None, field: str = "tagging"):
+        self.profiles = profiles
+        self.results = profiles if results is None else results
+        self.field = field
+
+    def chunks(self, cursor: Optional[str], size: int) -> Iterator[Chunk]:
+
+        from bson import json_util
+
+        query = {} if cursor is None else {"_id": {"$gt": self._decode_cursor(cursor)}}
+        chunk = []
+        for document in self.profiles.find(query).sort("_id", 1).batch_size(size):
+            document["id"] = document.pop("_id")
+            chunk.append(document)
+            if len(chunk) == size:
+                yield json_util.dumps(chunk[-1]["id"]), chunk
+                chunk = []
+        if chunk:
+            yield json_util.dumps(chunk[-1]["id"]), chunk
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Any:
+        """还原检查点中的 _id；旧版检查点以 str(_id) 保存，无法按扩展 JSON 解析时按旧格式还原"""
+        from bson import ObjectId, json_util
+
+        try:
+            return json_util.loads(cursor)
+        except ValueError:
+            return ObjectId(cursor) if ObjectId.is_valid(cursor) else cursor
+
+    def write(self, results: List[Dict[str, Any]]) -> None:
+
+        from pymongo import UpdateOne
+
+        self.results.bulk_write([UpdateOne({"_id": result["id"]}, {"$set": {self.field: result}}, upsert=True)
+                                 for result in results], ordered=False)
+
+
+# ---------- 检查点 ----------
+
+def load_checkpoint(path: Optional[str], version: str) -> Dict[str, Any]:
+    """读取检查点，文件缺失、损坏或标签数据版本不符时返回初始状态"""
+    initial = {"version": version, "cursor": None, "processed": 0, "errors": 0, "completed": False}
+    if not path:
+        return initial
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return initial
+    return checkpoint if checkpoint.get("version") == version else initial
+
+
+def save_checkpoint(path: Optional[str], checkpoint: Dict[str, Any]) -> None:
+    """先写临时文件再 os.replace，中断时检查点要么是旧值要么是新值"""
+    if not path:
+        return
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_path, path)
+
+
+def ensure_snapshot(path: Optional[str] = None) -> str:
+    """确保共享快照中的标签图与匹配自动机是最新的，否则重新构建；返回快照路径"""
+    path = path or os.environ.get(SNAPSHOT_PATH_ENV) or DEFAULT_SNAPSHOT_PATH
+    try:
+        snapshot = Snapshot.open(path)
+    except (OSError, ValueError, SnapshotError):
+        snapshot = None
+    fresh = is_fresh(snapshot, TAG_GRAPH_SECTION, [TAG_GRAPH_PATH]) and \
+        is_fresh(snapshot, MATCHER_SECTION, [TAG_GRAPH_PATH, CONFIG_PATH])
+    if snapshot is not None:
+        snapshot.close()
+    if not fresh:
+        from boot.build_snapshot import build_snapshot
+
+        result = build_snapshot(path)
+        logger.info("retag_snapshot_built", path=path, bytes=result["bytes"], duration_ms=round(result["duration_ms"]))
+    return path
+
+
+# ---------- 任务 ----------
+
+def retag(store: Any, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+          checkpoint_path: Optional[str] = None, max_pending: Optional[int] = None,
+          snapshot_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    执行重打标任务，返回 {"version", "processed", "errors", "resumed_from", "duration_s", "profiles_per_second"}
+    最多 max_pending 块（默认 workers 的 2 倍）同时在途；按提交顺序回收，检查点因此总是连续的前缀
+    snapshot_path 为 worker 使用的共享快照，默认为 $CAREERBOT_SNAPSHOT 或 snapshots/careerbot.snap
+    """
+    version = tagging_version()
+    checkpoint = load_checkpoint(checkpoint_path, version)
+    resumed_from, resumed_errors = checkpoint["processed"], checkpoint["errors"]
+    if checkpoint["completed"]:
+        logger.info("retag_already_completed", version=version, processed=resumed_from)
+        return {"version": version, "processed": 0, "errors": 0, "resumed_from": resumed_from,
+                "duration_s": 0.0, "profiles_per_second": 0.0}
+
+    snapshot_path = ensure_snapshot(snapshot_path)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    processed = errors = 0
+    started = time.perf_counter()
+
+    def collect(pending: deque) -> None:
+        nonlocal processed, errors
+        cursor, future = pending.popleft()
+        results = future.result()
+        store.write(results)
+        processed += len(results)
+        errors += sum(1 for result in results if "error" in result)
+        checkpoint.update(cursor=cursor, processed=resumed_from + processed, errors=resumed_errors + errors)
+        save_checkpoint(checkpoint_path, checkpoint)
+        elapsed = time.perf_counter() - started
+        logger.info("retag_progress", processed=checkpoint["processed"], errors=errors,
+                    profiles_per_second=round(processed / elapsed, 1))
+
+    logger.info("retag_started", version=version, workers=workers, chunk_size=chunk_size, resumed_from=resumed_from)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(snapshot_path,)) as pool:
+        pending: deque = deque()
+        for cursor, chunk in store.chunks(checkpoint["cursor"], chunk_size):
+            pending.append((cursor, pool.submit(_tag_chunk, chunk, version)))
+            if len(pending) >= max_pending:
+                collect(pending)
+        while pending:
+            collect(pending)
+
+    duration = time.perf_counter() - started
+    checkpoint["completed"] = True
+    save_checkpoint(checkpoint_path, checkpoint)
+    stats = {"version": version, "processed": processed, "errors": errors, "resumed_from": resumed_from,
+             "duration_s": duration, "profiles_per_second": processed / duration if duration else 0.0}
+    logger.info("retag_completed", **stats)
+    return stats
+
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description="Re-tag stored profiles against the current tag graph")
+    parser.add_argument("--input", required=True, help="profiles JSONL")
+    parser.add_argument("--output", required=True, help="results JSONL (appended)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", help="checkpoint path (default: <output>.checkpoint)")
+    args = parser.parse_args()
+    stats = retag(JsonlProfileStore(args.input, args.output), args.workers, args.chunk_size,
+                  args.checkpoint or f"{args.output}.checkpoint")
+    print(f"re-tagged {stats['processed']} profiles ({stats['errors']} errors) in {stats['duration_s']:.1f}s, "
+          f"{stats['profiles_per_second']:.0f} profiles/sec")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
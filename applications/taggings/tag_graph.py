@@ -0,0 +1,243 @@
+# tag_graph.py - 标签图与地理拓扑的编译结构
+"""
+把 data_json/ 下的只读标签数据编译为扁平的整数结构，供打标、匹配等流程直接按整数 ID 查询：
+- tag_graph_nodes.json：标签按 label_id 排序后分配整数 ID；层级、适用实体编码为数组；
+  relations 编译为 CSR 邻接（indptr / indices / 关系类型 / 权重）
+- ph_topology.json：地点按键排序后分配整数 ID，neighbors 编译为 CSR 邻接，
+  并预计算全地点对的跳数矩阵（uint8，HOPS_UNREACHABLE 表示不可达）
+
+编译结果写入 boot/build_snapshot.py 生成的共享快照（utilities/snapshot），多个 worker 进程以只读 mmap
+映射同一文件，经页缓存共享内存，启动时无需解析 JSON。快照缺失或数据源已更新时，在进程内编译同样的结构作为回退。
+"""
+
+import functools
+import json
+import os
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from utilities.snapshot.snapshot import Snapshot, SnapshotWriter, snapshot_for, source_fingerprint
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_json")
+TAG_GRAPH_PATH = os.path.join(DATA_DIR, "tag_graph_nodes.json")
+TOPOLOGY_PATH = os.path.join(DATA_DIR, "ph_topology.json")
+
+# ENTITY_BITS 为适用实体的位掩码编码
+ENTITY_BITS = {"user": 1, "job": 2, "company": 4}
+# HOPS_UNREACHABLE 为跳数矩阵中不可达地点对的取值，跳数达到该值的地点对同样视为不可达
+HOPS_UNREACHABLE = 255
+# NO_CITY_RANK 为没有 city_rank 字段的标签在 city_rank 数组中的取值
+NO_CITY_RANK = -1
+# GRAPH_FORMAT 为编译结构的版本号，结构变化时递增；版本号是快照分区名的一部分，旧快照自动回退为进程内编译
+GRAPH_FORMAT = 1
+TAG_GRAPH_SECTION = f"tag_graph.v{GRAPH_FORMAT}"
+TOPOLOGY_SECTION = f"topology.v{GRAPH_FORMAT}"
+
+
+def compile_tag_graph(writer: SnapshotWriter, path: str = TAG_GRAPH_PATH,
+                      prefix: str = TAG_GRAPH_SECTION) -> Dict[str, int]:
+    """解析 tag_graph_nodes.json 并把编译结构写入 writer，返回统计信息；指向未知标签的关系被丢弃"""
+    with open(path, "r", encoding="utf-8") as f:
+        nodes = json.load(f)
+    tag_ids = sorted(nodes)
+    index = {tag_id: i for i, tag_id in enumerate(tag_ids)}
+    layers = sorted({node["layer"] for node in nodes.values()})
+    rel_types = sorted({relation["type"] for node in nodes.values() for relation in node.get("relations", [])})
+    layer_index = {layer: i for i, layer in enumerate(layers)}
+    type_index = {rel_type: i for i, rel_type in enumerate(rel_types)}
+
+    indptr, indices, types, weights = [0], [], [], []
+    dropped = 0
+    for tag_id in tag_ids:
+        for relation in nodes[tag_id].get("relations", []):
+            target = index.get(relation["target"])
+            if target is None:
+                dropped += 1
+                continue
+            indices.append(target)
+            types.append(type_index[relation["type"]])
+            # 权重取 adjacent 的 distance 或 commute_to 的 commute_rank，其余关系为 0
+            weights.append(relation.get("distance", relation.get("commute_rank", 0)))
+        indptr.append(len(indices))
+
+    writer.add_bytes(f"{prefix}.fingerprint", source_fingerprint([path]))
+    writer.add_strings(f"{prefix}.ids", tag_ids)
+    writer.add_strings(f"{prefix}.labels", [nodes[tag_id]["label_text"] for tag_id in tag_ids])
+    writer.add_strings(f"{prefix}.layer_names", layers)
+    writer.add_array(f"{prefix}.layer", "B", [layer_index[nodes[tag_id]["layer"]] for tag_id in tag_ids])
+    writer.add_array(f"{prefix}.entities", "B", [
+        sum(ENTITY_BITS.get(entity, 0) for entity in set(nodes[tag_id].get("applicable_entities", [])))
+        for tag_id in tag_ids])
+    writer.add_array(f"{prefix}.city_rank", "h", [
+        NO_CITY_RANK if nodes[tag_id].get("city_rank") is None else nodes[tag_id]["city_rank"] for tag_id in tag_ids])
+    writer.add_strings(f"{prefix}.parent_region", [nodes[tag_id].get("parent_region") or "" for tag_id in tag_ids])
+    writer.add_strings(f"{prefix}.sub_key", [nodes[tag_id].get("sub_key") or "" for tag_id in tag_ids])
+    writer.add_strings(f"{prefix}.relation_types", rel_types)
+    writer.add_array(f"{prefix}.indptr", "I", indptr)
+    writer.add_array(f"{prefix}.indices", "I", indices)
+    writer.add_array(f"{prefix}.relation", "B", types)
+    writer.add_array(f"{prefix}.weight", "H", weights)
+    return {"tags": len(tag_ids), "relations": len(indices), "dropped_relations": dropped}
+
+
+def compile_topology(writer: SnapshotWriter, path: str = TOPOLOGY_PATH,
+                     prefix: str = TOPOLOGY_SECTION) -> Dict[str, int]:
+    """解析 ph_topology.json，写入地点 CSR 邻接与全地点对跳数矩阵，返回统计信息"""
+    with open(path, "r", encoding="utf-8") as f:
+        places = json.load(f)
+    keys = sorted(places)
+    index = {key: i for i, key in enumerate(keys)}
+    levels = sorted({place["level"] for place in places.values()})
+    level_index = {level: i for i, level in enumerate(levels)}
+
+    adjacency: List[List[int]] = []
+    dropped = 0
+    for key in keys:
+        neighbors = [index[neighbor] for neighbor in places[key].get("neighbors", []) if neighbor in index]
+        dropped += len(places[key].get("neighbors", [])) - len(neighbors)
+        adjacency.append(neighbors)
+
+    count = len(keys)
+    hops = bytearray([HOPS_UNREACHABLE]) * (count * count)
+    for source in range(count):
+        # 逐个源点做 BFS，跳数超过 254 的地点对按不可达处理
+        row = source * count
+        hops[row + source] = 0
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            distance = hops[row + current] + 1
+            if distance >= HOPS_UNREACHABLE:
+                continue
+            for neighbor in adjacency[current]:
+                if hops[row + neighbor] == HOPS_UNREACHABLE:
+                    hops[row + neighbor] = distance
+                    queue.append(neighbor)
+
+    indptr = [0]
+    for neighbors in adjacency:
+        indptr.append(indptr[-1] + len(neighbors))
+    writer.add_bytes(f"{prefix}.fingerprint", source_fingerprint([path]))
+    writer.add_strings(f"{prefix}.keys", keys)
+    writer.add_strings(f"{prefix}.names", [places[key]["name"] for key in keys])
+    writer.add_strings(f"{prefix}.parents", [places[key].get("parent_name") or "" for key in keys])
+    writer.add_strings(f"{prefix}.level_names", levels)
+    writer.add_array(f"{prefix}.level", "B", [level_index[places[key]["level"]] for key in keys])
+    writer.add_array(f"{prefix}.indptr", "I", indptr)
+    writer.add_array(f"{prefix}.indices", "I", [neighbor for neighbors in adjacency for neighbor in neighbors])
+    writer.add_bytes(f"{prefix}.hops", bytes(hops))
+    return {"places": count, "edges": indptr[-1], "dropped_neighbors": dropped}
+
+
+def compile_snapshot(writer: SnapshotWriter) -> List[str]:
+    """快照构建钩子（boot/build_snapshot.py 调用）：写入标签图与地理拓扑，返回数据源文件列表"""
+    compile_tag_graph(writer)
+    compile_topology(writer)
+    return [TAG_GRAPH_PATH, TOPOLOGY_PATH]
+
+
+class TagGraph:
+    """
+    标签图的只读视图，所有字段都是快照中的数组视图，按整数 ID 访问
+    """
+
+    def __init__(self, snapshot: Snapshot, prefix: str = TAG_GRAPH_SECTION):
+        self.ids = snapshot.strings(f"{prefix}.ids")
+        self.labels = snapshot.strings(f"{prefix}.labels")
+        self.layer_names = list(snapshot.strings(f"{prefix}.layer_names"))
+        self.relation_types = list(snapshot.strings(f"{prefix}.relation_types"))
+        self.parent_regions = snapshot.strings(f"{prefix}.parent_region")
+        self.sub_keys = snapshot.strings(f"{prefix}.sub_key")
+        self.layer_codes = snapshot.array(f"{prefix}.layer")
+        self.entity_bits = snapshot.array(f"{prefix}.entities")
+        self.city_ranks = snapshot.array(f"{prefix}.city_rank")
+        self.indptr = snapshot.array(f"{prefix}.indptr")
+        self.indices = snapshot.array(f"{prefix}.indices")
+        self.relation_codes = snapshot.array(f"{prefix}.relation")
+        self.weights = snapshot.array(f"{prefix}.weight")
+
+    def __len__(self) -> int:
+
+        return len(self.ids)
+
+    def id_of(self, label_id: str) -> int:
+        """label_id 对应的整数 ID，未知标签返回 -1"""
+        return self.ids.find(label_id)
+
+    def layer(self, tag: int) -> str:
+
+        return self.layer_names[self.layer_codes[tag]]
+
+    def applies_to(self, tag: int, entity: str) -> bool:
+
+        return bool(self.entity_bits[tag] & ENTITY_BITS.get(entity, 0))
+
+    def city_rank(self, tag: int) -> Optional[int]:
+
+        rank = self.city_ranks[tag]
+        return None if rank == NO_CITY_RANK else rank
+
+    def relations(self, tag: int) -> List[Tuple[str, int, int]]:
+        """返回 [(关系类型, 目标 ID, 权重)]，顺序与源数据一致"""
+        begin, end = self.indptr[tag], self.indptr[tag + 1]
+        return [(self.relation_types[self.relation_codes[i]], self.indices[i], self.weights[i]) for i in range(begin, end)]
+
+    def neighbors(self, tag: int, relation_type: Optional[str] = None) -> List[int]:
+        """返回目标 ID 列表，relation_type 给定时只返回该类型的关系"""
+        begin, end = self.indptr[tag], self.indptr[tag + 1]
+        if relation_type is None:
+            return list(self.indices[begin:end])
+        if relation_type not in self.relation_types:
+            return []
+        code = self.relation_types.index(relation_type)
+        return [self.indices[i] for i in range(begin, end) if self.relation_codes[i] == code]
+
+
+class PlaceTopology:
+    """
+    地理拓扑的只读视图：地点 CSR 邻接和全地点对跳数矩阵
+    """
+
+    def __init__(self, snapshot: Snapshot, prefix: str = TOPOLOGY_SECTION):
+        self.keys = snapshot.strings(f"{prefix}.keys")
+        self.names = snapshot.strings(f"{prefix}.names")
+        self.parents = snapshot.strings(f"{prefix}.parents")
+        self.level_names = list(snapshot.strings(f"{prefix}.level_names"))
+        self.level_codes = snapshot.array(f"{prefix}.level")
+        self.indptr = snapshot.array(f"{prefix}.indptr")
+        self.indices = snapshot.array(f"{prefix}.indices")
+        self.hop_matrix = snapshot.bytes(f"{prefix}.hops")
+        self.count = len(self.keys)
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def id_of(self, key: str) -> int:
+        """地点键（"name | parent"，小写）对应的整数 ID，未知地点返回 -1"""
+        return self.keys.find(key)
+
+    def level(self, place: int) -> str:
+
+        return self.level_names[self.level_codes[place]]
+
+    def neighbors(self, place: int) -> List[int]:
+
+        return list(self.indices[self.indptr[place]:self.indptr[place + 1]])
+
+    def hops(self, source: int, target: int) -> Optional[int]:
+        """两地之间沿 neighbors 的最少跳数，不可达返回 None"""
+        hops = self.hop_matrix[source * self.count + target]
+        return None if hops == HOPS_UNREACHABLE else hops
+
+
+@functools.lru_cache(maxsize=None)
+def load_tag_graph() -> TagGraph:
+    """进程内共享的标签图视图：优先使用共享快照，快照缺失或过期时在进程内编译同样的结构"""
+    return TagGraph(snapshot_for(TAG_GRAPH_SECTION, [TAG_GRAPH_PATH], compile_tag_graph))
+
+
+@functools.lru_cache(maxsize=None)
+def load_topology() -> PlaceTopology:
+    """进程内共享的地理拓扑视图：优先使用共享快照，快照缺失或过期时在进程内编译同样的结构"""
+    return PlaceTopology(snapshot_for(TOPOLOGY_SECTION, [TOPOLOGY_PATH], compile_topology))
@@ -0,0 +1,205 @@
+# tag_index.py - 标签向量的进程内相似检索
+"""
+标签库的 1468 个标签各有一条 embedding 向量（TagLibraryService → ChromaDB），概念抽取为每个推断概念
+取回最相似的 max_concepts 个标签。每个概念一次远程向量库往返代价过高，这里把全部标签向量放进进程内：
+
+- NumpyTagIndex：L2 归一化后的 float32 矩阵，余弦相似度即矩阵乘积；批量查询一次 (n, d) @ (d, N)，
+  np.argpartition 取 top-k 后只对 k 个结果排序。标签规模下暴力检索即可，无需近似索引
+- quantize=True 时每行按 max|x| / 127 对称量化为 int8，内存和磁盘占用为 float32 的 1/4，
+  打分时每次只把 SCORE_CHUNK_ROWS 行反量化到临时 float32 块中参与矩阵乘积，再按列乘回缩放系数：
+  查询期间的额外内存只有一个块（约 0.8 MB），不随标签数增长；代价是每次查询都要重新转换全部行，
+  查询吞吐比 float32 索引低约 15–25%
+- save / load 持久化为 .npy（矩阵、缩放系数）与 .ids.json（标签 ID 顺序），load 默认 mmap 只读映射，
+  多个 worker 经页缓存共享同一份矩阵
+- ChromaTagIndex：同一接口下的 ChromaDB 后端，chromadb 为可选依赖，只在使用该后端时导入
+
+open_tag_index() 按环境变量 CAREERBOT_TAG_INDEX（numpy / chroma）选择后端，默认 numpy。
+"""
+
+import json
+import os
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utilities.snapshot.snapshot import PROJECT_ROOT
+
+DEFAULT_INDEX_PATH = os.path.join(PROJECT_ROOT, "snapshots", "tag_embeddings")
+TAG_INDEX_BACKEND_ENV = "CAREERBOT_TAG_INDEX"
+DEFAULT_COLLECTION = "tag_library"
+# QUANTIZE_LEVELS 为 int8 对称量化的最大绝对值
+QUANTIZE_LEVELS = 127
+# SCORE_CHUNK_ROWS 为量化索引打分时每次反量化的行数，块保持在 CPU 缓存可容纳的量级
+SCORE_CHUNK_ROWS = 128
+
+Hit = Tuple[str, float]
+
+
+def _normalize_rows(vectors: Any) -> np.ndarray:
+
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class TagVectorIndex:
+    """
+    标签向量检索接口：search 返回 [(label_id, 余弦相似度)]，按相似度降序
+    """
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def search(self, query: Sequence[float], k: int = 20, min_score: Optional[float] = None) -> List[Hit]:
+        """单条查询"""
+        return self.search_batch([query], k, min_score)[0]
+
+    def search_batch(self, queries: Sequence[Sequence[float]], k: int = 20,
+                     min_score: Optional[float] = None) -> List[List[Hit]]:
+        """批量查询，返回与 queries 等长的结果列表"""
+        raise NotImplementedError
+
+
+class NumpyTagIndex(TagVectorIndex):
+    """
+    进程内暴力检索索引，matrix 为归一化后的 float32 矩阵，quantize 时为 int8 矩阵加每行缩放系数
+    """
+
+    def __init__(self, ids: Sequence[str], vectors: Any, quantize: bool = False, scales: Optional[Any] = None,
+                 normalized: bool = False):
+        self.ids = list(ids)
+        if normalized:
+            # save 写出的矩阵（load 时传入），已归一化或已量化，原样使用以保留 mmap 视图
+            self.matrix, self.scales = vectors, None if scales is None else np.asarray(scales, dtype=np.float32)
+        elif quantize:
+            unit = _normalize_rows(vectors)
+            peaks = np.abs(unit).max(axis=1)
+            peaks[peaks == 0] = 1.0
+            self.scales = (peaks / QUANTIZE_LEVELS).astype(np.float32)
+            self.matrix = np.round(unit / self.scales[:, None]).astype(np.int8)
+        else:
+            self.matrix, self.scales = _normalize_rows(vectors), None
+        if len(self.ids) != self.matrix.shape[0]:
+            raise ValueError(f"{len(self.ids)} ids for {self.matrix.shape[0]} vectors")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dimension(self) -> int:
+        return int(self.matrix.shape[1])
+
+    @property
+    def quantized(self) -> bool:
+        return self.scales is not None
+
+    def scores(self, queries: Any) -> np.ndarray:
+        """(n, d) 查询与全部标签的余弦相似度矩阵 (n, N)"""
+        normalized = _normalize_rows(queries)
+        if self.scales is None:
+            return normalized @ self.matrix.T
+        rows = self.matrix.shape[0]
+        scores = np.empty((normalized.shape[0], rows), dtype=np.float32)
+        block = np.empty((min(SCORE_CHUNK_ROWS, rows), self.matrix.shape[1]), dtype=np.float32)
+        for start in range(0, rows, SCORE_CHUNK_ROWS):
+            stop = min(rows, start + SCORE_CHUNK_ROWS)
+            chunk = block[:stop - start]
+            np.copyto(chunk, self.matrix[start:stop], casting="unsafe")
+            np.matmul(normalized, chunk.T, out=scores[:, start:stop])
+        scores *= self.scales
+        return scores
+
+    def search_batch(self, queries: Sequence[Sequence[float]], k: int = 20,
+                     min_score: Optional[float] = None) -> List[List[Hit]]:
+
+        scores = self.scores(queries)
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return [[] for _ in range(scores.shape[0])]
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(k), (scores.shape[0], k))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top, top_scores = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+        return [
+            [(self.ids[column], float(score)) for column, score in zip(row, row_scores)
+             if min_score is None or score >= min_score]
+            for row, row_scores in zip(top.tolist(), top_scores.tolist())
+        ]
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        """写入 <path>.npy、<path>.ids.json，量化索引另写 <path>.scales.npy"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.save(f"{path}.npy", self.matrix)
+        scales_path = f"{path}.scales.npy"
+        if self.scales is not None:
+            np.save(scales_path, self.scales)
+        elif os.path.exists(scales_path):
+            os.remove(scales_path)
+        with open(f"{path}.ids.json", "w", encoding="utf-8") as f:
+            json.dump(self.ids, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH, mmap: bool = True) -> "NumpyTagIndex":
+        """从 save 写入的文件加载；mmap 为 True 时矩阵以只读 mmap 映射"""
+        with open(f"{path}.ids.json", "r", encoding="utf-8") as f:
+            ids = json.load(f)
+        matrix = np.load(f"{path}.npy", mmap_mode="r" if mmap else None)
+        scales_path = f"{path}.scales.npy"
+        scales = np.load(scales_path) if os.path.exists(scales_path) else None
+        return cls(ids, matrix, scales=scales, normalized=True)
+
+    @classmethod
+    def from_chroma(cls, collection: Any, quantize: bool = False) -> "NumpyTagIndex":
+        """从 ChromaDB 集合导出全部标签向量构建本地索引"""
+        records = collection.get(include=["embeddings"])
+        return cls(records["ids"], records["embeddings"], quantize=quantize)
+
+
+class ChromaTagIndex(TagVectorIndex):
+    """
+    ChromaDB 后端：每次查询一次 collection.query 往返；集合需使用 cosine 距离，相似度为 1 - distance
+    """
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    @classmethod
+    def open(cls, persist_directory: Optional[str] = None, name: str = DEFAULT_COLLECTION) -> "ChromaTagIndex":
+
+        import chromadb
+
+        client = chromadb.PersistentClient(path=persist_directory) if persist_directory else chromadb.Client()
+        return cls(client.get_or_create_collection(name, metadata={"hnsw:space": "cosine"}))
+
+    def __len__(self) -> int:
+        return self.collection.count()
+
+    def search_batch(self, queries: Sequence[Sequence[float]], k: int = 20,
+                     min_score: Optional[float] = None) -> List[List[Hit]]:
+
+        result = self.collection.query(query_embeddings=_normalize_rows(queries).tolist(), n_results=k,
+                                       include=["distances"])
+        return [
+            [(label_id, 1.0 - distance) for label_id, distance in zip(ids, distances)
+             if min_score is None or 1.0 - distance >= min_score]
+            for ids, distances in zip(result["ids"], result["distances"])
+        ]
+
+
+def open_tag_index(backend: Optional[str] = None, path: str = DEFAULT_INDEX_PATH, **options: Any) -> TagVectorIndex:
+    """
+    按后端名打开标签向量索引：numpy 从 path 加载本地 .npy 索引；chroma 打开 ChromaDB 集合
+    （options 透传给 ChromaTagIndex.open，如 persist_directory、name）
+    """
+    backend = backend or os.environ.get(TAG_INDEX_BACKEND_ENV, "numpy")
+    if backend == "numpy":
+        return NumpyTagIndex.load(path, **options)
+    if backend == "chroma":
+        return ChromaTagIndex.open(**options)
+    raise ValueError(f"unknown tag index backend: {backend}")
@@ -0,0 +1,215 @@
+# tagging_cache.py - 按内容哈希缓存打标结果
+"""
+用户重复上传几乎相同的简历、招聘方重复发布同一份招聘简章时，完整的打标流程（抽取、LLM、图扩展）
+不必重新执行。TaggingCache 以 "规范化文本哈希 + 实体类型 + 标签数据版本" 为键缓存最终的分层标签输出：
+
+- 规范化：NFKC、统一换行、每段内空白合并为单个空格、去掉首尾空白，只改变排版的重复上传同样命中
+- 版本：tag_graph_nodes.json 与 tagging_config.json 的内容哈希，加上调用方给出的 pipeline_version
+  （如模型或提示词版本），任一变化后旧条目自然失效，无需主动清理
+- 两级存储：进程内 LRU（OrderedDict）在前，DiskTier（本地目录）或 MongoTier（MongoDB 集合）在后，
+  后端命中时回填 LRU
+- 段落级部分复用：文档按空行切分为段落，调用方提供段落级打标与合并函数时，整篇未命中、但有段落命中
+  段落缓存的文档只对缓存中没有的段落重新打标，再合并为整篇结果；没有任何段落命中的文档仍整篇调用 compute，
+  逐段打标每段都要付出一次调用的固定开销，全新文档逐段打标比整篇打标更慢
+- 段落缓存的填充：调用方提供 split 时，整篇打标的结果按来源拆分为各段落的结果写入段落缓存，
+  同一文档之后只改动部分段落的版本即可复用其余段落
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from applications.taggings.label_matcher import CONFIG_PATH
+from applications.taggings.tag_graph import TAG_GRAPH_PATH
+from utilities.snapshot.snapshot import PROJECT_ROOT
+
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, "cache", "taggings")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_paragraphs(text: str) -> List[str]:
+    """规范化文档并切分为段落（空行分隔），空段落被丢弃"""
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    paragraphs = (_WHITESPACE.sub(" ", paragraph).strip() for paragraph in _PARAGRAPH_BREAK.split(text))
+    return [paragraph for paragraph in paragraphs if paragraph]
+
+
+def content_hash(text: str) -> str:
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def tagging_version(paths: Sequence[str] = (TAG_GRAPH_PATH, CONFIG_PATH)) -> str:
+    """标签数据版本：数据源文件内容的哈希（不使用 mtime，部署重新检出文件后缓存依然有效）"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:16]
+
+
+class DiskTier:
+    """
+    本地目录后端：每个条目一个 JSON 文件，按键的前两位十六进制分目录；先写临时文件再 os.replace，
+    多个 worker 并发写入同一键时读者只会看到完整的文件
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+
+        digest = key.rsplit(":", 1)[-1]
+        return os.path.join(self.directory, digest[:2], f"{key.replace(':', '_')}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+class MongoTier:
+    """
+    MongoDB 后端：collection 为 pymongo 集合，文档形如 {"_id": 键, "value": 结果, "stored_at": 时间戳}；
+    需要过期时由部署方在 stored_at 上建立 TTL 索引
+    """
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+
+        document = self.collection.find_one({"_id": key}, {"value": 1})
+        return None if document is None else document["value"]
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+
+        self.collection.replace_one({"_id": key}, {"_id": key, "value": value, "stored_at": time.time()}, upsert=True)
+
+
+class TaggingCache:
+    """
+    TaggingCache 类实现打标结果的两级内容哈希缓存
+    整篇结果与段落结果共用同一个 LRU 和后端，键分别以 doc / para 开头
+    """
+
+    def __init__(self, tier: Optional[Any] = None, max_entries: int = 4096, pipeline_version: str = "",
+                 version: Optional[str] = None):
+        # tier 为第二级存储（DiskTier / MongoTier 或任何提供 get / put 的对象），None 时只使用进程内 LRU
+        self.tier = tier
+        # max_entries 为 LRU 条目上限，超过时淘汰最久未访问的条目
+        self.max_entries = max_entries
+        # version 为键中的版本段：标签数据内容哈希 + pipeline_version
+        self.version = version or f"{tagging_version()}{pipeline_version and '-' + pipeline_version}"
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        # 命中统计，供监控读取；paragraph_hits / paragraph_misses 只统计部分复用路径
+        self.stats = {"hits": 0, "tier_hits": 0, "misses": 0, "paragraph_hits": 0, "paragraph_misses": 0}
+
+    def _key(self, kind: str, entity: str, text: str) -> str:
+
+        return f"{kind}:{self.version}:{entity}:{content_hash(text)}"
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """先查 LRU，再查后端，后端命中时回填 LRU"""
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+            return value
+        if self.tier is not None:
+            value = self.tier.get(key)
+            if value is not None:
+                self._remember(key, value)
+        return value
+
+    def _put(self, key: str, value: Dict[str, Any]) -> None:
+
+        self._remember(key, value)
+        if self.tier is not None:
+            self.tier.put(key, value)
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, text: str, entity: str = "user") -> Optional[Dict[str, Any]]:
+        """整篇缓存查找，未命中返回 None"""
+        key = self._key("doc", entity, "\n\n".join(normalize_paragraphs(text)))
+        in_memory = key in self.entries
+        value = self._get(key)
+        if value is not None:
+            self.stats["hits" if in_memory else "tier_hits"] += 1
+        return value
+
+    def put(self, text: str, entity: str, result: Dict[str, Any]) -> None:
+
+        self._put(self._key("doc", entity, "\n\n".join(normalize_paragraphs(text))), result)
+
+    def put_paragraph(self, paragraph: str, entity: str, result: Dict[str, Any]) -> None:
+        """写入单个段落的打标结果，供本身按段落（分块）打标的调用方预先填充段落缓存"""
+        self._put(self._key("para", entity, " ".join(normalize_paragraphs(paragraph))), result)
+
+    async def run(self, text: str, entity: str, compute: Callable[[str], Awaitable[Dict[str, Any]]],
+                  compute_paragraph: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None,
+                  merge: Optional[Callable[[List[Dict[str, Any]]], Dict[str, Any]]] = None,
+                  split: Optional[Callable[[Dict[str, Any], List[str]], Sequence[Optional[Dict[str, Any]]]]] = None
+                  ) -> Dict[str, Any]:
+        """
+        run 方法返回 text 的打标结果
+        整篇命中时直接返回；未命中且提供了 compute_paragraph 与 merge、并且有段落命中段落缓存时按段落复用，
+        否则以规范化文本调用 compute 执行完整流程，并在提供了 split 时把 split(结果, 段落列表) 给出的
+        各段落结果（None 表示该段落不缓存）写入段落缓存；结果写回缓存
+        """
+        result = self.get(text, entity)
+        if result is not None:
+            return result
+        self.stats["misses"] += 1
+        paragraphs = normalize_paragraphs(text)
+        normalized = "\n\n".join(paragraphs)
+        reuse = compute_paragraph is not None and merge is not None
+        keys = [self._key("para", entity, paragraph) for paragraph in paragraphs] if reuse or split else []
+        partials = [self._get(key) for key in keys] if reuse else []
+        if not any(partial is not None for partial in partials):
+            result = await compute(normalized)
+            if split is not None:
+                for key, partial in zip(keys, split(result, paragraphs)):
+                    if partial is not None:
+                        self._put(key, partial)
+        else:
+            for index, paragraph in enumerate(paragraphs):
+                if partials[index] is None:
+                    self.stats["paragraph_misses"] += 1
+                    partials[index] = await compute_paragraph(paragraph)
+                    self._put(keys[index], partials[index])
+                else:
+                    self.stats["paragraph_hits"] += 1
+            result = merge(partials)
+        self._put(self._key("doc", entity, normalized), result)
+        return result
+
+    def clear(self) -> None:
+        """clear 方法清空进程内 LRU，后端条目不受影响"""
+        self.entries.clear()
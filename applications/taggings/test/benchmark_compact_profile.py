@@ -0,0 +1,156 @@
+# benchmark_compact_profile.py - 紧凑标签画像内存与匹配基准脚本
+# 职责：生成合成的七层标签画像（词表标签与 LLM 自由文本混合），对比原分层 JSON 结构（dict / list / str）
+#       与 CompactProfile 的单画像内存占用、JSON 字节数，编码 / 解码耗时，以及两两画像共有标签计数的速度
+#       （overlap() 首轮含位集构建、之后使用缓存的位集）与缓存位集后的内存占用；
+#       并核对 to_verbose() 往返后的字段内容与原画像一致（不计列表顺序）
+
+import json
+import os
+import random
+import sys
+import time
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.insert(0, root_dir)
+
+from applications.taggings.compact_profile import LAYERS, LEVELS, encode_profile
+from applications.taggings.tag_graph import load_tag_graph
+
+PROFILE_COUNT = 2000
+PAIR_COUNT = 20000
+FREE_TEXT = ("Customer-Oriented Culture", "Process Standardization Environment", "Remote Work Adaptation",
+             "Pressure-Avoidance Migration Type", "Structure-Feedback Type", "Trial-and-Error Expander",
+             "Weak Empathy", "Efficiency decline in multi-task parallel processing",
+             "Anxiety in high-feedback requirement teams", "Frequent career path hopping",
+             "Negative reaction to micromanagement", "High internal friction", "Perfectionism tendency")
+
+
+def deep_size(value, seen=None):
+    """递归统计对象及其引用的全部 dict / list / str 的 sys.getsizeof 之和（共享对象只计一次）"""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(key, seen) + deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(deep_size(item, seen) for item in value)
+    return size
+
+
+def make_profiles(graph, seed=13):
+    rng = random.Random(seed)
+    vocabulary = {layer: list(dict.fromkeys(graph.labels[tag] for tag in range(len(graph)) if graph.layer(tag) == layer))
+                  for layer in LAYERS}
+    cities = [tag for tag in range(len(graph)) if graph.city_rank(tag) is not None]
+
+    def pick(layer, count):
+        return rng.sample(vocabulary[layer], count)
+
+    def free(count):
+        return rng.sample(FREE_TEXT, count)
+
+    def skills(count):
+        return [{"skill": skill, "level": rng.choice(LEVELS[1:])} for skill in pick("layer_2_skills", count)]
+
+    def place(tag):
+        return {"city": graph.labels[tag], "rank": graph.city_rank(tag)}
+
+    profiles = []
+    for _ in range(PROFILE_COUNT):
+        profile = {
+            "layer_0_background": {"observed_tags": pick("layer_0_background", 3),
+                                   "inferred_tags": pick("layer_0_background", 2) + free(1),
+                                   "extended_context_tags": free(2)},
+            "layer_1_adaptable_positions": {"observed_positions": pick("layer_1_adaptable_positions", 2),
+                                            "extended_positions": pick("layer_1_adaptable_positions", 3),
+                                            "upward_challenge_roles": pick("layer_1_adaptable_positions", 2),
+                                            "downward_compatible_roles": pick("layer_1_adaptable_positions", 2)},
+            "layer_2_skills": {"basic_skills": skills(3), "technical_skills": skills(4), "soft_skills": skills(3),
+                               "tool_specific_skills": skills(2),
+                               "latent_skills": [{"skill": text, "level": "Intermediate"} for text in free(2)]},
+            "layer_3_geography": {"core_locations": [place(rng.choice(cities))],
+                                  "migrated_locations": [place(city) for city in rng.sample(cities, 2)],
+                                  "remote_adaptability": rng.choice(("yes", "no", "mixed"))},
+            "layer_4_positive_attributes": {"trait_tags": pick("layer_4_positive_attributes", 3) + ["MBTI-INTJ"],
+                                            "inferred_drive_patterns": free(2), "growth_dynamics": free(2)},
+            "layer_5_negative_attributes": {"explicit_weaknesses": free(2), "behavioral_limits": free(2),
+                                            "contextual_fail_patterns": free(2)},
+            "layer_6_potential_risks": {"trajectory_risks": free(2), "structural_risks": free(2),
+                                        "psychological_risks": free(2)},
+        }
+        # 经 JSON 往返，使每个画像持有各自的字符串对象，与从 API / 数据库读入的画像一致
+        profiles.append(json.loads(json.dumps(profile)))
+    return profiles
+
+
+def canonical(profile):
+    """不计列表顺序的比较形式"""
+    return {layer: {field: sorted(json.dumps(value, sort_keys=True) for value in values)
+                    if isinstance(values, list) else values for field, values in fields.items()}
+            for layer, fields in profile.items()}
+
+
+def timed(function, items):
+    started = time.perf_counter()
+    results = [function(item) for item in items]
+    return results, (time.perf_counter() - started) / len(items) * 1e6
+
+
+def main():
+    graph = load_tag_graph()
+    profiles = make_profiles(graph)
+    compact, encode_us = timed(lambda profile: encode_profile(profile, "user", graph), profiles)
+    decoded, decode_us = timed(lambda profile: profile.to_verbose(graph), compact)
+    assert all(canonical(a) == canonical(b) for a, b in zip(profiles, decoded))
+
+    verbose_bytes = sum(deep_size(profile) for profile in profiles) / PROFILE_COUNT
+    compact_bytes = sum(sys.getsizeof(profile) + sys.getsizeof(profile.data) for profile in compact) / PROFILE_COUNT
+    json_bytes = sum(len(json.dumps(profile).encode("utf-8")) for profile in profiles) / PROFILE_COUNT
+    payload_bytes = sum(len(profile.data) for profile in compact) / PROFILE_COUNT
+    print(f"{PROFILE_COUNT} profiles, round trip verified\n")
+    print(f"{'':<26} {'verbose':>10} {'compact':>10} {'ratio':>7}")
+    print(f"{'in-memory bytes/profile':<26} {verbose_bytes:>10.0f} {compact_bytes:>10.0f} "
+          f"{verbose_bytes / compact_bytes:>6.1f}x")
+    print(f"{'serialized bytes/profile':<26} {json_bytes:>10.0f} {payload_bytes:>10.0f} "
+          f"{json_bytes / payload_bytes:>6.1f}x")
+    print(f"\nencode {encode_us:.1f} us/profile, decode to verbose {decode_us:.1f} us/profile")
+
+    # 匹配：两两画像在全部层上共有的词表标签数
+    rng = random.Random(1)
+    pairs = [(rng.randrange(PROFILE_COUNT), rng.randrange(PROFILE_COUNT)) for _ in range(PAIR_COUNT)]
+
+    def verbose_tags(profile):
+        tags = set()
+        for fields in profile.values():
+            for values in fields.values():
+                if isinstance(values, list):
+                    tags.update(value if isinstance(value, str) else value.get("skill") or value.get("city")
+                                for value in values)
+        return tags
+
+    started = time.perf_counter()
+    for a, b in pairs:
+        len(verbose_tags(profiles[a]) & verbose_tags(profiles[b]))
+    verbose_rate = PAIR_COUNT / (time.perf_counter() - started)
+    # 首轮包含每个画像第一次比较时的位集构建，之后的轮次直接使用缓存的位集
+    rates = []
+    for _ in range(2):
+        started = time.perf_counter()
+        for a, b in pairs:
+            compact[a].overlap(compact[b])
+        rates.append(PAIR_COUNT / (time.perf_counter() - started))
+    matched_bytes = sum(sys.getsizeof(profile) + sys.getsizeof(profile.data) +
+                        sum(sys.getsizeof(bits) for bits in profile._bitsets)
+                        for profile in compact) / PROFILE_COUNT
+    print(f"\npairwise overlap: verbose sets {verbose_rate:,.0f}/s, compact overlap() first pass {rates[0]:,.0f}/s, "
+          f"repeated {rates[1]:,.0f}/s")
+    print(f"in-memory bytes/profile after matching (with cached bitsets): {matched_bytes:.0f}")
+    assert rates[1] > verbose_rate
+
+
+if __name__ == "__main__":
+    main()
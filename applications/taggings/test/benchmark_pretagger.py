@@ -0,0 +1,89 @@
+# benchmark_pretagger.py - 确定性预打标节省量基准脚本
+# 职责：构造带地点、职位、技能与 MBTI 提及的合成简历文本，对比基线（6 轮 LLM，每轮附 100 个已有标签）
+#       与预打标后剩余 LLM 请求的调用次数、输入 token 数和估算延迟，并报告预打标自身的耗时
+
+import os
+import random
+import statistics
+import sys
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.insert(0, root_dir)
+
+from applications.taggings.pretagger import LATENCY_MODEL, PreTagger
+
+DOCUMENT_COUNT = 300
+SENTENCES = (
+    "I have worked for {years} years in a fast paced office handling daily reports and client accounts.",
+    "My previous team valued punctuality and clear communication with customers.",
+    "I am looking for a stable role with growth opportunities and a supportive manager.",
+    "Available to start immediately and comfortable with rotating shifts.",
+)
+REMOTE = ("Open to remote or work from home setups.", "Prefer onsite work in the office.",
+          "Comfortable with hybrid: remote twice a week, onsite otherwise.", "")
+
+
+def labels_of(graph, layer, ranked=False):
+
+    return [graph.labels[tag] for tag in range(len(graph))
+            if graph.layer(tag) == layer and (not ranked or graph.city_rank(tag) is not None)]
+
+
+def make_documents(graph, seed=11):
+    """每篇包含 1 个现居城市、可选的原居住地、1-2 个职位、2-5 个技能、可选的 MBTI 类型与远程偏好"""
+    rng = random.Random(seed)
+    cities = labels_of(graph, "layer_3_geography", ranked=True)
+    positions = labels_of(graph, "layer_1_adaptable_positions")
+    skills = labels_of(graph, "layer_2_skills")
+    traits = labels_of(graph, "layer_4_positive_attributes")
+    mbti = [a + b + c + d for a in "EI" for b in "NS" for c in "TF" for d in "JP"]
+    documents = []
+    for _ in range(DOCUMENT_COUNT):
+        city = rng.choice(cities)
+        parts = [f"Currently based in {city}."]
+        if rng.random() < 0.4:
+            parts.append(f"Originally from {rng.choice(cities)}, moved for work.")
+        if rng.random() < 0.8:
+            parts.append("Worked as " + " and later ".join(rng.sample(positions, rng.randint(1, 2))) + ".")
+        parts.append("Skills: " + ", ".join(rng.sample(skills, rng.randint(2, 5))) + ".")
+        parts.append(f"Colleagues describe me as {rng.choice(traits).lower()}.")
+        if rng.random() < 0.5:
+            parts.append(f"MBTI: {rng.choice(mbti)}.")
+        parts.append(rng.choice(REMOTE))
+        parts.extend(sentence.format(years=rng.randint(1, 9)) for sentence in SENTENCES)
+        documents.append((" ".join(parts), {"location": city}))
+    return documents
+
+
+def main():
+    pretagger = PreTagger()
+    documents = make_documents(pretagger.graph)
+    results = [pretagger.estimate_savings(text, "user", fields) for text, fields in documents]
+
+    def total(key):
+        return sum(result[key] for result in results)
+
+    resolved = {}
+    for result in results:
+        for layer in result["resolved_layers"]:
+            resolved[layer] = resolved.get(layer, 0) + 1
+    pretag_ms = [result["pretag_ms"] for result in results]
+    print(f"{DOCUMENT_COUNT} documents, latency model {LATENCY_MODEL}\n")
+    print(f"{'':<24} {'baseline':>10} {'pre-tagged':>11} {'saved':>8}")
+    print(f"{'LLM calls / doc':<24} {total('baseline_calls') / DOCUMENT_COUNT:>10.2f} "
+          f"{total('llm_calls') / DOCUMENT_COUNT:>11.2f} "
+          f"{1 - total('llm_calls') / total('baseline_calls'):>8.1%}")
+    print(f"{'input tokens / doc':<24} {total('baseline_tokens') / DOCUMENT_COUNT:>10.0f} "
+          f"{total('llm_tokens') / DOCUMENT_COUNT:>11.0f} "
+          f"{1 - total('llm_tokens') / total('baseline_tokens'):>8.1%}")
+    print(f"\nestimated LLM latency saved: {total('latency_saved_ms') / DOCUMENT_COUNT:.0f} ms/doc")
+    print(f"pre-tag cost: mean {statistics.mean(pretag_ms):.2f} ms, "
+          f"p99 {sorted(pretag_ms)[int(len(pretag_ms) * 0.99) - 1]:.2f} ms")
+    for layer, count in sorted(resolved.items()):
+        print(f"resolved without LLM: {layer:<30} {count / DOCUMENT_COUNT:>6.1%} of documents")
+
+
+if __name__ == "__main__":
+    main()
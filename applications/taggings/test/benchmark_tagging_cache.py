@@ -0,0 +1,134 @@
+# benchmark_tagging_cache.py - 打标结果内容哈希缓存基准脚本
+# 职责：模拟重复上传的文档流（原样重传、只改排版、只改一个段落、全新文档），对比不使用缓存（每篇整篇打标一次）、
+#       只缓存整篇、整篇 + 段落级部分复用三种方式下的 LLM 调用次数、输入 token 数与按 LATENCY_MODEL 估算的打标耗时；
+#       （全新文档整篇打标一次，结果按 split 拆分写入段落缓存，之后改动一个段落的重传只为该段落打标）；
+#       同时测量缓存自身的查找开销，以及 LRU 清空后（模拟新 worker）从 DiskTier 回填的命中情况
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.insert(0, root_dir)
+
+from applications.taggings.label_matcher import load_label_matcher
+from applications.taggings.pretagger import LATENCY_MODEL, estimate_tokens
+from applications.taggings.tagging_cache import DiskTier, TaggingCache, normalize_paragraphs
+
+ORIGINAL_COUNT = 100
+STREAM_LENGTH = 400
+PARAGRAPHS = 5
+# 文档流中各类上传的比例：原样重传、只改排版、改动一个段落，其余为全新文档
+REUPLOAD, REFORMAT, EDIT = 0.3, 0.2, 0.25
+
+
+class Pipeline:
+    """
+    模拟打标流程：显式标签由匹配器给出；每次打标（整篇或单个段落）计为一次 LLM 调用，
+    成本按输入 token 数和 LATENCY_MODEL 计入 modeled_ms
+    """
+
+    def __init__(self):
+        self.matcher = load_label_matcher()
+        self.modeled_ms = 0.0
+        self.calls = 0
+        self.tokens = 0
+
+    def _tag(self, text):
+        tokens = estimate_tokens(text)
+        self.calls += 1
+        self.tokens += tokens
+        self.modeled_ms += LATENCY_MODEL["per_call_ms"] + tokens * LATENCY_MODEL["per_input_token_ms"]
+        return {"observed_tags": [tag["label_id"] for tag in self.matcher.observed_tags(text)]}
+
+    async def tag_paragraph(self, paragraph):
+        return self._tag(paragraph)
+
+    async def tag_document(self, text):
+        return self._tag(text)
+
+    def split(self, result, paragraphs):
+        """整篇结果的来源拆分：各段落命中的显式标签（确定性匹配，不计为 LLM 调用）"""
+        return [{"observed_tags": [tag["label_id"] for tag in self.matcher.observed_tags(paragraph)]}
+                for paragraph in paragraphs]
+
+
+def merge(partials):
+    return {"observed_tags": list(dict.fromkeys(tag for partial in partials for tag in partial["observed_tags"]))}
+
+
+def make_stream(seed=5):
+    rng = random.Random(seed)
+    graph = load_label_matcher().graph
+    labels = [graph.labels[tag] for tag in range(len(graph))]
+    words = "handled accounts managed team reports clients daily schedule office support projects".split()
+
+    def paragraph():
+        return " ".join(rng.choice(labels) if rng.random() < 0.1 else rng.choice(words) for _ in range(60)) + "."
+
+    originals = ["\n\n".join(paragraph() for _ in range(PARAGRAPHS)) for _ in range(ORIGINAL_COUNT)]
+    stream = list(originals)
+    while len(stream) < STREAM_LENGTH:
+        roll, base = rng.random(), rng.choice(originals)
+        if roll < REUPLOAD:
+            stream.append(base)
+        elif roll < REUPLOAD + REFORMAT:
+            stream.append("  " + base.replace(". ", ".  ").replace("\n\n", "\r\n \r\n") + "\n")
+        elif roll < REUPLOAD + REFORMAT + EDIT:
+            parts = base.split("\n\n")
+            parts[rng.randrange(len(parts))] = paragraph()
+            stream.append("\n\n".join(parts))
+        else:
+            stream.append("\n\n".join(paragraph() for _ in range(PARAGRAPHS)))
+    return stream
+
+
+async def replay(stream, cache, paragraph_reuse):
+    pipeline = Pipeline()
+    started = time.perf_counter()
+    for text in stream:
+        if cache is None:
+            await pipeline.tag_document("\n\n".join(normalize_paragraphs(text)))
+        elif paragraph_reuse:
+            await cache.run(text, "user", pipeline.tag_document, pipeline.tag_paragraph, merge, pipeline.split)
+        else:
+            await cache.run(text, "user", pipeline.tag_document)
+    return pipeline, (time.perf_counter() - started) * 1e3
+
+
+async def main():
+    stream = make_stream()
+    print(f"{len(stream)} uploads, {PARAGRAPHS} paragraphs each, latency model {LATENCY_MODEL}\n")
+    print(f"{'mode':<28} {'LLM calls':>10} {'input tokens':>13} {'modeled ms/doc':>15} {'wall ms':>9}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory:
+        modes = (("no cache", None, False), ("document cache", TaggingCache(), False),
+                 ("document + paragraph reuse", TaggingCache(DiskTier(directory)), True))
+        for name, cache, paragraph_reuse in modes:
+            pipeline, wall_ms = await replay(stream, cache, paragraph_reuse)
+            baseline = baseline or pipeline.modeled_ms
+            print(f"{name:<28} {pipeline.calls:>10} {pipeline.tokens:>13} {pipeline.modeled_ms / len(stream):>15.0f} "
+                  f"{wall_ms:>9.1f}"
+                  f"   saved {1 - pipeline.modeled_ms / baseline:.1%}")
+        cache = modes[-1][1]
+        print(f"\nstats: {cache.stats}")
+
+        # 查找开销：全部命中时每次 get 的耗时（规范化 + 哈希 + LRU 查找）
+        started = time.perf_counter()
+        for text in stream:
+            cache.get(text, "user")
+        print(f"cache lookup: {(time.perf_counter() - started) / len(stream) * 1e6:.1f} us/doc")
+
+        # 模拟新 worker：LRU 为空，依靠 DiskTier 命中
+        cold = TaggingCache(DiskTier(directory))
+        pipeline, wall_ms = await replay(stream, cold, True)
+        print(f"cold worker with disk tier: {pipeline.calls} LLM calls, {cold.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
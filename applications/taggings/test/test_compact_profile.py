@@ -0,0 +1,99 @@
+# test_compact_profile.py - 紧凑标签画像的编解码测试
+# 职责：核对 encode_profile() → to_verbose() 往返后画像内容不变（不计列表顺序），覆盖词表外的自由文本标签、
+#       LEVELS 之外的技能等级、migrated_locations 的先后顺序与各个 remote_adaptability 取值；
+#       以及标签图词表变化后解码旧画像时报错
+# 用法：python -m pytest -q applications/taggings/test/test_compact_profile.py
+
+import json
+import os
+import sys
+
+import pytest
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.insert(0, root_dir)
+
+from applications.taggings.compact_profile import LAYERS, encode_profile
+from applications.taggings.tag_graph import TAG_GRAPH_PATH, TagGraph, compile_tag_graph, load_tag_graph
+from utilities.snapshot.snapshot import Snapshot, SnapshotWriter
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return load_tag_graph()
+
+
+def labels(graph, layer, count):
+    return list(dict.fromkeys(graph.labels[tag] for tag in range(len(graph)) if graph.layer(tag) == layer))[:count]
+
+
+def canonical(profile):
+    """不计列表顺序的比较形式（migrated_locations 保留顺序，单独比较）"""
+    return {layer: {field: sorted(json.dumps(value, sort_keys=True) for value in values)
+                    if isinstance(values, list) else values for field, values in fields.items()}
+            for layer, fields in profile.items()}
+
+
+def make_profile(graph, remote):
+    skills = labels(graph, "layer_2_skills", 3)
+    # 按标签 ID 降序排列的两个城市，编码后若被排序就会颠倒原居住地 → 现居住地的顺序
+    cities = sorted((tag for tag in range(len(graph)) if graph.city_rank(tag) is not None), reverse=True)[:3]
+    place = {tag: {"city": graph.labels[tag], "rank": graph.city_rank(tag)} for tag in cities}
+    return {
+        "layer_0_background": {"observed_tags": labels(graph, "layer_0_background", 2),
+                               "inferred_tags": ["Customer-Oriented Culture"],
+                               "extended_context_tags": ["Customer-Oriented Culture", "Remote Work Adaptation"]},
+        "layer_1_adaptable_positions": {"observed_positions": labels(graph, "layer_1_adaptable_positions", 2),
+                                        "extended_positions": [], "upward_challenge_roles": [],
+                                        "downward_compatible_roles": ["Night Shift Floor Lead"]},
+        "layer_2_skills": {"basic_skills": [{"skill": skills[0], "level": "Intermediate"}],
+                           "technical_skills": [{"skill": skills[1], "level": "Conversational"},
+                                                {"skill": skills[2], "level": None}],
+                           "soft_skills": [{"skill": skills[0], "level": "Intermediate"}],
+                           "tool_specific_skills": [{"skill": "Zendesk", "level": "Self-taught"}],
+                           "latent_skills": [{"skill": "Structure-Feedback Type", "level": "Conversational"}]},
+        "layer_3_geography": {"core_locations": [place[cities[2]]],
+                              "migrated_locations": [place[cities[0]], place[cities[1]]],
+                              "remote_adaptability": remote},
+        "layer_4_positive_attributes": {"trait_tags": labels(graph, "layer_4_positive_attributes", 2) + ["MBTI-INTJ"],
+                                        "inferred_drive_patterns": ["Trial-and-Error Expander"],
+                                        "growth_dynamics": []},
+        "layer_5_negative_attributes": {"explicit_weaknesses": ["Weak Empathy"], "behavioral_limits": [],
+                                        "contextual_fail_patterns": ["Frequent career path hopping"]},
+        "layer_6_potential_risks": {"trajectory_risks": [], "structural_risks": ["High internal friction"],
+                                    "psychological_risks": ["Perfectionism tendency"]},
+    }
+
+
+@pytest.mark.parametrize("remote", ["yes", "no", "mixed", None])
+def test_round_trip(graph, remote):
+    profile = make_profile(graph, remote)
+    compact = encode_profile(profile, "user", graph)
+    decoded = compact.to_verbose(graph)
+
+    assert set(decoded) == set(LAYERS)
+    assert canonical(decoded) == canonical(profile)
+    geography = decoded["layer_3_geography"]
+    assert geography["migrated_locations"] == profile["layer_3_geography"]["migrated_locations"]
+    assert geography["remote_adaptability"] == remote
+    assert compact.entity == "user"
+    # 编码是确定性的：解码结果再次编码得到相同的 bytes
+    assert encode_profile(decoded, "user", graph) == compact
+
+
+def test_vocabulary_change_is_rejected(graph, tmp_path):
+    with open(TAG_GRAPH_PATH, "r", encoding="utf-8") as f:
+        nodes = json.load(f)
+    nodes["tag-zz_added_after_encoding"] = {"label_text": "Added After Encoding", "layer": "layer_0_background",
+                                            "applicable_entities": ["user"], "relations": []}
+    path = tmp_path / "tag_graph_nodes.json"
+    path.write_text(json.dumps(nodes), encoding="utf-8")
+    writer = SnapshotWriter()
+    compile_tag_graph(writer, str(path))
+    changed = TagGraph(Snapshot(writer.to_bytes()))
+
+    compact = encode_profile(make_profile(graph, "yes"), "user", graph)
+    with pytest.raises(ValueError, match="different tag graph vocabulary"):
+        compact.to_verbose(changed)
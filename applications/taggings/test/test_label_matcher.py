@@ -0,0 +1,87 @@
+# test_label_matcher.py - 标签文本多模式匹配的行为测试
+# 职责：用临时的小型标签图构建 Aho–Corasick 自动机，核对被更长命中完整包含的命中被丢弃
+#       （"Quezon City" 中不再计入 "Quezon"，技能标签及其去掉 skills 的变体只计一次），
+#       部分重叠的命中都保留，overlapping=True 时返回全部命中，以及整词匹配、规范化和停用词变体
+# 用法：python -m pytest -q applications/taggings/test/test_label_matcher.py
+
+import json
+import os
+import sys
+
+import pytest
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.insert(0, root_dir)
+
+from applications.taggings.label_matcher import LabelMatcher, compile_label_matcher
+from utilities.snapshot.snapshot import Snapshot, SnapshotWriter
+
+LABELS = {
+    "tag-quezon": ("Quezon", "layer_3_geography"),
+    "tag-quezon_city": ("Quezon City", "layer_3_geography"),
+    "tag-city_hall": ("City Hall", "layer_1_adaptable_positions"),
+    "tag-customer_service": ("Customer Service Skills", "layer_2_skills"),
+    "tag-service": ("Service", "layer_2_skills"),
+    "tag-cpa": ("Certified Public Accountant (CPA)", "layer_1_adaptable_positions"),
+    "tag-bay": ("Bay", "layer_3_geography"),
+    "tag-paranaque": ("Parañaque", "layer_3_geography"),
+    "tag-the_team": ("The Team", "layer_4_positive_attributes"),
+}
+# 标签 ID 按排序后的节点键编号
+TAG = {label_id: tag for tag, label_id in enumerate(sorted(LABELS))}
+
+
+@pytest.fixture(scope="module")
+def matcher(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("label_matcher")
+    graph_path, config_path, snapshot_path = (str(directory / name) for name in
+                                              ("nodes.json", "config.json", "matcher.snap"))
+    with open(graph_path, "w", encoding="utf-8") as f:
+        json.dump({label_id: {"label_id": label_id, "label_text": text, "layer": layer}
+                   for label_id, (text, layer) in LABELS.items()}, f)
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump({"processing_config": {"keyword_extraction": {"stop_words": ["the", "team"]}}}, f)
+    writer = SnapshotWriter()
+    compile_label_matcher(writer, graph_path, config_path)
+    writer.write(snapshot_path)
+    # match() 不使用标签图，graph 只有 observed_tags() 需要；
+    # 匹配器持有快照中的数组视图，映射随匹配器一起回收，不显式关闭
+    return LabelMatcher(Snapshot.open(snapshot_path), graph=None)
+
+
+def matched(matcher, text, overlapping=False):
+    names = {tag: label_id for label_id, tag in TAG.items()}
+    return {names[tag]: entry["count"] for tag, entry in matcher.match(text, overlapping).items()}
+
+
+def test_contained_hits_are_dropped(matcher):
+    assert matched(matcher, "Lives in Quezon City.") == {"tag-quezon_city": 1}
+    assert matched(matcher, "Lives in Quezon City.", overlapping=True) == {"tag-quezon_city": 1, "tag-quezon": 1}
+    # 同起点的较短变体 "customer service" 与内部的 "service" 都被完整包含
+    assert matched(matcher, "strong customer service skills") == {"tag-customer_service": 1}
+    assert matched(matcher, "strong customer service skills", overlapping=True) == \
+        {"tag-customer_service": 2, "tag-service": 1}
+
+
+def test_partial_overlaps_are_kept(matcher):
+    assert matched(matcher, "Quezon City Hall") == {"tag-quezon_city": 1, "tag-city_hall": 1}
+
+
+def test_separate_mentions_are_counted(matcher):
+    text = "Quezon, then Quezon City; customer service and service desk"
+    assert matched(matcher, text) == {"tag-quezon": 1, "tag-quezon_city": 1, "tag-customer_service": 1,
+                                      "tag-service": 1}
+    first = matcher.match(text)[TAG["tag-quezon_city"]]
+    assert first["first_position"] == len(" quezon then ") - 1
+    assert first["variants"] == ["quezon city"]
+
+
+def test_variants_and_normalization(matcher):
+    assert matched(matcher, "Certified Public Accountant (CPA), licensed CPA") == {"tag-cpa": 2}
+    assert matched(matcher, "PARANAQUE / Parañaque") == {"tag-paranaque": 2}
+    # 整词匹配："bay" 不命中 "ebay"
+    assert matched(matcher, "ebay seller near the bay") == {"tag-bay": 1}
+    # 只由停用词组成的变体被丢弃
+    assert matched(matcher, "the team") == {}
@@ -0,0 +1,52 @@
+# test_pretagger.py - 确定性预打标的地理层测试
+# 职责：以标签图数据核对 layer_3 的迁移判定：正文中迁移线索之后的城市作为原居住地、不再计入 core_locations，
+#       地点字段给出现居住地时由正文线索补出原居住地，以及只有原居住地、没有其他地点时不判定迁移
+# 用法：python -m pytest -q applications/taggings/test/test_pretagger.py
+
+import os
+import sys
+
+import pytest
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.insert(0, root_dir)
+
+from applications.taggings.pretagger import GEOGRAPHY_LAYER, PreTagger
+
+
+@pytest.fixture(scope="module")
+def pretagger():
+    return PreTagger()
+
+
+def geography(pretagger, text, fields=None):
+    layer = pretagger.pretag(text, fields=fields)["resolved_layers"][GEOGRAPHY_LAYER]
+    return ([place["city"] for place in layer["core_locations"]],
+            [place["city"] for place in layer["migrated_locations"]])
+
+
+@pytest.mark.parametrize("text, current, origin", [
+    ("I live in Makati. Originally from Cebu City.", "Makati", "Cebu City"),
+    ("Originally from Davao City. Now based in Taguig.", "Taguig", "Davao City"),
+    ("Born in Iloilo City, currently working in Makati as a team lead.", "Makati", "Iloilo City"),
+])
+def test_free_text_migration(pretagger, text, current, origin):
+    assert geography(pretagger, text) == ([current], [origin, current])
+
+
+def test_field_location_with_origin_in_text(pretagger):
+    assert geography(pretagger, "Originally from Cebu City.", {"location": "Makati"}) == (["Makati"], ["Cebu City", "Makati"])
+
+
+def test_origin_matching_field_location_is_not_migration(pretagger):
+    assert geography(pretagger, "Originally from Makati.", {"location": "Makati"}) == (["Makati"], [])
+
+
+def test_origin_alone_stays_core(pretagger):
+    assert geography(pretagger, "Originally from Cebu City.") == (["Cebu City"], [])
+
+
+def test_no_cue_keeps_all_mentions(pretagger):
+    assert geography(pretagger, "Worked in Makati and Taguig.") == (["Makati", "Taguig"], [])
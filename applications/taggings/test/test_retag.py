@@ -0,0 +1,105 @@
+# test_retag.py - 批量重打标任务的检查点恢复测试
+# 职责：以小批 JSONL 画像模拟任务中途中断，核对从检查点恢复后每个画像都被写出、已完成的任务不再重复执行、
+#       任务不修改父进程的 CAREERBOT_SNAPSHOT 环境变量；以及 MongoProfileStore 的游标在整数 / 字符串 / ObjectId
+#       类型的 _id 上恢复后继续读取剩余文档（需要 bson）
+# 用法：python -m pytest -q applications/taggings/test/test_retag.py
+
+import json
+import os
+import sys
+
+import pytest
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.insert(0, root_dir)
+
+from applications.taggings.retag import JsonlProfileStore, MongoProfileStore, retag
+from utilities.snapshot.snapshot import SNAPSHOT_PATH_ENV
+
+PROFILE_COUNT = 60
+CHUNK_SIZE = 10
+
+
+class InterruptedStore(JsonlProfileStore):
+    """读取 fail_after 块后抛出异常，模拟任务被中断"""
+
+    def __init__(self, input_path, output_path, fail_after):
+        super().__init__(input_path, output_path)
+        self.fail_after = fail_after
+
+    def chunks(self, cursor, size):
+        for number, chunk in enumerate(super().chunks(cursor, size)):
+            if number == self.fail_after:
+                raise KeyboardInterrupt("simulated interruption")
+            yield chunk
+
+
+def test_resume_from_checkpoint(tmp_path):
+    input_path, output_path, checkpoint_path, snapshot_path = (
+        str(tmp_path / name) for name in ("profiles.jsonl", "retagged.jsonl", "retag.checkpoint", "careerbot.snap"))
+    with open(input_path, "w", encoding="utf-8") as f:
+        for number in range(PROFILE_COUNT):
+            f.write(json.dumps({"id": f"p{number:03d}", "text": f"Customer service in Makati, profile {number}.",
+                                "tags": ["tag-retired_label"]}) + "\n")
+    environment = os.environ.get(SNAPSHOT_PATH_ENV)
+
+    with pytest.raises(KeyboardInterrupt):
+        retag(InterruptedStore(input_path, output_path, fail_after=3), 1, CHUNK_SIZE, checkpoint_path,
+              snapshot_path=snapshot_path)
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        interrupted = json.load(f)
+    assert not interrupted["completed"] and 0 < interrupted["processed"] <= 3 * CHUNK_SIZE
+
+    stats = retag(JsonlProfileStore(input_path, output_path), 1, CHUNK_SIZE, checkpoint_path,
+                  snapshot_path=snapshot_path)
+    assert stats["resumed_from"] == interrupted["processed"]
+    assert stats["resumed_from"] + stats["processed"] == PROFILE_COUNT
+    with open(output_path, "r", encoding="utf-8") as f:
+        results = [json.loads(line) for line in f]
+    assert {result["id"] for result in results} == {f"p{number:03d}" for number in range(PROFILE_COUNT)}
+    assert all(result["dropped_tags"] == ["tag-retired_label"] for result in results)
+
+    # 已完成的任务再次执行时直接返回
+    assert retag(JsonlProfileStore(input_path, output_path), 1, CHUNK_SIZE, checkpoint_path,
+                 snapshot_path=snapshot_path)["processed"] == 0
+    assert os.environ.get(SNAPSHOT_PATH_ENV) == environment
+
+
+class FakeCursor:
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self.documents, key=lambda document: document[key], reverse=direction < 0))
+
+    def batch_size(self, size):
+        return iter(self.documents)
+
+
+class FakeCollection:
+    """按 {"_id": {"$gt": 值}} 过滤的最小集合替身；与 MongoDB 一样，类型不同的 _id 不参与比较"""
+
+    def __init__(self, ids):
+        self.ids = ids
+
+    def find(self, query):
+        documents = [{"_id": _id} for _id in self.ids]
+        if query:
+            bound = query["_id"]["$gt"]
+            documents = [document for document in documents
+                         if type(document["_id"]) is type(bound) and document["_id"] > bound]
+        return FakeCursor(documents)
+
+
+@pytest.mark.parametrize("kind", ["int", "str", "objectid"])
+def test_mongo_cursor_keeps_id_type(kind):
+    bson = pytest.importorskip("bson")
+    ids = {"int": list(range(1, 8)), "str": [f"p{number}" for number in range(7)],
+           "objectid": [bson.ObjectId() for _ in range(7)]}[kind]
+    store = MongoProfileStore(FakeCollection(ids))
+    cursor, first = next(store.chunks(None, 3))
+    resumed = [document["id"] for _, chunk in store.chunks(cursor, 3) for document in chunk]
+    assert [document["id"] for document in first] + resumed == sorted(ids)
@@ -0,0 +1,103 @@
+# test_tagging_cache.py - 打标结果内容哈希缓存的行为测试
+# 职责：核对只改排版的重复上传命中整篇缓存，全新文档即使提供了段落级打标函数也只整篇打标一次，
+#       有段落命中段落缓存时只为未命中的段落打标并合并，整篇打标结果经 split 写入段落缓存后
+#       重传只改动一个段落的版本只为该段落打标，以及 DiskTier 在 LRU 清空后回填
+# 用法：python -m pytest -q applications/taggings/test/test_tagging_cache.py
+
+import asyncio
+import os
+import sys
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.insert(0, root_dir)
+
+from applications.taggings.tagging_cache import DiskTier, TaggingCache
+
+DOCUMENT = "Managed CRM accounts.\n\nHandled Excel reports.\n\nWorked night shifts in Manila."
+
+
+class Pipeline:
+    """记录整篇与段落打标调用的替身流程"""
+
+    def __init__(self):
+        self.documents = []
+        self.paragraphs = []
+
+    async def tag_document(self, text):
+        self.documents.append(text)
+        return {"tags": sorted(text.split("\n\n"))}
+
+    async def tag_paragraph(self, paragraph):
+        self.paragraphs.append(paragraph)
+        return {"tags": [paragraph]}
+
+
+def merge(partials):
+    return {"tags": sorted(tag for partial in partials for tag in partial["tags"])}
+
+
+def split(result, paragraphs):
+    return [{"tags": [tag for tag in result["tags"] if tag == paragraph]} for paragraph in paragraphs]
+
+
+def run(cache, pipeline, text, **kwargs):
+    return asyncio.run(cache.run(text, "user", pipeline.tag_document, pipeline.tag_paragraph, merge, **kwargs))
+
+
+def test_new_document_is_tagged_whole():
+    cache, pipeline = TaggingCache(version="test"), Pipeline()
+    result = run(cache, pipeline, DOCUMENT)
+    assert pipeline.documents == [DOCUMENT] and pipeline.paragraphs == []
+    assert cache.stats["misses"] == 1 and cache.stats["paragraph_misses"] == 0
+    # 只改排版的重传命中整篇缓存
+    reformatted = "  " + DOCUMENT.replace("\n\n", "\r\n \r\n").replace(" ", "  ") + "\n"
+    assert run(cache, pipeline, reformatted) == result
+    assert len(pipeline.documents) == 1 and cache.stats["hits"] == 1
+
+
+def test_cached_paragraphs_are_reused():
+    cache, pipeline = TaggingCache(version="test"), Pipeline()
+    cache.put_paragraph("Managed  CRM accounts.", "user", {"tags": ["Managed CRM accounts."]})
+    result = run(cache, pipeline, DOCUMENT)
+    assert pipeline.documents == []
+    assert pipeline.paragraphs == ["Handled Excel reports.", "Worked night shifts in Manila."]
+    assert result == {"tags": sorted(DOCUMENT.split("\n\n"))}
+    assert cache.stats["paragraph_hits"] == 1 and cache.stats["paragraph_misses"] == 2
+    # 之后只改动一个段落的版本只为改动的段落打标
+    edited = DOCUMENT.replace("Handled Excel reports.", "Handled payroll.")
+    run(cache, pipeline, edited)
+    assert pipeline.paragraphs[2:] == ["Handled payroll."] and pipeline.documents == []
+    # 段落缓存按实体区分
+    run(cache, pipeline, "Managed CRM accounts.")
+    assert cache.stats["hits"] == 0
+    asyncio.run(cache.run("Managed CRM accounts.", "job", pipeline.tag_document, pipeline.tag_paragraph, merge))
+    assert pipeline.documents == ["Managed CRM accounts."]
+
+
+def test_whole_document_result_seeds_paragraphs():
+    cache, pipeline = TaggingCache(version="test"), Pipeline()
+    run(cache, pipeline, DOCUMENT, split=split)
+    assert pipeline.documents == [DOCUMENT] and pipeline.paragraphs == []
+    edited = DOCUMENT.replace("Handled Excel reports.", "Handled payroll.")
+    result = run(cache, pipeline, edited, split=split)
+    assert len(pipeline.documents) == 1 and pipeline.paragraphs == ["Handled payroll."]
+    assert result == {"tags": sorted(edited.split("\n\n"))}
+    assert cache.stats["paragraph_hits"] == 2 and cache.stats["paragraph_misses"] == 1
+    # 没有 split 时整篇打标不写段落缓存
+    cache, pipeline = TaggingCache(version="test"), Pipeline()
+    run(cache, pipeline, DOCUMENT)
+    run(cache, pipeline, edited)
+    assert len(pipeline.documents) == 2 and pipeline.paragraphs == []
+
+
+def test_disk_tier_backfills_new_worker(tmp_path):
+    pipeline = Pipeline()
+    result = run(TaggingCache(DiskTier(str(tmp_path)), version="test"), pipeline, DOCUMENT)
+    cold = TaggingCache(DiskTier(str(tmp_path)), version="test")
+    assert run(cold, pipeline, DOCUMENT) == result
+    assert len(pipeline.documents) == 1 and cold.stats["tier_hits"] == 1
+    # 版本不同的缓存互不命中
+    run(TaggingCache(DiskTier(str(tmp_path)), version="other"), pipeline, DOCUMENT)
+    assert len(pipeline.documents) == 2
@@ -0,0 +1,59 @@
+# build_snapshot.py - 共享只读快照构建器
+"""
+部署前（或数据文件更新后）执行一次，把各模块的只读数据编译结构写入同一个版本化二进制快照：
+    python boot/build_snapshot.py [--output PATH]
+
+各模块在 SNAPSHOT_BUILDERS 中登记 "模块路径:函数名" 形式的构建钩子，钩子接收 SnapshotWriter、写入本模块的分区，
+并返回所依赖的数据源文件。快照以临时文件 + 原子重命名写出，运行中的 worker 不会映射到写了一半的文件；
+已映射旧快照的 worker 保持使用旧文件，重启后映射新快照。默认输出路径可由环境变量 CAREERBOT_SNAPSHOT 覆盖，
+worker 读取同一环境变量。
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Optional
+
+# 作为脚本直接执行时将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boot.startup_graph import load_hook
+from utilities.snapshot.snapshot import DEFAULT_SNAPSHOT_PATH, SNAPSHOT_PATH_ENV, SnapshotWriter
+
+# SNAPSHOT_BUILDERS 为各模块的快照构建钩子
+SNAPSHOT_BUILDERS = (
+    "applications.taggings.tag_graph:compile_snapshot",
+    "applications.taggings.label_matcher:compile_snapshot",
+    "applications.mbti.content_snapshot:compile_snapshot",
+)
+
+
+def build_snapshot(path: Optional[str] = None, builders: Iterable[str] = SNAPSHOT_BUILDERS) -> Dict[str, Any]:
+    """
+    执行所有构建钩子并写出快照，返回 {"path", "bytes", "sections", "sources", "duration_ms"}
+    """
+    path = path or os.environ.get(SNAPSHOT_PATH_ENV) or DEFAULT_SNAPSHOT_PATH
+    started = time.perf_counter()
+    writer = SnapshotWriter()
+    sources = []
+    for builder in builders:
+        sources.extend(load_hook(builder)(writer))
+    size = writer.write(path)
+    return {"path": path, "bytes": size, "sections": len(writer.sections), "sources": sources,
+            "duration_ms": (time.perf_counter() - started) * 1e3}
+
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description="Build the shared read-only data snapshot")
+    parser.add_argument("--output", help=f"snapshot path (default: ${SNAPSHOT_PATH_ENV} or {DEFAULT_SNAPSHOT_PATH})")
+    args = parser.parse_args()
+    result = build_snapshot(args.output)
+    print(f"wrote {result['path']}: {result['bytes']} bytes, {result['sections']} sections "
+          f"from {len(result['sources'])} sources in {result['duration_ms']:.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
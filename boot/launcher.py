@@ -0,0 +1,122 @@
+# launcher.py - boot 启动装配器
+"""
+Launcher 负责模块装配与启动编排，不包含业务逻辑：
+1. 从 ModuleRegistry 读取各模块清单（MODULE_INFO 的 name、dependencies、lifecycle）
+2. 交给 StartupGraph 按依赖 DAG 并发执行 initialize_module，同层无依赖的模块同时初始化
+3. 输出启动瀑布图与关键路径，记录 boot_* 指标，并据结果给出 C-2 返回码
+4. 预热阶段回放合成请求、预构建产物，完成后才翻转就绪信号（boot.warmup.readiness）
+
+返回码：0 全部模块就绪；1 必需模块初始化失败；2 仅可选模块（清单 optional=True）失败，可降级运行
+"""
+
+import asyncio
+import inspect
+import sys
+from typing import Any, Dict, Optional
+
+from boot.startup_graph import STATUS_OK, StartupGraph, load_hook, render_waterfall
+from boot.warmup import DEFAULT_BUDGET_SECONDS, readiness, warm_up
+from orchestrate.module_registry import ModuleRegistry, module_registry
+from utilities.logger.logger import get_logger
+from utilities.monitor.monitor import registry
+
+logger = get_logger("boot.launcher")
+
+# 模块初始化耗时与启动总耗时，按 E-3.3 的 boot_startup_duration 指标暴露
+module_init_histogram = registry.histogram(
+    "boot_module_init_duration_seconds", "initialize_module duration per module at startup", ("module",))
+startup_histogram = registry.histogram(
+    "boot_startup_duration_seconds", "Wall time of the module assembly stage at startup")
+
+
+class Launcher:
+    """
+    Launcher 为单一装配器类，对外提供 env_check / start / health / shutdown 契约方法
+    """
+
+    def __init__(self, modules: Optional[ModuleRegistry] = None, max_workers: Optional[int] = None):
+        # modules 为模块清单注册表，默认使用编排层共享的 module_registry 单例
+        self.modules = modules or module_registry
+        self.max_workers = max_workers
+        # report 为最近一次启动报告，health() 和运维接口据此判断模块状态
+        self.report: Optional[Dict[str, Any]] = None
+        self.warmup_report: Optional[Dict[str, Any]] = None
+        self.graph: Optional[StartupGraph] = None
+
+    def env_check(self) -> int:
+        """环境检查：Python 版本需满足 H-1.1.1 的 3.8+，返回 0|1"""
+        if sys.version_info < (3, 8):
+            logger.error("boot_env_check_failed", python=sys.version.split()[0])
+            return 1
+        return 0
+
+    async def assemble_modules(self, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        按依赖 DAG 并发初始化所有已注册模块，返回启动报告
+        注册表为空时先扫描 applications/ 下的模块清单
+        """
+        if not self.modules.manifests():
+            self.modules.discover()
+        self.graph = StartupGraph(self.modules.manifests(), max_workers=self.max_workers)
+        report = await self.graph.run(config)
+        for name, entry in report["modules"].items():
+            if entry["status"] == STATUS_OK:
+                module_init_histogram.labels(name).record(int(entry["duration_ms"] * 1e6))
+            else:
+                logger.warning("boot_module_init_failed", module_name=name, status=entry["status"], error=entry["error"])
+        startup_histogram.labels().record(int(report["total_ms"] * 1e6))
+        logger.info("boot_modules_initialized", duration_ms=round(report["total_ms"], 2),
+                    serial_ms=round(report["serial_ms"], 2), critical_path=report["critical_path"],
+                    critical_path_ms=round(report["critical_path_ms"], 2))
+        logger.info("boot_startup_waterfall", waterfall=render_waterfall(report))
+        self.report = report
+        return report
+
+    async def warm_up(self, budget_seconds: float = DEFAULT_BUDGET_SECONDS) -> Dict[str, Any]:
+        """
+        预热已注册模块：合成请求经 ModuleRegistry.dispatch 回放，预热结束后翻转就绪信号
+        """
+        self.warmup_report = await warm_up(self.modules.manifests(), self.modules.dispatch, budget_seconds)
+        return self.warmup_report
+
+    def start(self, production: bool = False, env_file: Optional[str] = None) -> int:
+        """同步启动入口：环境检查后装配模块并预热，返回 0|1|2"""
+        if self.env_check() != 0:
+            return 1
+
+        async def boot():
+            await self.assemble_modules()
+            await self.warm_up()
+
+        asyncio.run(boot())
+        return self.health()
+
+    def health(self) -> int:
+        """根据最近一次启动报告和就绪信号返回 0|1|2；尚未启动或尚未就绪时返回 1"""
+        if self.report is None or not readiness.is_ready():
+            return 1
+        failed = [name for name, entry in self.report["modules"].items() if entry["status"] != STATUS_OK]
+        if not failed:
+            return 0
+        manifests = {manifest["name"]: manifest for manifest in self.modules.manifests()}
+        return 2 if all(manifests.get(name, {}).get("optional") for name in failed) else 1
+
+    async def shutdown_modules(self) -> None:
+        """按拓扑序的逆序调用各模块 cleanup 钩子，被依赖的模块最后关闭"""
+        if self.graph is None:
+            return
+        manifests = {manifest["name"]: manifest for manifest in self.modules.manifests()}
+        for name in reversed(self.graph.order):
+            try:
+                hook = load_hook(manifests[name].get("lifecycle", {}).get("cleanup"))
+                if hook is not None:
+                    result = hook()
+                    if inspect.isawaitable(result):
+                        await result
+            except Exception as error:
+                logger.warning("boot_module_cleanup_failed", module_name=name, error=str(error))
+
+    def shutdown(self) -> int:
+        """同步优雅关闭入口，返回 0"""
+        asyncio.run(self.shutdown_modules())
+        return 0
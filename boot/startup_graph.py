@@ -0,0 +1,213 @@
+# startup_graph.py - 启动依赖图与模块并发初始化
+"""
+StartupGraph 根据各模块 MODULE_INFO（清单）中的 dependencies 构建依赖 DAG，
+每个模块在其全部依赖初始化完成后立即开始初始化，互不依赖的模块并发执行：
+- 协程形式的 initialize_module 直接在事件循环上 await（网络、数据库等 I/O 型初始化）
+- 普通函数形式的 initialize_module 放入线程池执行（JSON 读取、正则编译等加载型初始化）
+
+冷启动耗时因此由关键路径（最慢的一条依赖链）决定，而不是所有模块耗时之和。
+run() 返回启动报告：每个模块相对启动时刻的开始/结束时间、耗时、执行方式和状态，
+以及关键路径；render_waterfall() 将报告渲染为文本瀑布图。
+"""
+
+import asyncio
+import importlib
+import inspect
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# MODE_ASYNC / MODE_THREAD 为模块初始化的执行方式
+MODE_ASYNC = "async"
+MODE_THREAD = "thread"
+
+# STATUS_* 为模块初始化结果状态
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+
+class StartupGraphError(Exception):
+    """依赖图无效：依赖了未注册的模块，或存在循环依赖"""
+
+
+def load_hook(spec: Optional[str]) -> Optional[Callable]:
+    """
+    按 "模块路径:属性名" 导入生命周期钩子，spec 为空时返回 None
+    """
+    if not spec:
+        return None
+    module_path, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module_path), attribute)
+
+
+class StartupGraph:
+    """
+    StartupGraph 保存 模块名 -> 依赖列表 的 DAG，并按依赖关系并发执行各模块的初始化钩子
+    """
+
+    def __init__(self, module_infos: Iterable[Dict[str, Any]],
+                 hooks: Optional[Dict[str, Callable]] = None, max_workers: Optional[int] = None):
+        # _infos 存储模块名到 MODULE_INFO / 清单字典的映射
+        self._infos: Dict[str, Dict[str, Any]] = {info["name"]: info for info in module_infos}
+        # _hooks 为显式传入的初始化钩子，未传入的模块按清单 lifecycle.initialize 导入
+        self._hooks = dict(hooks or {})
+        self._max_workers = max_workers
+        # order 为拓扑序，构造时即完成校验，依赖图无效时立即抛出 StartupGraphError
+        self.order = self.topological_order()
+
+    def dependencies(self, name: str) -> List[str]:
+        """返回模块声明的依赖模块名列表"""
+        return list(self._infos[name].get("dependencies") or [])
+
+    def topological_order(self) -> List[str]:
+        """
+        Kahn 算法计算拓扑序；依赖未注册模块或存在循环依赖时抛出 StartupGraphError
+        """
+        remaining = {}
+        dependents: Dict[str, List[str]] = {name: [] for name in self._infos}
+        for name in self._infos:
+            deps = self.dependencies(name)
+            for dep in deps:
+                if dep not in self._infos:
+                    raise StartupGraphError(f"模块 {name} 依赖未注册的模块 {dep}")
+                dependents[dep].append(name)
+            remaining[name] = len(deps)
+        ready = deque(name for name, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for child in dependents[name]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self._infos):
+            cycle = sorted(name for name, count in remaining.items() if count > 0)
+            raise StartupGraphError(f"模块之间存在循环依赖: {', '.join(cycle)}")
+        return order
+
+    def _hook(self, name: str) -> Optional[Callable]:
+
+        if name in self._hooks:
+            return self._hooks[name]
+        return load_hook(self._infos[name].get("lifecycle", {}).get("initialize"))
+
+    async def run(self, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        并发初始化所有模块，每个模块在依赖全部成功后开始；依赖失败的模块标记为 skipped
+        config 为 模块名 -> 初始化配置 的字典，传给对应模块的 initialize_module(config)
+        返回启动报告字典
+        """
+        config = config or {}
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="boot-init")
+        started = time.perf_counter()
+        results: Dict[str, Dict[str, Any]] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def init_module(name: str) -> bool:
+            deps = self.dependencies(name)
+            deps_ok = all(await asyncio.gather(*(tasks[dep] for dep in deps)))
+            entry = results[name] = {"dependencies": deps, "mode": None, "status": STATUS_SKIPPED,
+                                     "start_ms": None, "end_ms": None, "duration_ms": 0.0, "error": None}
+            if not deps_ok:
+                entry["error"] = "依赖模块初始化失败"
+                return False
+            try:
+                hook = self._hook(name)
+            except Exception as import_error:
+                # 钩子导入失败同样记为该模块初始化失败
+                begin = end = time.perf_counter()
+                failure = import_error
+            else:
+                if hook is None or inspect.iscoroutinefunction(hook):
+                    entry["mode"] = MODE_ASYNC
+                    begin, end, failure = await _timed_await(hook, config.get(name))
+                else:
+                    entry["mode"] = MODE_THREAD
+                    begin, end, failure = await loop.run_in_executor(executor, _timed_call, hook, config.get(name))
+            if failure is None:
+                entry["status"] = STATUS_OK
+            else:
+                entry.update(status=STATUS_FAILED, error=f"{type(failure).__name__}: {failure}")
+            entry["start_ms"] = (begin - started) * 1e3
+            entry["end_ms"] = (end - started) * 1e3
+            entry["duration_ms"] = (end - begin) * 1e3
+            return entry["status"] == STATUS_OK
+
+        try:
+            # 按拓扑序创建任务，保证每个任务创建时其依赖任务已存在
+            for name in self.order:
+                tasks[name] = asyncio.ensure_future(init_module(name))
+            await asyncio.gather(*tasks.values())
+        finally:
+            executor.shutdown(wait=False)
+        total_ms = (time.perf_counter() - started) * 1e3
+        return self._report(results, total_ms)
+
+    def _report(self, results: Dict[str, Dict[str, Any]], total_ms: float) -> Dict[str, Any]:
+        """
+        汇总启动报告：关键路径从最晚结束的模块出发，每一步回溯到最晚结束的依赖（即真正卡住它开始的依赖）
+        """
+        finished = {name: entry for name, entry in results.items() if entry["end_ms"] is not None}
+        path = []
+        current = max(finished, key=lambda name: finished[name]["end_ms"]) if finished else None
+        while current is not None:
+            path.append(current)
+            gating = [dep for dep in results[current]["dependencies"] if dep in finished]
+            current = max(gating, key=lambda dep: finished[dep]["end_ms"]) if gating else None
+        path.reverse()
+        return {
+            "total_ms": total_ms,
+            "serial_ms": sum(entry["duration_ms"] for entry in results.values()),
+            "critical_path": path,
+            "critical_path_ms": sum(results[name]["duration_ms"] for name in path),
+            "modules": {name: results[name] for name in self.order},
+        }
+
+
+async def _timed_await(hook: Optional[Callable], config: Any):
+    """在事件循环上执行协程钩子，返回 (开始时刻, 结束时刻, 异常或 None)"""
+    begin = time.perf_counter()
+    try:
+        if hook is not None:
+            await hook(config)
+    except Exception as error:
+        return begin, time.perf_counter(), error
+    return begin, time.perf_counter(), None
+
+
+def _timed_call(hook: Callable, config: Any):
+    """在线程池中执行同步钩子，返回钩子在线程内实际运行的 (开始时刻, 结束时刻, 异常或 None)，不含排队等待"""
+    begin = time.perf_counter()
+    try:
+        hook(config)
+    except Exception as error:
+        return begin, time.perf_counter(), error
+    return begin, time.perf_counter(), None
+
+
+def render_waterfall(report: Dict[str, Any], width: int = 40) -> str:
+    """
+    将启动报告渲染为文本瀑布图：每个模块一行，时间条按启动总耗时缩放，关键路径上的模块以 * 标记
+    """
+    total = report["total_ms"] or 1.0
+    critical = set(report["critical_path"])
+    modules = report["modules"]
+    name_width = max([len(name) for name in modules] + [6])
+    lines = [f"{'module':<{name_width}}  mode    {'timeline':<{width}}  duration   status"]
+    for name, entry in sorted(modules.items(), key=lambda item: (item[1]["start_ms"] is None, item[1]["start_ms"] or 0)):
+        if entry["start_ms"] is None:
+            bar = " " * width
+        else:
+            begin = min(width - 1, int(entry["start_ms"] / total * width))
+            end = max(begin + 1, min(width, round(entry["end_ms"] / total * width)))
+            bar = " " * begin + "=" * (end - begin) + " " * (width - end)
+        marker = "*" if name in critical else " "
+        lines.append(f"{name:<{name_width}}  {entry['mode'] or '-':<6}  {bar}  {entry['duration_ms']:8.1f}ms  "
+                     f"{entry['status']}{marker}")
+    lines.append(f"total {report['total_ms']:.1f}ms  serial sum {report['serial_ms']:.1f}ms  "
+                 f"critical path ({' -> '.join(report['critical_path']) or '-'}) {report['critical_path_ms']:.1f}ms")
+    return "\n".join(lines)
@@ -0,0 +1,91 @@
+# benchmark_snapshot.py - 多 worker 共享只读快照效果验证脚本
+# 职责：分别以 1 个和 16 个 worker 子进程加载标签图、地理拓扑和 MBTI 模板表，对比
+#       json 模式（每个 worker 各自解析 JSON 并编译索引）与 snapshot 模式（各 worker 只读 mmap 同一份快照）
+#       的 worker 启动耗时、RSS 和 PSS（共享页按映射进程数均摊后的实际占用）
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到Python路径，以便导入boot、applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+WORKER_COUNTS = (1, 16)
+
+
+def memory_kb():
+    """读取 /proc/self/smaps_rollup 中的 Rss 与 Pss（kB）"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def worker(spawned_at):
+    """worker 子进程：加载并完整访问一遍只读数据，输出启动耗时和内存，然后等待父进程释放屏障"""
+    from applications.mbti.step2 import load_output_templates
+    from applications.taggings.tag_graph import load_tag_graph, load_topology
+
+    graph = load_tag_graph()
+    topology = load_topology()
+    templates = load_output_templates()
+    startup_ms = (time.time() - spawned_at) * 1e3
+    # 访问全部数据，使所有页都计入 RSS
+    touched = sum(len(graph.relations(tag)) for tag in range(len(graph)))
+    touched += sum(topology.hop_matrix) + sum(len(text) for text in templates.values())
+    print(json.dumps({"startup_ms": startup_ms, "touched": touched, **memory_kb()}), flush=True)
+    sys.stdin.read()
+
+
+def run_workers(count, snapshot_path):
+    """同时启动 count 个 worker，全部就绪后统计，再一起释放"""
+    env = dict(os.environ, CAREERBOT_SNAPSHOT=snapshot_path)
+    started = time.perf_counter()
+    processes = [subprocess.Popen([sys.executable, __file__, "worker", repr(time.time())], cwd=root_dir, env=env,
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                 for _ in range(count)]
+    results = [json.loads(process.stdout.readline()) for process in processes]
+    wall_ms = (time.perf_counter() - started) * 1e3
+    for process in processes:
+        process.stdin.close()
+        process.wait()
+    return {
+        "wall_ms": wall_ms,
+        "startup_ms": sum(result["startup_ms"] for result in results) / count,
+        "rss_kb": sum(result["Rss"] for result in results) / count,
+        "pss_kb": sum(result["Pss"] for result in results) / count,
+        "total_pss_kb": sum(result["Pss"] for result in results),
+    }
+
+
+def main():
+    from boot.build_snapshot import build_snapshot
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "careerbot.snap")
+        built = build_snapshot(snapshot_path)
+        print(f"snapshot: {built['bytes'] / 1024:.0f}KB, {built['sections']} sections, built in {built['duration_ms']:.0f}ms\n")
+        print(f"{'mode':<9} {'workers':>7} {'startup/worker':>15} {'all ready':>10} "
+              f"{'RSS/worker':>11} {'PSS/worker':>11} {'total PSS':>10}")
+        for count in WORKER_COUNTS:
+            # json 模式指向不存在的快照路径，worker 回退为各自解析 JSON 并在进程内编译
+            for mode, path in (("json", os.path.join(directory, "missing.snap")), ("snapshot", snapshot_path)):
+                result = run_workers(count, path)
+                print(f"{mode:<9} {count:>7} {result['startup_ms']:>13.1f}ms {result['wall_ms']:>8.0f}ms "
+                      f"{result['rss_kb'] / 1024:>9.1f}MB {result['pss_kb'] / 1024:>9.1f}MB "
+                      f"{result['total_pss_kb'] / 1024:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "worker":
+        worker(float(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,70 @@
+# benchmark_warmup.py - 启动预热效果验证脚本
+# 职责：分别在全新子进程中测量 不预热 / 预热后 两种情况下每个 MBTI intent 首个真实请求的耗时，
+#       确认预热消除了首批请求的冷启动尖刺；并验证超出预热预算时的就绪信号行为
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+# 将项目根目录添加到Python路径，以便导入boot、orchestrate、applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+
+async def first_requests(warm):
+    """在当前（全新）进程中装配模块，可选预热，然后按顺序发送每个 intent 的第一个请求并计时"""
+    from boot.launcher import Launcher
+    from applications.mbti.warmup import sample_requests
+
+    launcher = Launcher()
+    await launcher.assemble_modules()
+    if warm:
+        await launcher.warm_up()
+    timings = {}
+    for request in sample_requests():
+        request = dict(request, user_id="first_real_user")
+        started = time.perf_counter()
+        await launcher.modules.dispatch(request)
+        timings[request["intent"]] = (time.perf_counter() - started) * 1e3
+    return timings
+
+
+async def budget_demo():
+    """预热预算过小时：超时模块被取消，标记为 timeout，ready_on_timeout 决定是否仍然就绪"""
+    from boot.warmup import readiness, warm_up
+
+    async def slow_dispatch(request):
+        await asyncio.sleep(1.0)
+        return {"success": True}
+
+    manifests = [{"name": "slow", "lifecycle": {"warmup_requests": "applications.mbti.warmup:sample_requests"}}]
+    report = await warm_up(manifests, slow_dispatch, budget_seconds=0.2, ready_on_timeout=False)
+    print(f"budget 0.2s: within_budget={report['within_budget']} status={report['modules']['slow']['status']} "
+          f"ready={readiness.is_ready()} ({readiness.reason})")
+
+
+def run_child(mode):
+    result = subprocess.run([sys.executable, __file__, mode], cwd=root_dir, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    cold = run_child("cold")
+    warm = run_child("warm")
+    print(f"{'intent':<12} {'no warm-up':>12} {'after warm-up':>14}")
+    for intent in cold:
+        print(f"{intent:<12} {cold[intent]:>10.2f}ms {warm[intent]:>12.2f}ms")
+    print(f"{'total':<12} {sum(cold.values()):>10.2f}ms {sum(warm.values()):>12.2f}ms\n")
+    asyncio.run(budget_demo())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # 子进程模式：日志输出到 stderr，最后一行 stdout 为计时结果 JSON
+        print(json.dumps(asyncio.run(first_requests(sys.argv[1] == "warm"))))
+    else:
+        main()
@@ -0,0 +1,162 @@
+# warmup.py - 接收流量前的启动预热阶段
+"""
+WarmUp 在模块初始化完成之后、服务对外就绪之前执行，消除每次发布后首批请求的冷启动尖刺：
+1. prebuild：调用各模块清单 lifecycle.prebuild 钩子，预先构建可预计算的产物（内容文件解析、索引编译等）；
+   同步钩子放入线程池执行，不阻塞事件循环
+2. replay：调用 lifecycle.warmup_requests 钩子取得合成请求，经真实分派链路逐个回放，
+   触发延迟导入、缓存填充和首次调用开销；回放走完整处理链路，会持久化数据或链式调用其他步骤的模块不应注册此钩子
+
+各模块并发预热，整体受 budget_seconds 时间预算约束。预热期间产生的请求指标在结束后清零，
+不混入线上延迟分布。预热结束（或超出预算）后才翻转 readiness 就绪信号，并输出每个模块的预热耗时。
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from boot.startup_graph import load_hook
+from utilities.logger.logger import get_logger
+from utilities.monitor.monitor import MetricsRegistry, registry
+
+logger = get_logger("boot.warmup")
+
+# DEFAULT_BUDGET_SECONDS 为预热阶段的默认时间预算
+DEFAULT_BUDGET_SECONDS = 10.0
+
+
+class Readiness:
+    """
+    服务就绪信号：预热完成前为未就绪，供健康检查和负载均衡探针读取
+    """
+
+    def __init__(self):
+        self._ready = threading.Event()
+        # reason 记录最近一次状态变化的原因，如 warmup_complete、warmup_budget_exceeded
+        self.reason = "starting"
+
+    def mark_ready(self, reason: str) -> None:
+
+        self.reason = reason
+        self._ready.set()
+
+    def mark_not_ready(self, reason: str) -> None:
+
+        self.reason = reason
+        self._ready.clear()
+
+    def is_ready(self) -> bool:
+
+        return self._ready.is_set()
+
+
+# readiness 为进程级就绪信号单例
+readiness = Readiness()
+
+
+def _is_failure(response: Any) -> bool:
+
+    return not isinstance(response, dict) or response.get("success") is False or "error" in response
+
+
+class WarmUp:
+    """
+    WarmUp 按模块清单执行 prebuild 和合成请求回放，返回每个模块的预热报告
+    """
+
+    def __init__(self, manifests: Iterable[Dict[str, Any]],
+                 dispatch: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                 budget_seconds: float = DEFAULT_BUDGET_SECONDS,
+                 metrics_registry: Optional[MetricsRegistry] = None):
+        self.manifests = list(manifests)
+        # dispatch 为请求分派入口，回放的合成请求与真实请求走同一条链路
+        self.dispatch = dispatch
+        self.budget_seconds = budget_seconds
+        self.metrics_registry = metrics_registry or registry
+
+    async def _warm_module(self, manifest: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """预热单个模块：先 prebuild，再按顺序回放合成请求，逐步写入 entry"""
+        lifecycle = manifest.get("lifecycle", {})
+        began = time.perf_counter()
+        prebuild = load_hook(lifecycle.get("prebuild"))
+        if prebuild is not None:
+            if inspect.iscoroutinefunction(prebuild):
+                await prebuild(None)
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, prebuild, None)
+        entry["prebuild_ms"] = (time.perf_counter() - began) * 1e3
+        request_factory = load_hook(lifecycle.get("warmup_requests"))
+        for request in (request_factory() if request_factory is not None else []):
+            started = time.perf_counter()
+            response = await self.dispatch(request)
+            entry["intents"][request.get("intent")] = (time.perf_counter() - started) * 1e3
+            entry["requests"] += 1
+            if _is_failure(response):
+                entry["failed"].append(request.get("intent"))
+        entry["status"] = "ok" if not entry["failed"] else "failed"
+
+    async def _run_module(self, manifest: Dict[str, Any], entry: Dict[str, Any]) -> None:
+
+        began = time.perf_counter()
+        try:
+            await self._warm_module(manifest, entry)
+        except Exception as error:
+            entry.update(status="failed", error=f"{type(error).__name__}: {error}")
+        finally:
+            entry["duration_ms"] = (time.perf_counter() - began) * 1e3
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        并发预热所有模块，超出时间预算的模块被取消并标记为 timeout
+        返回 {"total_ms", "within_budget", "modules": {模块名: 预热报告}}
+        """
+        modules = {
+            manifest["name"]: {"status": "pending", "prebuild_ms": 0.0, "requests": 0, "failed": [],
+                               "intents": {}, "duration_ms": 0.0, "error": None}
+            for manifest in self.manifests
+        }
+        tasks = [asyncio.ensure_future(self._run_module(manifest, modules[manifest["name"]]))
+                 for manifest in self.manifests]
+        started = time.perf_counter()
+        within_budget = True
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=self.budget_seconds)
+            for task in pending:
+                task.cancel()
+            if pending:
+                within_budget = False
+                await asyncio.gather(*pending, return_exceptions=True)
+        for entry in modules.values():
+            if entry["status"] == "pending":
+                entry["status"] = "timeout"
+        # 回放的合成请求不计入线上请求指标
+        self.metrics_registry.reset_request_metrics()
+        return {"total_ms": (time.perf_counter() - started) * 1e3, "within_budget": within_budget,
+                "modules": modules}
+
+
+async def warm_up(manifests: Iterable[Dict[str, Any]],
+                  dispatch: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                  budget_seconds: float = DEFAULT_BUDGET_SECONDS, ready_on_timeout: bool = True) -> Dict[str, Any]:
+    """
+    执行预热并翻转就绪信号：预热在预算内完成后标记就绪；
+    超出预算时记录告警，ready_on_timeout 为 True 则仍然就绪（避免发布卡死），否则保持未就绪
+    """
+    readiness.mark_not_ready("warming_up")
+    report = await WarmUp(manifests, dispatch, budget_seconds).run()
+    for name, entry in report["modules"].items():
+        logger.info("warmup_module_finished", module_name=name, status=entry["status"],
+                    duration_ms=round(entry["duration_ms"], 2), prebuild_ms=round(entry["prebuild_ms"], 2),
+                    requests=entry["requests"], failed_intents=entry["failed"], error=entry["error"],
+                    intents_ms={intent: round(ms, 2) for intent, ms in entry["intents"].items()})
+    if report["within_budget"]:
+        readiness.mark_ready("warmup_complete")
+    else:
+        logger.warning("warmup_budget_exceeded", budget_seconds=budget_seconds,
+                       unfinished=[name for name, entry in report["modules"].items() if entry["status"] == "timeout"])
+        if ready_on_timeout:
+            readiness.mark_ready("warmup_budget_exceeded")
+    logger.info("warmup_finished", duration_ms=round(report["total_ms"], 2), within_budget=report["within_budget"],
+                ready=readiness.is_ready())
+    return report
@@ -3,3 +3,5 @@
 缓存管理模块的包初始化文件。
 导出ConfigCache类供entry主模块使用。
 """
+
+from entry.cache.config_cache import ConfigCache
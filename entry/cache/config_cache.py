@@ -22,3 +22,55 @@ ConfigCache负责entry的配置缓存管理，是连接orchestrate配置系统
 - 高效查找：使用合适数据结构保证验证性能
 - 热更新支持：预留配置变更时的缓存刷新机制
 """
+
+from typing import Dict, Iterable
+
+
+class ConfigCache:
+    """
+    entry配置缓存
+    启动时通过load()一次性写入配置，运行时验证器直接读取实例属性，不做任何拷贝
+    """
+
+    def __init__(self):
+        # intent_whitelist 使用 frozenset 存储，O(1) 成员检查且运行时不可被修改
+        self.intent_whitelist: frozenset = frozenset()
+        # validation_rules 存储字段验证规则配置
+        self.validation_rules: Dict[str, object] = {}
+        # module_mappings 缓存 intent 到模块名的映射关系
+        self.module_mappings: Dict[str, str] = {}
+
+    def load(self, config: Dict[str, object]) -> None:
+        """
+        一次性加载配置到内存
+        Args:
+            config: 包含 intent_whitelist、validation_rules、module_mappings 的配置字典
+        """
+        self.intent_whitelist = frozenset(config.get("intent_whitelist", ()))
+        self.validation_rules = dict(config.get("validation_rules", {}))
+        self.module_mappings = dict(config.get("module_mappings", {}))
+
+    def load_from_modules(self, module_infos: Iterable[Dict[str, object]]) -> None:
+        """
+        根据各模块 MODULE_INFO 的 orchestrate_info.supported_intents 构建 intent 白名单和模块映射
+        Args:
+            module_infos: 模块 MODULE_INFO 字典序列
+        """
+        module_mappings = {}
+        for module_info in module_infos:
+            intents = module_info.get("orchestrate_info", {}).get("supported_intents", [])
+            for intent in intents:
+                module_mappings[intent] = module_info.get("name")
+        self.load({
+            "intent_whitelist": module_mappings.keys(),
+            "validation_rules": self.validation_rules,
+            "module_mappings": module_mappings
+        })
+
+    def to_dict(self) -> Dict[str, object]:
+        """返回当前缓存配置的快照，供 get_cached_config 接口使用"""
+        return {
+            "intent_whitelist": sorted(self.intent_whitelist),
+            "validation_rules": dict(self.validation_rules),
+            "module_mappings": dict(self.module_mappings)
+        }
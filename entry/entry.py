@@ -19,7 +19,171 @@ entry作为Career Bot系统的轻量级入口验证器，负责接收前端所
 - 简单可靠：单一职责，专注验证逻辑，无复杂业务处理
 """
 
-import asynico
-from utilities import utilities # Goes with everything shared globally utility tools includes datatime.
+import json
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from entry.cache.config_cache import ConfigCache
+from entry.validators.data_validator import validate_request_data
+from entry.validators.intent_validator import IntentValidator
+from entry.validators.request_peek import PEEK_FIELDS, RequestPeekError, peek_fields
+from entry.validators.validation_result import ERROR_VALIDATION_FAILED, ValidationResult
+from utilities.time import Time
+
+
+# AGENT_NAME 作为响应中的 agent_name 字段值
+AGENT_NAME = "entry"
+
+# 小于该字节数的请求体直接完整解析：json.loads 的C实现比逐字段预读更快，且解析结果缓存复用
+PEEK_MIN_BYTES = 512
+
+# 转发函数类型：接收验证通过的请求字典，返回orchestrate的响应字典
+Forwarder = Callable[[Dict[str, object]], Awaitable[Dict[str, object]]]
+
+
+class PeekedRequest:
+    """
+    只预读了头部字段的请求
+    header 保存 intent、request_id、user_id；完整请求体在 body() 首次调用时解析一次并缓存
+    """
+
+    __slots__ = ("raw", "header", "_body")
+
+    def __init__(self, raw: Union[bytes, str], header: Dict[str, object], body: Optional[Dict[str, object]] = None):
+        self.raw = raw
+        self.header = header
+        self._body = body
+
+    def body(self) -> Dict[str, object]:
+        """解析并缓存完整请求体，保证每个请求只完整解析一次"""
+        if self._body is None:
+            self._body = json.loads(self.raw)
+        return self._body
+
+
+class Entry:
+    """
+    entry入口验证器
+    run_raw() 先预读头部字段完成intent白名单和request_id校验，通过后才完整解析请求体并转发orchestrate
+    """
+
+    def __init__(self, config_cache: Optional[ConfigCache] = None, forward: Optional[Forwarder] = None):
+        """
+        Args:
+            config_cache: 配置缓存，默认创建空缓存，需调用 initialize() 加载
+            forward: 验证通过后的转发函数，默认转发给 orchestrate_instance.handle_request
+        """
+        self.config_cache = config_cache or ConfigCache()
+        self.intent_validator = IntentValidator(self.config_cache)
+        self.forward = forward
+
+    async def initialize(self, config: Dict[str, object]) -> None:
+        """
+        启动时一次性加载配置到缓存
+        Args:
+            config: 包含 intent_whitelist、validation_rules、module_mappings 的配置字典
+        """
+        self.config_cache.load(config)
+
+    async def get_cached_config(self) -> Dict[str, object]:
+        """获取当前缓存配置"""
+        return self.config_cache.to_dict()
+
+    def gate(self, raw: Union[bytes, str]) -> Union[PeekedRequest, ValidationResult]:
+        """
+        入口快速校验，不完整解析请求体
+        Returns:
+            PeekedRequest: 校验通过的请求
+            ValidationResult: 校验失败的结果
+        """
+        body = None
+        try:
+            if len(raw) < PEEK_MIN_BYTES:
+                body = json.loads(raw)
+                if not isinstance(body, dict):
+                    raise RequestPeekError("Request body must be a JSON object")
+                header = {field: body[field] for field in PEEK_FIELDS if field in body}
+            else:
+                header = peek_fields(raw, PEEK_FIELDS)
+        except ValueError as e:
+            # RequestPeekError 与 json.JSONDecodeError 都是 ValueError 子类
+            return ValidationResult.from_errors([
+                {"field": "request", "error_code": ERROR_VALIDATION_FAILED, "message": str(e)}
+            ])
+        result = self.intent_validator.validate(header.get("intent"))
+        if not result.is_valid:
+            return result
+        result = validate_request_data(header)
+        if not result.is_valid:
+            return result
+        return PeekedRequest(raw, header, body)
+
+    def admit_raw(self, raw: Union[bytes, str]) -> Tuple[Optional[Dict[str, object]], Optional[Dict[str, object]]]:
+        """
+        校验原始JSON请求体并完整解析一次，不转发
+        供自行处理转发的入口使用（如 SSE 流式请求）
+        Returns:
+            (请求字典, None)：校验通过
+            (None, 错误响应)：校验失败
+        """
+        gated = self.gate(raw)
+        if isinstance(gated, ValidationResult):
+            return None, self._error_response(None, gated)
+        try:
+            body = gated.body()
+        except ValueError as e:
+            return None, self._error_response(gated.header.get("request_id"), ValidationResult.from_errors([
+                {"field": "request", "error_code": ERROR_VALIDATION_FAILED, "message": f"Malformed JSON request body: {e}"}
+            ]))
+        # 顶层重复键时 json.loads 以最后一次出现为准，需与预读值一致，防止绕过白名单
+        for field, value in gated.header.items():
+            if body.get(field) != value:
+                return None, self._error_response(gated.header.get("request_id"), ValidationResult.from_errors([
+                    {"field": field, "error_code": ERROR_VALIDATION_FAILED, "message": f"Duplicate {field} in request body"}
+                ]))
+        return body, None
+
+    async def run_raw(self, raw: Union[bytes, str]) -> Dict[str, object]:
+        """
+        处理原始JSON请求体
+        验证失败时直接返回错误响应；验证通过后完整解析一次并转发orchestrate
+        """
+        body, error = self.admit_raw(raw)
+        if error is not None:
+            return error
+        return await self._forward(body)
+
+    async def run(self, request: Dict[str, object]) -> Dict[str, object]:
+        """
+        处理已解析的请求字典
+        """
+        if not isinstance(request, dict):
+            return self._error_response(None, ValidationResult.from_errors([
+                {"field": "request", "error_code": ERROR_VALIDATION_FAILED, "message": "request must be a JSON object"}
+            ]))
+        result = self.intent_validator.validate(request.get("intent"))
+        if result.is_valid:
+            result = validate_request_data(request)
+        if not result.is_valid:
+            return self._error_response(request.get("request_id"), result)
+        return await self._forward(request)
+
+    async def _forward(self, request: Dict[str, object]) -> Dict[str, object]:
+        """转发验证通过的请求给orchestrate"""
+        if self.forward is None:
+            from orchestrate.orchestrate import orchestrate_instance
+            self.forward = orchestrate_instance.handle_request
+        return await self.forward(request)
+
+    def _error_response(self, request_id: Optional[str], result: ValidationResult) -> Dict[str, object]:
+        """根据验证结果构建标准错误响应（A-7.2 AgentResponse）"""
+        return {
+            "request_id": request_id,
+            "agent_name": AGENT_NAME,
+            "success": False,
+            "timestamp": Time.now().strftime(Time.TIMESTAMP_FORMAT),
+            "status": result.status,
+            "error_code": result.error_code,
+            "errors": result.errors
+        }
 
 
@@ -0,0 +1,148 @@
+# benchmark_data_validator.py - DataValidator 编译校验性能基准脚本
+# 职责：用真实形态的MBTI请求对比 编译后的分组校验函数、逐条解释规则字典的朴素校验器、pydantic 模型 三者的单次校验耗时
+
+import os
+import random
+import re
+import sys
+import timeit
+
+# 将项目根目录添加到Python路径，以便导入entry、applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from applications.mbti.schemas import schema_manager
+from entry.validators.data_validator import DEFAULT_REQUIRED_FIELDS, DataValidator
+from utilities.time import Time
+
+# 对照组使用的 timestamp_uuid 正则
+REQUEST_ID_PATTERN = re.compile(
+    r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\+\d{4}_[0-9a-f]{8}-[0-9a-f]{4}-[4][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$',
+    re.IGNORECASE
+)
+
+
+def build_payloads():
+    """构建step1、step2(96题答案)、step4、step5 四种典型请求"""
+    request_id = Time.timestamp()
+    return {
+        "step1": {"intent": "mbti_step1", "request_id": request_id, "user_id": "user_123", "test_user": True},
+        "step2": {
+            "intent": "mbti_step2",
+            "request_id": request_id,
+            "user_id": "user_123",
+            "responses": {i: random.randint(1, 5) for i in range(96)},
+        },
+        "step4": {
+            "intent": "mbti_step4",
+            "request_id": request_id,
+            "user_id": "user_123",
+            "mbti_type": "INTJ",
+            "responses": {f"question_{i}": random.choice("AB") for i in range(12)},
+        },
+        "step5": {
+            "intent": "mbti_step5",
+            "request_id": request_id,
+            "user_id": "user_123",
+            "mbti_type": "INTJ",
+            "reverse_dimensions": ["E", "S", "F", "P"],
+            "dimension_scores": {"E": 2, "S": 1, "F": 3, "P": 0},
+        },
+    }
+
+
+class NaiveValidator:
+    """每次请求遍历规则字典并按类型名分派检查函数的朴素解释器，作为对照组"""
+
+    CHECKS = {
+        "uuid": lambda v: isinstance(v, str) and REQUEST_ID_PATTERN.match(v) is not None,
+        "string": lambda v: isinstance(v, str),
+        "dict": lambda v: isinstance(v, dict),
+        "list": lambda v: isinstance(v, list),
+        "int": lambda v: isinstance(v, int) and not isinstance(v, bool),
+        "bool": lambda v: isinstance(v, bool),
+    }
+
+    def __init__(self, schema_provider):
+        field_types = schema_provider.get_field_types()
+        self.rules = {
+            group_name: [
+                {
+                    "field": field,
+                    "type": field_types.get(field),
+                    "required": field in DEFAULT_REQUIRED_FIELDS.get(group_name, ()),
+                }
+                for field in fields
+            ]
+            for group_name, fields in schema_provider.get_field_groups().items()
+        }
+
+    def validate(self, data, groups):
+        errors = []
+        for group_name in groups:
+            for rule in self.rules[group_name]:
+                value = data.get(rule["field"])
+                if value is None or value == "":
+                    if rule["required"]:
+                        errors.append({"field": rule["field"], "error": "missing"})
+                    continue
+                check = self.CHECKS.get(rule["type"])
+                if check is not None and not check(value):
+                    errors.append({"field": rule["field"], "error": "type"})
+        return errors
+
+
+def build_pydantic_model(schema_provider, groups):
+    """按字段分组动态构建 pydantic 模型；pydantic 未安装时返回 None"""
+    try:
+        from typing import Optional
+
+        from pydantic import StrictBool, StrictInt, StrictStr, constr, create_model
+    except ImportError:
+        return None
+    type_map = {
+        "uuid": constr(pattern=REQUEST_ID_PATTERN.pattern),
+        "string": StrictStr,
+        "dict": dict,
+        "list": list,
+        "int": StrictInt,
+        "bool": StrictBool,
+    }
+    field_types = schema_provider.get_field_types()
+    field_groups = schema_provider.get_field_groups()
+    fields = {}
+    for group_name in groups:
+        required = DEFAULT_REQUIRED_FIELDS.get(group_name, ())
+        for field in field_groups[group_name]:
+            annotation = type_map.get(field_types.get(field), object)
+            fields[field] = (annotation, ...) if field in required else (Optional[annotation], None)
+    return create_model("MbtiRequest", **fields)
+
+
+def bench(label, func, number=20000):
+    """执行 number 次 func 并打印单次耗时（微秒）"""
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"{label:<28} {seconds / number * 1e6:8.2f} us/op")
+
+
+def main():
+    groups = ("request_fields", "mbti_test_fields", "assessment_fields")
+    compiled = DataValidator(schema_manager)
+    naive = NaiveValidator(schema_manager)
+    model = build_pydantic_model(schema_manager, groups)
+
+    for name, payload in build_payloads().items():
+        print(f"\n=== {name} payload ===")
+        assert compiled.validate(payload, groups).is_valid, compiled.validate(payload, groups).to_dict()
+        assert not naive.validate(payload, groups)
+        bench("compiled DataValidator", lambda: compiled.validate(payload, groups))
+        bench("naive rule interpreter", lambda: naive.validate(payload, groups))
+        if model is not None:
+            bench("pydantic model_validate", lambda: model.model_validate(payload))
+        else:
+            print("pydantic model_validate      skipped (pydantic not installed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmark_request_peek.py - entry 预读扫描性能基准脚本
+# 职责：对比 "先预读头部字段再决定是否完整解析" 与 "先 json.loads 完整解析再校验" 两种入口方式
+# 在小请求、step2(96题)请求、简历上传请求上的 拒绝耗时 和 接收耗时
+
+import asyncio
+import json
+import os
+import random
+import sys
+import timeit
+
+# 将项目根目录添加到Python路径，以便导入entry和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from entry.entry import Entry
+from entry.validators.data_validator import validate_request_data
+from utilities.time import Time
+
+
+def build_payloads(intent):
+    """构建不同大小的原始请求体，intent 由调用方指定（白名单内或白名单外）"""
+    request_id = Time.timestamp()
+    resume_text = " ".join(random.choice(["Customer", "Service", "Manila", "CRM", "Skills", "Excel"]) for _ in range(40000))
+    return {
+        "small": json.dumps({"intent": intent, "request_id": request_id, "user_id": "user_123", "test_user": True}),
+        "step2_96_answers": json.dumps({
+            "intent": intent,
+            "request_id": request_id,
+            "user_id": "user_123",
+            "responses": {str(i): random.randint(1, 5) for i in range(96)},
+        }),
+        "resume_upload": json.dumps({
+            "intent": intent,
+            "request_id": request_id,
+            "user_id": "user_123",
+            "resume": {"file_name": "cv.pdf", "text": resume_text},
+        }),
+        # 头部字段排在大字段之后：预读需要跳过整个简历正文
+        "resume_upload_header_last": json.dumps({
+            "resume": {"file_name": "cv.pdf", "text": resume_text},
+            "intent": intent,
+            "request_id": request_id,
+            "user_id": "user_123",
+        }),
+    }
+
+
+def full_decode_gate(entry, raw):
+    """对照组：先完整解析请求体再做 intent 与字段校验"""
+    body = json.loads(raw)
+    result = entry.intent_validator.validate(body.get("intent"))
+    if result.is_valid:
+        result = validate_request_data(body)
+    return result
+
+
+def bench(label, func, number):
+    """执行 number 次 func 并打印单次耗时（微秒）"""
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"  {label:<24} {seconds / number * 1e6:10.2f} us/op")
+
+
+def main():
+    entry = Entry()
+    asyncio.run(entry.initialize({"intent_whitelist": ["mbti_step1", "mbti_step2", "resume_upload"]}))
+
+    for case, intent in (("reject (intent not allowed)", "unknown_intent"), ("accept", "mbti_step2")):
+        print(f"\n=== {case} ===")
+        for name, raw in build_payloads(intent).items():
+            number = 200 if name.startswith("resume") else 20000
+            print(f"{name} ({len(raw)} bytes)")
+            bench("peek gate", lambda: entry.gate(raw) if case != "accept" else entry.gate(raw).body(), number)
+            bench("full json.loads gate", lambda: full_decode_gate(entry, raw), number)
+
+
+if __name__ == "__main__":
+    main()
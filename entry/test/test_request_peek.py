@@ -0,0 +1,93 @@
+# test_request_peek.py - entry 预读扫描器的行为测试
+# 职责：核对 peek_fields 对截断、缺少分隔符、非对象、非法 UTF-8 等畸形请求体只抛出 RequestPeekError，
+#       跳过的嵌套对象 / 数组和含转义引号的字符串不会误读出目标字段，顶层重复键以第一次出现为准，
+#       以及 Entry.admit_raw 对重复键取值不一致、预读范围之外的畸形请求体返回校验错误
+# 用法：python -m pytest -q entry/test/test_request_peek.py
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# 将项目根目录添加到Python路径，以便导入entry和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from entry.entry import PEEK_MIN_BYTES, Entry
+from entry.validators.request_peek import RequestPeekError, peek_fields
+from utilities.time import Time
+
+MALFORMED = [
+    "", " ", "[]", '"intent"', "null",
+    "{", '{"intent"', '{"intent":', '{"intent":"mbti_step1"', '{"intent":"mbti_step1",',
+    '{"intent" "mbti_step1"}', '{intent:"mbti_step1"}', "{'intent':'mbti_step1'}",
+    '{"x":1 "intent":"mbti_step1"}', '{"x":,"intent":"mbti_step1"}', '{"intent":tru}',
+    '{"x":"abc', '{"x":"a\\"}', '{"x":{"a":[1,2}', '{"x":tru', '{,}', '{"x":1,}',
+    b'\xff{"intent":"mbti_step1"}', b'{"intent":"\xe4\xb8"}',
+]
+
+
+@pytest.mark.parametrize("raw", MALFORMED)
+def test_malformed_body_raises_peek_error(raw):
+    with pytest.raises(RequestPeekError):
+        peek_fields(raw)
+
+
+@pytest.mark.parametrize("raw", [
+    '{"meta": [1, {"intent": "nested"}], "intent": "mbti_step1"}',
+    '{"meta": {"intent": "nested", "deep": {"request_id": "x"}}, "intent": "mbti_step1"}',
+    '{"note": "}\\"{\\"intent\\": \\"nested", "intent": "mbti_step1"}',
+    '{"path": "C:\\\\", "intent": "mbti_step1"}',
+    '{"n": -1.5e3, "ok": true, "none": null, "intent": "mbti_step1"}',
+    ' \n{ "intent" :\t"mbti_step1" } ',
+])
+def test_skipped_values_do_not_leak_fields(raw):
+    assert peek_fields(raw, ["intent"]) == {"intent": "mbti_step1"} == {"intent": json.loads(raw)["intent"]}
+
+
+def test_values_match_full_parse():
+    body = {"user_id": 42, "resume": {"text": "x" * 100}, "intent": "mbti_step1",
+            "request_id": "\u5f20\\\"id\"", "extra": [None]}
+    raw = json.dumps(body)
+    for payload in (raw, raw.encode("utf-8")):
+        assert peek_fields(payload) == {field: body[field] for field in ("intent", "request_id", "user_id")}
+    assert peek_fields("{}") == {} and peek_fields('{"other": 1}') == {}
+
+
+def test_duplicate_top_level_key_first_wins():
+    assert peek_fields('{"intent": "mbti_step1", "intent": "admin"}', ["intent"]) == {"intent": "mbti_step1"}
+
+
+def make_entry():
+    entry = Entry()
+    asyncio.run(entry.initialize({"intent_whitelist": ["mbti_step1"]}))
+    return entry
+
+
+def peeked_body(**fields):
+    """构造大于 PEEK_MIN_BYTES 的请求体，使 gate 走预读路径"""
+    header = {"intent": "mbti_step1", "request_id": Time.timestamp(), "user_id": "user_123"}
+    header.update(fields)
+    raw = json.dumps(header)[:-1] + ', "padding": "' + "x" * PEEK_MIN_BYTES + '"'
+    assert len(raw) > PEEK_MIN_BYTES
+    return raw
+
+
+def test_admit_raw_rejects_duplicate_key_with_different_value():
+    entry = make_entry()
+    body, error = entry.admit_raw(peeked_body() + ', "intent": "admin_reset"}')
+    assert body is None and error["success"] is False
+    assert error["errors"][0]["field"] == "intent"
+    # 重复键取值相同时与 json.loads 结果一致，允许通过
+    body, error = entry.admit_raw(peeked_body() + ', "intent": "mbti_step1"}')
+    assert error is None and body["intent"] == "mbti_step1"
+
+
+def test_admit_raw_rejects_body_malformed_after_header():
+    entry = make_entry()
+    request_id = Time.timestamp()
+    body, error = entry.admit_raw(peeked_body(request_id=request_id) + ', "answers": [1, 2}')
+    assert body is None and error["success"] is False and error["request_id"] == request_id
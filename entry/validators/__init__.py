@@ -3,3 +3,7 @@
 验证器模块的包初始化文件。
 导出IntentValidator和DataValidator类供entry主模块使用。
 """
+
+from entry.validators.data_validator import DataValidator, validate_request_data
+from entry.validators.intent_validator import IntentValidator
+from entry.validators.validation_result import ValidationResult
@@ -23,3 +23,183 @@ DataValidator专门负责AgentRequest的数据规范校验，从ConfigCache读
 - 错误定位：精确指出哪个字段验证失败，便于前端修复
 - 扩展性：支持动态添加新的验证规则，无需修改代码
 """
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from entry.validators.validation_result import (
+    ERROR_FIELD_MISSING,
+    ERROR_VALIDATION_FAILED,
+    ValidationResult,
+)
+from utilities.time import Time
+
+# 默认的必需字段：按字段分组声明，未声明的字段只在出现时检查类型和格式
+DEFAULT_REQUIRED_FIELDS = {
+    "request_fields": ("request_id", "intent"),
+}
+
+# 字段类型到生成代码片段的映射，{v} 为字段值变量名
+# 每种类型生成一条内联表达式，运行时不再查表分派
+# uuid 类型的 request_id 实际为 Time.timestamp() 生成的 timestamp_uuid 格式
+_TYPE_CHECKS = {
+    "uuid": "_is_valid_request_id({v})",
+    "string": "isinstance({v}, str)",
+    "dict": "isinstance({v}, dict)",
+    "list": "isinstance({v}, list)",
+    "int": "isinstance({v}, int) and {v} is not True and {v} is not False",
+    "bool": "{v} is True or {v} is False",
+}
+
+# 生成代码中 dict.get 的缺省哨兵，区分"字段不存在"和"字段值为 None"
+_MISSING = object()
+
+# 字段组校验函数类型：接收请求字典，返回字段错误列表（无错误时返回 None）
+GroupCheck = Callable[[Dict[str, object]], Optional[List[Dict[str, str]]]]
+
+
+def _field_error(field: str, error_code: str, message: str) -> Dict[str, str]:
+    """构建单条字段错误记录，精确指出出错字段"""
+    return {"field": field, "error_code": error_code, "message": message}
+
+
+def generate_group_source(function_name: str, fields: Iterable[str], field_types: Dict[str, str],
+                          required: Iterable[str] = ()) -> str:
+    """
+    为一个字段分组生成专用校验函数的源代码
+    每个字段展开为独立的 存在性 → 类型 → 格式 检查语句，不经过通用规则解释
+    Args:
+        function_name: 生成函数的名称
+        fields: 分组内的字段名列表
+        field_types: 字段名到类型的映射
+        required: 该分组内必须存在且非空的字段
+    Returns:
+        str: 可直接 exec 的函数源代码
+    """
+    required = set(required)
+    lines = [
+        f"def {function_name}(data):",
+        "    errors = None",
+        "    get = data.get",
+    ]
+    for index, field in enumerate(fields):
+        field_type = field_types.get(field)
+        value = f"v{index}"
+        lines.append(f"    {value} = get({field!r}, _MISSING)")
+        if field in required:
+            lines.append(f"    if {value} is _MISSING or {value} is None or {value} == '':")
+            lines.append("        if errors is None: errors = []")
+            lines.append(
+                f"        errors.append(_field_error({field!r}, {ERROR_FIELD_MISSING!r}, "
+                f"{field + ' is required'!r}))"
+            )
+            branch = "elif"
+        else:
+            lines.append(f"    if {value} is _MISSING or {value} is None:")
+            lines.append("        pass")
+            branch = "elif"
+        check = _TYPE_CHECKS.get(field_type)
+        if check is not None:
+            lines.append(f"    {branch} not ({check.format(v=value)}):")
+            lines.append("        if errors is None: errors = []")
+            lines.append(
+                f"        errors.append(_field_error({field!r}, {ERROR_VALIDATION_FAILED!r}, "
+                f"{field + ' must be of type ' + field_type!r}))"
+            )
+    lines.append("    return errors")
+    return "\n".join(lines) + "\n"
+
+
+def compile_group(group_name: str, fields: Iterable[str], field_types: Dict[str, str],
+                  required: Iterable[str] = ()) -> GroupCheck:
+    """
+    将字段分组编译为专用校验函数
+    Returns:
+        GroupCheck: 接收请求字典、返回字段错误列表或 None 的函数
+    """
+    function_name = f"_check_{group_name}"
+    source = generate_group_source(function_name, fields, field_types, required)
+    namespace = {
+        "_MISSING": _MISSING,
+        "_field_error": _field_error,
+        "_is_valid_request_id": Time.is_valid_request_id,
+    }
+    code = compile(source, f"<data_validator:{group_name}>", "exec")
+    exec(code, namespace)
+    return namespace[function_name]
+
+
+class DataValidator:
+    """
+    AgentRequest 数据规范校验器
+    启动时将 schema 中的每个字段分组编译为一个专用函数，运行时按分组直接调用；
+    schema_provider.schema_version 变化时自动重新编译
+    """
+
+    def __init__(self, schema_provider, required_fields: Optional[Dict[str, Tuple[str, ...]]] = None):
+        """
+        Args:
+            schema_provider: 提供 get_field_types()、get_field_groups() 和 schema_version 的字段定义管理器，
+                             例如 applications.mbti.schemas.schema_manager
+            required_fields: 分组名到必需字段元组的映射，默认使用 DEFAULT_REQUIRED_FIELDS
+        """
+        self.schema_provider = schema_provider
+        self.required_fields = dict(DEFAULT_REQUIRED_FIELDS if required_fields is None else required_fields)
+        self.compiled_groups: Dict[str, GroupCheck] = {}
+        self.compiled_version = None
+        self.compile()
+
+    def compile(self) -> None:
+        """根据当前字段定义重新编译所有字段分组"""
+        field_types = self.schema_provider.get_field_types()
+        field_groups = self.schema_provider.get_field_groups()
+        self.compiled_groups = {
+            group_name: compile_group(group_name, fields, field_types, self.required_fields.get(group_name, ()))
+            for group_name, fields in field_groups.items()
+        }
+        self.compiled_version = getattr(self.schema_provider, "schema_version", None)
+
+    def validate(self, data: Dict[str, object], groups: Iterable[str] = ("request_fields",)) -> ValidationResult:
+        """
+        按字段分组校验请求数据
+        Args:
+            data: 请求字典
+            groups: 需要校验的字段分组名称
+        Returns:
+            ValidationResult: 验证结果，失败时 errors 逐条列出出错字段
+        Raises:
+            KeyError: 当分组名称不存在于字段定义中
+        """
+        if getattr(self.schema_provider, "schema_version", None) != self.compiled_version:
+            self.compile()
+        if not isinstance(data, dict):
+            return ValidationResult.from_errors(
+                [_field_error("request", ERROR_VALIDATION_FAILED, "request must be a JSON object")]
+            )
+        compiled_groups = self.compiled_groups
+        errors = None
+        for group_name in groups:
+            group_errors = compiled_groups[group_name](data)
+            if group_errors:
+                if errors is None:
+                    errors = group_errors
+                else:
+                    errors.extend(group_errors)
+        if errors is None:
+            return ValidationResult.valid()
+        return ValidationResult.from_errors(errors)
+
+
+# 默认校验器在首次调用时基于 MBTI 模块的字段定义创建，避免 entry 被导入时加载业务模块
+_default_validator: Optional[DataValidator] = None
+
+
+def validate_request_data(data: Dict[str, object], groups: Iterable[str] = ("request_fields",)) -> ValidationResult:
+    """
+    MBTI 模块 orchestrate_info.data_flow.input_validation 指向的校验入口
+    使用 applications.mbti.schemas.schema_manager 的字段定义校验请求
+    """
+    global _default_validator
+    if _default_validator is None:
+        from applications.mbti.schemas import schema_manager
+        _default_validator = DataValidator(schema_manager)
+    return _default_validator.validate(data, groups)
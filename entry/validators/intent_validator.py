@@ -21,3 +21,43 @@ IntentValidator专门负责intent白名单验证逻辑，直接从ConfigCache读
 - 结果标准化：返回统一的ValidationResult，便于主流程处理
 - 配置驱动：验证规则完全由配置决定，便于动态调整
 """
+
+from entry.validators.validation_result import (
+    ERROR_FIELD_MISSING,
+    ERROR_INTENT_NOT_ALLOWED,
+    STATUS_FIELD_MISSING,
+    STATUS_INVALID_INTENT,
+    ValidationResult,
+)
+
+
+class IntentValidator:
+    """
+    Intent白名单验证器
+    直接引用 ConfigCache.intent_whitelist 做集合成员检查
+    """
+
+    def __init__(self, config_cache):
+        """
+        Args:
+            config_cache: 已加载配置的 entry.cache.ConfigCache 实例
+        """
+        self.config_cache = config_cache
+
+    def validate(self, intent: object) -> ValidationResult:
+        """
+        验证 intent 是否存在且在白名单中
+        Args:
+            intent: 请求中的 intent 字段值
+        Returns:
+            ValidationResult: valid / field_missing / invalid_intent
+        """
+        if not intent:
+            return ValidationResult(False, STATUS_FIELD_MISSING, ERROR_FIELD_MISSING, [
+                {"field": "intent", "error_code": ERROR_FIELD_MISSING, "message": "intent is required"}
+            ])
+        if not isinstance(intent, str) or intent not in self.config_cache.intent_whitelist:
+            return ValidationResult(False, STATUS_INVALID_INTENT, ERROR_INTENT_NOT_ALLOWED, [
+                {"field": "intent", "error_code": ERROR_INTENT_NOT_ALLOWED, "message": f"intent not allowed: {intent}"}
+            ])
+        return ValidationResult.valid()
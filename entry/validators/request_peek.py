@@ -0,0 +1,157 @@
+# request_peek.py - 请求头字段预读扫描器
+"""
+设计用途：
+在完整解析JSON请求体之前，只扫描顶层对象读取 intent、request_id、user_id 等少量字段，
+让entry能在不解码96题答案或简历正文的情况下拒绝非法请求。
+
+扫描规则：
+1. 只读取顶层对象的键，嵌套对象和数组整体跳过，不构建任何Python对象
+2. 目标字段的字符串值使用json标准库的C实现scanstring解码；跳过的字符串只用str.find定位结束引号，
+   容器通过正则跳转到下一个结构字符
+3. 目标字段全部找到后立即停止，后续内容留给下游一次性完整解析
+4. 顶层重复键以第一次出现为准，下游完整解析后需核对预读值（json.loads以最后一次为准）
+"""
+
+import json
+import re
+from json.decoder import scanstring
+from typing import Dict, Iterable, Union
+
+
+# 默认预读字段
+PEEK_FIELDS = frozenset(("intent", "request_id", "user_id"))
+
+# JSON空白字符，先做单字符判断，只有确实存在空白时才调用正则跳过
+_WHITESPACE_CHARS = ' \t\n\r'
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# 容器跳过时关心的结构字符：字符串起点和括号
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+# 标量值（数字、true、false、null）的结束位置
+_SCALAR_END = re.compile(r'[,}\]\s]')
+
+# 用于解码目标字段值的共享解码器
+_decoder = json.JSONDecoder()
+
+
+class RequestPeekError(ValueError):
+    """请求体不是合法的JSON顶层对象时抛出"""
+
+
+def _skip_string(text: str, index: int) -> int:
+    """
+    跳过 index 处（起始引号之后）的字符串内容，返回结束引号之后的位置
+    使用 str.find 定位引号并检查前导反斜杠个数，不构建字符串对象
+    """
+    find = text.find
+    while True:
+        quote = find('"', index)
+        if quote < 0:
+            raise RequestPeekError("Unterminated JSON string")
+        backslash = quote - 1
+        while text[backslash] == '\\':
+            backslash -= 1
+        if (quote - backslash) % 2 == 1:
+            return quote + 1
+        index = quote + 1
+
+
+def _skip_value(text: str, index: int) -> int:
+    """
+    跳过 index 处开始的一个JSON值，返回值结束后的位置
+    """
+    char = text[index]
+    if char == '"':
+        return _skip_string(text, index + 1)
+    if char == '{' or char == '[':
+        depth = 0
+        position = index
+        search = _STRUCTURAL.search
+        while True:
+            match = search(text, position)
+            if match is None:
+                raise RequestPeekError("Unterminated JSON container")
+            char = match.group()
+            position = match.end()
+            if char == '"':
+                position = _skip_string(text, position)
+            elif char == '{' or char == '[':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return position
+    match = _SCALAR_END.search(text, index)
+    if match is None:
+        raise RequestPeekError("Unterminated JSON value")
+    if match.start() == index:
+        raise RequestPeekError(f"Expecting value at position {index}")
+    return match.start()
+
+
+def peek_fields(raw: Union[bytes, str], fields: Iterable[str] = PEEK_FIELDS) -> Dict[str, object]:
+    """
+    预读请求体顶层对象中的指定字段
+    Args:
+        raw: 原始请求体（UTF-8字节串或字符串）
+        fields: 需要预读的顶层字段名
+    Returns:
+        Dict[str, object]: 找到的字段及其值，未出现的字段不包含在结果中
+    Raises:
+        RequestPeekError: 请求体不是JSON对象或在扫描范围内格式错误
+    """
+    try:
+        text = raw.decode("utf-8") if isinstance(raw, (bytes, bytearray)) else raw
+        wanted = fields if isinstance(fields, frozenset) else frozenset(fields)
+        remaining = len(wanted)
+        found = {}
+        skip_whitespace = _WHITESPACE.match
+        decode_value = _decoder.raw_decode
+
+        index = skip_whitespace(text, 0).end()
+        if text[index:index + 1] != '{':
+            raise RequestPeekError("Request body must be a JSON object")
+        index += 1
+        if text[index] in _WHITESPACE_CHARS:
+            index = skip_whitespace(text, index).end()
+        if text[index] == '}':
+            return found
+
+        while True:
+            if text[index] != '"':
+                raise RequestPeekError(f"Expecting property name at position {index}")
+            key, index = scanstring(text, index + 1)
+            if text[index] in _WHITESPACE_CHARS:
+                index = skip_whitespace(text, index).end()
+            if text[index] != ':':
+                raise RequestPeekError(f"Expecting ':' at position {index}")
+            index += 1
+            if text[index] in _WHITESPACE_CHARS:
+                index = skip_whitespace(text, index).end()
+
+            if key in wanted and key not in found:
+                if text[index] == '"':
+                    found[key], index = scanstring(text, index + 1)
+                else:
+                    found[key], index = decode_value(text, index)
+                remaining -= 1
+                if remaining == 0:
+                    return found
+            else:
+                index = _skip_value(text, index)
+
+            if text[index] in _WHITESPACE_CHARS:
+                index = skip_whitespace(text, index).end()
+            char = text[index]
+            if char == ',':
+                index += 1
+                if text[index] in _WHITESPACE_CHARS:
+                    index = skip_whitespace(text, index).end()
+            elif char == '}':
+                return found
+            else:
+                raise RequestPeekError(f"Expecting ',' or '}}' at position {index}")
+    except RequestPeekError:
+        raise
+    except (ValueError, IndexError) as e:
+        # json.JSONDecodeError、UnicodeDecodeError 都是 ValueError 子类；IndexError 来自截断的请求体
+        raise RequestPeekError(f"Malformed JSON request body: {e}") from e
@@ -0,0 +1,73 @@
+# validation_result.py - 验证结果标准对象
+"""
+设计用途：
+ValidationResult是entry所有验证器的统一返回对象，IntentValidator和DataValidator
+都返回该对象，便于entry主流程用同一种方式判断验证是否通过并生成错误响应。
+
+状态与错误码（见entry_Structured_readme.md A-6.3 / A-7.3）：
+- valid：验证通过
+- invalid_intent：ENTRY/INTENT_NOT_ALLOWED，意图不在白名单中
+- field_missing：ENTRY/FIELD_MISSING，必需字段缺失
+- validation_failed：ENTRY/VALIDATION_FAILED，字段类型或格式错误
+"""
+
+from typing import Dict, List, Optional
+
+
+# 验证状态常量
+STATUS_VALID = "valid"
+STATUS_INVALID_INTENT = "invalid_intent"
+STATUS_FIELD_MISSING = "field_missing"
+STATUS_VALIDATION_FAILED = "validation_failed"
+
+# 错误码常量
+ERROR_INTENT_NOT_ALLOWED = "ENTRY/INTENT_NOT_ALLOWED"
+ERROR_FIELD_MISSING = "ENTRY/FIELD_MISSING"
+ERROR_VALIDATION_FAILED = "ENTRY/VALIDATION_FAILED"
+
+
+class ValidationResult:
+    """
+    标准化验证结果
+    is_valid为True时errors为空列表；失败时errors逐条记录出错字段、错误码和描述
+    """
+
+    __slots__ = ("is_valid", "status", "error_code", "errors")
+
+    def __init__(self, is_valid: bool, status: str, error_code: Optional[str] = None,
+                 errors: Optional[List[Dict[str, str]]] = None):
+        self.is_valid = is_valid
+        self.status = status
+        self.error_code = error_code
+        self.errors = errors or []
+
+    @classmethod
+    def valid(cls) -> "ValidationResult":
+        """返回验证通过的结果对象"""
+        return _VALID_RESULT
+
+    @classmethod
+    def from_errors(cls, errors: List[Dict[str, str]]) -> "ValidationResult":
+        """
+        根据字段错误列表构建失败结果
+        只要存在缺失字段即判定为field_missing，否则为validation_failed
+        """
+        if not errors:
+            return _VALID_RESULT
+        for error in errors:
+            if error["error_code"] == ERROR_FIELD_MISSING:
+                return cls(False, STATUS_FIELD_MISSING, ERROR_FIELD_MISSING, errors)
+        return cls(False, STATUS_VALIDATION_FAILED, ERROR_VALIDATION_FAILED, errors)
+
+    def to_dict(self) -> Dict[str, object]:
+        """转换为可直接返回给前端的字典"""
+        return {
+            "is_valid": self.is_valid,
+            "status": self.status,
+            "error_code": self.error_code,
+            "errors": list(self.errors)
+        }
+
+
+# 验证通过的结果不携带任何可变状态，全局共享同一个实例避免重复创建
+_VALID_RESULT = ValidationResult(True, STATUS_VALID)
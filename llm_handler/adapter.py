@@ -0,0 +1,144 @@
+# adapter.py 为 llm_handler 的适配层（B-2.2）
+# 只负责对上游 LLM API 的调用与异常归类，不做任何业务决策
+# 通过 litellm.acompletion 调用 OpenAI 兼容接口；LLM_API_BASE 可指向自建网关或本地模拟服务
+
+# 导入标准库
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# DEFAULT_MODEL 为 G-1.1 规定的统一模型
+DEFAULT_MODEL = "gpt-4o-2024-08-06"
+# DEFAULT_TIMEOUT_SECONDS 为 G-5.2 规定的单次调用超时
+DEFAULT_TIMEOUT_SECONDS = 60.0
+
+
+class LLMError(Exception):
+    """
+    LLMError 为 llm_handler 对外抛出的唯一异常类型
+    code 采用 E-3.3 的 LLM/{REASON} 命名，message 面向调用方
+    """
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def _classify(error: Exception) -> LLMError:
+    """_classify 函数把 litellm / openai 异常归类为 LLM/{REASON} 错误码"""
+    name = type(error).__name__
+    if "RateLimit" in name:
+        return LLMError("LLM/RATE_LIMITED", "LLM rate limit reached, retry later")
+    if "Timeout" in name:
+        return LLMError("LLM/API_TIMEOUT", "LLM call timed out")
+    if "ContextWindow" in name:
+        return LLMError("LLM/TOKEN_LIMIT", "prompt exceeds the model context window")
+    if "Connection" in name:
+        return LLMError("LLM/NETWORK_ERROR", "cannot reach the LLM API")
+    return LLMError("LLM/API_ERROR", f"LLM API error ({name})")
+
+
+class LiteLLMAdapter:
+    """
+    LiteLLMAdapter 类封装一次补全调用（complete 为非流式，stream 为流式）
+    litellm 在首次调用时才导入（导入耗时数秒），启动预热可提前调用 preload()
+    """
+
+    def __init__(self, model: Optional[str] = None, api_base: Optional[str] = None, api_key: Optional[str] = None,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        self.model = model or os.environ.get("LLM_MODEL", DEFAULT_MODEL)
+        self.api_base = api_base or os.environ.get("LLM_API_BASE")
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        self.timeout = timeout
+        self._litellm = None
+
+    def preload(self) -> None:
+
+        if self._litellm is None:
+            import litellm
+
+            self._litellm = litellm
+
+    def _arguments(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> Dict[str, Any]:
+
+        arguments = {"model": self.model, "messages": messages, "timeout": self.timeout,
+                     "temperature": params.get("temperature"), "max_tokens": params.get("max_tokens")}
+        if self.api_base:
+            arguments["api_base"] = self.api_base
+        if self.api_key:
+            arguments["api_key"] = self.api_key
+        if params.get("json_mode"):
+            arguments["response_format"] = {"type": "json_object"}
+        return arguments
+
+    async def complete(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        complete 方法返回 J-1.3 LLMResponse 结构：raw_output、model_used、tokens_used、call_duration_ms
+        上游异常转换为 LLMError
+        """
+        self.preload()
+        started = time.perf_counter()
+        try:
+            response = await self._litellm.acompletion(**self._arguments(messages, params))
+        except Exception as e:
+            raise _classify(e) from e
+        usage = getattr(response, "usage", None)
+        return {
+            "raw_output": response.choices[0].message.content or "",
+            "model_used": getattr(response, "model", None) or self.model,
+            "tokens_used": {
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+                "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+                "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+            },
+            "call_duration_ms": (time.perf_counter() - started) * 1e3,
+        }
+
+    async def stream(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        stream 方法以流式调用上游，逐段 yield {"type": "token", "text"}，
+        结束时 yield {"type": "done", "response": LLMResponse}，LLMResponse 额外包含 first_token_ms
+        消费方停止迭代时关闭上游连接；上游异常转换为 LLMError
+        """
+        self.preload()
+        started = time.perf_counter()
+        first_token_ms = None
+        parts = []
+        usage = None
+        model_used = None
+        try:
+            response = await self._litellm.acompletion(stream=True, stream_options={"include_usage": True},
+                                                       **self._arguments(messages, params))
+        except Exception as e:
+            raise _classify(e) from e
+        try:
+            iterator = response.__aiter__()
+            while True:
+                try:
+                    chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    raise _classify(e) from e
+                usage = getattr(chunk, "usage", None) or usage
+                model_used = getattr(chunk, "model", None) or model_used
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - started) * 1e3
+                    parts.append(text)
+                    yield {"type": "token", "text": text}
+        finally:
+            await response.aclose()
+        yield {"type": "done", "response": {
+            "raw_output": "".join(parts),
+            "model_used": model_used or self.model,
+            "tokens_used": {
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+                "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+                "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+            },
+            "call_duration_ms": (time.perf_counter() - started) * 1e3,
+            "first_token_ms": first_token_ms,
+        }}
@@ -0,0 +1,235 @@
+# llm_cache.py 负责 LLM 响应缓存（G-3.1 调用缓存机制）
+# 以 (模型, 模板 ID, 规范化变量, 调用参数) 为键缓存 LLM 原始输出
+# 进程内 LRU 在前，SQLite 持久层在后，支持 TTL 与按总字节数淘汰
+
+# 导入标准库
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from utilities.snapshot.snapshot import PROJECT_ROOT
+
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, "cache", "llm", "llm_cache.sqlite3")
+# KEY_PARAMS 为参与缓存键的调用参数，其余参数（超时、重试等）不影响输出
+KEY_PARAMS = ("temperature", "max_tokens", "json_mode", "top_p", "seed", "stop")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def canonicalize(value: Any) -> Any:
+    """
+    canonicalize 函数把模板变量规范化为稳定的可序列化结构
+    字符串做 NFKC、空白合并、去首尾空白；字典按键排序由 json.dumps(sort_keys=True) 保证；
+    集合排序后转为列表；列表保持顺序
+    """
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", value)).strip()
+    if isinstance(value, dict):
+        return {str(key): canonicalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((canonicalize(item) for item in value), key=lambda item: json.dumps(item, sort_keys=True))
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def cache_key(model: str, prompt: str, system_prompt: Optional[str] = None, template_id: Optional[str] = None,
+              variables: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    cache_key 函数生成缓存键
+    给出 template_id 时以 (模型, 模板 ID, 规范化变量, 参数) 为键，模板渲染中的空白、变量顺序差异不影响命中；
+    否则以 (模型, system_prompt, prompt, 参数) 的精确文本为键；模板内容变化时调用方需更换 template_id（如附加版本号）
+    """
+    params = {name: params[name] for name in KEY_PARAMS if params and params.get(name) is not None}
+    if template_id:
+        material = {"model": model, "template_id": template_id, "variables": canonicalize(variables or {}),
+                    "params": params}
+    else:
+        material = {"model": model, "system_prompt": system_prompt, "prompt": prompt, "params": params}
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SQLiteStore:
+    """
+    SQLiteStore 类实现 LLM 缓存的持久层
+    - 每个条目记录过期时间和最近访问时间，读取时跳过已过期条目
+    - 总字节数超过 max_bytes 时先删除已过期条目，再按最近访问时间从旧到新删除
+    - WAL 模式下多个 worker 进程可以共享同一个数据库文件；总字节数由触发器维护在库内的 llm_cache_size 表中，
+      每个进程都能看到其他进程写入的字节，不依赖进程内计数
+    单次读写为本地亚毫秒级操作，直接在事件循环中执行（本模块禁止使用线程池）
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 256 * 1024 * 1024):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # 建表、建触发器与初始化计数在同一个写事务中完成，多个 worker 同时启动时不会重复计数
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, task TEXT, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache_size (id INTEGER PRIMARY KEY CHECK (id = 1), "
+                "total_bytes INTEGER NOT NULL)")
+            # 旧版本创建的库没有计数行，按现有条目初始化一次
+            self.connection.execute(
+                "INSERT OR IGNORE INTO llm_cache_size (id, total_bytes) SELECT 1, COALESCE(SUM(size), 0) FROM llm_cache")
+            self.connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS llm_cache_size_insert AFTER INSERT ON llm_cache BEGIN "
+                "UPDATE llm_cache_size SET total_bytes = total_bytes + NEW.size WHERE id = 1; END")
+            self.connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS llm_cache_size_delete AFTER DELETE ON llm_cache BEGIN "
+                "UPDATE llm_cache_size SET total_bytes = total_bytes - OLD.size WHERE id = 1; END")
+            self.connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS llm_cache_size_update AFTER UPDATE OF size ON llm_cache BEGIN "
+                "UPDATE llm_cache_size SET total_bytes = total_bytes + NEW.size - OLD.size WHERE id = 1; END")
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+
+    @property
+    def total_bytes(self) -> int:
+        """total_bytes 为库内全部条目（含其他 worker 写入的条目）的总字节数"""
+        return self.connection.execute("SELECT total_bytes FROM llm_cache_size WHERE id = 1").fetchone()[0]
+
+    def get(self, key: str, now: float) -> Optional[Tuple[Dict[str, Any], float]]:
+        """get 方法返回未过期的 (条目, 过期时间) 并刷新访问时间，不存在或已过期时返回 None"""
+        row = self.connection.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        self.connection.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, task: str, value: Dict[str, Any], ttl_seconds: float, now: float) -> None:
+        """put 方法写入或覆盖条目，写入后按 max_bytes 淘汰"""
+        encoded = json.dumps(value, ensure_ascii=False)
+        size = len(encoded.encode("utf-8"))
+        # 覆盖使用 UPSERT 而不是 INSERT OR REPLACE：REPLACE 删除旧行时默认不触发 DELETE 触发器，计数会偏大
+        self.connection.execute(
+            "INSERT INTO llm_cache (key, task, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET task = excluded.task, value = excluded.value, size = excluded.size, "
+            "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+            (key, task, encoded, size, now + ttl_seconds, now))
+        if self.total_bytes > self.max_bytes:
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """
+        _evict 方法删除过期条目，仍超出上限时按最近访问时间淘汰到上限的 90%
+        在写事务中执行，多个 worker 同时超限时依次淘汰，后进入者按前者淘汰后的字节数判断
+        """
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            target = self.max_bytes * 0.9
+            if self.total_bytes > target:
+                connection.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            total_bytes = self.total_bytes
+            if total_bytes > target:
+                freed = 0
+                cutoff = None
+                for accessed_at, size in connection.execute(
+                        "SELECT accessed_at, size FROM llm_cache ORDER BY accessed_at"):
+                    freed += size
+                    cutoff = accessed_at
+                    if total_bytes - freed <= target:
+                        break
+                connection.execute("DELETE FROM llm_cache WHERE accessed_at <= ?", (cutoff,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class LLMCache:
+    """
+    LLMCache 类组合进程内 LRU 与 SQLite 持久层
+    - lookup / store_response 以 cache_key 生成的键读写，task 为统计与淘汰用的任务类别（如 taggings、ninetest）
+    - 按任务类别统计 hits（LRU 命中）、store_hits（持久层命中）、misses、bypassed
+    """
+
+    def __init__(self, store: Optional[SQLiteStore] = None, max_entries: int = 2048,
+                 ttl_seconds: float = 7 * 24 * 3600.0):
+        # store 为持久层，None 时只使用进程内 LRU
+        self.store = store
+        # max_entries 为 LRU 条目上限
+        self.max_entries = max_entries
+        # ttl_seconds 为默认保留时长，可按调用覆盖
+        self.ttl_seconds = ttl_seconds
+        # entries 保存 键 → (过期时间, 响应)，按最近访问排序
+        self.entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, task: str, outcome: str) -> None:
+
+        counters = self.stats.get(task)
+        if counters is None:
+            counters = self.stats[task] = {"hits": 0, "store_hits": 0, "misses": 0, "bypassed": 0}
+        counters[outcome] += 1
+
+    def bypass(self, task: str) -> None:
+        """bypass 方法记录一次绕过缓存的调用"""
+        self._count(task, "bypassed")
+
+    def lookup(self, key: str, task: str) -> Optional[Dict[str, Any]]:
+        """lookup 方法依次查找 LRU 与持久层，持久层命中时回填 LRU"""
+        now = time.time()
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self.entries.move_to_end(key)
+                self._count(task, "hits")
+                return entry[1]
+            del self.entries[key]
+        if self.store is not None:
+            found = self.store.get(key, now)
+            if found is not None:
+                self._remember(key, *found)
+                self._count(task, "store_hits")
+                return found[0]
+        self._count(task, "misses")
+        return None
+
+    def store_response(self, key: str, task: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        """store_response 方法写入 LRU 与持久层"""
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._remember(key, value, now + ttl)
+        if self.store is not None:
+            self.store.put(key, task, value, ttl, now)
+
+    def _remember(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def hit_rates(self) -> Dict[str, float]:
+        """hit_rates 方法返回各任务类别的命中率（LRU 与持久层命中之和 / 可缓存调用数）"""
+        rates = {}
+        for task, counters in self.stats.items():
+            cacheable = counters["hits"] + counters["store_hits"] + counters["misses"]
+            rates[task] = (counters["hits"] + counters["store_hits"]) / cacheable if cacheable else 0.0
+        return rates
+
+    def clear(self) -> None:
+        """clear 方法清空进程内 LRU，持久层不受影响"""
+        self.entries.clear()
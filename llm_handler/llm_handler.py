@@ -0,0 +1,215 @@
+# llm_handler.py 为 llm_handler 的主文件（B-2.1）
+# 只做请求校验、依赖装配与流程编排：缓存查找 → 适配层调用 → 缓存写入 → 标准响应
+# 对外暴露 run(request) 作为调用入口（A-3.4），需要逐段输出的调用方使用 stream(request)
+
+# 导入标准库
+import contextlib
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from llm_handler.adapter import LiteLLMAdapter, LLMError
+from llm_handler.llm_cache import LLMCache, SQLiteStore, cache_key
+from llm_handler.scheduler import DEFAULT_PRIORITY, PRIORITIES, LLMScheduler, estimate_tokens
+from utilities.logger.logger import get_logger
+from utilities.time import Time
+
+# logger 为 llm_handler 的结构化日志记录器
+logger = get_logger("llm_handler")
+
+AGENT_NAME = "llm_handler_agent"
+# TASK_TYPES 为 C-2.1 支持的核心任务类型
+TASK_TYPES = ("llm_completion", "llm_chat", "llm_json")
+# 输入限制见 J-1.2 LLMRequest
+MAX_PROMPT_CHARS = 50000
+MAX_SYSTEM_PROMPT_CHARS = 5000
+DEFAULT_PARAMS = {"temperature": 0.7, "max_tokens": 1000, "json_mode": False}
+
+
+def _params(request: Dict[str, Any]) -> Dict[str, Any]:
+    """_params 函数合并默认参数与 additional_params，并校验取值范围"""
+    additional = request.get("additional_params") or {}
+    params = {name: additional.get(name, default) for name, default in DEFAULT_PARAMS.items()}
+    if request.get("task_type") == "llm_json":
+        params["json_mode"] = True
+    try:
+        temperature, max_tokens = float(params["temperature"]), int(params["max_tokens"])
+    except (TypeError, ValueError):
+        raise LLMError("LLM/INVALID_PARAMS", "temperature and max_tokens must be numbers") from None
+    if not 0.0 <= temperature <= 2.0:
+        raise LLMError("LLM/INVALID_PARAMS", "temperature must be between 0 and 2")
+    if not 1 <= max_tokens <= 4000:
+        raise LLMError("LLM/INVALID_PARAMS", "max_tokens must be between 1 and 4000")
+    return params
+
+
+def _messages(data: Dict[str, Any]) -> List[Dict[str, str]]:
+    """_messages 函数校验 prompt 并组装消息列表"""
+    prompt = data.get("prompt")
+    system_prompt = data.get("system_prompt")
+    if not isinstance(prompt, str) or not prompt:
+        raise LLMError("LLM/INVALID_PROMPT", "context.data.prompt must be a non-empty string")
+    if len(prompt) > MAX_PROMPT_CHARS:
+        raise LLMError("LLM/PROMPT_TOO_LONG", f"prompt exceeds {MAX_PROMPT_CHARS} characters")
+    if system_prompt is not None and not isinstance(system_prompt, str):
+        raise LLMError("LLM/INVALID_PROMPT", "context.data.system_prompt must be a string")
+    if system_prompt and len(system_prompt) > MAX_SYSTEM_PROMPT_CHARS:
+        raise LLMError("LLM/PROMPT_TOO_LONG", f"system_prompt exceeds {MAX_SYSTEM_PROMPT_CHARS} characters")
+    messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def task_category(request: Dict[str, Any]) -> str:
+    """
+    task_category 函数返回缓存统计用的任务类别
+    优先使用 additional_params.task，其次为 template_id 的首段（如 "taggings.layer_2_skills" → "taggings"），
+    最后为 task_type
+    """
+    additional = request.get("additional_params") or {}
+    template_id = ((request.get("context") or {}).get("data") or {}).get("template_id")
+    return additional.get("task") or (template_id.split(".", 1)[0] if template_id else request.get("task_type", ""))
+
+
+class LLMHandler:
+    """
+    LLMHandler 类编排一次 LLM 调用
+    - 可缓存的调用先查 LLMCache；additional_params.cache 为 False 时绕过缓存（非确定性任务，如对话生成）
+    - additional_params.cache_ttl_seconds 可覆盖默认缓存时长
+    - 未命中的调用经 LLMScheduler 排队，additional_params.priority 为 interactive / standard / bulk；
+      可缓存调用以缓存键合并在途的相同调用
+    """
+
+    def __init__(self, adapter: Optional[LiteLLMAdapter] = None, cache: Optional[LLMCache] = None,
+                 scheduler: Optional[LLMScheduler] = None):
+        self.adapter = adapter or LiteLLMAdapter()
+        self.cache = cache if cache is not None else LLMCache(SQLiteStore())
+        self.scheduler = scheduler or LLMScheduler()
+
+    def _response(self, request: Dict[str, Any], success: bool, response: Optional[Dict[str, Any]] = None,
+                  error: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+
+        return {"request_id": request.get("request_id"), "agent_name": AGENT_NAME, "success": success,
+                "timestamp": Time.now().isoformat(), "response": response, "error": error}
+
+    async def _complete(self, messages: List[Dict[str, str]], params: Dict[str, Any], key: Optional[str], task: str,
+                        additional: Dict[str, Any]) -> Dict[str, Any]:
+        """_complete 方法调用上游并写入缓存，合并的调用只写一次"""
+        result = await self.adapter.complete(messages, params)
+        if key is not None:
+            self.cache.store_response(key, task, result, additional.get("cache_ttl_seconds"))
+        return result
+
+    def _prepare(self, request: Dict[str, Any]) -> Tuple[List[Dict[str, str]], Dict[str, Any], str, Optional[str]]:
+        """_prepare 方法校验请求，返回 (消息列表, 调用参数, 优先级, 缓存键)；绕过缓存时缓存键为 None"""
+        if request.get("task_type") not in TASK_TYPES:
+            raise LLMError("LLM/INVALID_PARAMS", f"unsupported task_type: {request.get('task_type')}")
+        data = (request.get("context") or {}).get("data") or {}
+        messages = _messages(data)
+        params = _params(request)
+        additional = request.get("additional_params") or {}
+        priority = additional.get("priority", DEFAULT_PRIORITY)
+        if priority not in PRIORITIES:
+            raise LLMError("LLM/INVALID_PARAMS", f"priority must be one of {', '.join(PRIORITIES)}")
+        key = None
+        if additional.get("cache", True):
+            key = cache_key(self.adapter.model, data["prompt"], data.get("system_prompt"), data.get("template_id"),
+                            data.get("variables"), params)
+        return messages, params, priority, key
+
+    def _log(self, request: Dict[str, Any], task: str, started: float, error: Optional[LLMError] = None,
+             **fields: Any) -> None:
+
+        duration_ms = round((time.perf_counter() - started) * 1e3, 1)
+        if error is not None:
+            logger.warning("llm_call_failed", request_id=request.get("request_id"), module_name=AGENT_NAME,
+                           operation=task, duration_ms=duration_ms, success=False, retry_count=0,
+                           error_code=error.code)
+        else:
+            logger.info("llm_call", request_id=request.get("request_id"), module_name=AGENT_NAME, operation=task,
+                        duration_ms=duration_ms, success=True, retry_count=0, **fields)
+
+    async def run(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        run 方法执行一次 LLM 调用，返回 E-1.3 AgentResponse
+        失败时 success 为 False，error 为 {"code", "message"}
+        """
+        started = time.perf_counter()
+        task = task_category(request)
+        cached = False
+        try:
+            messages, params, priority, key = self._prepare(request)
+            additional = request.get("additional_params") or {}
+            if key is not None:
+                result = self.cache.lookup(key, task)
+                cached = result is not None
+            else:
+                self.cache.bypass(task)
+                result = None
+            if result is None:
+                result = await self.scheduler.submit(key, priority, estimate_tokens(messages, params),
+                                                     lambda: self._complete(messages, params, key, task, additional))
+        except LLMError as e:
+            self._log(request, task, started, e)
+            return self._response(request, False, error={"code": e.code, "message": e.message})
+        self._log(request, task, started, cached=cached)
+        return self._response(request, True, {**result, "cached": cached})
+
+    async def stream(self, request: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        stream 方法以异步迭代器逐段返回输出，请求格式与 run 相同：
+        {"type": "token", "text"} 若干段，最后为 {"type": "done", "response": AgentResponse}，
+        失败时为 {"type": "error", "response": AgentResponse}
+        - 缓存命中时以一段返回完整输出；上游流不参与合并，完整输出在流结束后写入缓存
+        - 消费方停止迭代（aclose 或任务取消，如客户端断开）时关闭上游连接并释放调度槽位
+        - 消费方读得慢时不再从上游读取，由 TCP 流控向上游施加背压
+        """
+        started = time.perf_counter()
+        task = task_category(request)
+        try:
+            messages, params, priority, key = self._prepare(request)
+            additional = request.get("additional_params") or {}
+            result = None
+            if key is not None:
+                result = self.cache.lookup(key, task)
+            else:
+                self.cache.bypass(task)
+            cached = result is not None
+            if cached:
+                yield {"type": "token", "text": result["raw_output"]}
+            else:
+                async with self.scheduler.slot(priority, estimate_tokens(messages, params)) as usage:
+                    async with contextlib.aclosing(self.adapter.stream(messages, params)) as events:
+                        async for event in events:
+                            if event["type"] == "token":
+                                yield event
+                            else:
+                                result = event["response"]
+                    usage["total_tokens"] = result["tokens_used"]["total_tokens"]
+                if key is not None:
+                    self.cache.store_response(key, task, result, additional.get("cache_ttl_seconds"))
+        except LLMError as e:
+            self._log(request, task, started, e)
+            yield {"type": "error",
+                   "response": self._response(request, False, error={"code": e.code, "message": e.message})}
+            return
+        self._log(request, task, started, cached=cached, first_token_ms=result.get("first_token_ms"))
+        yield {"type": "done", "response": self._response(request, True, {**result, "cached": cached})}
+
+
+_handler: Optional[LLMHandler] = None
+
+
+async def run(request: Dict[str, Any]) -> Dict[str, Any]:
+    """模块入口：使用进程内共享的 LLMHandler 执行调用"""
+    global _handler
+    if _handler is None:
+        _handler = LLMHandler()
+    return await _handler.run(request)
+
+
+def stream(request: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """流式入口：返回进程内共享的 LLMHandler 的流式迭代器，事件格式见 LLMHandler.stream"""
+    global _handler
+    if _handler is None:
+        _handler = LLMHandler()
+    return _handler.stream(request)
@@ -0,0 +1,261 @@
+# scheduler.py 负责 LLM 调用的排队与并发控制（G-3.2 并发控制）
+# 按优先级类别分别限制并发数与每分钟 token 预算，全局并发不超过 H-3.1 的 100；
+# 同一缓存键的调用在上游返回前只发出一次（single-flight），其余调用等待同一结果
+# 只使用 asyncio 原语（H-2.3）
+
+# 导入标准库
+import asyncio
+import contextlib
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+from utilities.monitor.monitor import MetricsRegistry, registry
+
+# PRIORITIES 按从高到低排列：interactive 为用户等待中的调用（MBTI 分析文本、入职时的打标签），
+# standard 为默认，bulk 为批量任务（retag 等）
+PRIORITIES = ("interactive", "standard", "bulk")
+DEFAULT_PRIORITY = "standard"
+# MAX_CONCURRENT_CALLS 为 H-3.1 规定的全局并发上限
+MAX_CONCURRENT_CALLS = 100
+# DEFAULT_CLASSES 为每个优先级的 (并发上限, 每分钟 token 预算)，预算为 None 表示不限
+# bulk 的并发上限低于全局上限，批量任务占满自身配额时 interactive 仍有空闲槽位
+DEFAULT_CLASSES = {
+    "interactive": (60, None),
+    "standard": (30, None),
+    "bulk": (20, 300000),
+}
+# BURST_SECONDS 为 token 桶容量对应的秒数：空闲后最多一次放行这么多秒的预算
+BURST_SECONDS = 10.0
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(messages: List[Dict[str, str]], params: Dict[str, Any]) -> int:
+    """estimate_tokens 函数按字符数估算输入 token，加上 max_tokens 作为调用前的预算占用"""
+    return sum(len(message["content"]) for message in messages) // CHARS_PER_TOKEN + int(params["max_tokens"])
+
+
+class TokenBudget:
+    """
+    TokenBudget 类为一个优先级类别的每分钟 token 预算（token 桶）
+    - 调用前按估算值扣除，调用结束后按实际 total_tokens 多退少补
+    - 单次估算超过桶容量时，桶满即放行，避免大请求永远排不上
+    """
+
+    def __init__(self, tokens_per_minute: float, burst_seconds: float = BURST_SECONDS):
+        self.rate = tokens_per_minute / 60.0
+        self.capacity = self.rate * burst_seconds
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def take(self, tokens: int, now: float) -> float:
+        """take 方法尝试扣除 tokens：成功返回 0，否则返回还需等待的秒数"""
+        self._refill(now)
+        needed = min(tokens, self.capacity)
+        if self.available >= needed:
+            self.available -= tokens
+            return 0.0
+        return (needed - self.available) / self.rate
+
+    def adjust(self, tokens: float) -> None:
+        """adjust 方法退还（正数）或追加扣除（负数）tokens"""
+        self.available = min(self.capacity, self.available + tokens)
+
+
+class _Ticket:
+    """一次排队中的上游调用"""
+
+    __slots__ = ("priority", "tokens", "future", "enqueued_at", "granted_priority")
+
+    def __init__(self, priority: str, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.perf_counter_ns()
+        self.granted_priority: Optional[str] = None
+
+
+class _Flight:
+    """一次上游调用及等待其结果的调用方数量"""
+
+    __slots__ = ("ticket", "task", "waiters")
+
+    def __init__(self, ticket: _Ticket):
+        self.ticket = ticket
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+
+
+class LLMScheduler:
+    """
+    LLMScheduler 类调度 LLM 上游调用
+    - 每个优先级一个 FIFO 队列；有空闲槽位时从高优先级往低优先级放行，
+      某一类别达到自身并发上限或 token 预算不足时跳过该类别，低优先级类别仍可放行
+    - submit 给出 key 时，相同 key 的在途调用合并为一次；合并进来的调用优先级更高且原调用仍在排队时，
+      原调用提升到更高优先级的队尾
+    - 所有等待方都取消（客户端断开）时取消在途调用
+    - 指标：llm_handler_agent_queue_wait_seconds{priority}（排队时长）、
+      llm_handler_agent_coalesced_total{priority}（被合并的调用数）
+    """
+
+    def __init__(self, classes: Optional[Dict[str, Any]] = None, max_concurrent: int = MAX_CONCURRENT_CALLS,
+                 burst_seconds: float = BURST_SECONDS, metrics_registry: Optional[MetricsRegistry] = None):
+        classes = {**DEFAULT_CLASSES, **(classes or {})}
+        self.max_concurrent = max_concurrent
+        # limits / budgets 为每个优先级的并发上限与 token 预算
+        self.limits = {priority: classes[priority][0] for priority in PRIORITIES}
+        self.budgets = {priority: TokenBudget(classes[priority][1], burst_seconds)
+                        for priority in PRIORITIES if classes[priority][1]}
+        self.queues: Dict[str, Deque[_Ticket]] = {priority: deque() for priority in PRIORITIES}
+        self.running = {priority: 0 for priority in PRIORITIES}
+        self.running_total = 0
+        # inflight 保存 key → 在途调用
+        self.inflight: Dict[str, _Flight] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        target = metrics_registry or registry
+        wait = target.histogram("llm_handler_agent_queue_wait_seconds",
+                                "Time LLM calls spend queued before reaching the upstream API", ("priority",))
+        coalesced = target.counter("llm_handler_agent_coalesced_total",
+                                   "LLM calls served by an identical in-flight call", ("priority",))
+        self._wait_series = {priority: wait.labels(priority) for priority in PRIORITIES}
+        self._coalesced_series = {priority: coalesced.labels(priority) for priority in PRIORITIES}
+
+    async def submit(self, key: Optional[str], priority: str, tokens: int,
+                     call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        submit 方法排队执行 call() 并返回其结果
+        key 为 None 时不参与合并（如绕过缓存的非确定性调用）；tokens 为调用前的 token 估算
+        """
+        if priority not in self.queues:
+            raise ValueError(f"unknown priority: {priority}")
+        flight = self.inflight.get(key) if key is not None else None
+        if flight is None:
+            flight = _Flight(_Ticket(priority, tokens, asyncio.get_running_loop().create_future()))
+            flight.task = asyncio.ensure_future(self._execute(flight.ticket, call))
+            if key is not None:
+                self.inflight[key] = flight
+                flight.task.add_done_callback(lambda _, key=key, flight=flight: self._forget(key, flight))
+        else:
+            self._coalesced_series[priority].inc()
+            self._promote(flight.ticket, priority)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+
+        if self.inflight.get(key) is flight:
+            del self.inflight[key]
+
+    def _promote(self, ticket: _Ticket, priority: str) -> None:
+        """
+        _promote 方法把尚未放行的调用移到更高优先级的队尾
+        _execute 任务还没运行时调用尚未入队，只改优先级，入队时即进入更高优先级的队列
+        """
+        if ticket.future.done() or PRIORITIES.index(priority) >= PRIORITIES.index(ticket.priority):
+            return
+        queue = self.queues[ticket.priority]
+        ticket.priority = priority
+        if ticket in queue:
+            queue.remove(ticket)
+            self.queues[priority].append(ticket)
+            self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: str, tokens: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        slot 方法排队占用一个槽位直到退出，不参与合并（如流式输出，每个调用方各自消费一条上游流）
+        退出前把实际用量写入 yield 出的字典的 total_tokens，用于校正 token 预算
+        """
+        if priority not in self.queues:
+            raise ValueError(f"unknown priority: {priority}")
+        ticket = _Ticket(priority, tokens, asyncio.get_running_loop().create_future())
+        await self._acquire(ticket)
+        usage: Dict[str, Any] = {}
+        try:
+            yield usage
+        finally:
+            self._release(ticket, usage.get("total_tokens"))
+
+    async def _acquire(self, ticket: _Ticket) -> None:
+
+        self.queues[ticket.priority].append(ticket)
+        self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.granted_priority is not None:
+                self._release(ticket, None)
+            else:
+                self.queues[ticket.priority].remove(ticket)
+            raise
+        self._wait_series[ticket.granted_priority].record(time.perf_counter_ns() - ticket.enqueued_at)
+
+    async def _execute(self, ticket: _Ticket, call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+
+        await self._acquire(ticket)
+        tokens_used = None
+        try:
+            result = await call()
+            tokens_used = (result.get("tokens_used") or {}).get("total_tokens")
+            return result
+        finally:
+            self._release(ticket, tokens_used)
+
+    def _release(self, ticket: _Ticket, tokens_used: Optional[int]) -> None:
+
+        priority = ticket.granted_priority
+        self.running[priority] -= 1
+        self.running_total -= 1
+        budget = self.budgets.get(priority)
+        if budget is not None and tokens_used is not None:
+            budget.adjust(ticket.tokens - tokens_used)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """_dispatch 方法按优先级放行排队中的调用，token 预算不足时定时重试"""
+        now = time.monotonic()
+        retry_after = None
+        for priority in PRIORITIES:
+            queue = self.queues[priority]
+            budget = self.budgets.get(priority)
+            while queue and self.running_total < self.max_concurrent and self.running[priority] < self.limits[priority]:
+                ticket = queue[0]
+                if budget is not None:
+                    wait = budget.take(ticket.tokens, now)
+                    if wait:
+                        retry_after = wait if retry_after is None else min(retry_after, wait)
+                        break
+                queue.popleft()
+                self.running[priority] += 1
+                self.running_total += 1
+                ticket.granted_priority = priority
+                ticket.future.set_result(None)
+        if retry_after is not None:
+            loop = asyncio.get_running_loop()
+            if self._timer is not None and self._timer.when() <= loop.time() + retry_after:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = loop.call_later(retry_after, self._wake)
+
+    def _wake(self) -> None:
+
+        self._timer = None
+        self._dispatch()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """snapshot 方法返回每个优先级当前的排队数、运行数与可用 token"""
+        return {priority: {"queued": len(self.queues[priority]), "running": self.running[priority],
+                           "tokens_available": (round(self.budgets[priority].available)
+                                                if priority in self.budgets else None)}
+                for priority in PRIORITIES}
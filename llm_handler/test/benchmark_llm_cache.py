@@ -0,0 +1,166 @@
+# benchmark_llm_cache.py - LLM 响应缓存命中率与延迟基准脚本
+# 职责：以合成的调用序列（taggings、ninetest、final_analysis、company_identity 四类模板调用，
+#       变量重复但渲染时空白 / 键顺序不同，另加绕过缓存的对话调用）驱动 LLMHandler，
+#       对比精确 prompt 键与模板键的分任务命中率、总耗时；并测量进程重启后（LRU 清空）持久层命中、
+#       SQLite 按字节上限淘汰后的库大小
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到Python路径，以便导入llm_handler和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from llm_handler.llm_cache import LLMCache, SQLiteStore
+from llm_handler.llm_handler import LLMHandler
+from utilities.logger.logger import configure_logging
+
+CALLS = 3000
+# UPSTREAM_LATENCY_MS 为模拟上游单次调用耗时
+UPSTREAM_LATENCY_MS = 5.0
+# 每类任务：(template_id, 不同变量组合数, Zipf 指数)
+TASKS = {
+    "taggings": ("taggings.layer_2_skills.v1", 400, 1.1),
+    "ninetest": ("ninetest.narrative.v1", 60, 0.9),
+    "final_analysis": ("final_analysis.report.v1", 300, 0.6),
+    "company_identity": ("company_identity.summary.v1", 120, 1.0),
+}
+
+
+class SimulatedUpstream:
+    """进程内的上游替身：固定延迟返回与 prompt 相关的输出，接口与 LiteLLMAdapter.complete 一致"""
+
+    model = "gpt-4o-2024-08-06"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, messages, params):
+        self.calls += 1
+        await asyncio.sleep(UPSTREAM_LATENCY_MS / 1e3)
+        content = messages[-1]["content"]
+        return {"raw_output": f"output for {len(content)} chars", "model_used": self.model,
+                "tokens_used": {"prompt_tokens": len(content) // 4, "completion_tokens": 50,
+                                "total_tokens": len(content) // 4 + 50},
+                "call_duration_ms": UPSTREAM_LATENCY_MS}
+
+
+def render(template_id, variables, rng):
+    """模拟调用方渲染模板：变量顺序与空白随调用点不同"""
+    items = list(variables.items())
+    rng.shuffle(items)
+    spacing = rng.choice((" ", "  ", "\n"))
+    body = spacing.join(f"{name}:{spacing}{value}" for name, value in items)
+    return f"[{template_id}]{spacing}{body}{rng.choice(('', ' ', chr(10)))}"
+
+
+def make_requests(seed=7):
+    rng = random.Random(seed)
+    weights = {task: [1 / (rank + 1) ** exponent for rank in range(count)]
+               for task, (_, count, exponent) in TASKS.items()}
+    requests = []
+    for index in range(CALLS):
+        if rng.random() < 0.1:
+            requests.append({"request_id": f"r{index}", "task_type": "llm_chat",
+                             "context": {"data": {"prompt": f"free chat turn {index}"}},
+                             "additional_params": {"task": "chat", "cache": False, "temperature": 1.0}})
+            continue
+        task = rng.choice(list(TASKS))
+        template_id = TASKS[task][0]
+        choice = rng.choices(range(TASKS[task][1]), weights[task])[0]
+        variables = {"entity_id": f"{task}-{choice}", "locale": "en", "fields": ["summary", "skills"]}
+        requests.append({"request_id": f"r{index}", "task_type": "llm_json",
+                         "context": {"data": {"prompt": render(template_id, variables, rng),
+                                              "template_id": template_id,
+                                              "variables": {name: f" {value} " if isinstance(value, str) else value
+                                                            for name, value in variables.items()}}},
+                         "additional_params": {"temperature": 0.0}})
+    return requests
+
+
+async def drive(handler, requests):
+    started = time.perf_counter()
+    for request in requests:
+        response = await handler.run(request)
+        assert response["success"], response["error"]
+    return time.perf_counter() - started
+
+
+def strip_templates(requests):
+    """去掉 template_id 与 variables，使缓存键退化为精确 prompt 文本"""
+    stripped = []
+    for request in requests:
+        data = {key: value for key, value in request["context"]["data"].items()
+                if key not in ("template_id", "variables")}
+        task = request["context"]["data"].get("template_id", "").split(".", 1)[0]
+        additional = {**request["additional_params"], **({"task": task} if task else {})}
+        stripped.append({**request, "context": {"data": data}, "additional_params": additional})
+    return stripped
+
+
+def report(title, cache, upstream, elapsed):
+    print(f"{title}: {upstream.calls} upstream calls, {elapsed:.2f}s")
+    rates = cache.hit_rates()
+    for task in sorted(cache.stats):
+        counters = cache.stats[task]
+        print(f"  {task:<18} hit rate {rates[task]:6.1%}  lru {counters['hits']:>5}  "
+              f"store {counters['store_hits']:>4}  miss {counters['misses']:>4}  bypassed {counters['bypassed']:>4}")
+
+
+def main():
+    # 每次调用一条 llm_call 日志，基准中只保留警告以上
+    configure_logging(level=logging.WARNING)
+    requests = make_requests()
+    with tempfile.TemporaryDirectory() as directory:
+        for title, workload, name in (("exact-prompt keys", strip_templates(requests), "exact"),
+                                      ("template-aware keys", requests, "template")):
+            store = SQLiteStore(os.path.join(directory, f"{name}.sqlite3"))
+            cache = LLMCache(store, max_entries=256)
+            upstream = SimulatedUpstream()
+            elapsed = asyncio.run(drive(LLMHandler(upstream, cache), workload))
+            report(title, cache, upstream, elapsed)
+            store.close()
+            print()
+
+        # 重启：新进程只保留持久层
+        store = SQLiteStore(os.path.join(directory, "template.sqlite3"))
+        cache = LLMCache(store, max_entries=256)
+        upstream = SimulatedUpstream()
+        elapsed = asyncio.run(drive(LLMHandler(upstream, cache), requests))
+        report("after restart (empty LRU, warm SQLite)", cache, upstream, elapsed)
+        store.close()
+
+        # 按字节上限淘汰
+        store = SQLiteStore(os.path.join(directory, "bounded.sqlite3"), max_bytes=32 * 1024)
+        cache = LLMCache(store, max_entries=64)
+        asyncio.run(drive(LLMHandler(SimulatedUpstream(), cache), requests))
+        rows = store.connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        print(f"\nbounded store (32 KiB): {rows} entries, {store.total_bytes} bytes kept")
+        assert store.total_bytes <= store.max_bytes
+        store.close()
+
+        # 单次查找耗时
+        store = SQLiteStore(os.path.join(directory, "template.sqlite3"))
+        keys = [row[0] for row in store.connection.execute("SELECT key FROM llm_cache")]
+        cache = LLMCache(store, max_entries=len(keys))
+        started = time.perf_counter()
+        for key in keys:
+            cache.lookup(key, "bench")
+        store_us = (time.perf_counter() - started) / len(keys) * 1e6
+        started = time.perf_counter()
+        for key in keys:
+            cache.lookup(key, "bench")
+        lru_us = (time.perf_counter() - started) / len(keys) * 1e6
+        print(f"lookup latency: SQLite {store_us:.1f} us, LRU {lru_us:.2f} us "
+              f"(upstream call {UPSTREAM_LATENCY_MS * 1e3:.0f} us simulated)")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
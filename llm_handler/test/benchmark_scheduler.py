@@ -0,0 +1,174 @@
+# benchmark_scheduler.py - LLM 调用调度（优先级并发、token 预算、single-flight 合并）基准脚本
+# 职责：启动本地 OpenAI 兼容模拟服务（mock_llm_server.py），经 LiteLLMAdapter 真实 HTTP 调用驱动 LLMHandler：
+#       1. 50 个相同的并发调用，核对上游只收到 1 次请求（对比绕过缓存、不合并时的 50 次）
+#       2. 批量调用占满队列时穿插 interactive 调用，对比单一 FIFO 并发上限（等价于普通信号量）
+#          与优先级调度下 interactive 的端到端延迟与各优先级排队时长
+#       3. bulk 配置每分钟 token 预算时的实际 token 吞吐
+
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+# 将项目根目录添加到Python路径，以便导入llm_handler和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from llm_handler.adapter import LiteLLMAdapter
+from llm_handler.llm_cache import LLMCache
+from llm_handler.llm_handler import LLMHandler
+from llm_handler.scheduler import PRIORITIES, LLMScheduler
+from utilities.logger.logger import configure_logging
+from utilities.monitor.monitor import MetricsRegistry
+
+LATENCY_MS = 200.0
+# 生成速度取高值，上游耗时以首 token 延迟为主
+TOKENS_PER_SECOND = 1000.0
+BULK_CALLS = 120
+INTERACTIVE_CALLS = 20
+INTERACTIVE_INTERVAL = 0.1
+CONCURRENCY = 8
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    process = subprocess.Popen([sys.executable, os.path.join(current_dir, "mock_llm_server.py"),
+                                "--port", str(port), "--latency-ms", str(LATENCY_MS),
+                                "--tokens-per-second", str(TOKENS_PER_SECOND)])
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/stats", timeout=1.0)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("mock LLM server did not start")
+
+
+def server_stats(port, reset=False):
+    if reset:
+        return httpx.post(f"http://127.0.0.1:{port}/stats/reset").json()
+    return httpx.get(f"http://127.0.0.1:{port}/stats").json()
+
+
+def request(index, prompt, priority="standard", cache=True, max_tokens=64):
+    return {"request_id": f"r{index}", "task_type": "llm_completion",
+            "context": {"data": {"prompt": prompt}},
+            "additional_params": {"priority": priority, "cache": cache, "max_tokens": max_tokens,
+                                  "temperature": 0.0}}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+async def timed_run(handler, item):
+    started = time.perf_counter()
+    response = await handler.run(item)
+    assert response["success"], response["error"]
+    return time.perf_counter() - started
+
+
+async def coalescing(adapter, port):
+    for cache in (False, True):
+        server_stats(port, reset=True)
+        handler = LLMHandler(adapter, LLMCache(), LLMScheduler(metrics_registry=MetricsRegistry()))
+        started = time.perf_counter()
+        await asyncio.gather(*(timed_run(handler, request(index, "summarize the MBTI profile INTJ", cache=cache))
+                               for index in range(50)))
+        elapsed = time.perf_counter() - started
+        label = "single-flight" if cache else "cache bypassed"
+        print(f"  {label:<15} 50 identical calls -> {server_stats(port)['requests']:>2} upstream requests, "
+              f"{elapsed:.2f}s")
+    assert server_stats(port)["requests"] == 1
+
+
+async def mixed_load(adapter, port, prioritized):
+    metrics = MetricsRegistry()
+    classes = {"interactive": (CONCURRENCY, None), "standard": (CONCURRENCY, None),
+               "bulk": (CONCURRENCY - 2, None)}
+    scheduler = LLMScheduler(classes, max_concurrent=CONCURRENCY, metrics_registry=metrics)
+    handler = LLMHandler(adapter, LLMCache(), scheduler)
+    server_stats(port, reset=True)
+    bulk_priority, interactive_priority = ("bulk", "interactive") if prioritized else ("standard", "standard")
+    bulk = [asyncio.ensure_future(timed_run(handler, request(index, f"retag profile {index}", bulk_priority)))
+            for index in range(BULK_CALLS)]
+    interactive = []
+    for index in range(INTERACTIVE_CALLS):
+        await asyncio.sleep(INTERACTIVE_INTERVAL)
+        interactive.append(asyncio.ensure_future(
+            timed_run(handler, request(index, f"MBTI analysis text {index}", interactive_priority))))
+    interactive_latency = await asyncio.gather(*interactive)
+    bulk_latency = await asyncio.gather(*bulk)
+    assert server_stats(port)["max_active"] <= CONCURRENCY
+    waits = metrics.metrics["llm_handler_agent_queue_wait_seconds"].series
+    label = "priority classes" if prioritized else "single FIFO limit"
+    print(f"  {label:<18} interactive p50 {percentile(interactive_latency, 0.5) * 1e3:6.0f} ms  "
+          f"p95 {percentile(interactive_latency, 0.95) * 1e3:6.0f} ms   bulk p95 "
+          f"{percentile(bulk_latency, 0.95) * 1e3:6.0f} ms   max upstream concurrency {server_stats(port)['max_active']}")
+    for priority in PRIORITIES:
+        series = waits.get((priority,))
+        if series is not None and series.count:
+            print(f"    queue wait {priority:<12} n={series.count:<4} p50 {series.quantile(0.5) * 1e3:7.1f} ms  "
+                  f"p95 {series.quantile(0.95) * 1e3:7.1f} ms")
+    return percentile(interactive_latency, 0.95)
+
+
+async def token_budget(adapter, port):
+    tokens_per_minute = 600000
+    scheduler = LLMScheduler({"bulk": (20, tokens_per_minute)}, burst_seconds=1.0, metrics_registry=MetricsRegistry())
+    handler = LLMHandler(adapter, LLMCache(), scheduler)
+    prompt = "candidate profile text " * 70
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(handler.run(request(index, f"{index} {prompt}", "bulk", max_tokens=100))
+                                       for index in range(100)))
+    elapsed = time.perf_counter() - started
+    used = sum(response["response"]["tokens_used"]["total_tokens"] for response in responses)
+    print(f"  bulk budget {tokens_per_minute / 60:,.0f} tokens/s (1 s burst): {used:,} tokens in {elapsed:.2f}s "
+          f"= {used / elapsed:,.0f} tokens/s")
+
+
+async def main_async(port):
+    # 离线环境下避免 litellm 导入时联网拉取模型价格表
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    adapter = LiteLLMAdapter(api_base=f"http://127.0.0.1:{port}/v1", api_key="mock-key")
+    adapter.preload()
+    print("single-flight coalescing")
+    await coalescing(adapter, port)
+    print("\ninteractive calls during a bulk backlog "
+          f"({BULK_CALLS} bulk, {INTERACTIVE_CALLS} interactive, {CONCURRENCY} upstream slots, "
+          f"{LATENCY_MS:.0f} ms upstream latency)")
+    fifo = await mixed_load(adapter, port, prioritized=False)
+    prioritized = await mixed_load(adapter, port, prioritized=True)
+    assert prioritized < fifo
+    print("\ntoken-per-minute budget")
+    await token_budget(adapter, port)
+
+
+def main():
+    # 每次调用一条 llm_call 日志，基准中只保留警告以上
+    configure_logging(level=logging.WARNING)
+    port = free_port()
+    server = start_server(port)
+    try:
+        asyncio.run(main_async(port))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
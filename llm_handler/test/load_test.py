@@ -0,0 +1,233 @@
+# load_test.py - llm_handler 负载测试脚本
+# 职责：经本地 OpenAI 兼容模拟服务（mock_llm_server.py，或 --api-base 指定的已有服务）驱动 LLMHandler，
+#       按闭环并发（--concurrency）或开环泊松到达（--rate）发出请求，prompt 从有限集合中按 Zipf 抽取
+#       （重复的 prompt 经缓存与 single-flight 合并），可混合优先级、选择流式输出；
+#       报告吞吐（请求/秒、生成 token/秒）、端到端延迟与流式首 token 延迟的 p50/p90/p99/max、
+#       各优先级排队时长、按错误码统计的失败数、缓存命中与合并数，以及上游实际收到的请求数
+# 用法：python llm_handler/test/load_test.py --requests 1000 --concurrency 64 --latency lognormal:400:0.6 \
+#           --error-rate 0.01 --rate-limit-rate 0.02 --priorities interactive=0.2,standard=0.5,bulk=0.3
+
+import argparse
+import asyncio
+import collections
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+# 将项目根目录添加到Python路径，以便导入llm_handler和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from llm_handler.adapter import LiteLLMAdapter
+from llm_handler.llm_cache import LLMCache
+from llm_handler.llm_handler import LLMHandler
+from llm_handler.scheduler import MAX_CONCURRENT_CALLS, PRIORITIES, LLMScheduler
+from utilities.logger.logger import configure_logging
+from utilities.monitor.monitor import MetricsRegistry
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test llm_handler against a local OpenAI-compatible server")
+    load = parser.add_argument_group("load")
+    load.add_argument("--requests", type=int, default=500)
+    load.add_argument("--concurrency", type=int, default=32, help="closed-loop workers (ignored with --rate)")
+    load.add_argument("--rate", type=float, default=None, help="open-loop Poisson arrivals per second")
+    load.add_argument("--unique-prompts", type=int, default=200, help="distinct prompts, drawn with Zipf(1.0)")
+    load.add_argument("--prompt-chars", type=int, default=800)
+    load.add_argument("--max-tokens", type=int, default=256)
+    load.add_argument("--priorities", default="standard=1", help="e.g. interactive=0.2,standard=0.5,bulk=0.3")
+    load.add_argument("--stream", action="store_true", help="consume LLMHandler.stream instead of run")
+    load.add_argument("--no-cache", action="store_true", help="bypass the cache (and single-flight) per call")
+    load.add_argument("--max-concurrent", type=int, default=MAX_CONCURRENT_CALLS)
+    load.add_argument("--seed", type=int, default=7)
+    server = parser.add_argument_group("mock server (ignored with --api-base)")
+    server.add_argument("--api-base", default=None, help="use an already running server, e.g. http://host:8399/v1")
+    server.add_argument("--latency", default="lognormal:400:0.5")
+    server.add_argument("--tokens-per-second", type=float, default=50.0)
+    server.add_argument("--error-rate", type=float, default=0.0)
+    server.add_argument("--rate-limit-rate", type=float, default=0.0)
+    server.add_argument("--rpm", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(args):
+    port = free_port()
+    command = [sys.executable, os.path.join(current_dir, "mock_llm_server.py"), "--port", str(port),
+               "--latency", args.latency, "--tokens-per-second", str(args.tokens_per_second),
+               "--error-rate", str(args.error_rate), "--rate-limit-rate", str(args.rate_limit_rate),
+               "--seed", str(args.seed)]
+    if args.rpm:
+        command += ["--rpm", str(args.rpm)]
+    process = subprocess.Popen(command)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/stats", timeout=1.0)
+            return process, f"http://127.0.0.1:{port}/v1"
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("mock LLM server did not start")
+
+
+def server_stats(api_base):
+    try:
+        return httpx.get(api_base.rsplit("/v1", 1)[0] + "/stats", timeout=2.0).json()
+    except (httpx.HTTPError, ValueError):
+        return None
+
+
+def make_workload(args):
+    """按种子生成 (请求, 计划发出时间) 列表；闭环模式下计划时间为 None"""
+    rng = random.Random(args.seed)
+    weights = [1.0 / (rank + 1) for rank in range(args.unique_prompts)]
+    mix = {}
+    for item in args.priorities.split(","):
+        name, _, weight = item.partition("=")
+        if name not in PRIORITIES:
+            raise SystemExit(f"unknown priority: {name}")
+        mix[name] = float(weight or 1)
+    filler = ("candidate experience summary " * (args.prompt_chars // 29 + 1))[:args.prompt_chars]
+    workload = []
+    at = 0.0
+    for index in range(args.requests):
+        prompt_id = rng.choices(range(args.unique_prompts), weights)[0]
+        priority = rng.choices(list(mix), list(mix.values()))[0]
+        request = {"request_id": f"load-{index}", "task_type": "llm_completion",
+                   "context": {"data": {"prompt": f"[prompt {prompt_id}] {filler}"}},
+                   "additional_params": {"priority": priority, "max_tokens": args.max_tokens,
+                                         "cache": not args.no_cache, "task": "load_test"}}
+        if args.rate:
+            at += rng.expovariate(args.rate)
+        workload.append((request, at if args.rate else None))
+    return workload
+
+
+async def issue(handler, request, stream, results):
+    started = time.perf_counter()
+    first_token = None
+    if stream:
+        response = None
+        async for event in handler.stream(request):
+            if event["type"] == "token":
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+            else:
+                response = event["response"]
+    else:
+        response = await handler.run(request)
+    elapsed = time.perf_counter() - started
+    body = response.get("response") or {}
+    results.append({"priority": request["additional_params"]["priority"], "latency": elapsed,
+                    "first_token": first_token, "success": response["success"],
+                    "error": (response.get("error") or {}).get("code"), "cached": body.get("cached", False),
+                    "completion_tokens": (body.get("tokens_used") or {}).get("completion_tokens", 0)})
+
+
+async def drive(handler, workload, args):
+    results = []
+    started = time.perf_counter()
+    if args.rate:
+        tasks = []
+        for request, at in workload:
+            delay = at - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(issue(handler, request, args.stream, results)))
+        await asyncio.gather(*tasks)
+    else:
+        pending = collections.deque(request for request, _ in workload)
+
+        async def worker():
+            while pending:
+                await issue(handler, pending.popleft(), args.stream, results)
+
+        await asyncio.gather(*(worker() for _ in range(min(args.concurrency, len(workload)))))
+    return results, time.perf_counter() - started
+
+
+def percentiles(values):
+    values = sorted(values)
+    if not values:
+        return "-"
+    pick = [values[min(len(values) - 1, int(q * len(values)))] for q in (0.5, 0.9, 0.99)]
+    return "  ".join(f"{label} {value * 1e3:7.0f} ms" for label, value in zip(("p50", "p90", "p99"), pick)) + \
+        f"  max {values[-1] * 1e3:7.0f} ms"
+
+
+def report(args, results, elapsed, metrics, stats):
+    succeeded = [result for result in results if result["success"]]
+    tokens = sum(result["completion_tokens"] for result in succeeded if not result["cached"])
+    mode = f"open loop {args.rate:g} req/s" if args.rate else f"closed loop, {args.concurrency} workers"
+    print(f"{len(results)} requests ({mode}, {'stream' if args.stream else 'run'}, "
+          f"{args.unique_prompts} distinct prompts) in {elapsed:.2f}s")
+    print(f"  throughput      {len(succeeded) / elapsed:8.1f} req/s   {tokens / elapsed:10,.0f} generated tokens/s")
+    print(f"  latency         {percentiles([result['latency'] for result in succeeded])}")
+    print(f"  uncached        {percentiles([result['latency'] for result in succeeded if not result['cached']])}")
+    if args.stream:
+        print(f"  first token     {percentiles([r['first_token'] for r in succeeded if r['first_token'] is not None])}")
+    for priority in PRIORITIES:
+        latencies = [result["latency"] for result in succeeded if result["priority"] == priority]
+        if latencies:
+            print(f"  {priority:<15} {percentiles(latencies)}   n={len(latencies)}")
+    waits = metrics.metrics["llm_handler_agent_queue_wait_seconds"].series
+    for priority in PRIORITIES:
+        series = waits.get((priority,))
+        if series is not None and series.count:
+            print(f"  queue wait {priority:<12} p50 {series.quantile(0.5) * 1e3:7.1f} ms  "
+                  f"p99 {series.quantile(0.99) * 1e3:7.1f} ms")
+    errors = collections.Counter(result["error"] for result in results if not result["success"])
+    coalesced = sum(series.value for series in metrics.metrics["llm_handler_agent_coalesced_total"].series.values())
+    print(f"  failed          {sum(errors.values())}  " + "  ".join(f"{code} {count}" for code, count in errors.items()))
+    print(f"  cache hits      {sum(result['cached'] for result in succeeded)}   coalesced {coalesced}")
+    if stats is not None:
+        # 上游收到的请求数多于未命中缓存、未被合并的调用数时，差额为 SDK 内置的自动重试
+        calls = len(results) - sum(result["cached"] for result in succeeded) - coalesced
+        print(f"  upstream        {stats['requests']} requests received for {calls} calls "
+              f"({max(0, stats['requests'] - calls)} SDK retries), {stats['errors']} injected 500, "
+              f"{stats['rate_limited']} answered 429, max {stats['max_active']} concurrent")
+
+
+async def main_async(args, api_base):
+    metrics = MetricsRegistry()
+    adapter = LiteLLMAdapter(api_base=api_base, api_key=os.environ.get("OPENAI_API_KEY") or "mock-key")
+    adapter.preload()
+    handler = LLMHandler(adapter, LLMCache(), LLMScheduler(max_concurrent=args.max_concurrent,
+                                                           metrics_registry=metrics))
+    results, elapsed = await drive(handler, make_workload(args), args)
+    report(args, results, elapsed, metrics, server_stats(api_base))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # 每次调用一条 llm_call 日志，负载测试中只保留警告以上
+    configure_logging(level=logging.WARNING)
+    # 离线环境下避免 litellm 导入时联网拉取模型价格表
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    server = None
+    api_base = args.api_base
+    if api_base is None:
+        server, api_base = start_mock(args)
+    try:
+        asyncio.run(main_async(args, api_base))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# mock_llm_server.py - 本地 OpenAI 兼容 LLM 模拟服务
+# 职责：提供 POST /v1/chat/completions，按 prompt 哈希返回确定的输出与 token 用量；
+#       首 token 前的延迟按可配置的分布抽样，之后按 tokens_per_second 生成（每个词计一个 token）：
+#       非流式在全部生成后一次返回，stream=true 时逐词以 SSE 分块返回；
+#       可按比例注入 500 错误与 429 限流，或按每分钟请求数上限返回 429（带 Retry-After）；
+#       延迟与错误注入的随机数以 (seed, prompt 哈希, 该 prompt 第几次出现) 为种子，同一请求序列的结果可复现；
+#       GET /stats 返回请求数、最大同时处理数、中途断开的流数与注入的错误数，供基准脚本核对
+# 用法：python llm_handler/test/mock_llm_server.py --port 8399 --latency lognormal:400:0.5 --tokens-per-second 50 \
+#           --error-rate 0.01 --rate-limit-rate 0.02 --rpm 600 --seed 7
+#       llm_handler 侧设置 LLM_API_BASE=http://127.0.0.1:8399/v1
+
+import argparse
+import asyncio
+import collections
+import hashlib
+import json
+import math
+import random
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = ("analysis", "profile", "skill", "career", "growth", "team", "role", "signal", "pattern", "context",
+         "strength", "risk", "market", "fit", "experience", "trait")
+CHARS_PER_TOKEN = 4
+
+
+class LatencyDistribution:
+    """
+    首 token 延迟分布，spec 格式（单位毫秒）：
+    fixed:MS、uniform:LOW:HIGH、lognormal:MEDIAN:SIGMA、exponential:MEAN；纯数字等同 fixed
+    """
+
+    def __init__(self, spec):
+        kind, *values = str(spec).split(":")
+        if not values:
+            kind, values = "fixed", [kind]
+        arity = {"fixed": 1, "uniform": 2, "lognormal": 2, "exponential": 1}
+        if kind not in arity or len(values) != arity[kind]:
+            raise ValueError(f"invalid latency distribution: {spec}")
+        self.spec = str(spec)
+        self.kind = kind
+        self.values = [float(value) for value in values]
+
+    def sample(self, rng):
+        """返回一次抽样的延迟秒数"""
+        if self.kind == "fixed":
+            milliseconds = self.values[0]
+        elif self.kind == "uniform":
+            milliseconds = rng.uniform(*self.values)
+        elif self.kind == "lognormal":
+            milliseconds = rng.lognormvariate(math.log(self.values[0]), self.values[1])
+        else:
+            milliseconds = rng.expovariate(1.0 / self.values[0])
+        return milliseconds / 1e3
+
+
+def prompt_digest(messages):
+    return hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).digest()
+
+
+def completion_text(messages, max_tokens):
+    """按消息内容哈希生成确定的输出，长度不超过 max_tokens 个词"""
+    digest = prompt_digest(messages)
+    count = min(max_tokens, 16 + digest[0] % 48)
+    return " ".join(WORDS[digest[index % len(digest)] % len(WORDS)] for index in range(count))
+
+
+def usage_of(messages, content):
+    prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // CHARS_PER_TOKEN
+    completion_tokens = len(content.split())
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+def error_response(status, message, error_type, code, headers=None):
+    return JSONResponse({"error": {"message": message, "type": error_type, "param": None, "code": code}},
+                        status_code=status, headers=headers)
+
+
+def create_app(latency=200.0, tokens_per_second=50.0, error_rate=0.0, rate_limit_rate=0.0,
+               requests_per_minute=None, seed=0):
+    """latency 为毫秒数（固定延迟）或 LatencyDistribution 的 spec 字符串"""
+    app = FastAPI()
+    distribution = LatencyDistribution(latency)
+    stats = {"requests": 0, "active": 0, "max_active": 0, "disconnected": 0, "errors": 0, "rate_limited": 0,
+             "completion_tokens": 0}
+    # occurrences 记录每个 prompt 哈希出现的次数，recent 为最近一分钟内接受的请求时间
+    occurrences = collections.Counter()
+    recent = collections.deque()
+
+    def request_rng(digest):
+        occurrences[digest] += 1
+        return random.Random(f"{seed}:{digest.hex()}:{occurrences[digest]}")
+
+    def rejection(rng):
+        """按每分钟请求数上限与注入比例决定是否拒绝本次请求，返回错误响应或 None"""
+        now = time.monotonic()
+        while recent and now - recent[0] >= 60.0:
+            recent.popleft()
+        if requests_per_minute and len(recent) >= requests_per_minute:
+            stats["rate_limited"] += 1
+            retry_after = max(1, math.ceil(60.0 - (now - recent[0])))
+            return error_response(429, "Rate limit reached for requests", "requests", "rate_limit_exceeded",
+                                  {"retry-after": str(retry_after)})
+        roll = rng.random()
+        if roll < error_rate:
+            stats["errors"] += 1
+            return error_response(500, "The server had an error while processing your request", "server_error",
+                                  None)
+        if roll < error_rate + rate_limit_rate:
+            stats["rate_limited"] += 1
+            return error_response(429, "Rate limit reached for tokens", "tokens", "rate_limit_exceeded",
+                                  {"retry-after": "1"})
+        recent.append(now)
+        return None
+
+    def begin():
+        stats["active"] += 1
+        stats["max_active"] = max(stats["max_active"], stats["active"])
+
+    async def chunks(body, content, completion_id, first_token_delay):
+        finished = False
+        try:
+            await asyncio.sleep(first_token_delay)
+            base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": body.get("model", "mock")}
+            words = content.split(" ")
+            for index, word in enumerate(words):
+                text = word if index == 0 else " " + word
+                choice = {"index": 0, "delta": {"role": "assistant", "content": text}, "finish_reason": None}
+                yield f"data: {json.dumps({**base, 'choices': [choice]})}\n\n"
+                stats["completion_tokens"] += 1
+                await asyncio.sleep(1.0 / tokens_per_second)
+            choice = {"index": 0, "delta": {}, "finish_reason": "stop"}
+            yield f"data: {json.dumps({**base, 'choices': [choice]})}\n\n"
+            if (body.get("stream_options") or {}).get("include_usage"):
+                usage = usage_of(body.get("messages") or [], content)
+                yield f"data: {json.dumps({**base, 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+            finished = True
+        finally:
+            stats["active"] -= 1
+            if not finished:
+                stats["disconnected"] += 1
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(body: dict):
+        stats["requests"] += 1
+        messages = body.get("messages") or []
+        rng = request_rng(prompt_digest(messages))
+        rejected = rejection(rng)
+        if rejected is not None:
+            return rejected
+        begin()
+        content = completion_text(messages, int(body.get("max_tokens") or 256))
+        completion_id = "chatcmpl-" + hashlib.sha256(content.encode("utf-8")).hexdigest()[:24]
+        first_token_delay = distribution.sample(rng)
+        if body.get("stream"):
+            return StreamingResponse(chunks(body, content, completion_id, first_token_delay),
+                                     media_type="text/event-stream")
+        try:
+            await asyncio.sleep(first_token_delay + len(content.split(" ")) / tokens_per_second)
+        finally:
+            stats["active"] -= 1
+        usage = usage_of(messages, content)
+        stats["completion_tokens"] += usage["completion_tokens"]
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return {**stats, "latency": distribution.spec, "tokens_per_second": tokens_per_second,
+                "error_rate": error_rate, "rate_limit_rate": rate_limit_rate,
+                "requests_per_minute": requests_per_minute, "seed": seed}
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        stats.update(requests=0, max_active=stats["active"], disconnected=0, errors=0, rate_limited=0,
+                     completion_tokens=0)
+        occurrences.clear()
+        recent.clear()
+        return stats
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible mock LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8399)
+    parser.add_argument("--latency", default=None,
+                        help="first-token latency in ms: fixed:MS, uniform:LOW:HIGH, lognormal:MEDIAN:SIGMA, "
+                             "exponential:MEAN")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="shorthand for --latency fixed:MS")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--rpm", type=int, default=None, help="requests per minute before answering 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    app = create_app(args.latency or args.latency_ms, args.tokens_per_second, args.error_rate, args.rate_limit_rate,
+                     args.rpm, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# test_llm_cache.py - LLM 缓存 SQLite 持久层的字节计数测试
+# 职责：以两个 SQLiteStore 连接同一数据库文件模拟多个 worker，核对库内总字节数包含对方写入的条目、
+#       覆盖与淘汰后与 SUM(size) 一致、交替写入时总字节数不超过上限，以及旧版本创建的库在打开时补建计数
+# 用法：python -m pytest -q llm_handler/test/test_llm_cache.py
+
+import os
+import sqlite3
+import sys
+
+# 将项目根目录添加到Python路径，以便导入llm_handler和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from llm_handler.llm_cache import SQLiteStore
+
+
+def stored_bytes(store):
+    return store.connection.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+
+def value(size):
+    return {"raw_output": "x" * size}
+
+
+def test_workers_see_each_others_bytes(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    first, second = SQLiteStore(path), SQLiteStore(path)
+    first.put("a", "taggings", value(100), 60, now=0)
+    second.put("b", "taggings", value(200), 60, now=0)
+    assert first.total_bytes == second.total_bytes == stored_bytes(first)
+    # 覆盖同一个键只计新值
+    first.put("b", "taggings", value(10), 60, now=1)
+    assert second.total_bytes == stored_bytes(second)
+    first.close()
+    second.close()
+
+
+def test_interleaved_workers_stay_under_limit(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    workers = [SQLiteStore(path, max_bytes=4096) for _ in range(3)]
+    for index in range(300):
+        workers[index % 3].put(f"key-{index}", "taggings", value(100), 3600, now=index)
+        assert workers[0].total_bytes <= 4096
+    assert workers[1].total_bytes == stored_bytes(workers[1])
+    # 最近写入的条目保留，最早的条目被淘汰
+    keys = {row[0] for row in workers[2].connection.execute("SELECT key FROM llm_cache")}
+    assert "key-299" in keys and "key-0" not in keys
+    for worker in workers:
+        worker.close()
+
+
+def test_expired_entries_are_evicted_first(tmp_path):
+    store = SQLiteStore(str(tmp_path / "llm_cache.sqlite3"), max_bytes=1000)
+    store.put("old", "taggings", value(400), 10, now=0)
+    store.put("fresh", "taggings", value(400), 3600, now=1)
+    store.get("old", now=5)
+    store.put("new", "taggings", value(400), 3600, now=20)
+    keys = {row[0] for row in store.connection.execute("SELECT key FROM llm_cache")}
+    assert keys == {"fresh", "new"} and store.total_bytes == stored_bytes(store)
+    store.close()
+
+
+def test_counter_initialized_for_existing_database(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE llm_cache (key TEXT PRIMARY KEY, task TEXT, value TEXT NOT NULL, "
+                       "size INTEGER NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+    connection.execute("INSERT INTO llm_cache VALUES ('a', 't', '{}', 123, 1e12, 0)")
+    connection.commit()
+    connection.close()
+    store = SQLiteStore(path)
+    assert store.total_bytes == 123
+    store.close()
+    # 再次打开不重复计数
+    store = SQLiteStore(path)
+    assert store.total_bytes == 123
+    store.close()
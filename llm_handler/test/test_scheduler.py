@@ -0,0 +1,156 @@
+# test_scheduler.py - LLMScheduler 合并、优先级提升与取消的行为测试
+# 职责：不访问网络，以进程内的 call 协程驱动调度器，核对 single-flight 合并次数、
+#       合并时的优先级提升（含原调用尚未入队的情况）、按优先级放行的顺序以及等待方取消时的行为
+# 用法：python -m pytest -q llm_handler/test/test_scheduler.py
+
+import asyncio
+import os
+import sys
+
+# 将项目根目录添加到Python路径，以便导入llm_handler和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from llm_handler.scheduler import LLMScheduler
+from utilities.monitor.monitor import MetricsRegistry
+
+
+def make_scheduler(**kwargs):
+    return LLMScheduler(metrics_registry=MetricsRegistry(), **kwargs)
+
+
+async def settle():
+    """让已创建的任务都运行到各自的下一个等待点"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def coalesced(scheduler, priority):
+    return scheduler._coalesced_series[priority].value
+
+
+class Upstream:
+    """记录调用次数；release 事件置位前 call 一直挂起"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    def call(self, name):
+        async def run():
+            self.calls.append(name)
+            await self.release.wait()
+            return {"raw_output": name, "tokens_used": {"total_tokens": 1}}
+        return run
+
+
+def test_identical_calls_coalesce():
+    async def scenario():
+        scheduler = make_scheduler()
+        upstream = Upstream()
+        tasks = [asyncio.ensure_future(scheduler.submit("k", "standard", 10, upstream.call("k")))
+                 for _ in range(50)]
+        await settle()
+        upstream.release.set()
+        results = await asyncio.gather(*tasks)
+        assert upstream.calls == ["k"]
+        assert all(result["raw_output"] == "k" for result in results)
+        assert coalesced(scheduler, "standard") == 49
+        assert scheduler.inflight == {}
+
+    asyncio.run(scenario())
+
+
+def test_promote_before_leader_is_queued():
+    # 回归：原调用的 _execute 任务尚未运行时加入更高优先级的相同调用，曾因票据不在队列中抛出 ValueError
+    async def scenario():
+        scheduler = make_scheduler()
+        upstream = Upstream()
+        upstream.release.set()
+        results = await asyncio.gather(scheduler.submit("k", "bulk", 10, upstream.call("k")),
+                                       scheduler.submit("k", "interactive", 10, upstream.call("k")))
+        assert [result["raw_output"] for result in results] == ["k", "k"]
+        assert upstream.calls == ["k"]
+        assert coalesced(scheduler, "interactive") == 1
+        assert scheduler._wait_series["interactive"].count == 1
+        assert scheduler._wait_series["bulk"].count == 0
+
+    asyncio.run(scenario())
+
+
+def test_promote_queued_call_ahead_of_bulk_backlog():
+    async def scenario():
+        scheduler = make_scheduler(max_concurrent=1)
+        blocker = Upstream()
+        upstream = Upstream()
+        running = asyncio.ensure_future(scheduler.submit(None, "bulk", 10, blocker.call("blocker")))
+        backlog = [asyncio.ensure_future(scheduler.submit(f"b{index}", "bulk", 10, upstream.call(f"b{index}")))
+                   for index in range(3)]
+        shared = asyncio.ensure_future(scheduler.submit("shared", "bulk", 10, upstream.call("shared")))
+        await settle()
+        assert [ticket for ticket in scheduler.queues["bulk"]][-1] is scheduler.inflight["shared"].ticket
+        joined = asyncio.ensure_future(scheduler.submit("shared", "interactive", 10, upstream.call("shared")))
+        await settle()
+        assert scheduler.inflight["shared"].ticket in scheduler.queues["interactive"]
+        assert len(scheduler.queues["bulk"]) == 3
+        upstream.release.set()
+        blocker.release.set()
+        await asyncio.gather(running, shared, joined, *backlog)
+        assert upstream.calls == ["shared", "b0", "b1", "b2"]
+
+    asyncio.run(scenario())
+
+
+def test_dispatch_order_follows_priority():
+    async def scenario():
+        scheduler = make_scheduler(max_concurrent=1)
+        blocker = Upstream()
+        upstream = Upstream()
+        upstream.release.set()
+        running = asyncio.ensure_future(scheduler.submit(None, "standard", 10, blocker.call("blocker")))
+        await settle()
+        queued = [asyncio.ensure_future(scheduler.submit(None, priority, 10, upstream.call(priority)))
+                  for priority in ("bulk", "standard", "interactive")]
+        await settle()
+        blocker.release.set()
+        await asyncio.gather(running, *queued)
+        assert upstream.calls == ["interactive", "standard", "bulk"]
+
+    asyncio.run(scenario())
+
+
+def test_cancel_one_waiter_keeps_shared_call():
+    async def scenario():
+        scheduler = make_scheduler()
+        upstream = Upstream()
+        first = asyncio.ensure_future(scheduler.submit("k", "standard", 10, upstream.call("k")))
+        second = asyncio.ensure_future(scheduler.submit("k", "standard", 10, upstream.call("k")))
+        await settle()
+        first.cancel()
+        await settle()
+        upstream.release.set()
+        assert (await second)["raw_output"] == "k"
+        assert first.cancelled()
+        assert upstream.calls == ["k"]
+
+    asyncio.run(scenario())
+
+
+def test_cancel_all_waiters_cancels_call_and_frees_slot():
+    async def scenario():
+        scheduler = make_scheduler()
+        upstream = Upstream()
+        waiters = [asyncio.ensure_future(scheduler.submit("k", "standard", 10, upstream.call("k")))
+                   for _ in range(2)]
+        await settle()
+        flight = scheduler.inflight["k"]
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await settle()
+        assert flight.task.cancelled()
+        assert scheduler.running_total == 0
+        assert scheduler.inflight == {}
+
+    asyncio.run(scenario())
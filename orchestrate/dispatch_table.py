@@ -0,0 +1,44 @@
+# dispatch_table.py - 扁平的 intent -> 处理函数分派表
+"""
+DispatchTable 订阅 RegistryCenter 的快照发布：启动时以当前快照构建一次，之后每次模块注册、注销（热插拔）
+发布新快照时重建，得到一张 intent -> 处理函数（如 applications.mbti.router.process_mbti_request）的普通字典。
+
+Router 对每个请求只做一次字典查找即可直达模块登记的处理函数，不再先按 route_type 找到业务模块、
+再经 ModuleRegistry 和模块入口函数逐层转发。重建时整体替换字典引用，读者无需加锁。
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from orchestrate.registry_center import RegistryCenter, RegistrySnapshot
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class DispatchTable:
+    """
+    DispatchTable 持有由注册表快照构建的扁平分派字典，以及构建所依据的快照 generation
+    """
+
+    def __init__(self, registry_center: Optional[RegistryCenter] = None):
+        # _table 为 intent 到处理函数的普通字典，只会被整体替换
+        self._table: Dict[str, Handler] = {}
+        # generation 为当前分派表对应的注册表快照版本号
+        self.generation = -1
+        (registry_center or RegistryCenter()).subscribe(self.rebuild)
+
+    def rebuild(self, snapshot: RegistrySnapshot) -> None:
+        """以注册表快照重建分派表（RegistryCenter 发布新快照时回调）"""
+        self._table = dict(snapshot.intent_handlers)
+        self.generation = snapshot.generation
+
+    def get(self, intent: Optional[str]) -> Optional[Handler]:
+        """返回 intent 对应的处理函数，未注册时返回 None"""
+        return self._table.get(intent)
+
+    def intents(self) -> Dict[str, str]:
+        """返回 intent 到处理函数名称的映射，供运维查看当前分派表"""
+        return {intent: f"{handler.__module__}.{handler.__qualname__}" for intent, handler in self._table.items()}
+
+
+# dispatch_table 为全局单例，编排层共享同一张分派表
+dispatch_table = DispatchTable()
@@ -0,0 +1,161 @@
+# module_registry.py - 业务模块清单注册与按需加载
+"""
+ModuleRegistry 在启动时只读取各业务模块的 manifest.py（纯数据清单），
+据此得知每个模块支持的 intent；模块实现（router、step、schemas 等）在该模块的
+第一个请求到达时才通过清单中的 entrypoint 导入并缓存。
+
+这样冷启动只付出读取清单的代价，未被使用的模块永远不会被导入；
+manifests() 的返回值与 MODULE_INFO 结构兼容，可直接交给 ConfigCache.load_from_modules。
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import os
+import pkgutil
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from orchestrate.registry_center import RegistryCenter
+
+# APPLICATIONS_PACKAGE 为业务模块所在的包名
+APPLICATIONS_PACKAGE = "applications"
+# APPLICATIONS_DIR 为业务模块所在目录（项目根目录下的 applications/）
+APPLICATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), APPLICATIONS_PACKAGE)
+
+
+class ModuleRegistry:
+    """
+    ModuleRegistry 维护 模块名 -> 清单、intent -> 模块名 两张表，
+    并在首次分派时按清单 entrypoint 导入模块实现
+    """
+
+    def __init__(self):
+        # _manifests 存储模块名到清单字典的映射
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+        # _intent_modules 存储 intent 到模块名的映射，分派时 O(1) 查找
+        self._intent_modules: Dict[str, str] = {}
+        # _entrypoints 缓存已加载模块的入口函数，命中后不再经过 importlib
+        self._entrypoints: Dict[str, Callable] = {}
+        # _load_lock 保证多线程同时首次加载同一模块时只导入一次
+        self._load_lock = threading.Lock()
+
+    def discover(self, package: str = APPLICATIONS_PACKAGE, path: str = APPLICATIONS_DIR) -> List[str]:
+        """
+        扫描 package 下的子包，注册带有 manifest 子模块的业务模块
+        只导入 manifest 本身，不导入子包的 __init__ 以外的任何实现代码
+        返回本次注册的模块名列表
+        """
+        registered = []
+        for module_info in pkgutil.iter_modules([path]):
+            if not module_info.ispkg:
+                continue
+            manifest_name = f"{package}.{module_info.name}.manifest"
+            # find_spec 找不到清单时返回 None，没有清单的模块保持原有接入方式
+            if importlib.util.find_spec(manifest_name) is None:
+                continue
+            manifest = importlib.import_module(manifest_name).MANIFEST
+            self.register_manifest(manifest)
+            registered.append(manifest["name"])
+        return registered
+
+    def register_manifest(self, manifest: Dict[str, Any]) -> None:
+        """
+        注册一个模块清单，清单需包含 name、entrypoint 和 orchestrate_info.supported_intents
+        """
+        name = manifest["name"]
+        # 热插拔：同名模块重新注册清单时先下线旧版本，移除其 intent 和已注册的处理函数
+        if name in self._manifests:
+            self.unload(name)
+            self._intent_modules = {intent: owner for intent, owner in self._intent_modules.items() if owner != name}
+        self._manifests[name] = manifest
+        for intent in manifest.get("orchestrate_info", {}).get("supported_intents", []):
+            self._intent_modules[intent] = name
+
+    def manifests(self) -> List[Dict[str, Any]]:
+        """返回所有已注册清单，结构兼容 ConfigCache.load_from_modules"""
+        return list(self._manifests.values())
+
+    def intents(self) -> Dict[str, str]:
+        """返回 intent 到模块名映射的拷贝"""
+        return dict(self._intent_modules)
+
+    def module_for_intent(self, intent: str) -> Optional[str]:
+        """根据 intent 返回负责的模块名，未注册时返回 None"""
+        return self._intent_modules.get(intent)
+
+    def is_loaded(self, name: str) -> bool:
+        """模块实现是否已被导入"""
+        return name in self._entrypoints
+
+    def load(self, name: str) -> Callable:
+        """
+        按清单 entrypoint（"模块路径:属性名"）导入模块实现并返回入口函数
+        首次调用时导入，之后直接返回缓存
+        """
+        entrypoint = self._entrypoints.get(name)
+        if entrypoint is not None:
+            return entrypoint
+        with self._load_lock:
+            entrypoint = self._entrypoints.get(name)
+            if entrypoint is None:
+                module_path, _, attribute = self._manifests[name]["entrypoint"].partition(":")
+                entrypoint = getattr(importlib.import_module(module_path), attribute)
+                self._register_handlers(name)
+                self._entrypoints[name] = entrypoint
+        return entrypoint
+
+    def _register_handlers(self, name: str) -> None:
+        """
+        导入清单 orchestrate_info.intent_handlers 中各 intent 的处理函数并注册到 RegistryCenter，
+        发布的新快照触发编排层扁平分派表重建，之后该模块的请求一次查表直达处理函数
+        """
+        manifest = self._manifests[name]
+        specs = manifest.get("orchestrate_info", {}).get("intent_handlers", {})
+        if not specs:
+            return
+        intents = []
+        for intent, spec in specs.items():
+            module_path, _, attribute = spec.partition(":")
+            intents.append({"intent": intent, "handler": getattr(importlib.import_module(module_path), attribute)})
+        RegistryCenter().register_module({
+            "name": name,
+            "version": manifest.get("version"),
+            "capabilities": manifest.get("capabilities", []),
+            "intents": intents,
+        })
+
+    def unload(self, name: str) -> None:
+        """
+        热插拔下线模块：丢弃入口函数缓存，并从 RegistryCenter 注销其处理函数（分派表随之重建）
+        清单保留，之后的请求重新走按需加载
+        """
+        with self._load_lock:
+            self._entrypoints.pop(name, None)
+        RegistryCenter().unregister_module(name)
+
+    def resolve(self, intent: str) -> Optional[Callable]:
+        """根据 intent 返回负责模块的入口函数（必要时加载模块），未注册时返回 None"""
+        name = self._intent_modules.get(intent)
+        if name is None:
+            return None
+        return self.load(name)
+
+    async def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        将请求分派给 intent 对应模块的入口函数
+        模块首次加载在线程池中完成，导入和 JSON 读取不阻塞事件循环
+        """
+        intent = request.get("intent")
+        # 非字符串的 intent（如列表）不可哈希，按未注册处理
+        name = self._intent_modules.get(intent) if isinstance(intent, str) else None
+        if name is None:
+            return {"success": False, "error": f"未注册的intent: {intent}", "error_code": "UNKNOWN_INTENT"}
+        entrypoint = self._entrypoints.get(name)
+        if entrypoint is None:
+            entrypoint = await asyncio.get_running_loop().run_in_executor(None, self.load, name)
+        return await entrypoint(request)
+
+
+# module_registry 为全局单例，编排层共享同一份清单与加载缓存
+module_registry = ModuleRegistry()
@@ -4,10 +4,30 @@
 
 # 导入标准库
 import asyncio
-from typing import Dict, Any, Optional
+import os
+from typing import AsyncIterator, Dict, Any, Optional
 
 # 从当前目录导入 router 模块
 from .router import Router
+# 从当前目录导入 replay_cache 模块，用于重复请求的幂等重放
+from .replay_cache import ReplayCache
+# 从当前目录导入 sse_relay 模块，以 Server-Sent Events 向前端转发流式输出
+from . import sse_relay
+# 导入结构化日志工具，请求上下文绑定后所有下游日志自动携带 request_id 和 user_id
+from utilities.logger.logger import bind_request_context, get_logger, reset_request_context
+# 导入指标工具，按 route_type/intent 记录请求耗时并通过 /metrics 暴露
+from utilities.monitor.monitor import METRICS_PORT, start_metrics_server, timed
+# 导入事件循环阻塞检测器，定位在事件循环上执行的同步耗时代码
+from utilities.monitor.loop_monitor import LoopMonitor
+# 导入追踪工具，为请求经过的每一跳创建 OpenTelemetry span
+from utilities.monitor.tracing import DEFAULT_TRACE_EXPORT_PATH, TRACE_EXPORT_PATH_ENV, configure_tracing, traced
+# 导入采样分析器，把请求的 route_type/intent 标注到当前任务上，并支持信号触发采样
+from utilities.monitor import profiler
+# 导入启动装配器，按模块依赖图并发初始化各业务模块并输出启动瀑布图
+from boot.launcher import Launcher
+
+# logger 为中枢的结构化日志记录器
+logger = get_logger("orchestrate")
 
 
 class Orchestrate:
@@ -31,21 +51,62 @@ class Orchestrate:
         # 键为模块名，值为字段映射字典
         self.field_mappings = {}
 
+        # replay_cache 通过 ReplayCache() 创建幂等重放缓存
+        # 以 (intent, request_id) 为键，客户端超时重试时不再重复计分和写库
+        self.replay_cache = ReplayCache()
+
+    @traced("orchestrate.handle_request")
+    @timed("orchestrate_request", "Orchestrate request latency and outcomes",
+           request_labels=("route_type", "intent"))
     async def handle_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         handle_request 方法接收请求数据字典
         通过 router.route_request 调用路由器处理请求
         返回处理后的响应数据字典
         """
-        # request_data 作为参数传入 router.route_request 方法
-        # 调用路由器进行业务编排和分发
-        # 返回的 response 被赋值给 response 变量
-        response = await self.router.route_request(request_data)
+        # 采样分析进行中时，将当前任务的采样样本归属到本请求的 route_type/intent
+        profile_token = profiler.tag_current_task(request_data)
+        # 绑定请求上下文，本次请求在任意模块输出的日志都带上 request_id 和 user_id
+        context_token = bind_request_context(
+            request_id=request_data.get("request_id"),
+            user_id=request_data.get("user_id")
+        )
+        try:
+            # request_data 作为参数传入 router.route_request 方法
+            # 通过 replay_cache.run 包装调用，相同 (intent, request_id) 的请求只执行一次
+            # 返回的 response 被赋值给 response 变量
+            response = await self.replay_cache.run(
+                request_data.get("intent"),
+                request_data.get("request_id"),
+                lambda: self._route(request_data)
+            )
+        finally:
+            reset_request_context(context_token)
+            profiler.release_task_tag(profile_token)
 
         # response 作为方法返回值返回给调用方
         # 完成一次完整的请求处理流程
         return response
 
+    async def _route(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        _route 方法通过 router.route_request 执行一次请求
+        replay_cache 在独立任务中执行计算，该任务同样需要标记，采样样本才能归属到本请求
+        """
+        profile_token = profiler.tag_current_task(request_data)
+        try:
+            return await self.router.route_request(request_data)
+        finally:
+            profiler.release_task_tag(profile_token)
+
+    def stream_request(self, request_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        stream_request 方法接收请求数据字典
+        通过 router.stream_request 返回逐段输出的事件迭代器，由 sse_relay 转为 SSE 发送给前端
+        流式请求不经过 replay_cache：重放完整响应会失去逐段输出的意义
+        """
+        return self.router.stream_request(request_data)
+
     async def register_module(self, module_name: str, capabilities: Dict[str, Any]) -> None:
         """
         register_module 方法接收模块名字符串和能力字典
@@ -95,24 +156,56 @@ class Orchestrate:
 orchestrate_instance = Orchestrate()
 
 
+def _log_relay_exit(task: "asyncio.Task") -> None:
+    """_log_relay_exit 函数在 SSE 转发服务任务结束时记录原因"""
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error("sse_relay_failed", error=f"{type(error).__name__}: {error}")
+    else:
+        logger.warning("sse_relay_stopped")
+
+
 async def main():
     """
     main 函数作为程序的主入口点
     初始化并启动 orchestrate 服务
     """
-    # 打印启动信息到控制台
+    # 记录启动日志
     # 提示 orchestrate 服务已启动
-    print("Orchestrate service starting...")
+    logger.info("orchestrate_service_starting")
+
+    # 启动 Prometheus 指标端点，供采集各 route_type/intent/step 的耗时分布
+    start_metrics_server(METRICS_PORT)
+    # 启动事件循环延迟探针和阻塞检测，定期输出阻塞代码位置报告
+    LoopMonitor().start()
+    # 启用头部采样追踪，span 以 OTLP JSON 行格式写入本地文件（默认 cache/traces/，可由 CAREERBOT_TRACE_EXPORT 覆盖），无需采集器
+    configure_tracing(sample_ratio=0.1, export_path=os.environ.get(TRACE_EXPORT_PATH_ENV) or DEFAULT_TRACE_EXPORT_PATH)
+    # 收到 SIGUSR2 信号时对事件循环进行30秒采样分析，输出 collapsed/speedscope 火焰图文件
+    profiler.install_signal_trigger(seconds=30)
+
+    # 按模块清单的 dependencies 构建依赖图并发执行 initialize_module，冷启动耗时取决于关键路径
+    launcher = Launcher()
+    await launcher.assemble_modules()
+    # 接收流量前回放合成请求并预构建缓存，预热完成（或超出预算）后才翻转就绪信号
+    await launcher.warm_up(budget_seconds=10.0)
+
+    # 启动 SSE 转发服务，前端经 /frontend_service/stream 逐段接收 LLM 输出
+    # 服务退出（如端口绑定失败）时记录日志，主循环随之结束并抛出其异常，进程不会在缺少流式端点的状态下继续运行
+    relay_task = asyncio.create_task(sse_relay.serve(orchestrate_instance))
+    relay_task.add_done_callback(_log_relay_exit)
 
     # 这里可以添加服务启动逻辑
     # 例如启动 HTTP 服务器或消息队列监听器
 
     # 保持服务运行状态
     # 使用无限循环或事件监听器
-    while True:
+    while not relay_task.done():
         # 可以通过 await asyncio.sleep() 实现异步等待
         # 或者监听外部事件/请求
         await asyncio.sleep(1)
+    relay_task.result()
 
 
 if __name__ == "__main__":
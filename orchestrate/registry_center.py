@@ -1,24 +1,78 @@
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+
+def _freeze(value: Any) -> Any:
+    """
+    _freeze 将模块上报的嵌套字典/列表转换为只读结构（MappingProxyType / tuple）
+    注册时转换一次，之后快照中的数据不会再被任何一方原地修改
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """
+    _thaw 将快照中的只读结构还原为普通的 dict / list
+    供 get_fields / get_all_fields 的 thaw=True 返回给调用方：结果可以直接 json.dumps，调用方修改也不会影响快照
+    """
+    # _freeze 只产生 MappingProxyType 和 tuple，按精确类型判断，避免 Mapping 抽象类检查的开销
+    value_type = type(value)
+    if value_type is MappingProxyType:
+        return {key: _thaw(item) for key, item in value.items()}
+    if value_type is tuple:
+        return [_thaw(item) for item in value]
+    return value
+
+
+class RegistrySnapshot:
+    """
+    RegistrySnapshot 为注册表某一时刻的不可变快照
+    所有映射均为只读视图，发布后不再变化；读者拿到快照后可以无锁、无拷贝地任意读取
+    generation 为单调递增的版本号，每次注册或注销都会发布新快照并加一，缓存可以以它为键判断是否失效
+    """
+
+    __slots__ = ("generation", "module_meta", "intent_handlers", "intent_modules", "field_definitions")
+
+    def __init__(self, generation: int, module_meta: Dict[str, Any], intent_handlers: Dict[str, Callable],
+                 intent_modules: Dict[str, str], field_definitions: Dict[str, Any]):
+        self.generation = generation
+        # module_meta 键为模块名，值为包含 name、version、capabilities、needs_frontend 等信息的只读映射
+        self.module_meta = MappingProxyType(module_meta)
+        # intent_handlers 键为意图字符串，值为对应的处理函数引用
+        self.intent_handlers = MappingProxyType(intent_handlers)
+        # intent_modules 键为意图字符串，值为注册该意图的模块名，注销模块时据此移除其意图
+        self.intent_modules = MappingProxyType(intent_modules)
+        # field_definitions 键为模块名，值为只读的字段定义
+        self.field_definitions = MappingProxyType(field_definitions)
+
+
 class RegistryCenter:
     """
     RegistryCenter 类负责管理整个 CareerBot 系统中的模块注册信息
     作为单例模式实现，用于收集和索引所有模块的注册信息
+
+    采用写时复制（copy-on-write）：注册表状态是一个不可变的 RegistrySnapshot，
+    register_module / unregister_module 在写锁内基于当前快照构造新快照，再一次性替换引用发布；
+    读操作只读取一次快照引用，不加锁、不拷贝，热插拔期间也不会读到注册了一半的模块
     """
 
     # _instance 被设置为类属性，用于存储单例实例
     # 初始化为 None，表示尚未创建实例
     _instance = None
 
-    # module_meta 被初始化为空字典，用于存储各模块的元信息
-    # 键为模块名，值为包含 name、version、capabilities、needs_frontend 等信息的字典
-    module_meta = {}
+    # _snapshot 为当前发布的注册表快照，只会被整体替换，从不原地修改
+    _snapshot = RegistrySnapshot(0, {}, {}, {}, {})
 
-    # intent_handlers 被初始化为空字典，用于存储意图与处理函数的映射关系
-    # 键为意图字符串，值为对应的处理函数引用
-    intent_handlers = {}
+    # _write_lock 串行化写者，避免两个并发注册基于同一旧快照构造、后发布者覆盖先发布者
+    _write_lock = threading.Lock()
 
-    # field_definitions 被初始化为空字典，用于存储模块定义的输入输出字段结构
-    # 键为模块名，值为字段定义字典
-    field_definitions = {}
+    # _listeners 为快照发布后的回调（如编排层的扁平分派表），同样整体替换而非原地修改
+    _listeners = ()
 
     def __new__(cls):
         # __new__ 方法在创建实例时被调用，用于实现单例模式
@@ -28,6 +82,54 @@ class RegistryCenter:
             cls._instance = super().__new__(cls)
         return cls._instance
 
+    @property
+    def module_meta(self) -> Mapping[str, Any]:
+
+        return self._snapshot.module_meta
+
+    @property
+    def intent_handlers(self) -> Mapping[str, Callable]:
+
+        return self._snapshot.intent_handlers
+
+    @property
+    def field_definitions(self) -> Mapping[str, Any]:
+
+        return self._snapshot.field_definitions
+
+    @property
+    def generation(self) -> int:
+        """当前快照的版本号，每次注册或注销加一"""
+        return self._snapshot.generation
+
+    def snapshot(self) -> RegistrySnapshot:
+        """
+        返回当前发布的不可变快照
+        需要在多次读取之间保持一致视图的调用方应先取快照，再从同一快照上读取
+        """
+        return self._snapshot
+
+    def subscribe(self, listener: Callable[[RegistrySnapshot], None]) -> RegistrySnapshot:
+        """
+        subscribe 方法登记快照发布回调，每次注册或注销发布新快照后以新快照调用 listener
+        登记时立即以当前快照调用一次，登记与发布在同一把写锁内完成，不会漏掉中间发布的快照
+        """
+        with self._write_lock:
+            type(self)._listeners = self._listeners + (listener,)
+            listener(self._snapshot)
+            return self._snapshot
+
+    def _publish(self, module_meta: Dict[str, Any], intent_handlers: Dict[str, Callable],
+                 intent_modules: Dict[str, str], field_definitions: Dict[str, Any]) -> RegistrySnapshot:
+        # 调用方持有写锁；替换类属性引用是原子操作，读者要么看到旧快照，要么看到完整的新快照
+        snapshot = RegistrySnapshot(self._snapshot.generation + 1, module_meta, intent_handlers,
+                                    intent_modules, field_definitions)
+        type(self)._snapshot = snapshot
+        # 回调在写锁内按发布顺序执行，订阅方总是按 generation 递增的顺序收到快照
+        for listener in self._listeners:
+            listener(snapshot)
+        return snapshot
+
     def register_module(self, module_info: dict):
         """
         register_module 方法接受模块主动上报的 MODULE_INFO 字典
@@ -35,75 +137,109 @@ class RegistryCenter:
 
         通过 module_info 参数传入模块注册信息字典
         解析其中的 name、capabilities、intents、entrypoint、fields、needs_frontend 等字段
-        并分别存储到对应的数据结构中
+        基于当前快照复制出新的映射并写入，最后整体发布为新快照；返回新快照的 generation
         """
         # 从 module_info 字典中提取模块名称，作为后续存储的键
         module_name = module_info.get('name')
 
-        # 如果 module_name 存在，则继续处理注册信息
-        if module_name:
-            # 将模块的元信息存储到 module_meta 字典中
+        # 如果 module_name 不存在，则不发布新快照，返回当前 generation
+        if not module_name:
+            return self.generation
+
+        with self._write_lock:
+            current = self._snapshot
+            module_meta = dict(current.module_meta)
+            intent_handlers = dict(current.intent_handlers)
+            intent_modules = dict(current.intent_modules)
+            field_definitions = dict(current.field_definitions)
+
+            # 将模块的元信息存储到 module_meta 中
             # 包含 name、version、capabilities、needs_frontend 等字段
-            self.module_meta[module_name] = {
+            module_meta[module_name] = _freeze({
                 'name': module_info.get('name'),
                 'version': module_info.get('version'),
                 'capabilities': module_info.get('capabilities', []),
                 'needs_frontend': module_info.get('needs_frontend', False)
-            }
+            })
 
-            # 从 module_info 中获取 intents 字段，默认为空列表
-            intents = module_info.get('intents', [])
+            # 重新注册同名模块时，先移除该模块此前注册的意图，避免残留已下线的意图
+            for intent_name, owner in current.intent_modules.items():
+                if owner == module_name:
+                    del intent_handlers[intent_name]
+                    del intent_modules[intent_name]
 
             # 遍历 intents 列表，为每个意图注册对应的处理函数
-            for intent_info in intents:
+            for intent_info in module_info.get('intents', []):
                 # 从 intent_info 中提取意图名称和对应的处理函数
                 intent_name = intent_info.get('intent')
                 handler_func = intent_info.get('handler')
 
-                # 如果意图名称和处理函数都存在，则存储到 intent_handlers 字典中
+                # 如果意图名称和处理函数都存在，则存储到 intent_handlers 中
                 if intent_name and handler_func:
-                    self.intent_handlers[intent_name] = handler_func
+                    intent_handlers[intent_name] = handler_func
+                    intent_modules[intent_name] = module_name
 
-            # 从 module_info 中获取 fields 字段，存储模块的字段定义
-            fields = module_info.get('fields', {})
+            # 将字段定义以模块名作为键存储，转换为只读结构
+            field_definitions[module_name] = _freeze(module_info.get('fields', {}))
 
-            # 将字段定义存储到 field_definitions 字典中，以模块名作为键
-            self.field_definitions[module_name] = fields
+            return self._publish(module_meta, intent_handlers, intent_modules, field_definitions).generation
 
-    def get_handler_for_intent(self, intent: str):
+    def unregister_module(self, module_name: str) -> int:
+        """
+        unregister_module 方法用于热插拔下线模块
+        移除该模块的元信息、字段定义及其注册的全部意图，发布新快照并返回其 generation
+        模块未注册时不发布新快照
+        """
+        with self._write_lock:
+            current = self._snapshot
+            if module_name not in current.module_meta:
+                return current.generation
+            module_meta = {name: meta for name, meta in current.module_meta.items() if name != module_name}
+            field_definitions = {name: fields for name, fields in current.field_definitions.items()
+                                 if name != module_name}
+            intent_modules = {intent: owner for intent, owner in current.intent_modules.items()
+                              if owner != module_name}
+            intent_handlers = {intent: current.intent_handlers[intent] for intent in intent_modules}
+            return self._publish(module_meta, intent_handlers, intent_modules, field_definitions).generation
+
+    def get_handler_for_intent(self, intent: str) -> Optional[Callable]:
         """
         get_handler_for_intent 方法根据意图名称返回对应的处理函数
         供中枢系统调用具体的意图处理逻辑
 
         通过 intent 参数传入意图字符串
-        从 intent_handlers 字典中查找对应的处理函数
+        从当前快照的 intent_handlers 中查找对应的处理函数
         如果找到则返回处理函数，否则返回 None
         """
-        # 通过 intent 作为键，从 intent_handlers 字典中获取对应的处理函数
+        # 通过 intent 作为键，从当前快照中获取对应的处理函数
         # 如果意图不存在，则返回 None
-        return self.intent_handlers.get(intent)
+        return self._snapshot.intent_handlers.get(intent)
 
-    def get_fields(self, module_name: str):
+    def get_fields(self, module_name: str, thaw: bool = False) -> Mapping[str, Any]:
         """
         get_fields 方法根据模块名称返回该模块的字段定义
         用于获取特定模块的输入输出字段结构
 
         通过 module_name 参数传入模块名称字符串
-        从 field_definitions 字典中查找对应的字段定义
-        如果找到则返回字段定义字典，否则返回空字典
+        从当前快照的 field_definitions 中查找对应的字段定义
+        如果找到则返回字段定义的只读视图，否则返回空字典
+        thaw 为 True 时返回普通 dict / list 的深拷贝，可以直接 json.dumps 或修改，但每次调用都要复制整个结构
         """
-        # 通过 module_name 作为键，从 field_definitions 字典中获取字段定义
-        # 如果模块不存在，则返回空字典
-        return self.field_definitions.get(module_name, {})
+        # 通过 module_name 作为键，从当前快照中获取字段定义
+        # 默认直接返回只读视图，不拷贝；快照不会被原地修改，调用方也无法回写
+        fields = self._snapshot.field_definitions.get(module_name, {})
+        return _thaw(fields) if thaw else fields
 
-    def get_all_fields(self):
+    def get_all_fields(self, thaw: bool = False) -> Dict[str, Any]:
         """
         get_all_fields 方法返回所有模块的字段定义
         用于获取系统中所有模块的输入输出字段结构总览
 
-        不需要传入参数，直接返回 field_definitions 字典的副本
-        避免外部直接修改内部数据结构
+        默认返回当前快照中字段定义的浅拷贝，各模块的字段定义仍为只读视图
+        避免外部直接修改内部数据结构；thaw 为 True 时返回普通 dict / list 的深拷贝，
+        只读且需要零拷贝的调用方应使用 snapshot().field_definitions
         """
-        # 返回 field_definitions 字典的浅拷贝
-        # 防止外部代码直接修改内部的字段定义数据
-        return self.field_definitions.copy()
+        # 返回模块名 → 字段定义的浅拷贝，与注册表改为快照之前的 .copy() 开销相同
+        if thaw:
+            return _thaw(self._snapshot.field_definitions)
+        return self._snapshot.field_definitions.copy()
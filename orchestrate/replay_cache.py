@@ -0,0 +1,142 @@
+# replay_cache.py 负责请求幂等重放
+# 以 (intent, request_id) 为键缓存已完成请求的响应
+# 客户端超时重试时直接返回缓存结果，并发的重复请求共享同一次计算（single-flight）
+
+# 导入标准库
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from utilities.time import Time
+
+
+def request_id_epoch(request_id: str) -> Optional[float]:
+    """
+    request_id_epoch 函数解析 timestamp_uuid 格式 request_id 中内嵌的时间戳
+    返回 Unix 秒数，格式不符时返回 None
+    """
+    # Time.parse_request_id 不使用正则和 strptime，同一秒内的 request_id 复用上次解析结果
+    try:
+        return Time.parse_request_id(request_id).timestamp()
+    except ValueError:
+        return None
+
+
+class _Flight:
+    """一次进行中的计算及等待其结果的请求数量"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class ReplayCache:
+    """
+    ReplayCache 类实现按 (intent, request_id) 的短时响应缓存
+    - 已完成的成功响应保留 ttl_seconds 秒，重复提交直接返回
+    - 同一键的并发请求只执行一次：计算在独立任务中进行，所有请求（包括第一个）等待同一个任务；
+      某个请求被取消（客户端断开）不影响其余请求，所有等待的请求都取消后才取消计算
+    - request_id 内嵌时间戳早于 window_seconds 的请求不查缓存也不写缓存
+    """
+
+    def __init__(self, ttl_seconds: float = 120.0, window_seconds: float = 3600.0, max_entries: int = 10000):
+        # ttl_seconds 为缓存响应的保留时长
+        self.ttl_seconds = ttl_seconds
+        # window_seconds 为 request_id 的有效重放窗口
+        # MBTI 流程的各步骤复用 step1 生成的 request_id，因此窗口需要覆盖一次完整答题过程
+        self.window_seconds = window_seconds
+        # max_entries 为缓存条目上限，超过时淘汰最早写入的条目
+        self.max_entries = max_entries
+
+        # entries 按写入顺序保存 键 → (过期时间, 响应)
+        # TTL 固定，写入顺序即过期顺序，清理时只需从头部弹出
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # in_flight 保存正在计算中的键 → _Flight
+        self.in_flight: Dict[Tuple[str, str], _Flight] = {}
+
+        # 命中统计，供监控读取
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "bypassed": 0}
+
+    async def run(self, intent: Optional[str], request_id: Optional[str],
+                  compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        run 方法以幂等方式执行 compute
+        命中缓存时返回缓存响应；同键计算进行中时等待其结果；否则执行并缓存成功响应
+        """
+        # intent 或 request_id 缺失时无法判定重复，直接执行
+        if not intent or not request_id:
+            return await compute()
+
+        # request_id 格式无法解析或内嵌时间戳超出窗口时，跳过缓存查找直接执行
+        now = time.time()
+        issued_at = request_id_epoch(request_id)
+        if issued_at is None or now - issued_at > self.window_seconds:
+            self.stats["bypassed"] += 1
+            return await compute()
+
+        key = (intent, request_id)
+        monotonic_now = time.monotonic()
+        self._evict_expired(monotonic_now)
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.stats["hits"] += 1
+            return entry[1]
+
+        flight = self.in_flight.get(key)
+        if flight is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            flight = _Flight(asyncio.ensure_future(self._compute(key, compute)))
+            self.in_flight[key] = flight
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._forget(key, flight))
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    async def _compute(self, key: Tuple[str, str], compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """_compute 方法执行计算并缓存成功响应"""
+        response = await compute()
+        if self._is_cacheable(response):
+            self._store(key, response, time.monotonic())
+        return response
+
+    def _forget(self, key: Tuple[str, str], flight: _Flight) -> None:
+        """_forget 方法在计算结束（含取消）时移除进行中的记录"""
+        if self.in_flight.get(key) is flight:
+            del self.in_flight[key]
+
+    def _is_cacheable(self, response: Any) -> bool:
+        """
+        _is_cacheable 方法判断响应是否可缓存
+        只缓存成功响应，失败和异常响应允许客户端重试
+        """
+        return isinstance(response, dict) and response.get("success") is not False and "error" not in response
+
+    def _store(self, key: Tuple[str, str], response: Dict[str, Any], monotonic_now: float) -> None:
+        """_store 方法写入缓存条目并维持条目上限"""
+        self.entries[key] = (monotonic_now + self.ttl_seconds, response)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _evict_expired(self, monotonic_now: float) -> None:
+        """_evict_expired 方法从最早写入的条目开始清理已过期条目"""
+        entries = self.entries
+        while entries:
+            expires_at = next(iter(entries.values()))[0]
+            if expires_at > monotonic_now:
+                break
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """clear 方法清空已完成的缓存条目，进行中的计算不受影响"""
+        self.entries.clear()
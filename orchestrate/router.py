@@ -4,9 +4,31 @@
 
 # 导入标准库
 import asyncio
-from typing import Dict, Any, Optional
+import hmac
+import os
+from typing import AsyncIterator, Dict, Any, Optional
 from enum import Enum
 
+# 导入追踪装饰器，路由分发作为独立的一跳记录 span
+from utilities.monitor.tracing import traced
+# 导入采样分析器，供管理路由按需触发线上性能采样
+from utilities.monitor import profiler
+# 导入扁平分派表，已注册的 intent 一次查表直达模块登记的处理函数
+from orchestrate.dispatch_table import DispatchTable, dispatch_table
+# 导入模块清单注册表，分派表尚未收录的 intent 经其按需加载模块实现
+from orchestrate.module_registry import ModuleRegistry, module_registry
+# 导入流式 intent 的服务端提示词构建，前端流式请求只提交业务输入
+from orchestrate.stream_prompts import STREAM_PROMPTS, build_stream_request
+# 导入时间工具，构建流式错误事件中的 AgentResponse 时间戳
+from utilities.time import Time
+
+# AGENT_NAME 作为编排层自行构建的 AgentResponse 中的 agent_name 字段值
+AGENT_NAME = "orchestrate"
+# ADMIN_TOKEN_ENV 为管理路由口令所在的环境变量，未设置时管理路由整体关闭
+ADMIN_TOKEN_ENV = "CAREERBOT_ADMIN_TOKEN"
+# STREAM_INTENTS 为 frontend_service 下支持流式输出的 intent，每个 intent 的提示词由 stream_prompts 在服务端构建
+STREAM_INTENTS = tuple(STREAM_PROMPTS)
+
 
 class RouteType(Enum):
     """
@@ -29,6 +51,8 @@ class RouteType(Enum):
     TAGGINGS = "taggings"
     # FRONTEND_SERVICE 代表前端服务相关的路由类型
     FRONTEND_SERVICE = "frontend_service"
+    # ADMIN 代表运维管理相关的路由类型（如按需性能采样）
+    ADMIN = "admin"
 
 
 class Router:
@@ -37,7 +61,12 @@ class Router:
     将不同类型的请求路由到对应的业务模块处理
     """
 
-    def __init__(self):
+    def __init__(self, intent_table: Optional[DispatchTable] = None, modules: Optional[ModuleRegistry] = None):
+        # intent_table 为 intent 到处理函数的扁平分派表，随注册表快照发布自动重建
+        self.intent_table = intent_table or dispatch_table
+        # modules 为模块清单注册表，intent 尚未进入分派表时据此加载模块实现
+        self.modules = modules or module_registry
+
         # route_handlers 被初始化为空字典
         # 用于存储路由类型到处理函数的映射关系
         # 键为 RouteType 枚举值，值为对应的异步处理函数
@@ -84,12 +113,29 @@ class Router:
         # _handle_frontend_service 被赋值给 RouteType.FRONTEND_SERVICE
         self.route_handlers[RouteType.FRONTEND_SERVICE] = self._handle_frontend_service
 
+        # 为 ADMIN 类型设置运维管理处理函数
+        # _handle_admin 被赋值给 RouteType.ADMIN
+        self.route_handlers[RouteType.ADMIN] = self._handle_admin
+
+    @traced("orchestrate.route_request")
     async def route_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         route_request 方法接收请求数据字典
         根据请求类型路由到对应的处理函数
         返回处理后的响应数据字典
+        已加载模块的 intent 在扁平分派表中一次查找即可直达处理函数；
+        未命中时再按 route_type 走路由处理器（首次请求在其中加载模块，加载后的请求即可命中分派表）
         """
+        # intent_handler 从扁平分派表中按 intent 查找处理函数
+        # 非字符串的 intent（如列表）不可哈希，不查表，交给路由处理器按未知 intent 返回错误响应
+        intent = request_data.get("intent")
+        intent_handler = self.intent_table.get(intent) if isinstance(intent, str) else None
+        if intent_handler is not None:
+            try:
+                return await intent_handler(request_data)
+            except Exception as e:
+                return {"error": f"Handler execution failed: {str(e)}"}
+
         # 从 request_data 中提取 route_type 字段
         # 用于确定请求的路由类型
         route_type_str = request_data.get("route_type")
@@ -148,10 +194,13 @@ class Router:
         """
         _handle_mbti 方法处理 MBTI 测试相关的请求
         接收请求数据字典，返回 MBTI 处理结果字典
+        仅在 intent 尚未进入扁平分派表时到达这里：经 ModuleRegistry 按清单加载 MBTI 模块并分派，
+        加载时注册的 intent 处理函数使后续请求直接命中分派表
         """
-        # 这里实现 MBTI 模块的处理逻辑
-        # 目前返回占位符响应
-        return {"module": "mbti", "status": "processed", "data": request_data}
+        # 注册表为空（如未经 boot 装配直接使用 Router）时先扫描 applications/ 下的模块清单
+        if not self.modules.manifests():
+            self.modules.discover()
+        return await self.modules.dispatch(request_data)
 
     async def _handle_resume(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -198,6 +247,64 @@ class Router:
         # 目前返回占位符响应
         return {"module": "frontend_service", "status": "processed", "data": request_data}
 
+    async def _handle_admin(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        _handle_admin 方法处理运维管理请求
+        intent 为 "profile_start" 时在后台启动采样分析，按 route_type/intent 输出火焰图文件
+        请求需携带与环境变量 CAREERBOT_ADMIN_TOKEN 一致的 admin_token
+        """
+        # 未配置口令或口令不一致时拒绝请求，使用 hmac.compare_digest 避免计时侧信道
+        expected_token = os.environ.get(ADMIN_TOKEN_ENV)
+        provided_token = request_data.get("admin_token")
+        if not expected_token or not isinstance(provided_token, str) or \
+                not hmac.compare_digest(provided_token.encode(), expected_token.encode()):
+            return {"error": "Admin route not authorized"}
+
+        intent = request_data.get("intent")
+        if intent == "profile_start":
+            # seconds 和 rate_hz 可选，分别为采样时长（秒）和采样频率（次/秒）
+            try:
+                seconds = float(request_data.get("seconds", 30))
+                rate_hz = float(request_data.get("rate_hz", profiler.DEFAULT_RATE_HZ))
+            except (TypeError, ValueError):
+                return {"error": "seconds and rate_hz must be numbers"}
+            if not 0 < rate_hz <= 1000:
+                return {"error": "rate_hz must be between 0 and 1000"}
+            if not profiler.start_session(seconds, rate_hz):
+                return {"error": "A profiling session is already running"}
+            return {"module": "admin", "status": "profiling_started",
+                    "seconds": min(seconds, profiler.MAX_SECONDS), "output_dir": profiler.DEFAULT_OUTPUT_DIR}
+
+        return {"error": f"Unsupported admin intent: {intent}"}
+
+    def stream_request(self, request_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        stream_request 方法返回流式请求的事件迭代器，事件格式与 llm_handler.stream 相同：
+        若干 {"type": "token", "text"}，最后为 {"type": "done" 或 "error", "response": AgentResponse}
+        目前只支持 route_type 为 frontend_service、intent 在 STREAM_INTENTS 中的请求；
+        前端只提交 context.data.inputs 中的业务输入，提示词与调用参数由 build_stream_request 在服务端构建
+        """
+        intent = request_data.get("intent")
+        if request_data.get("route_type") != RouteType.FRONTEND_SERVICE.value or \
+                not isinstance(intent, str) or intent not in STREAM_INTENTS:
+            return self._stream_error(request_data, "ORCHESTRATE/STREAM_NOT_SUPPORTED",
+                                      f"Streaming is only supported for frontend_service intents "
+                                      f"{', '.join(STREAM_INTENTS)}")
+        agent_request, error = build_stream_request(request_data)
+        if error is not None:
+            return self._stream_error(request_data, "ORCHESTRATE/INVALID_STREAM_INPUT", error)
+        # llm_handler 在首个流式请求时才导入，导入编排层不加载缓存、调度器与适配层
+        from llm_handler.llm_handler import stream as stream_llm
+
+        return stream_llm(agent_request)
+
+    async def _stream_error(self, request_data: Dict[str, Any], code: str,
+                            message: str) -> AsyncIterator[Dict[str, Any]]:
+        """_stream_error 方法以单个 error 事件返回路由错误，response 为与 llm_handler 相同格式的 AgentResponse"""
+        yield {"type": "error", "response": {
+            "request_id": request_data.get("request_id"), "agent_name": AGENT_NAME, "success": False,
+            "timestamp": Time.now().isoformat(), "response": None, "error": {"code": code, "message": message}}}
+
     def register_handler(self, route_type: RouteType, handler_func) -> None:
         """
         register_handler 方法注册自定义的路由处理函数
@@ -0,0 +1,93 @@
+# sse_relay.py 负责把流式请求以 Server-Sent Events 转发给前端
+# 前端 POST /frontend_service/stream 提交请求（route_type 为 frontend_service、intent 为 STREAM_INTENTS 之一，
+# 只携带 context.data.inputs 业务输入，提示词由 orchestrate.stream_prompts 在服务端构建），
+# 响应为 text/event-stream：若干 "event: token" （data 为 {"text"}），最后一条 "event: done" 或 "event: error"
+# （data 为 AgentResponse）；首个 token 生成后即发送，首字节时间从完整生成时间降为首 token 时间
+# - 背压：事件按客户端发送进度逐个从 llm_handler 拉取，客户端读得慢时上游读取随之暂停；
+#   单个事件 SEND_TIMEOUT_SECONDS 内发不出去（客户端停止读取）时断开，释放 LLM 调度槽位
+# - 取消：客户端断开后 sse-starlette 取消事件生成器，llm_handler 随之关闭上游连接并释放调度槽位
+# - 鉴权：请求需携带 "Authorization: Bearer <令牌>"，令牌与环境变量 CAREERBOT_STREAM_TOKEN 一致；
+#   未设置该环境变量时端点整体关闭
+# - 校验：请求体经 entry 的入口校验（intent 白名单、request_id 等字段规范）后才转发
+# - 默认只监听本机回环地址，由前置网关对外暴露
+# fastapi / sse-starlette / uvicorn / entry 在 create_app / serve 中导入，导入本模块不加载 Web 框架
+
+# 导入标准库
+import contextlib
+import hmac
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Optional
+
+STREAM_PATH = "/frontend_service/stream"
+SSE_HOST = "127.0.0.1"
+SSE_PORT = 8000
+# STREAM_TOKEN_ENV 为流式端点令牌所在的环境变量
+STREAM_TOKEN_ENV = "CAREERBOT_STREAM_TOKEN"
+# SEND_TIMEOUT_SECONDS 为单个事件写入客户端连接的最长等待时间
+SEND_TIMEOUT_SECONDS = 30.0
+# PING_SECONDS 为空闲时发送注释行的间隔，避免代理在排队或首 token 前断开连接
+PING_SECONDS = 15
+
+
+async def sse_events(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, str]]:
+    """
+    sse_events 函数把 llm_handler.stream 的事件转为 sse-starlette 的 {"event", "data"} 字典
+    生成器结束或被取消时关闭上游事件迭代器
+    """
+    async with contextlib.aclosing(events):
+        async for event in events:
+            data = {"text": event["text"]} if event["type"] == "token" else event["response"]
+            yield {"event": event["type"], "data": json.dumps(data, ensure_ascii=False)}
+
+
+def authorized(header: Optional[str]) -> bool:
+    """authorized 函数校验 Authorization 头中的 Bearer 令牌，使用 hmac.compare_digest 避免计时侧信道"""
+    expected_token = os.environ.get(STREAM_TOKEN_ENV)
+    scheme, _, provided_token = (header or "").partition(" ")
+    return bool(expected_token) and scheme.lower() == "bearer" and \
+        hmac.compare_digest(provided_token.strip().encode(), expected_token.encode())
+
+
+def create_app(orchestrator: Any, entry: Any = None):
+    """
+    create_app 函数创建转发流式请求的 FastAPI 应用
+    orchestrator 需提供 stream_request(request_data) 方法（Orchestrate 实例）
+    entry 为入口校验器（entry.entry.Entry 实例），默认以流式 intent 为白名单创建
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+    from sse_starlette.sse import EventSourceResponse
+
+    if entry is None:
+        from entry.entry import Entry
+        from orchestrate.router import STREAM_INTENTS
+
+        entry = Entry()
+        entry.config_cache.load({"intent_whitelist": STREAM_INTENTS})
+
+    app = FastAPI()
+
+    @app.post(STREAM_PATH)
+    async def stream(request: Request):
+        if not authorized(request.headers.get("authorization")):
+            return JSONResponse({"error": "Unauthorized"}, status_code=401)
+        request_data, error = entry.admit_raw(await request.body())
+        if error is not None:
+            return JSONResponse(error, status_code=400)
+        return EventSourceResponse(sse_events(orchestrator.stream_request(request_data)), ping=PING_SECONDS,
+                                   send_timeout=SEND_TIMEOUT_SECONDS)
+
+    return app
+
+
+async def serve(orchestrator: Any, host: str = SSE_HOST, port: int = SSE_PORT) -> None:
+    """serve 函数在当前事件循环中运行 SSE 转发服务，直到任务被取消"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(create_app(orchestrator), host=host, port=port, log_level="warning"))
+    try:
+        await server.serve()
+    except SystemExit as e:
+        # uvicorn 绑定端口失败时调用 sys.exit，转为普通异常交由调用方记录并处理
+        raise RuntimeError(f"SSE relay failed to start on {host}:{port}") from e
@@ -0,0 +1,85 @@
+# stream_prompts.py - 流式 intent 的服务端提示词构建
+"""
+设计用途：
+前端经 SSE 端点发起的流式请求只提交业务输入，提示词、系统提示词与调用参数全部由服务端按 intent 构建，
+端点不能被当作通用的 LLM 代理使用。目前支持的流式 intent 对应两个生成耗时较长的报告：
+- final_analysis_stream：final_analysis_output 的职业分析报告；输入 talent_test_report、mbti_reverse_test_report 必填，
+  提供 resume_analysis_report 时为第二阶段综合分析
+- ninetest_narrative_stream：ninetest 的天赋叙述报告；输入 talent_categories 必填，digit_frequencies 可选
+
+使用方式：
+- 业务输入放在请求的 context.data.inputs 中，只取各 intent 声明的字段；请求中的 prompt / system_prompt、
+  additional_params 等其他字段一律忽略
+- 提示模板迁移到 global_config 之前以本模块常量维护；修改模板时同时升级 template_id 中的版本号，
+  LLM 缓存以 (template_id, 输入) 为键，旧条目随之失效
+"""
+
+import json
+from typing import Any, Dict, Optional, Tuple
+
+# STREAM_PROMPTS 为流式 intent 到服务端提示模板的映射
+# required / optional 为 context.data.inputs 中接受的字段，user_prompt 中的 {inputs} 替换为这些字段的 JSON
+STREAM_PROMPTS: Dict[str, Dict[str, Any]] = {
+    "final_analysis_stream": {
+        "template_id": "final_analysis.report.v1",
+        "required": ("talent_test_report", "mbti_reverse_test_report"),
+        "optional": ("resume_analysis_report",),
+        "system_prompt": (
+            "You are a career development coach. Write an encouraging, constructive and specific career analysis "
+            "for the user based only on the test reports provided. Do not invent facts that are not in the reports."
+        ),
+        "user_prompt": (
+            "Write the user's career analysis report in markdown with these sections: suitable career directions "
+            "(at least 3, each with the reason), positions to consider carefully (at least 2, each with the reason), "
+            "overall career development advice, and a short report summary. When a resume analysis report is "
+            "included, combine it with the test reports into a comprehensive analysis.\n\nReports:\n{inputs}"
+        ),
+        "params": {"temperature": 0.7, "max_tokens": 2000},
+    },
+    "ninetest_narrative_stream": {
+        "template_id": "ninetest.narrative.v1",
+        "required": ("talent_categories",),
+        "optional": ("digit_frequencies",),
+        "system_prompt": (
+            "You are a career development coach. Turn the user's talent test results into a warm, encouraging "
+            "narrative. Base every statement on the results provided."
+        ),
+        "user_prompt": (
+            "Write the user's talent report in markdown with a title, a one-line subtitle, their strengths, "
+            "areas for improvement and a warm closing reminder.\n\nTalent test results:\n{inputs}"
+        ),
+        "params": {"temperature": 0.7, "max_tokens": 1500},
+    },
+}
+
+
+def build_stream_request(request_data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    build_stream_request 函数按 intent 的服务端模板把前端请求转为 llm_handler 的 AgentRequest
+    Returns:
+        (AgentRequest, None)：构建成功
+        (None, 错误信息)：intent 不支持流式输出或输入缺失
+    """
+    template = STREAM_PROMPTS.get(request_data.get("intent")) if isinstance(request_data.get("intent"), str) else None
+    if template is None:
+        return None, f"Unsupported stream intent: {request_data.get('intent')}"
+    context = request_data.get("context")
+    data = context.get("data") if isinstance(context, dict) else None
+    inputs = data.get("inputs") if isinstance(data, dict) else None
+    if not isinstance(inputs, dict):
+        return None, "context.data.inputs must be an object"
+    missing = [name for name in template["required"] if inputs.get(name) in (None, "", [], {})]
+    if missing:
+        return None, f"Missing inputs: {', '.join(missing)}"
+    variables = {name: inputs[name] for name in template["required"] + template["optional"]
+                 if inputs.get(name) is not None}
+    prompt = template["user_prompt"].format(inputs=json.dumps(variables, ensure_ascii=False, sort_keys=True, indent=2))
+    return {
+        "request_id": request_data.get("request_id"),
+        "user_id": request_data.get("user_id"),
+        "task_type": "llm_completion",
+        "context": {"data": {"prompt": prompt, "system_prompt": template["system_prompt"],
+                             "template_id": template["template_id"], "variables": variables}},
+        # 前端发起的调用有用户在等待，固定按 interactive 优先级排队
+        "additional_params": {**template["params"], "priority": "interactive"},
+    }, None
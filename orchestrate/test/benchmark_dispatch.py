@@ -0,0 +1,66 @@
+# benchmark_dispatch.py - 两级路由与扁平分派表的开销对比脚本
+# 职责：同一个 mbti_step1 请求分别经过
+#       两级路由（Router 按 route_type -> ModuleRegistry -> mbti.run -> MBTIRouter.process -> step1.process）
+#       扁平分派（Router 查一次 intent 分派表 -> MBTIRouter.process -> step1.process）
+#       直接调用 MBTIRouter.process
+#       测量每个请求的平均耗时，两种路由与直接调用之差即为编排层的路由开销
+
+import asyncio
+import gc
+import os
+import sys
+import time
+
+# 将项目根目录添加到Python路径，以便导入orchestrate和applications模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from orchestrate.router import Router
+
+ITERATIONS = 20000
+ROUNDS = 5
+REQUEST = {"route_type": "mbti", "intent": "mbti_step1", "user_id": "benchmark_user", "test_user": True}
+
+
+class TwoLevelTable:
+    """始终查不到 intent 的分派表，使 Router 退回到按 route_type 的两级路由"""
+
+    def get(self, intent):
+        return None
+
+
+async def per_request_us(call):
+    for _ in range(100):
+        await call(dict(REQUEST))
+    # 先回收上一轮遗留的响应对象，避免 GC 停顿被计入下一条路径
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await call(dict(REQUEST))
+    return (time.perf_counter() - started) / ITERATIONS * 1e6
+
+
+async def main():
+    flat_router = Router()
+    two_level_router = Router(intent_table=TwoLevelTable())
+    # 首个请求加载 MBTI 模块，加载时注册 intent 处理函数并重建扁平分派表
+    await two_level_router.route_request(dict(REQUEST))
+    from applications.mbti.router import process_mbti_request
+
+    print(f"dispatch table generation {flat_router.intent_table.generation}: {flat_router.intent_table.intents()}\n")
+    # 三条路径交替执行多轮，各取最小值，减少调度和缓存状态带来的抖动
+    rounds = {"direct": [], "two_level": [], "flat": []}
+    for _ in range(ROUNDS):
+        rounds["direct"].append(await per_request_us(process_mbti_request))
+        rounds["two_level"].append(await per_request_us(two_level_router.route_request))
+        rounds["flat"].append(await per_request_us(flat_router.route_request))
+    direct, two_level, flat = (min(rounds[path]) for path in ("direct", "two_level", "flat"))
+    print(f"{'path':<28} {'per request':>12} {'routing overhead':>17}")
+    print(f"{'MBTIRouter.process (direct)':<28} {direct:>10.2f}us {'-':>17}")
+    print(f"{'two-level (route_type+intent)':<28} {two_level:>10.2f}us {two_level - direct:>15.2f}us")
+    print(f"{'flat dispatch table':<28} {flat:>10.2f}us {flat - direct:>15.2f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+# benchmark_sse_relay.py - LLM 流式输出 SSE 转发基准脚本
+# 职责：启动本地 OpenAI 兼容模拟服务（llm_handler/test/mock_llm_server.py，固定首 token 延迟 + 固定 tokens/s），
+#       在同一事件循环中运行 sse_relay 应用，经 HTTP 客户端对比：
+#       1. 非流式 llm_handler.run 的完整生成时间（前端此前的首字节时间）与 SSE 首个 token 事件到达时间（TTFB）
+#       2. 客户端读到几个 token 后断开，核对模拟服务记录到上游流中途关闭、调度槽位全部释放
+
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+import uvicorn
+
+# 将项目根目录添加到Python路径，以便导入orchestrate、llm_handler和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from utilities.logger.logger import configure_logging
+from orchestrate.stream_prompts import build_stream_request
+from utilities.time import Time
+
+LATENCY_MS = 400.0
+STREAM_TOKEN = "bench-token"
+TOKENS_PER_SECOND = 30.0
+RUNS = 5
+RUN_ID = Time.timestamp()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(port):
+    script = os.path.join(root_dir, "llm_handler", "test", "mock_llm_server.py")
+    process = subprocess.Popen([sys.executable, script, "--port", str(port), "--latency-ms", str(LATENCY_MS),
+                                "--tokens-per-second", str(TOKENS_PER_SECOND)])
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/stats", timeout=1.0)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("mock LLM server did not start")
+
+
+def stream_request(index):
+    # 前端请求只携带业务输入；输入中带本次运行的 RUN_ID 与 index，服务端构建的请求不会命中 LLM 缓存，测量的是生成耗时
+    inputs = {"talent_test_report": {"run": f"{RUN_ID}/{index}", "top_talents": ["analysis", "organization"]},
+              "mbti_reverse_test_report": {"mbti_type": "INTJ", "reverse_dimensions": ["E", "S", "F", "P"]}}
+    return {"route_type": "frontend_service", "intent": "final_analysis_stream", "request_id": Time.timestamp(),
+            "user_id": "bench", "context": {"data": {"inputs": inputs}}}
+
+
+def llm_request(index):
+    # 非流式对照：同样由服务端模板构建，直接调用 run
+    agent_request, _ = build_stream_request(stream_request(index))
+    return agent_request
+
+
+async def read_stream(client, url, request, stop_after=None):
+    """返回 (首个 token 事件耗时, 完整耗时, token 事件数, 最后一个事件名)"""
+    started = time.perf_counter()
+    first = None
+    tokens = 0
+    event = None
+    headers = {"Authorization": f"Bearer {STREAM_TOKEN}"}
+    async with client.stream("POST", url, json=request, headers=headers) as response:
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+                if event == "token":
+                    tokens += 1
+                    if first is None:
+                        first = time.perf_counter() - started
+                    if stop_after is not None and tokens >= stop_after:
+                        break
+    return first, time.perf_counter() - started, tokens, event
+
+
+async def main_async(mock_port, relay_port):
+    from llm_handler import llm_handler
+    from orchestrate import sse_relay
+    from orchestrate.orchestrate import orchestrate_instance
+
+    server = uvicorn.Server(uvicorn.Config(sse_relay.create_app(orchestrate_instance), host="127.0.0.1",
+                                           port=relay_port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    url = f"http://127.0.0.1:{relay_port}{sse_relay.STREAM_PATH}"
+
+    # 预热：首次调用加载 litellm 并建立连接
+    await llm_handler.run(llm_request(-1))
+    full = []
+    for index in range(RUNS):
+        started = time.perf_counter()
+        response = await llm_handler.run(llm_request(index))
+        assert response["success"], response["error"]
+        full.append(time.perf_counter() - started)
+
+    ttfb, totals = [], []
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        for index in range(RUNS):
+            first, total, tokens, last = await read_stream(client, url, stream_request(RUNS + index))
+            assert last == "done" and tokens > 0, last
+            ttfb.append(first)
+            totals.append(total)
+        print(f"upstream: {LATENCY_MS:.0f} ms to first token, {TOKENS_PER_SECOND:.0f} tokens/s, {RUNS} runs")
+        print(f"  non-streaming run()  time to first byte {statistics.median(full) * 1e3:7.0f} ms (median)")
+        print(f"  SSE relay            time to first byte {statistics.median(ttfb) * 1e3:7.0f} ms, "
+              f"last event {statistics.median(totals) * 1e3:7.0f} ms (median)")
+        assert statistics.median(ttfb) < statistics.median(full)
+
+        # 缺少令牌或请求未通过入口校验时不转发到上游
+        request = stream_request(98)
+        rejected = (await client.post(url, json=request)).status_code, \
+            (await client.post(url, json={**request, "intent": "mbti_step1"},
+                               headers={"Authorization": f"Bearer {STREAM_TOKEN}"})).status_code
+        print(f"  rejected: no token -> {rejected[0]}, intent outside whitelist -> {rejected[1]}")
+        assert rejected == (401, 400)
+
+        # 客户端断开
+        httpx.post(f"http://127.0.0.1:{mock_port}/stats/reset")
+        await read_stream(client, url, stream_request(99), stop_after=3)
+    await asyncio.sleep(0.5)
+    stats = httpx.get(f"http://127.0.0.1:{mock_port}/stats").json()
+    running = {priority: state["running"] for priority, state in llm_handler._handler.scheduler.snapshot().items()}
+    print(f"  client disconnect after 3 tokens: upstream streams closed early {stats['disconnected']}, "
+          f"active upstream {stats['active']}, scheduler running {running}")
+    assert stats["disconnected"] == 1 and stats["active"] == 0 and not any(running.values())
+
+    server.should_exit = True
+    await serving
+
+
+def main():
+    # 每次调用一条 llm_call 日志，基准中只保留警告以上
+    configure_logging(level=logging.WARNING)
+    mock_port, relay_port = free_port(), free_port()
+    os.environ["LLM_API_BASE"] = f"http://127.0.0.1:{mock_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+    os.environ["CAREERBOT_STREAM_TOKEN"] = STREAM_TOKEN
+    # 离线环境下避免 litellm 导入时联网拉取模型价格表
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    mock = start_mock(mock_port)
+    try:
+        asyncio.run(main_async(mock_port, relay_port))
+    finally:
+        mock.terminate()
+        mock.wait()
+
+
+if __name__ == "__main__":
+    main()
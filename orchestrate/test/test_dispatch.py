@@ -0,0 +1,55 @@
+# test_dispatch.py - 扁平分派表与两级路由的一致性测试
+# 职责：同一个在 step1 中抛出异常的 mbti_step1 请求，先经两级路由（首次加载模块）、再经扁平分派表，
+#       核对两次返回相同的 MBTIRouter 错误响应，且分派表登记的是 MBTIRouter 入口而不是 stepN.process；
+#       不可哈希的 intent 返回未注册 intent 的错误响应而不是抛出异常
+# 用法：python -m pytest -q orchestrate/test/test_dispatch.py
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# 将项目根目录添加到Python路径，以便导入orchestrate和applications模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from orchestrate.router import Router
+
+REQUEST = {"route_type": "mbti", "intent": "mbti_step1", "request_id": "req-dispatch", "user_id": "u1"}
+
+
+class EmptyTable:
+    """始终查不到 intent 的分派表，使 Router 走按 route_type 的两级路由"""
+
+    def get(self, intent):
+        return None
+
+
+def test_flat_table_keeps_router_error_contract(monkeypatch):
+    async def failing_step(request):
+        raise RuntimeError("boom")
+
+    async def scenario():
+        two_level = await Router(intent_table=EmptyTable()).route_request(dict(REQUEST))
+        flat_router = Router()
+        handler = flat_router.intent_table.get("mbti_step1")
+        flat = await flat_router.route_request(dict(REQUEST))
+        return handler, two_level, flat
+
+    import applications.mbti.step1 as step1
+    monkeypatch.setattr(step1, "process", failing_step)
+    handler, two_level, flat = asyncio.run(scenario())
+
+    from applications.mbti.router import process_mbti_request
+    assert handler is process_mbti_request
+    assert two_level == flat
+    assert flat["success"] is False and flat["error_code"] == "SYSTEM_ERROR"
+    assert flat["request_id"] == "req-dispatch"
+
+
+@pytest.mark.parametrize("intent", [["mbti_step1"], {"intent": "mbti_step1"}])
+def test_unhashable_intent_is_unknown(intent):
+    response = asyncio.run(Router().route_request(dict(REQUEST, intent=intent)))
+    assert response["success"] is False and response["error_code"] == "UNKNOWN_INTENT"
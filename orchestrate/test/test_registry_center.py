@@ -0,0 +1,99 @@
+# test_registry_center.py - RegistryCenter 写时复制快照的行为测试
+# 职责：核对注册后修改模块上报的原字典不影响已发布快照，已取得的旧快照在重注册 / 注销后保持不变，
+#       get_fields 默认返回只读视图、get_all_fields 默认返回浅拷贝，thaw=True 时返回可 json.dumps、可修改且不回写快照的普通字典，
+#       以及重注册同名模块时移除其已下线的意图
+# 用法：python -m pytest -q orchestrate/test/test_registry_center.py
+
+import json
+import os
+import sys
+
+import pytest
+
+# 将项目根目录添加到Python路径，以便导入orchestrate模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from orchestrate.registry_center import RegistryCenter
+
+MODULE = "test_registry_module"
+
+
+def handler_v1():
+    return 1
+
+
+def handler_v2():
+    return 2
+
+
+def module_info(version, intents):
+    return {
+        "name": MODULE,
+        "version": str(version),
+        "capabilities": ["a"],
+        "intents": [{"intent": intent, "handler": handler} for intent, handler in intents],
+        "fields": {"answer": {"type": "int", "range": [1, 5]}, "tags": ["x", "y"]},
+    }
+
+
+@pytest.fixture
+def center():
+    center = RegistryCenter()
+    yield center
+    center.unregister_module(MODULE)
+
+
+def test_reported_dict_is_isolated_from_snapshot(center):
+    info = module_info(1, [("test_intent_a", handler_v1)])
+    center.register_module(info)
+    info["fields"]["answer"]["type"] = "str"
+    info["fields"]["tags"].append("z")
+    info["capabilities"].append("b")
+    snapshot = center.snapshot()
+    assert snapshot.field_definitions[MODULE]["answer"]["type"] == "int"
+    assert snapshot.field_definitions[MODULE]["tags"] == ("x", "y")
+    assert snapshot.module_meta[MODULE]["capabilities"] == ("a",)
+    with pytest.raises(TypeError):
+        snapshot.field_definitions[MODULE]["answer"]["type"] = "str"
+
+
+def test_old_snapshot_survives_reregister_and_unregister(center):
+    center.register_module(module_info(1, [("test_intent_a", handler_v1), ("test_intent_b", handler_v1)]))
+    old = center.snapshot()
+    generation = center.register_module(module_info(2, [("test_intent_a", handler_v2)]))
+    assert generation == old.generation + 1
+    assert center.get_handler_for_intent("test_intent_a") is handler_v2
+    # 重注册后不再提供的意图被移除
+    assert center.get_handler_for_intent("test_intent_b") is None
+    center.unregister_module(MODULE)
+    assert MODULE not in center.module_meta and center.get_handler_for_intent("test_intent_a") is None
+    assert old.module_meta[MODULE]["version"] == "1"
+    assert old.intent_handlers["test_intent_a"] is handler_v1 and old.intent_handlers["test_intent_b"] is handler_v1
+
+
+def test_field_getters_return_read_only_views(center):
+    center.register_module(module_info(1, []))
+    fields = center.get_fields(MODULE)
+    assert fields is center.snapshot().field_definitions[MODULE]
+    with pytest.raises(TypeError):
+        fields["answer"]["type"] = "str"
+    all_fields = center.get_all_fields()
+    assert all_fields[MODULE] is fields
+    all_fields[MODULE] = {}
+    assert center.get_fields(MODULE) is fields
+    assert center.get_fields("missing_module") == {}
+
+
+def test_field_getters_thaw_to_plain_copies(center):
+    center.register_module(module_info(1, []))
+    fields = center.get_fields(MODULE, thaw=True)
+    assert fields == {"answer": {"type": "int", "range": [1, 5]}, "tags": ["x", "y"]}
+    json.dumps(fields)
+    json.dumps(center.get_all_fields(thaw=True))
+    fields["answer"]["type"] = "str"
+    fields["tags"].append("z")
+    center.get_all_fields(thaw=True)[MODULE]["extra"] = {}
+    assert center.get_fields(MODULE, thaw=True) == {"answer": {"type": "int", "range": [1, 5]}, "tags": ["x", "y"]}
+    assert center.get_fields("missing_module", thaw=True) == {}
@@ -0,0 +1,157 @@
+# test_replay_cache.py - 请求幂等重放缓存的行为测试
+# 职责：不依赖路由和业务模块，用可控的 compute 协程核对 ReplayCache 的 single-flight 合并、
+#       第一个请求被取消时其余请求照常拿到结果、全部取消时才取消计算、只缓存成功响应、TTL 过期，
+#       以及 request_id 缺失 / 格式不符 / 超出窗口时绕过缓存
+# 用法：python -m pytest -q orchestrate/test/test_replay_cache.py
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# 将项目根目录添加到Python路径，以便导入orchestrate和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from orchestrate import replay_cache
+from orchestrate.replay_cache import ReplayCache
+from utilities.time import Time
+
+INTENT = "mbti_step1"
+
+
+class Upstream:
+    """可控的 compute：记录调用次数，release() 之前一直挂起"""
+
+    def __init__(self, response=None):
+        self.calls = 0
+        self.cancelled = 0
+        self.response = {"success": True} if response is None else response
+        self.gate = asyncio.Event()
+
+    async def compute(self):
+        self.calls += 1
+        try:
+            await self.gate.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.response
+
+    def release(self):
+        self.gate.set()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_duplicates_share_one_call():
+    async def scenario():
+        cache, upstream, request_id = ReplayCache(), Upstream(), Time.timestamp()
+        waiters = [asyncio.create_task(cache.run(INTENT, request_id, upstream.compute)) for _ in range(3)]
+        await settle()
+        upstream.release()
+        responses = await asyncio.gather(*waiters)
+        assert upstream.calls == 1
+        assert all(response is upstream.response for response in responses)
+        assert cache.stats["misses"] == 1 and cache.stats["coalesced"] == 2
+        # 完成后的重复提交直接命中缓存
+        assert await cache.run(INTENT, request_id, upstream.compute) is upstream.response
+        assert upstream.calls == 1 and cache.stats["hits"] == 1 and not cache.in_flight
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_first_caller_keeps_coalesced_waiters():
+    async def scenario():
+        cache, upstream, request_id = ReplayCache(), Upstream(), Time.timestamp()
+        first = asyncio.create_task(cache.run(INTENT, request_id, upstream.compute))
+        await settle()
+        second = asyncio.create_task(cache.run(INTENT, request_id, upstream.compute))
+        await settle()
+        first.cancel()
+        await settle()
+        assert first.cancelled() and not second.done()
+        upstream.release()
+        assert await second is upstream.response
+        assert upstream.calls == 1 and upstream.cancelled == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_all_callers_cancels_the_call():
+    async def scenario():
+        cache, upstream, request_id = ReplayCache(), Upstream(), Time.timestamp()
+        waiters = [asyncio.create_task(cache.run(INTENT, request_id, upstream.compute)) for _ in range(2)]
+        await settle()
+        for waiter in waiters:
+            waiter.cancel()
+        await settle()
+        assert upstream.cancelled == 1 and not cache.in_flight and not cache.entries
+        # 之后的重复提交重新执行
+        upstream.release()
+        assert await cache.run(INTENT, request_id, upstream.compute) is upstream.response
+        assert upstream.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_only_successful_responses_are_cached():
+    async def scenario():
+        cache, request_id = ReplayCache(), Time.timestamp()
+        for response in ({"success": False}, {"success": True, "error": {"code": "X"}}):
+            upstream = Upstream(response)
+            upstream.release()
+            assert await cache.run(INTENT, request_id, upstream.compute) is response
+        assert not cache.entries
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        try:
+            await cache.run(INTENT, request_id, fail)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("compute exception was swallowed")
+        assert not cache.entries and not cache.in_flight
+
+    asyncio.run(scenario())
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    async def scenario():
+        # 只替换 replay_cache 模块看到的时钟，事件循环仍使用真实时钟
+        clock = [1000.0]
+        monkeypatch.setattr(replay_cache, "time", SimpleNamespace(time=time.time, monotonic=lambda: clock[0]))
+        cache, upstream, request_id = ReplayCache(ttl_seconds=10), Upstream(), Time.timestamp()
+        upstream.release()
+        await cache.run(INTENT, request_id, upstream.compute)
+        clock[0] += 9
+        await cache.run(INTENT, request_id, upstream.compute)
+        assert upstream.calls == 1
+        clock[0] += 2
+        await cache.run(INTENT, request_id, upstream.compute)
+        assert upstream.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_requests_outside_window_bypass_cache():
+    async def scenario():
+        cache = ReplayCache(window_seconds=60)
+        upstream = Upstream()
+        upstream.release()
+        stale = "2020-01-01T00:00:00+0800_12345678-1234-5678-9012-123456789012"
+        for intent, request_id in ((INTENT, stale), (INTENT, "not-a-request-id"), (None, Time.timestamp()),
+                                   (INTENT, None)):
+            for _ in range(2):
+                await cache.run(intent, request_id, upstream.compute)
+        assert upstream.calls == 8
+        assert cache.stats["bypassed"] == 4 and not cache.entries
+
+    asyncio.run(scenario())
@@ -0,0 +1,328 @@
+# logger.py - Career Bot 各模块共用的非阻塞结构化日志
+"""
+设计用途：
+请求路径上的日志调用只构建 LogRecord，并通过 logging.handlers.QueueHandler 放入内存队列；
+后台线程把记录渲染为 JSON 行并批量写入输出流，请求协程不会因写日志而阻塞。
+
+使用方式：
+- 安装了 structlog（requirements.txt）时以 structlog 作为前端；未安装时由一个小的标准库适配器驱动
+  同一个队列后端，调用方式相同：logger.info("event_name", key=value)
+- bind_request_context() 绑定的 request_id / user_id 会附加到同一任务输出的每条记录上
+- 高频的 DEBUG 事件可以按事件名抽样输出
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, Optional, TextIO
+
+try:
+    import structlog
+except ImportError:  # 未安装时退回标准库前端，后端完全相同
+    structlog = None
+
+
+ROOT_LOGGER_NAME = "careerbot"
+
+PHILIPPINES_TZ = timezone(timedelta(hours=8))
+
+# LogRecord 自带的属性，不属于调用方传入的字段
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_request_context: contextvars.ContextVar = contextvars.ContextVar("careerbot_request_context", default={})
+
+
+def bind_request_context(**fields: Any) -> contextvars.Token:
+    """
+    bind_request_context 函数把字段（通常为 request_id 和 user_id）附加到当前任务输出的每条日志上
+    返回的 token 交给 reset_request_context() 恢复绑定前的上下文
+    """
+    merged = dict(_request_context.get())
+    for key, value in fields.items():
+        if value is not None:
+            merged[key] = value
+    return _request_context.set(merged)
+
+
+def reset_request_context(token: contextvars.Token) -> None:
+
+    _request_context.reset(token)
+
+
+class DebugSampler:
+    """DebugSampler 类对 DEBUG 记录按事件名每 rate 条保留一条，其他级别全部保留"""
+
+    def __init__(self, rate: int = 1):
+        self.rate = max(1, int(rate))
+        self._counters: Dict[str, int] = {}
+
+    def keep(self, level: int, event: str) -> bool:
+
+        if level > logging.DEBUG or self.rate == 1:
+            return True
+        count = self._counters.get(event, 0)
+        self._counters[event] = count + 1
+        return count % self.rate == 0
+
+
+class JsonLineFormatter(logging.Formatter):
+    """JsonLineFormatter 类把一条记录及其附加字段渲染为一行 JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, PHILIPPINES_TZ).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class BatchingQueueListener(threading.Thread):
+    """
+    BatchingQueueListener 类为后台写线程
+    每次从队列取出最多 batch_size 条记录，渲染后以一次 write 整批写入输出流
+    """
+
+    _STOP = object()
+
+    def __init__(self, log_queue: "queue.SimpleQueue", stream: TextIO, batch_size: int = 256,
+                 flush_interval: float = 0.2):
+        super().__init__(name="careerbot-log-writer", daemon=True)
+        self.log_queue = log_queue
+        self.stream = stream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.formatter = JsonLineFormatter()
+
+    def run(self) -> None:
+
+        get = self.log_queue.get
+        get_nowait = self.log_queue.get_nowait
+        stopping = False
+        while not stopping:
+            try:
+                first = get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for record in batch:
+                if record is self._STOP:
+                    stopping = True
+                    continue
+                try:
+                    lines.append(self.formatter.format(record))
+                except Exception:
+                    lines.append(json.dumps({"level": "error", "event": "log_format_failed", "logger": record.name}))
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except Exception:
+                    pass
+
+    def stop(self) -> None:
+
+        self.log_queue.put(self._STOP)
+        self.join(timeout=5)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """_QueueHandler 类直接把记录放入队列，不在调用方线程中预先格式化"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+
+        return record
+
+
+def _emit(logger: logging.Logger, level: int, msg: str, exc_info: Any = None,
+          extra: Optional[Dict[str, Any]] = None, **_: Any) -> None:
+    """
+    _emit 函数直接构建 LogRecord 并交给 handler
+    事件都有名称，Logger._log 中 findCaller() 的栈回溯不值得它的开销
+    """
+    if exc_info is True:
+        exc_info = sys.exc_info()
+    elif isinstance(exc_info, BaseException):
+        exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+    logger.handle(logger.makeRecord(logger.name, level, "(unknown file)", 0, msg, (), exc_info or None, extra=extra))
+
+
+class _RecordLogger:
+    """_RecordLogger 类交给 structlog 使用：接收 render_to_log_kwargs 的输出并调用 _emit()"""
+
+    __slots__ = ("_logger",)
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+
+    def debug(self, **kwargs: Any) -> None:
+        _emit(self._logger, logging.DEBUG, **kwargs)
+
+    def info(self, **kwargs: Any) -> None:
+        _emit(self._logger, logging.INFO, **kwargs)
+
+    def warning(self, **kwargs: Any) -> None:
+        _emit(self._logger, logging.WARNING, **kwargs)
+
+    def error(self, **kwargs: Any) -> None:
+        _emit(self._logger, logging.ERROR, **kwargs)
+
+    def critical(self, **kwargs: Any) -> None:
+        _emit(self._logger, logging.CRITICAL, **kwargs)
+
+    warn = warning
+    fatal = critical
+
+
+def _rename_reserved(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """_rename_reserved 函数为与 LogRecord 属性同名的字段加上 field_ 前缀（logging 拒绝覆盖这些属性）"""
+    for key in [key for key in fields if key in _RECORD_ATTRIBUTES]:
+        fields[f"field_{key}"] = fields.pop(key)
+    return fields
+
+
+class EventLogger:
+    """EventLogger 类为未安装 structlog 时使用的标准库前端，调用方式与 structlog 一致"""
+
+    __slots__ = ("_logger", "_bound")
+
+    def __init__(self, logger: logging.Logger, bound: Optional[Dict[str, Any]] = None):
+        self._logger = logger
+        self._bound = bound or {}
+
+    def bind(self, **fields: Any) -> "EventLogger":
+
+        return EventLogger(self._logger, {**self._bound, **fields})
+
+    def _log(self, level: int, event: str, fields: Dict[str, Any], exc_info: bool = False) -> None:
+
+        if not self._logger.isEnabledFor(level) or not _sampler.keep(level, event):
+            return
+        extra = _rename_reserved({**_request_context.get(), **self._bound, **fields})
+        _emit(self._logger, level, event, exc_info, extra)
+
+    def debug(self, event: str, **fields: Any) -> None:
+        self._log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        self._log(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        self._log(logging.WARNING, event, fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        self._log(logging.ERROR, event, fields)
+
+    def exception(self, event: str, **fields: Any) -> None:
+        self._log(logging.ERROR, event, fields, exc_info=True)
+
+
+_state_lock = threading.Lock()
+_listener: Optional[BatchingQueueListener] = None
+_sampler = DebugSampler()
+
+
+def _merge_request_context(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+
+    context = _request_context.get()
+    if context:
+        for key, value in context.items():
+            event_dict.setdefault(key, value)
+    return event_dict
+
+
+# structlog.stdlib.render_to_log_kwargs 直接转交给 logging 的参数名
+_LOGGING_KWARGS = ("event", "exc_info", "stack_info", "stacklevel")
+
+
+def _drop_reserved_names(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+
+    kept = {key: event_dict.pop(key) for key in _LOGGING_KWARGS if key in event_dict}
+    _rename_reserved(event_dict)
+    event_dict.update(kept)
+    return event_dict
+
+
+def _sample_debug(_, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+
+    if method_name == "debug" and not _sampler.keep(logging.DEBUG, event_dict.get("event", "")):
+        raise structlog.DropEvent
+    return event_dict
+
+
+def configure_logging(level: int = logging.INFO, stream: Optional[TextIO] = None, batch_size: int = 256,
+                      flush_interval: float = 0.2, debug_sample_rate: int = 1) -> None:
+    """
+    configure_logging 函数（重新）配置共享的日志管线：级别、输出流、批量大小、刷新间隔和 DEBUG 抽样率
+    可以多次调用，每次调用替换之前的写线程
+    """
+    global _listener, _sampler
+    with _state_lock:
+        if _listener is not None:
+            _listener.stop()
+        _sampler = DebugSampler(debug_sample_rate)
+        log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        _listener = BatchingQueueListener(log_queue, stream or sys.stderr, batch_size, flush_interval)
+        _listener.start()
+
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.handlers[:] = [_QueueHandler(log_queue)]
+        root.setLevel(level)
+        root.propagate = False
+
+        if structlog is not None:
+            structlog.configure(
+                processors=[
+                    _sample_debug,
+                    _merge_request_context,
+                    _drop_reserved_names,
+                    structlog.stdlib.render_to_log_kwargs,
+                ],
+                wrapper_class=structlog.make_filtering_bound_logger(level),
+                logger_factory=lambda name, *args: _RecordLogger(logging.getLogger(name)),
+                cache_logger_on_first_use=True,
+            )
+
+
+def shutdown_logging() -> None:
+    """shutdown_logging 函数写出队列中剩余的记录并停止写线程"""
+    global _listener
+    with _state_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_logger(name: str):
+    """
+    get_logger 函数返回 careerbot 层级下的日志对象
+    首次调用时按默认参数配置日志管线
+    """
+    if _listener is None:
+        configure_logging()
+    logger_name = name if name.startswith(ROOT_LOGGER_NAME) else f"{ROOT_LOGGER_NAME}.{name}"
+    if structlog is not None:
+        return structlog.get_logger(logger_name)
+    return EventLogger(logging.getLogger(logger_name))
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,176 @@
+# loop_monitor.py - 事件循环延迟与阻塞调用检测
+"""
+设计用途：
+探测任务每次休眠 probe_interval，把实际唤醒比预期晚的时间记录到 event_loop_lag_seconds 直方图，
+每次唤醒同时刷新心跳。
+
+看门狗线程检查该心跳：事件循环超过 block_threshold 没有推进时，说明循环卡在某一个回调中。
+看门狗此时通过 sys._current_frames() 采样事件循环线程的当前调用栈，并把样本归属到属于本项目的
+最内层栈帧，即真正阻塞的业务代码，而不是 asyncio 内部。
+
+阻塞点按代码位置汇总，导出为 event_loop_blocked_samples_total{location}，并定期以前 N 名报告的形式
+写入日志，持续给出需要移出事件循环的代码清单。
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from utilities.logger.logger import get_logger
+from utilities.monitor.monitor import MetricsRegistry, registry
+
+logger = get_logger("monitor.loop")
+
+# 项目根目录：包含 utilities/、applications/、orchestrate/ 等目录
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class LoopMonitor:
+    """
+    LoopMonitor 类测量调度延迟，并找出阻塞事件循环的代码
+    start() 必须在被监控事件循环上运行的协程中调用
+    """
+
+    def __init__(self, probe_interval: float = 0.05, block_threshold: float = 0.1,
+                 report_interval: float = 60.0, top_n: int = 10,
+                 metrics_registry: Optional[MetricsRegistry] = None, project_root: str = PROJECT_ROOT):
+        self.probe_interval = probe_interval
+        self.block_threshold = block_threshold
+        self.report_interval = report_interval
+        self.top_n = top_n
+        self.project_root = project_root + os.sep
+        # 看门狗在每个阈值时长内采样两次，避免漏掉较短的阻塞
+        self.check_interval = block_threshold / 2
+
+        target = metrics_registry or registry
+        self.lag_histogram = target.histogram(
+            "event_loop_lag_seconds", "Delay between a probe's scheduled and actual wake-up").labels()
+        self.blocked_counter = target.counter(
+            "event_loop_blocked_samples_total", "Watchdog samples taken while the loop was blocked",
+            ("location",))
+
+        # 代码位置 → {"samples", "blocked_seconds", "max_stall_seconds", "stack"}
+        self.offenders: Dict[str, Dict[str, Any]] = {}
+        # 由看门狗线程写入，由事件循环线程上的 report() 读取
+        self._offenders_lock = threading.Lock()
+        self._last_tick = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+
+        if self._probe_task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopping.clear()
+        self._probe_task = asyncio.get_running_loop().create_task(self._probe())
+        self._watchdog = threading.Thread(target=self._watch, name="careerbot-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+
+        self._stopping.set()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _probe(self) -> None:
+
+        interval = self.probe_interval
+        clock = time.monotonic
+        next_report = clock() + self.report_interval
+        while True:
+            scheduled = clock()
+            await asyncio.sleep(interval)
+            now = clock()
+            self._last_tick = now
+            lag = now - scheduled - interval
+            self.lag_histogram.record(int(lag * 1e9) if lag > 0 else 0)
+            if now >= next_report:
+                next_report = now + self.report_interval
+                self.log_report()
+
+    def _watch(self) -> None:
+
+        expected_gap = self.probe_interval
+        while not self._stopping.wait(self.check_interval):
+            stalled = time.monotonic() - self._last_tick - expected_gap
+            if stalled < self.block_threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._record_sample(frame, stalled)
+
+    def _record_sample(self, frame, stalled: float) -> None:
+
+        location = self._locate(frame)
+        with self._offenders_lock:
+            offender = self.offenders.get(location)
+            if offender is None:
+                if len(self.offenders) >= 10 * self.top_n + 100:
+                    return
+                offender = self.offenders[location] = {
+                    "samples": 0,
+                    "blocked_seconds": 0.0,
+                    "max_stall_seconds": 0.0,
+                    "stack": "".join(traceback.format_stack(frame)),
+                }
+            offender["samples"] += 1
+            # 每个样本代表一个看门狗检查间隔的阻塞时间
+            offender["blocked_seconds"] += self.check_interval
+            if stalled > offender["max_stall_seconds"]:
+                offender["max_stall_seconds"] = stalled
+        self.blocked_counter.labels(location).inc()
+
+    def _locate(self, frame) -> str:
+        """_locate 方法返回项目内（不含 site-packages）最内层栈帧，格式为 "路径:行号 函数名" """
+        innermost = frame
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(self.project_root) and "site-packages" not in filename:
+                relative = filename[len(self.project_root):]
+                return f"{relative}:{frame.f_lineno} {frame.f_code.co_name}"
+            frame = frame.f_back
+        return f"{innermost.f_code.co_filename}:{innermost.f_lineno} {innermost.f_code.co_name}"
+
+    def report(self) -> List[Dict[str, Any]]:
+        """report 方法按阻塞时间从多到少返回前 top_n 个阻塞点"""
+        with self._offenders_lock:
+            ranked = sorted(((location, dict(offender)) for location, offender in self.offenders.items()),
+                            key=lambda item: item[1]["blocked_seconds"], reverse=True)
+        return [
+            {
+                "location": location,
+                "samples": offender["samples"],
+                "blocked_seconds": round(offender["blocked_seconds"], 3),
+                "max_stall_seconds": round(offender["max_stall_seconds"], 3),
+                "stack": offender["stack"],
+            }
+            for location, offender in ranked[:self.top_n]
+        ]
+
+    def log_report(self) -> None:
+
+        offenders = self.report()
+        if not offenders:
+            return
+        logger.warning(
+            "event_loop_blocking_report",
+            lag_p99_seconds=self.lag_histogram.quantile(0.99),
+            offenders=[{key: value for key, value in offender.items() if key != "stack"} for offender in offenders],
+        )
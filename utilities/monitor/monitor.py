@@ -0,0 +1,416 @@
+# monitor.py - Career Bot 各模块共用的低开销指标
+"""
+设计用途：
+计数器和延迟直方图保存在普通的 Python 结构中，在请求路径上直接更新。直方图以整数纳秒记录耗时，
+写入对数线性（HDR 风格）分桶：每个 2 的幂区间分 16 个子桶，任一记录值的误差不超过 6.25%，
+一次记录只需一次 bit_length() 和一次列表自增。
+
+使用方式：
+- 热路径为 timed() 装饰器，装饰 Orchestrate.handle_request、MBTIRouter.process 和各 stepN.process；
+  序列按 route_type / intent / step 和 outcome 打标签
+- 指标以 Prometheus 文本格式在 /metrics 暴露：安装了 prometheus-client（requirements.txt）时注册为其默认
+  registry 的自定义 collector；未安装时由标准库 HTTP 服务输出相同文本。两者都在 start_metrics_server()
+  中导入，只记录指标的处理函数导入本模块的开销很小
+
+更新不加锁：请求处理运行在 asyncio 事件循环线程中，即使在无 GIL 的并发下偶尔丢失一次自增，对指标也可以接受
+"""
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+METRICS_PORT = 9464
+
+# 每个指标超过该数量的标签组合后，新组合归入 "other" 序列
+MAX_SERIES_PER_METRIC = 1000
+OVERFLOW_LABEL = "other"
+
+# 导出给 Prometheus 的分桶边界（秒），由细粒度的 HDR 分桶汇总得到
+EXPORT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+# 记录值上限为 2**40 纳秒（约 18 分钟），超出的值计入最后一个分桶
+_MAX_VALUE_BITS = 40
+_BUCKET_COUNT = (_MAX_VALUE_BITS - _SUB_BUCKET_BITS) * _SUB_BUCKETS + 2 * _SUB_BUCKETS
+
+
+def bucket_index(value: int) -> int:
+    """bucket_index 函数返回非负整数值所在的 HDR 分桶下标"""
+    if value < 2 * _SUB_BUCKETS:
+        return value if value > 0 else 0
+    shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+    if shift > _MAX_VALUE_BITS - _SUB_BUCKET_BITS - 1:
+        return _BUCKET_COUNT - 1
+    return shift * _SUB_BUCKETS + (value >> shift)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """bucket_upper_bound 函数返回 HDR 分桶的上界（不含）"""
+    if index < 2 * _SUB_BUCKETS:
+        return index + 1
+    shift = index // _SUB_BUCKETS - 1
+    mantissa = index - shift * _SUB_BUCKETS
+    return (mantissa + 1) << shift
+
+
+class HistogramSeries:
+    """HistogramSeries 类为一组标签对应的延迟序列：HDR 分桶计数、总次数与纳秒耗时总和"""
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+
+    def record(self, value_ns: int) -> None:
+
+        # 内联 bucket_index()：每次被装饰的调用都会执行一次
+        if value_ns < 2 * _SUB_BUCKETS:
+            index = value_ns if value_ns > 0 else 0
+        else:
+            shift = value_ns.bit_length() - _SUB_BUCKET_BITS - 1
+            if shift > _MAX_VALUE_BITS - _SUB_BUCKET_BITS - 1:
+                index = _BUCKET_COUNT - 1
+            else:
+                index = shift * _SUB_BUCKETS + (value_ns >> shift)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value_ns
+
+    def reset(self) -> None:
+
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+
+    def quantile(self, q: float) -> float:
+        """quantile 方法返回 q 分位数（秒），取其所在分桶的上界"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                seen += bucket_count
+                if seen >= rank:
+                    return bucket_upper_bound(index) / 1e9
+        return bucket_upper_bound(_BUCKET_COUNT - 1) / 1e9
+
+    def export_buckets(self, bounds: Iterable[float] = EXPORT_BUCKETS) -> List[Tuple[float, int]]:
+        """export_buckets 方法把细粒度分桶汇总为累计的 (le 秒, 次数) 列表，最后一项为 +Inf"""
+        cumulative = []
+        seen = 0
+        index = 0
+        counts = self.counts
+        for bound in bounds:
+            bound_ns = int(bound * 1e9)
+            while index < _BUCKET_COUNT and bucket_upper_bound(index) <= bound_ns:
+                seen += counts[index]
+                index += 1
+            cumulative.append((bound, seen))
+        cumulative.append((float("inf"), self.count))
+        return cumulative
+
+
+class _Metric:
+    """_Metric 类为 Counter 与 Histogram 共用的 标签组合 → 序列 映射"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # series 以导出用的（字符串化的）标签值为键
+        self.series: Dict[Tuple[str, ...], Any] = {}
+        # _lookup 把热路径上见到的原始标签元组映射到对应序列
+        self._lookup: Dict[Tuple[Any, ...], Any] = {}
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def labels(self, *values: Any):
+        """labels 方法返回给定标签值对应的序列，首次使用时创建"""
+        try:
+            return self._lookup[values]
+        except KeyError:
+            pass
+        except TypeError:  # 取自请求的标签值不可哈希
+            values = tuple(map(str, values))
+        return self._create_series(values)
+
+    def _create_series(self, values: Tuple[Any, ...]):
+
+        key = tuple("" if value is None else str(value) for value in values)
+        if key not in self.series and len(self.series) >= MAX_SERIES_PER_METRIC:
+            key = (OVERFLOW_LABEL,) * len(self.labelnames)
+        series = self.series.setdefault(key, self._new_series())
+        if len(self._lookup) < 2 * MAX_SERIES_PER_METRIC:
+            self._lookup[values] = series
+        return series
+
+    def clear(self) -> None:
+
+        self.series.clear()
+        self._lookup.clear()
+
+    def reset(self) -> None:
+        """reset 方法原地清零每个序列，timed() 持有的序列引用保持有效"""
+        for series in list(self.series.values()):
+            series.reset()
+
+
+class CounterSeries:
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+
+        self.value += amount
+
+    def reset(self) -> None:
+
+        self.value = 0
+
+
+class Counter(_Metric):
+
+    kind = "counter"
+
+    def _new_series(self) -> CounterSeries:
+        return CounterSeries()
+
+
+class Histogram(_Metric):
+
+    kind = "histogram"
+
+    def _new_series(self) -> HistogramSeries:
+        return HistogramSeries()
+
+
+class MetricsRegistry:
+    """MetricsRegistry 类按名称保存全部指标，重复注册同名指标时返回已有指标"""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        # timed() 创建的请求级指标名称
+        self.request_metrics: set = set()
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name: str, documentation: str, labelnames: Iterable[str]):
+
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = metric_class(name, documentation, tuple(labelnames))
+            elif not isinstance(metric, metric_class) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Histogram:
+
+        return self._register(Histogram, name, documentation, labelnames)
+
+    def clear(self) -> None:
+        """clear 方法丢弃全部已记录的序列，保留指标定义"""
+        for metric in list(self.metrics.values()):
+            metric.clear()
+
+    def reset_request_metrics(self) -> None:
+        """
+        reset_request_metrics 方法清零全部 timed() 指标的序列
+        用于在真实流量到来之前丢弃启动预热回放的合成请求
+        """
+        for name in list(self.request_metrics):
+            self.metrics[name].reset()
+
+    def render_text(self) -> str:
+        """render_text 方法以 Prometheus 文本格式渲染全部指标"""
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for key, series in list(metric.series.items()):
+                labels = ",".join(
+                    f'{label}="{_escape_label(value)}"' for label, value in zip(metric.labelnames, key)
+                )
+                if metric.kind == "counter":
+                    lines.append(f"{metric.name}{{{labels}}} {series.value}")
+                    continue
+                separator = "," if labels else ""
+                for bound, count in series.export_buckets():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric.name}_bucket{{{labels}{separator}le="{le}"}} {count}')
+                lines.append(f"{metric.name}_count{{{labels}}} {series.count}")
+                lines.append(f"{metric.name}_sum{{{labels}}} {series.total / 1e9}")
+        return "\n".join(lines) + "\n"
+
+    def collect(self):
+        """collect 方法实现 prometheus_client 的 collector 协议：逐个产出由本 registry 构建的指标族"""
+        from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+        for metric in list(self.metrics.values()):
+            if metric.kind == "counter":
+                # prometheus_client 会自行为计数器样本追加 _total 后缀
+                family = CounterMetricFamily(metric.name[:-6] if metric.name.endswith("_total") else metric.name,
+                                             metric.documentation, labels=metric.labelnames)
+                for key, series in list(metric.series.items()):
+                    family.add_metric(key, series.value)
+            else:
+                family = HistogramMetricFamily(metric.name, metric.documentation, labels=metric.labelnames)
+                for key, series in list(metric.series.items()):
+                    buckets = [("+Inf" if bound == float("inf") else repr(bound), count)
+                               for bound, count in series.export_buckets()]
+                    family.add_metric(key, buckets, series.total / 1e9)
+            yield family
+
+
+def _escape_label(value: str) -> str:
+
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+
+# 处理函数未收到请求字典时使用的空请求
+_EMPTY: Dict[str, Any] = {}
+
+
+def timed(metric: str, documentation: str, request_labels: Tuple[str, ...] = (),
+          metrics_registry: Optional[MetricsRegistry] = None, **static_labels: str) -> Callable:
+    """
+    timed 装饰器用于最后一个位置参数为请求字典的异步处理函数
+    记录 <metric>_duration_seconds 与 <metric>_requests_total{outcome}；处理函数抛出异常、
+    返回 success=False 或包含 "error" 键时 outcome 为 "error"，判定方式与 replay_cache 一致
+
+    request_labels 在每次调用时从请求字典读取，如 ("route_type", "intent")；
+    static_labels 对每个处理函数固定，如 step="mbti_step1"
+    """
+    target = metrics_registry or registry
+    static_names = tuple(static_labels)
+    static_values = tuple(static_labels[name] for name in static_names)
+    labelnames = static_names + tuple(request_labels)
+    histogram = target.histogram(f"{metric}_duration_seconds", documentation, labelnames)
+    counter = target.counter(f"{metric}_requests_total", documentation, labelnames + ("outcome",))
+    target.request_metrics.update((histogram.name, counter.name))
+    clock = time.perf_counter_ns
+    # 请求标签值 → (直方图序列, 成功计数, 失败计数)：每次调用只需一次字典查找
+    series_cache: Dict[Tuple[Any, ...], Tuple[HistogramSeries, CounterSeries, CounterSeries]] = {}
+
+    def resolve(request_values: Tuple[Any, ...]):
+
+        label_values = static_values + request_values
+        entry = (
+            histogram.labels(*label_values),
+            counter.labels(*label_values, "success"),
+            counter.labels(*label_values, "error"),
+        )
+        try:
+            if len(series_cache) < 2 * MAX_SERIES_PER_METRIC:
+                series_cache[request_values] = entry
+        except TypeError:  # 标签值不可哈希，labels() 已将其字符串化
+            pass
+        return entry
+
+    def decorator(func: Callable) -> Callable:
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if request_labels:
+                request = args[-1] if args else None
+                get = request.get if isinstance(request, dict) else _EMPTY.get
+                request_values = tuple(map(get, request_labels))
+            else:
+                request_values = ()
+            start = clock()
+            try:
+                response = await func(*args, **kwargs)
+            except BaseException:
+                elapsed = clock() - start
+                entry = resolve(request_values)
+                entry[0].record(elapsed)
+                entry[2].value += 1
+                raise
+            elapsed = clock() - start
+            try:
+                entry = series_cache[request_values]
+            except (KeyError, TypeError):
+                entry = resolve(request_values)
+            entry[0].record(elapsed)
+            if type(response) is dict and (response.get("success") is False or "error" in response):
+                entry[2].value += 1
+            else:
+                entry[1].value += 1
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _metrics_handler(metrics_registry: MetricsRegistry):
+    """_metrics_handler 函数返回未安装 prometheus-client 时使用的标准库 /metrics 请求处理类"""
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics_registry.render_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 每隔几秒一次的抓取请求否则会刷满 stderr
+            pass
+
+    return MetricsHandler
+
+
+_collector_registered = False
+
+
+def start_metrics_server(port: int = METRICS_PORT, addr: str = "0.0.0.0",
+                         metrics_registry: Optional[MetricsRegistry] = None):
+    """
+    start_metrics_server 函数在守护线程中提供 /metrics
+    安装了 prometheus_client 时使用它；否则启动并返回标准库 ThreadingHTTPServer 实例
+    """
+    global _collector_registered
+    target = metrics_registry or registry
+    try:
+        import prometheus_client
+    except ImportError:  # 退回标准库的指标服务
+        prometheus_client = None
+    if prometheus_client is not None:
+        if not _collector_registered:
+            prometheus_client.REGISTRY.register(target)
+            _collector_registered = True
+        return prometheus_client.start_http_server(port, addr)
+
+    from http.server import ThreadingHTTPServer
+    server = ThreadingHTTPServer((addr, port), _metrics_handler(target))
+    threading.Thread(target=server.serve_forever, name="careerbot-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,250 @@
+# profiler.py - 线上 orchestrate 进程的按需采样分析器
+"""
+设计用途：
+profile_for(seconds) 启动一个线程，以 rate_hz 的频率通过 sys._current_frames() 采样事件循环线程的调用栈，
+直到时间结束。每个样本归属到正在处理的请求：Orchestrate.handle_request 和 MBTIRouter.process 在请求前后
+调用 tag_current_task() / release_task_tag()，分析期间以 route_type/intent 标记 asyncio 任务，采样线程查找
+事件循环的当前任务。事件循环在 select() 中等待时的样本标记为 "(idle)"。
+
+使用方式：
+- 结果写为 collapsed 栈文件（兼容 flamegraph.pl / speedscope，标签作为根帧）和每个路由一个 profile 的
+  speedscope JSON 文件
+- 通过 orchestrate 的管理路由（见 Router._handle_admin）或 install_signal_trigger() 注册的 SIGUSR2 信号触发
+- 两次分析之间不运行任何采样，也不记录任何数据
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from utilities.logger.logger import get_logger
+from utilities.time import Time
+
+logger = get_logger("monitor.profiler")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 分析结果默认写入已被 git 忽略的 cache/ 下，可由环境变量 CAREERBOT_PROFILE_DIR 覆盖
+PROFILE_DIR_ENV = "CAREERBOT_PROFILE_DIR"
+DEFAULT_OUTPUT_DIR = os.environ.get(PROFILE_DIR_ENV) or os.path.join(PROJECT_ROOT, "cache", "profiles")
+DEFAULT_RATE_HZ = 97
+MAX_SECONDS = 120
+IDLE_LABEL = "(idle)"
+UNTAGGED_LABEL = "(untagged)"
+
+# 没有回调运行时事件循环线程停留的选择器方法
+_IDLE_FUNCTIONS = frozenset(("select", "poll", "epoll", "kqueue", "control"))
+
+# 当前正在运行的分析器；同一时间只允许一次分析
+_active: Optional["SamplingProfiler"] = None
+_session_task: Optional[asyncio.Task] = None
+
+
+def tag_current_task(request: Dict[str, Any]) -> Optional[Tuple["SamplingProfiler", asyncio.Task]]:
+    """
+    tag_current_task 函数把当前 asyncio 任务的样本归属到该请求的 route_type/intent，直到以返回的 token 调用 release_task_tag()
+    最外层的标记优先，链式调用的 step 仍归属到触发它们的请求；不在分析期间时不做任何事并返回 None
+    """
+    profiler = _active
+    if profiler is None:
+        return None
+    task = asyncio.current_task()
+    if task is None or task in profiler.task_labels:
+        return None
+    route_type = request.get("route_type") or "-"
+    profiler.task_labels[task] = f"{route_type}/{request.get('intent') or '-'}"
+    return profiler, task
+
+
+def release_task_tag(token: Optional[Tuple["SamplingProfiler", asyncio.Task]]) -> None:
+
+    if token is not None:
+        token[0].task_labels.pop(token[1], None)
+
+
+class SamplingProfiler:
+    """SamplingProfiler 类以固定频率采样一个线程的调用栈，并按 (标签, 调用栈) 计数"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, thread_id: int, rate_hz: float = DEFAULT_RATE_HZ):
+        self.loop = loop
+        self.thread_id = thread_id
+        self.interval = 1.0 / rate_hz
+        self.samples: Counter = Counter()
+        self.task_labels: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+        self.sample_count = 0
+        self._frame_names: Dict[Any, str] = {}
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._root = PROJECT_ROOT + os.sep
+
+    def start(self) -> None:
+
+        self._thread = threading.Thread(target=self._run, name="careerbot-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _run(self) -> None:
+
+        interval = self.interval
+        next_sample = time.perf_counter()
+        while not self._stopping.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._sample(frame)
+            next_sample += interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                self._stopping.wait(delay)
+            else:
+                # 采样落后（长回调持有 GIL）时重新对齐，不连续补采
+                next_sample = time.perf_counter()
+
+    def _frame_name(self, code) -> str:
+
+        name = self._frame_names.get(code)
+        if name is None:
+            filename = code.co_filename
+            if filename.startswith(self._root):
+                filename = filename[len(self._root):]
+            name = self._frame_names[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+        return name
+
+    def _sample(self, frame) -> None:
+
+        if frame.f_code.co_name in _IDLE_FUNCTIONS:
+            self.samples[(IDLE_LABEL, ())] += 1
+            self.sample_count += 1
+            return
+        stack = []
+        while frame is not None:
+            stack.append(self._frame_name(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        task = asyncio.current_task(self.loop)
+        label = self.task_labels.get(task, UNTAGGED_LABEL) if task is not None else UNTAGGED_LABEL
+        self.samples[(label, tuple(stack))] += 1
+        self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """collapsed 方法返回 collapsed 栈文本，每行为 "标签;根帧;...;叶帧 次数" """
+        lines = []
+        for (label, stack), count in sorted(self.samples.items()):
+            lines.append(f"{';'.join((label,) + stack)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """speedscope 方法返回 speedscope 文件格式：共享帧表，每个标签一个 sampled profile"""
+        frame_index: Dict[str, int] = {}
+        frames = []
+        profiles: Dict[str, Tuple[list, list]] = {}
+        for (label, stack), count in self.samples.items():
+            indices = []
+            for frame_name in stack:
+                index = frame_index.get(frame_name)
+                if index is None:
+                    index = frame_index[frame_name] = len(frames)
+                    frames.append({"name": frame_name})
+                indices.append(index)
+            samples, weights = profiles.setdefault(label, ([], []))
+            samples.append(indices)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "careerbot.monitor.profiler",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": label,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for label, (samples, weights) in sorted(profiles.items())
+            ],
+        }
+
+    def write(self, output_dir: str, name: str) -> Dict[str, str]:
+
+        os.makedirs(output_dir, exist_ok=True)
+        collapsed_path = os.path.join(output_dir, f"{name}.collapsed.txt")
+        speedscope_path = os.path.join(output_dir, f"{name}.speedscope.json")
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        with open(speedscope_path, "w", encoding="utf-8") as f:
+            json.dump(self.speedscope(name), f)
+        return {"collapsed": collapsed_path, "speedscope": speedscope_path}
+
+
+def is_profiling() -> bool:
+
+    return _active is not None
+
+
+async def profile_for(seconds: float, rate_hz: float = DEFAULT_RATE_HZ,
+                      output_dir: str = DEFAULT_OUTPUT_DIR) -> Dict[str, Any]:
+    """
+    profile_for 函数对当前事件循环分析 seconds 秒并写出结果文件
+    必须在被分析的事件循环上运行；已有分析在运行时抛出 RuntimeError
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("A profiling session is already running")
+    seconds = max(0.1, min(float(seconds), MAX_SECONDS))
+    profiler = SamplingProfiler(asyncio.get_running_loop(), threading.get_ident(), rate_hz)
+    _active = profiler
+    profiler.start()
+    logger.info("profiling_started", seconds=seconds, rate_hz=rate_hz)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+        _active = None
+    # 在事件循环之外写文件
+    name = "profile_" + Time.now().strftime("%Y%m%dT%H%M%S")
+    paths = await asyncio.get_running_loop().run_in_executor(None, profiler.write, output_dir, name)
+    logger.info("profiling_finished", samples=profiler.sample_count, **paths)
+    return {"samples": profiler.sample_count, **paths}
+
+
+def start_session(seconds: float, rate_hz: float = DEFAULT_RATE_HZ,
+                  output_dir: str = DEFAULT_OUTPUT_DIR) -> bool:
+    """
+    start_session 函数在当前事件循环上以后台任务启动 profile_for()
+    已有分析在运行时返回 False
+    """
+    global _session_task
+    if _active is not None or (_session_task is not None and not _session_task.done()):
+        return False
+    _session_task = asyncio.get_running_loop().create_task(profile_for(seconds, rate_hz, output_dir))
+    return True
+
+
+def install_signal_trigger(seconds: float = 30.0, sig: int = getattr(signal, "SIGUSR2", 0),
+                           rate_hz: float = DEFAULT_RATE_HZ, output_dir: str = DEFAULT_OUTPUT_DIR) -> bool:
+    """
+    install_signal_trigger 函数使进程每次收到 sig（默认 SIGUSR2，即 kill -USR2 <pid>）时启动一次分析
+    必须在运行中的事件循环上调用；平台不支持该信号时返回 False
+    """
+    if not sig:
+        return False
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(sig, start_session, seconds, rate_hz, output_dir)
+    except (NotImplementedError, RuntimeError):
+        return False
+    return True
@@ -0,0 +1,212 @@
+# tracing.py - 跨请求各环节的 OpenTelemetry span
+"""
+设计用途：
+traced() 装饰每个环节：Orchestrate.handle_request、Router.route_request、MBTIRouter.process 以及各个
+stepN.process。每次调用以环节名开启一个 span，并把 request_id / intent / user_id / route_type 记为属性。
+当前 span 通过 contextvars 跨 await 传递，链式调用（step2 -> step3、step4 -> router -> step5）嵌套在
+触发它们的环节之下，其隐藏开销体现在父环节的耗时分解中。
+
+使用方式：
+- 调用 configure_tracing() 之前追踪关闭，装饰器直接透传
+- 头部抽样由 traced() 在根环节自行决定，结果保存在 ContextVar 中，未被抽中的请求的每个环节都完全跳过
+  SDK（即使开启不记录的 span 也要约 10us）；被抽中的根环节开启真实 span，SDK 抽样器为
+  ParentBased(ALWAYS_ON)，子环节随之记录
+- 结束的 span 写入内存导出器（供测试和临时分析）和/或 OTLP JSON 行文件，不需要采集服务
+- 未安装 opentelemetry SDK（requirements.txt）时 configure_tracing() 记录警告，追踪保持关闭；
+  SDK 在 configure_tracing() 中导入而不是模块导入时，从不追踪的进程不会加载它
+"""
+
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utilities.logger.logger import get_logger
+
+logger = get_logger("monitor.tracing")
+
+SERVICE_NAME = "careerbot"
+
+# 项目根目录：包含 utilities/、applications/、orchestrate/ 等目录
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# span 导出文件默认位于已被 git 忽略的 cache/ 下，可由环境变量 CAREERBOT_TRACE_EXPORT 覆盖
+TRACE_EXPORT_PATH_ENV = "CAREERBOT_TRACE_EXPORT"
+DEFAULT_TRACE_EXPORT_PATH = os.path.join(PROJECT_ROOT, "cache", "traces", "orchestrate_traces.jsonl")
+
+# 请求中存在时复制到每个 span 上的字段
+REQUEST_ATTRIBUTES = ("request_id", "intent", "user_id", "route_type")
+
+_tracer = None
+_provider = None
+_memory_exporter = None
+_sample_ratio = 1.0
+# opentelemetry.trace.Status / StatusCode，由 configure_tracing() 绑定
+_Status = None
+_StatusCode = None
+
+# 当前请求的头部抽样结果：不在任何被追踪环节内时为 None
+_sampled: contextvars.ContextVar = contextvars.ContextVar("careerbot_trace_sampled", default=None)
+
+
+class JsonLinesSpanExporter:
+    """
+    JsonLinesSpanExporter 类把结束的 span 追加写入文件，每行一个 JSON 文档
+    安装了 OTLP proto 包时使用 OTLP JSON 编码（每批一个 ExportTraceServiceRequest），否则每行一个 SDK span JSON
+    实现 SDK 的 SpanExporter 接口但不继承它，因此可以在导入 SDK 之前定义
+    """
+
+    def __init__(self, path: str):
+        from opentelemetry.sdk.trace.export import SpanExportResult
+        try:
+            from google.protobuf.json_format import MessageToDict
+            from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+        except ImportError:  # 改为写出 SDK 自带的 span JSON
+            MessageToDict = encode_spans = None
+        self.path = path
+        self._lock = threading.Lock()
+        self._result = SpanExportResult
+        self._encode = (lambda spans: MessageToDict(encode_spans(spans))) if encode_spans is not None else None
+
+    def export(self, spans: Sequence[Any]):
+
+        if self._encode is not None:
+            lines = [json.dumps(self._encode(spans), separators=(",", ":"))]
+        else:
+            lines = [json.dumps(json.loads(span.to_json()), separators=(",", ":")) for span in spans]
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError:
+            return self._result.FAILURE
+        return self._result.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+
+        return True
+
+
+def configure_tracing(sample_ratio: float = 0.1, export_path: Optional[str] = None,
+                      in_memory: bool = False) -> bool:
+    """
+    configure_tracing 函数以头部抽样方式开启追踪
+    export_path 经 BatchSpanProcessor 追加写入 OTLP JSON 行；in_memory 为真时保留 span 供 finished_spans() 读取
+    未安装 SDK 时返回 False
+    """
+    global _tracer, _provider, _memory_exporter, _sample_ratio, _Status, _StatusCode
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased
+        from opentelemetry.trace import Status, StatusCode
+    except ImportError:  # 追踪保持关闭，traced() 直接透传
+        logger.warning("tracing_unavailable", reason="opentelemetry-sdk not installed")
+        return False
+    _Status, _StatusCode = Status, StatusCode
+    shutdown_tracing()
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(ALWAYS_ON),
+    )
+    if export_path:
+        os.makedirs(os.path.dirname(os.path.abspath(export_path)), exist_ok=True)
+        provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter(export_path)))
+    if in_memory:
+        _memory_exporter = InMemorySpanExporter()
+        provider.add_span_processor(SimpleSpanProcessor(_memory_exporter))
+    # 使用私有 provider：全局 provider 每个进程只能设置一次
+    _provider = provider
+    _sample_ratio = sample_ratio
+    _tracer = provider.get_tracer("careerbot.hops")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """shutdown_tracing 函数写出待导出的 span 并关闭追踪"""
+    global _tracer, _provider, _memory_exporter
+    _tracer = None
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _memory_exporter = None
+
+
+def finished_spans() -> List[Any]:
+    """finished_spans 函数返回内存导出器捕获的 span（未以 in_memory=True 配置时为空）"""
+    return list(_memory_exporter.get_finished_spans()) if _memory_exporter is not None else []
+
+
+def hop_breakdown(spans: Iterable[Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    hop_breakdown 函数按 trace 分组 span
+    每个环节给出总耗时和自身耗时（总耗时减去子环节耗时）
+    """
+    spans = list(spans)
+    child_time: Dict[int, int] = {}
+    for span in spans:
+        if span.parent is not None:
+            child_time[span.parent.span_id] = child_time.get(span.parent.span_id, 0) + span.end_time - span.start_time
+    traces: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for span in spans:
+        total = span.end_time - span.start_time
+        traces.setdefault(format(span.context.trace_id, "032x"), []).append((span.start_time, {
+            "hop": span.name,
+            "request_id": span.attributes.get("request_id"),
+            "total_ms": total / 1e6,
+            "self_ms": (total - child_time.get(span.context.span_id, 0)) / 1e6,
+        }))
+    return {trace_id: [hop for _, hop in sorted(hops, key=lambda item: item[0])] for trace_id, hops in traces.items()}
+
+
+def _is_failure(response: Any) -> bool:
+
+    return type(response) is dict and (response.get("success") is False or "error" in response)
+
+
+def traced(span_name: str, request_attributes: Tuple[str, ...] = REQUEST_ATTRIBUTES,
+           **static_attributes: Any) -> Callable:
+    """
+    traced 函数装饰最后一个位置参数为请求字典的异步环节
+    追踪开启时每次调用开启一个 span
+    """
+
+    def decorator(func: Callable) -> Callable:
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return await func(*args, **kwargs)
+            sampled = _sampled.get()
+            if sampled is False:
+                return await func(*args, **kwargs)
+            if sampled is None:
+                # 根环节：为整个请求做头部抽样决定
+                token = _sampled.set(random.random() < _sample_ratio)
+                try:
+                    return await wrapper(*args, **kwargs)
+                finally:
+                    _sampled.reset(token)
+            request = args[-1] if args else None
+            attributes = dict(static_attributes)
+            if type(request) is dict:
+                for name in request_attributes:
+                    value = request.get(name)
+                    if value is not None:
+                        attributes[name] = value if isinstance(value, (str, bool, int, float)) else str(value)
+            with tracer.start_as_current_span(span_name, attributes=attributes) as span:
+                response = await func(*args, **kwargs)
+                if _is_failure(response) and span.is_recording():
+                    span.set_status(_Status(_StatusCode.ERROR, str(response.get("error_code") or response.get("error"))))
+                return response
+
+        return wrapper
+
+    return decorator
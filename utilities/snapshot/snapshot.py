@@ -0,0 +1,281 @@
+# snapshot.py - 各 worker 进程共享的带版本只读二进制快照
+"""
+设计用途：
+快照文件由若干具名分段组成：定长类型数组（array 的 typecode）、原始字节和字符串表。构建步骤把 JSON 内容文件
+一次性编译为这些平铺结构；每个 worker 以 mmap(ACCESS_READ) 打开文件，以映射上的 memoryview.cast() 视图读取分段。
+worker 启动时不解析也不复制任何数据，各 worker 通过页缓存共享同一份内存页，而不是各自持有一份解析结果。
+
+文件布局（本机字节序，记录在文件头中）：
+
+    header  魔数 b"CBSNAP"、格式版本 u16、字节序 u8、填充 u8、分段数 u32、构建时间 f64
+    table   每个分段一项：名称（56 字节 utf-8，以 NUL 填充）、typecode（1 字节）、填充（7）、偏移 u64、字节数 u64
+    data    各分段数据，按 8 字节对齐
+
+使用方式：
+- 使用方以 source_fingerprint() 检查快照是否过期：源文件名、大小和 mtime 的摘要，每个文件只需一次 stat()，不读取内容
+- 各模块把自己的指纹作为字节分段与数据一起保存
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+MAGIC = b"CBSNAP"
+FORMAT_VERSION = 1
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_SNAPSHOT_PATH = os.path.join(PROJECT_ROOT, "snapshots", "careerbot.snap")
+SNAPSHOT_PATH_ENV = "CAREERBOT_SNAPSHOT"
+
+_HEADER = struct.Struct("=6sHBxId")
+_ENTRY = struct.Struct("=56sc7xQQ")
+_ALIGN = 8
+_BYTE_ORDERS = {"little": 0, "big": 1}
+# 只允许定长 typecode，同一份快照在任何构建主机上含义相同
+_TYPECODES = frozenset("bBhHiIqQfd")
+_RAW = "B"
+
+
+class SnapshotError(Exception):
+    """SnapshotError 异常表示文件不是快照、格式版本或字节序不符，或缺少所需分段"""
+
+
+def source_fingerprint(paths: Iterable[str]) -> bytes:
+    """source_fingerprint 函数返回编译分段所用源文件的名称、大小和 mtime 的摘要"""
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.digest()
+
+
+class SnapshotWriter:
+    """SnapshotWriter 类在内存中收集分段，并写出为一个快照文件"""
+
+    def __init__(self):
+        self.sections: Dict[str, Tuple[str, bytes]] = {}
+
+    def add_array(self, name: str, typecode: str, values: Iterable[Union[int, float]]) -> None:
+
+        if typecode not in _TYPECODES:
+            raise ValueError(f"Unsupported typecode {typecode!r}")
+        self._add(name, typecode, array(typecode, values).tobytes())
+
+    def add_bytes(self, name: str, data: bytes) -> None:
+
+        self._add(name, _RAW, bytes(data))
+
+    def add_strings(self, name: str, strings: Sequence[str]) -> None:
+        """add_strings 方法写入字符串表：<name>.offsets（u32，len + 1 项）与 <name>.blob（utf-8）"""
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = [0]
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        self.add_array(f"{name}.offsets", "I", offsets)
+        self.add_bytes(f"{name}.blob", b"".join(encoded))
+
+    def add_string_map(self, name: str, mapping: Dict[str, str]) -> None:
+        """add_string_map 方法写入只读 str -> str 映射：键排序以便二分查找，值按相同顺序存放"""
+        keys = sorted(mapping)
+        self.add_strings(f"{name}.keys", keys)
+        self.add_strings(f"{name}.values", [mapping[key] for key in keys])
+
+    def _add(self, name: str, typecode: str, data: bytes) -> None:
+
+        if len(name.encode("utf-8")) > 56:
+            raise ValueError(f"Section name too long: {name}")
+        if name in self.sections:
+            raise ValueError(f"Duplicate section {name}")
+        self.sections[name] = (typecode, data)
+
+    def to_bytes(self) -> bytes:
+
+        names = sorted(self.sections)
+        offset = _align(_HEADER.size + _ENTRY.size * len(names))
+        table = []
+        for name in names:
+            typecode, data = self.sections[name]
+            table.append(_ENTRY.pack(name.encode("utf-8"), typecode.encode("ascii"), offset, len(data)))
+            offset = _align(offset + len(data))
+        out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, _BYTE_ORDERS[sys.byteorder], len(names), time.time()))
+        out += b"".join(table)
+        for name in names:
+            out += b"\0" * (_align(len(out)) - len(out))
+            out += self.sections[name][1]
+        return bytes(out)
+
+    def write(self, path: str) -> int:
+        """write 方法以原子方式写出（临时文件 + 重命名），运行中的 worker 不会映射到写了一半的文件"""
+        data = self.to_bytes()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return len(data)
+
+
+def _align(offset: int) -> int:
+
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class StringTable(Sequence):
+    """StringTable 类为首尾相接存放的字符串，访问时才解码"""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+
+        if index < 0:
+            index += len(self)
+        return bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]).decode("utf-8")
+
+    def find(self, value: str) -> int:
+        """find 方法返回 value 在有序表中的下标，不存在时返回 -1"""
+        index = bisect.bisect_left(self, value)
+        return index if index < len(self) and self[index] == value else -1
+
+
+class StringMap(Mapping):
+    """StringMap 类为基于两个字符串表的只读 str -> str 映射（在有序键上二分查找）"""
+
+    def __init__(self, keys: StringTable, values: StringTable):
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: str) -> str:
+
+        index = self._keys.find(key) if isinstance(key, str) else -1
+        if index < 0:
+            raise KeyError(key)
+        return self._values[index]
+
+    def __iter__(self) -> Iterator[str]:
+
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+
+        return len(self._keys)
+
+
+class Snapshot:
+    """Snapshot 类为以只读方式打开的快照，各分段是缓冲区上的零拷贝视图"""
+
+    def __init__(self, buffer, path: Optional[str] = None, mapped=None):
+        self.path = path
+        self._mapped = mapped
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise SnapshotError("File too short for a snapshot header")
+        magic, version, byte_order, count, built_at = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise SnapshotError("Not a snapshot file")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Snapshot format {version}, expected {FORMAT_VERSION}")
+        if byte_order != _BYTE_ORDERS[sys.byteorder]:
+            raise SnapshotError("Snapshot was built on a host with another byte order")
+        self.built_at = built_at
+        self._view = view
+        self._sections: Dict[str, Tuple[str, int, int]] = {}
+        for index in range(count):
+            raw_name, typecode, offset, nbytes = _ENTRY.unpack_from(view, _HEADER.size + index * _ENTRY.size)
+            self._sections[raw_name.rstrip(b"\0").decode("utf-8")] = (typecode.decode("ascii"), offset, nbytes)
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, path, mapped)
+
+    def names(self) -> List[str]:
+
+        return sorted(self._sections)
+
+    def __contains__(self, name: str) -> bool:
+
+        return name in self._sections
+
+    def array(self, name: str) -> memoryview:
+
+        try:
+            typecode, offset, nbytes = self._sections[name]
+        except KeyError:
+            raise SnapshotError(f"Snapshot has no section {name}") from None
+        return self._view[offset:offset + nbytes].cast(typecode)
+
+    def bytes(self, name: str) -> memoryview:
+
+        return self.array(name)
+
+    def strings(self, name: str) -> StringTable:
+
+        return StringTable(self.array(f"{name}.offsets"), self.array(f"{name}.blob"))
+
+    def string_map(self, name: str) -> StringMap:
+
+        return StringMap(self.strings(f"{name}.keys"), self.strings(f"{name}.values"))
+
+    def close(self) -> None:
+        """close 方法解除文件映射，之前交出的视图必须先释放"""
+        self._view.release()
+        if self._mapped is not None:
+            self._mapped.close()
+
+
+_shared: Dict[str, Optional[Snapshot]] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_snapshot(path: Optional[str] = None) -> Optional[Snapshot]:
+    """
+    shared_snapshot 函数返回 path 处（默认为 $CAREERBOT_SNAPSHOT 或 snapshots/careerbot.snap）的进程级快照，每个进程只映射一次
+    文件不存在或无法使用时返回 None，调用方随后退回解析 JSON 源文件
+    """
+    path = path or os.environ.get(SNAPSHOT_PATH_ENV) or DEFAULT_SNAPSHOT_PATH
+    try:
+        return _shared[path]
+    except KeyError:
+        pass
+    with _shared_lock:
+        if path not in _shared:
+            try:
+                _shared[path] = Snapshot.open(path)
+            except (OSError, ValueError, SnapshotError):
+                _shared[path] = None
+        return _shared[path]
+
+
+def is_fresh(snapshot: Optional[Snapshot], prefix: str, sources: Iterable[str]) -> bool:
+    """is_fresh 函数在快照包含 <prefix>.fingerprint 且与当前源文件一致时返回 True"""
+    name = f"{prefix}.fingerprint"
+    return snapshot is not None and name in snapshot and bytes(snapshot.bytes(name)) == source_fingerprint(sources)
+
+
+def snapshot_for(prefix: str, sources: Sequence[str], compile_fn: Callable[[SnapshotWriter], object]) -> Snapshot:
+    """
+    snapshot_for 函数在共享快照包含最新的 prefix 分段时直接返回它，否则以 compile_fn 编译出内存中的快照，
+    调用方在两种情况下读取相同的布局；compile_fn 必须写入 <prefix>.fingerprint
+    """
+    snapshot = shared_snapshot()
+    if is_fresh(snapshot, prefix, sources):
+        return snapshot
+    writer = SnapshotWriter()
+    compile_fn(writer)
+    return Snapshot(writer.to_bytes())
@@ -0,0 +1,85 @@
+# benchmark_logger.py - 结构化日志调用开销基准脚本
+# 职责：对比 同步 StreamHandler 写入、队列化 get_logger() 写入、被级别过滤的 debug 调用 三者在调用方线程上的单次耗时
+
+import io
+import logging
+import os
+import sys
+import time
+import timeit
+
+# 将项目根目录添加到Python路径，以便导入utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from utilities.logger.logger import (
+    JsonLineFormatter,
+    bind_request_context,
+    configure_logging,
+    get_logger,
+    reset_request_context,
+    shutdown_logging,
+    structlog,
+)
+from utilities.time import Time
+
+
+class NullStream(io.TextIOBase):
+    """丢弃所有写入的输出流，避免基准结果受终端或磁盘速度影响"""
+
+    def write(self, text):
+        return len(text)
+
+
+class SlowStream(NullStream):
+    """每次写入阻塞 200 微秒，模拟繁忙磁盘或被下游读取缓慢的管道"""
+
+    def write(self, text):
+        time.sleep(0.0002)
+        return len(text)
+
+
+def bench(label, func, number=50000):
+    """执行 number 次 func 并打印单次耗时（微秒）"""
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"{label:<36} {seconds / number * 1e6:8.2f} us/op")
+
+
+def build_sync_logger(stream):
+    """对照组：在调用方线程上完成JSON格式化和写入的同步 logger"""
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonLineFormatter())
+    logger = logging.getLogger("benchmark.sync")
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def run(stream_name, stream_class, number):
+    print(f"\n=== {stream_name} stream ===")
+    configure_logging(level=logging.INFO, stream=stream_class())
+    queued = get_logger("benchmark.queued")
+    sync = build_sync_logger(stream_class())
+
+    token = bind_request_context(request_id=Time.timestamp(), user_id="user_123")
+    try:
+        bench("sync StreamHandler + JSON", lambda: sync.info(
+            "mbti_step3_triggered", extra={"request_id": "r", "user_id": "u", "mbti_type": "INTJ"}), number)
+        bench("queued get_logger().info", lambda: queued.info("mbti_step3_triggered", mbti_type="INTJ"), number)
+        bench("filtered get_logger().debug",
+              lambda: queued.debug("mbti_database_agent_called", mbti_type="INTJ"), number)
+    finally:
+        reset_request_context(token)
+        shutdown_logging()
+
+
+def main():
+    print(f"front end: {'structlog' if structlog is not None else 'stdlib EventLogger'}")
+    run("null", NullStream, 50000)
+    run("slow (200us/write)", SlowStream, 2000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmark_monitor.py - 指标装饰器开销基准脚本
+# 职责：测量 timed() 装饰器相对裸协程调用的额外耗时（纳秒），并与 prometheus_client Histogram 对比
+
+import asyncio
+import os
+import sys
+import time
+
+# 将项目根目录添加到Python路径，以便导入utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from utilities.monitor.monitor import MetricsRegistry, timed
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+REQUEST = {"route_type": "mbti", "intent": "mbti_step2", "request_id": "r", "user_id": "user_123"}
+
+
+async def handler(request):
+    return {"success": True}
+
+
+async def per_call_ns(func, number):
+    """在同一个事件循环中连续 await number 次 func，返回单次平均纳秒数"""
+    best = None
+    for _ in range(5):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            await func(REQUEST)
+        elapsed = (time.perf_counter_ns() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def build_prometheus_handler():
+    """对照组：使用 prometheus_client Histogram.time() 包装同一个协程；未安装时返回 None"""
+    if prometheus_client is None:
+        return None
+    histogram = prometheus_client.Histogram(
+        "benchmark_duration_seconds", "benchmark", ["route_type", "intent"],
+        registry=prometheus_client.CollectorRegistry()
+    )
+
+    async def wrapped(request):
+        with histogram.labels(request["route_type"], request["intent"]).time():
+            return await handler(request)
+
+    return wrapped
+
+
+async def main():
+    number = 200000
+    registry = MetricsRegistry()
+    static = timed("bench_static", "benchmark", metrics_registry=registry, step="mbti_step2")(handler)
+    labeled = timed("bench_labeled", "benchmark", request_labels=("route_type", "intent"),
+                    metrics_registry=registry)(handler)
+
+    bare = await per_call_ns(handler, number)
+    print(f"{'bare coroutine':<36} {bare:8.0f} ns/op")
+    for label, func in (("timed(step=...)", static), ("timed(request_labels=...)", labeled)):
+        cost = await per_call_ns(func, number)
+        print(f"{label:<36} {cost:8.0f} ns/op  (+{cost - bare:.0f} ns)")
+    prometheus_handler = build_prometheus_handler()
+    if prometheus_handler is not None:
+        cost = await per_call_ns(prometheus_handler, number)
+        print(f"{'prometheus_client Histogram.time()':<36} {cost:8.0f} ns/op  (+{cost - bare:.0f} ns)")
+    else:
+        print("prometheus_client Histogram.time()   skipped (prometheus-client not installed)")
+
+    series = registry.metrics["bench_labeled_duration_seconds"].labels("mbti", "mbti_step2")
+    print(f"\nrecorded {series.count} calls, p50={series.quantile(0.5) * 1e9:.0f} ns, "
+          f"p99={series.quantile(0.99) * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+# benchmark_profiler.py - 按需采样分析器验证脚本
+# 职责：在采样分析进行中并发执行 MBTI step1/step2 流程，输出 collapsed/speedscope 文件，
+#       打印各 route_type/intent 的样本数和最热的叶子函数；并统计开启采样后流程吞吐的变化
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from applications.mbti.router import MBTIRouter
+from utilities.monitor import profiler
+from utilities.time import Time
+
+QUESTION_COUNT = 96
+
+
+async def run_flows(router, seconds):
+    """在 seconds 秒内循环执行 step1 → step2（step2 内部触发 step3），返回完成的流程数"""
+    completed = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        await router.process({"intent": "mbti_step1", "user_id": "profile_user", "test_user": True})
+        await router.process({
+            "intent": "mbti_step2",
+            "user_id": "profile_user",
+            "request_id": Time.timestamp(),
+            "responses": {i: random.randint(1, 5) for i in range(QUESTION_COUNT)},
+        })
+        completed += 1
+        await asyncio.sleep(0)
+    return completed
+
+
+async def main():
+    router = MBTIRouter()
+    baseline = await run_flows(router, 2.0)
+
+    output_dir = tempfile.mkdtemp(prefix="careerbot_profile_")
+    session = asyncio.create_task(profiler.profile_for(2.0, rate_hz=200, output_dir=output_dir))
+    await asyncio.sleep(0)
+    profiled = await run_flows(router, 2.0)
+    result = await session
+    print(f"flows/2s without profiler: {baseline}  with profiler (200 Hz): {profiled}")
+    print(f"samples: {result['samples']}\n{result['collapsed']}\n{result['speedscope']}")
+
+    per_label = Counter()
+    leaves = Counter()
+    with open(result["collapsed"], encoding="utf-8") as f:
+        for line in f:
+            frames, count = line.rsplit(" ", 1)
+            parts = frames.split(";")
+            per_label[parts[0]] += int(count)
+            if len(parts) > 1:
+                leaves[parts[-1]] += int(count)
+    print("\nsamples per route_type/intent:")
+    for label, count in per_label.most_common():
+        print(f"  {label:<28} {count}")
+    print("\nhottest leaf functions:")
+    for leaf, count in leaves.most_common(8):
+        print(f"  {count:>5}  {leaf}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+# benchmark_request_id.py - request ID 生成与解析性能基准脚本
+# 职责：对比 Time.timestamp() 新旧实现的每秒生成数量，以及 Time.parse_request_id 与各step正则校验的单次耗时
+
+import os
+import re
+import sys
+import time
+import timeit
+import uuid
+from datetime import datetime
+
+# 将项目根目录添加到Python路径，以便导入utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from utilities.time import Time
+
+# 原step1-5中使用的timestamp_uuid正则
+REQUEST_ID_PATTERN = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\+\d{4}_[0-9a-f]{8}-[0-9a-f]{4}-[4][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$'
+
+
+def legacy_timestamp():
+    """原 Time.timestamp() 实现：每次调用 datetime.now + strftime + uuid4"""
+    current_time = datetime.now(Time.PHILIPPINES_TZ).strftime(Time.TIMESTAMP_FORMAT)
+    return f"{current_time}_{uuid.uuid4()}"
+
+
+def legacy_is_valid(request_id):
+    """原step模块中的正则校验"""
+    return bool(re.match(REQUEST_ID_PATTERN, str(request_id), re.IGNORECASE))
+
+
+def legacy_parse(request_id):
+    """原方式取内嵌时间戳：正则校验后 strptime"""
+    if not legacy_is_valid(request_id):
+        raise ValueError(request_id)
+    return datetime.strptime(request_id[:24], Time.TIMESTAMP_FORMAT)
+
+
+def rate(func, seconds=1.0):
+    """在 seconds 秒内循环调用 func，返回每秒调用次数"""
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(1000):
+            func()
+        count += 1000
+    return count / seconds
+
+
+def per_call_ns(func, number=200000):
+    """返回 func 单次调用耗时（纳秒）"""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    ids = [Time.timestamp() for _ in range(100000)]
+    assert len(set(ids)) == len(ids)
+    assert all(legacy_is_valid(request_id) for request_id in ids)
+    assert all(Time.parse_request_id(request_id) == legacy_parse(request_id) for request_id in ids[:1000])
+
+    print("=== generation ===")
+    print(f"legacy Time.timestamp     {rate(legacy_timestamp):12,.0f} ids/s")
+    print(f"cached Time.timestamp     {rate(Time.timestamp):12,.0f} ids/s")
+
+    request_id = ids[0]
+    print("\n=== validation / parse ===")
+    print(f"legacy re.match           {per_call_ns(lambda: legacy_is_valid(request_id)):8.0f} ns/op")
+    print(f"Time.is_valid_request_id  {per_call_ns(lambda: Time.is_valid_request_id(request_id)):8.0f} ns/op")
+    print(f"legacy regex + strptime   {per_call_ns(lambda: legacy_parse(request_id)):8.0f} ns/op")
+    print(f"Time.parse_request_id     {per_call_ns(lambda: Time.parse_request_id(request_id)):8.0f} ns/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmark_tracing.py - 跨跳追踪验证与开销基准脚本
+# 职责：以全量采样跑一遍 MBTI step1 → step2（→ 隐式触发 step3）流程，按 trace 打印每一跳的总耗时与自身耗时；
+#       并对比 未启用、启用但未采样、启用且采样 三种情况下 traced() 装饰器的单次开销
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+# 将项目根目录添加到Python路径，以便导入applications和utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from applications.mbti.router import MBTIRouter
+from utilities.monitor import tracing
+from utilities.time import Time
+
+QUESTION_COUNT = 96
+
+
+async def run_flow(router):
+    """step1 生成 request_id，step2 提交随机答案；step2 内部会继续调用 step3"""
+    step1 = await router.process({"intent": "mbti_step1", "user_id": "trace_user", "test_user": True})
+    request_id = step1.get("request_id") or Time.timestamp()
+    await router.process({
+        "intent": "mbti_step2",
+        "user_id": "trace_user",
+        "request_id": request_id,
+        "responses": {i: random.randint(1, 5) for i in range(QUESTION_COUNT)},
+    })
+
+
+@tracing.traced("benchmark.hop")
+async def hop(request):
+    return {"success": True}
+
+
+async def per_call_ns(number=50000):
+    request = {"request_id": Time.timestamp(), "intent": "benchmark"}
+    best = None
+    for _ in range(5):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            await hop(request)
+        elapsed = (time.perf_counter_ns() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+async def main():
+    if not tracing.configure_tracing(sample_ratio=1.0, in_memory=True):
+        print("opentelemetry-sdk not installed, nothing to trace")
+        return
+    await run_flow(MBTIRouter())
+    for trace_id, hops in tracing.hop_breakdown(tracing.finished_spans()).items():
+        print(f"\n=== trace {trace_id[:16]} ===")
+        for item in hops:
+            print(f"{item['hop']:<28} total={item['total_ms']:8.3f} ms  self={item['self_ms']:8.3f} ms")
+
+    tracing.shutdown_tracing()
+    print(f"\n{'traced() disabled':<36} {await per_call_ns():8.0f} ns/op")
+    tracing.configure_tracing(sample_ratio=0.0)
+    print(f"{'traced() enabled, not sampled':<36} {await per_call_ns():8.0f} ns/op")
+    tracing.configure_tracing(sample_ratio=1.0)
+    print(f"{'traced() enabled, sampled':<36} {await per_call_ns():8.0f} ns/op")
+    tracing.shutdown_tracing()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
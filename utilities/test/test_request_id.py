@@ -0,0 +1,83 @@
+# test_request_id.py - request ID 解析与校验的边界测试
+# 职责：核对 Time.parse_request_id / Time.is_valid_request_id 对格式边界的判定与原 step 模块中的正则一致
+#       （大写十六进制、版本 / 变体位、非 ASCII、非字符串、长度），非法日期抛出 ValueError，
+#       以及同一秒前缀复用解析结果时不会返回其他前缀的时间
+# 用法：python -m pytest -q utilities/test/test_request_id.py
+
+import os
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# 将项目根目录添加到Python路径，以便导入utilities模块
+current_dir = os.path.dirname(__file__)
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, root_dir)
+
+from utilities.time import Time
+
+# 原step1-5中使用的timestamp_uuid正则（re.IGNORECASE）
+REQUEST_ID_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\+\d{4}_[0-9a-f]{8}-[0-9a-f]{4}-[4][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$', re.IGNORECASE)
+
+VALID = "2024-01-15T14:30:25+0800_12345678-1234-4678-9012-123456789abc"
+
+SHAPES = [
+    VALID,
+    "2024-01-15T14:30:25+0800_12345678-1234-4678-b012-123456789abc",
+    VALID.upper(),
+    VALID.replace("-9012-", "-B012-"),
+    VALID.replace("-9012-", "-C012-"),
+    VALID.replace("T", "t"),
+    VALID[:-1] + "C",
+    VALID.replace("-4678-", "-5678-"),
+    VALID.replace("-9012-", "-c012-"),
+    VALID.replace("+0800", "-0800"),
+    VALID.replace("T", " "),
+    VALID.replace("_", "-"),
+    VALID[:-1] + "g",
+    VALID[:-1] + "٣",
+    VALID[:-1],
+    VALID + "0",
+    "",
+]
+
+
+@pytest.mark.parametrize("request_id", SHAPES)
+def test_shape_matches_legacy_regex(request_id):
+    assert Time.is_valid_request_id(request_id) == bool(REQUEST_ID_PATTERN.match(request_id))
+
+
+@pytest.mark.parametrize("request_id", [None, 12345, VALID.encode("ascii")])
+def test_non_string_is_invalid(request_id):
+    assert not Time.is_valid_request_id(request_id)
+    with pytest.raises(ValueError):
+        Time.parse_request_id(request_id)
+
+
+@pytest.mark.parametrize("prefix", ["2024-13-15T14:30:25+0800", "2024-02-30T14:30:25+0800",
+                                    "2024-01-15T24:30:25+0800"])
+def test_impossible_date_is_invalid(prefix):
+    assert not Time.is_valid_request_id(prefix + VALID[24:])
+
+
+def test_parsed_time_and_offset():
+    assert Time.parse_request_id(VALID) == datetime(2024, 1, 15, 14, 30, 25, tzinfo=Time.PHILIPPINES_TZ)
+    other = Time.parse_request_id(VALID.replace("+0800", "+0530"))
+    assert other.utcoffset() == timedelta(hours=5, minutes=30)
+    assert other == datetime(2024, 1, 15, 9, 0, 25, tzinfo=timezone.utc)
+
+
+def test_prefix_reuse_does_not_leak_between_prefixes():
+    first = Time.parse_request_id(VALID)
+    later = Time.parse_request_id(VALID.replace(":25+", ":26+"))
+    assert later - first == timedelta(seconds=1)
+    assert Time.parse_request_id(VALID) == first
+
+
+def test_generated_ids_round_trip():
+    for _ in range(1000):
+        request_id = Time.timestamp()
+        assert REQUEST_ID_PATTERN.match(request_id)
+        assert abs(Time.parse_request_id(request_id) - Time.now()) < timedelta(seconds=5)
@@ -1,6 +1,8 @@
 from datetime import datetime, timezone, timedelta
 
-import uuid
+import os
+import threading
+import time as _time
 
 class Time :
 
@@ -8,6 +10,29 @@ class Time :
 
     TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
 
+    # request_id layout: 24-char timestamp, "_", 36-char uuid4
+    REQUEST_ID_LENGTH = 61
+
+    _RANDOM_BLOCK_SIZE = 16 * 512
+    # request_id shape check: map every digit (and hex letter in the uuid part) to "0" with one
+    # bytes.translate call and compare against the expected layout; letters are case-insensitive,
+    # as in the re.IGNORECASE pattern the step modules used
+    _DIGIT_SHAPE = bytes.maketrans(b"123456789t", b"000000000T")
+    _HEX_SHAPE = bytes.maketrans(b"123456789abcdefABCDEF", b"0" * 21)
+    _TIMESTAMP_LAYOUT = b"0000-00-00T00:00:00+0000_"
+    _UUID_LAYOUT = b"00000000-0000-0000-0000-000000000000"
+    _VERSION_OFFSET = 39
+    _VARIANT_OFFSET = 44
+    # uuid4 variant nibble must be 10xx: map any random nibble onto 8, 9, a or b
+    _VARIANT_NIBBLE = {c: "89ab"[int(c, 16) & 3] for c in "0123456789abcdef"}
+
+    _lock = threading.Lock()
+    _prefix_second = None
+    _prefix = ""
+    _random_block = b""
+    _random_offset = 0
+    _last_parsed = ("", None)
+
     @classmethod
     def now(cls) -> datetime:
 
@@ -16,9 +41,75 @@ class Time :
     @classmethod
     def timestamp(cls) ->str:
 
-        current_time = cls.now().strftime(cls.TIMESTAMP_FORMAT)
-        unique_id = str(uuid.uuid4())
+        with cls._lock:
+            second = int(_time.time())
+            if second != cls._prefix_second:
+                # the formatted prefix only changes once per second
+                cls._prefix = datetime.fromtimestamp(second, cls.PHILIPPINES_TZ).strftime(cls.TIMESTAMP_FORMAT)
+                cls._prefix_second = second
+            offset = cls._random_offset
+            if offset >= len(cls._random_block):
+                cls._random_block = os.urandom(cls._RANDOM_BLOCK_SIZE)
+                offset = 0
+            cls._random_offset = offset + 16
+            current_time = cls._prefix
+            random_hex = cls._random_block[offset:offset + 16].hex()
+        unique_id = (
+            f"{random_hex[:8]}-{random_hex[8:12]}-4{random_hex[13:16]}-"
+            f"{cls._VARIANT_NIBBLE[random_hex[16]]}{random_hex[17:20]}-{random_hex[20:]}"
+        )
         timestamp_with_uuid = f"{current_time}_{unique_id}"
         return timestamp_with_uuid
+
+    @classmethod
+    def parse_request_id(cls, request_id: str) -> datetime:
+        """
+        Return the timestamp embedded in a timestamp_uuid request id.
+        Raises ValueError when request_id is not in the Time.timestamp() format.
+        """
+        if type(request_id) is not str or len(request_id) != cls.REQUEST_ID_LENGTH:
+            raise ValueError(f"Invalid request ID format: {request_id}")
+        # str.encode raises UnicodeEncodeError (a ValueError) for non-ASCII input
+        encoded = request_id.encode("ascii")
+        if (encoded[:25].translate(cls._DIGIT_SHAPE) != cls._TIMESTAMP_LAYOUT
+                or encoded[25:].translate(cls._HEX_SHAPE) != cls._UUID_LAYOUT
+                or encoded[cls._VERSION_OFFSET] != 52  # "4"
+                or encoded[cls._VARIANT_OFFSET] not in b"89abAB"):
+            raise ValueError(f"Invalid request ID format: {request_id}")
+
+        # most request ids in flight share the same second: reuse the last parsed prefix
+        prefix = request_id[:24]
+        last_prefix, last_datetime = cls._last_parsed
+        if prefix == last_prefix:
+            return last_datetime
+        offset_minutes = int(prefix[20:22]) * 60 + int(prefix[22:24])
+        parsed = datetime(
+            int(prefix[:4]), int(prefix[5:7]), int(prefix[8:10]),
+            int(prefix[11:13]), int(prefix[14:16]), int(prefix[17:19]),
+            tzinfo=cls.PHILIPPINES_TZ if offset_minutes == 480 else timezone(timedelta(minutes=offset_minutes))
+        )
+        cls._last_parsed = (prefix, parsed)
+        return parsed
+
+    @classmethod
+    def is_valid_request_id(cls, request_id: str) -> bool:
+
+        try:
+            cls.parse_request_id(request_id)
+        except ValueError:
+            return False
+        return True
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+
+        # a forked worker must not replay the parent's buffered random bytes
+        cls._lock = threading.Lock()
+        cls._random_block = b""
+        cls._random_offset = 0
+
 # output format ex : 2024-01-15T14:30:25+0800_12345678-1234-5678-9012-123456789012
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=Time._reset_after_fork)
+
 time = Time()